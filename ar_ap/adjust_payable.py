@@ -5,6 +5,8 @@ from PySide6.QtWidgets import (QWidget, QVBoxLayout, QLabel, QLineEdit, QPushBut
                                QMessageBox, QHBoxLayout, QDialog)
 from create_database import DatabaseManager
 from utils.crud.search_dialog import AdvancedSearchDialog
+from utils.money import Money
+from ledger import adjust_party_movement
 
 class AdjustPayableWindow(QWidget):
     def __init__(self, main_window):
@@ -14,7 +16,6 @@ class AdjustPayableWindow(QWidget):
         self.db_manager = DatabaseManager()
         self.selected_creditor = None
         self.selected_transaction = None
-        self.original_amount = 0
         self.init_ui()
 
     def init_ui(self):
@@ -119,13 +120,11 @@ class AdjustPayableWindow(QWidget):
             self.date_input.setText(self.selected_transaction['date'])
             self.details_input.setText(self.selected_transaction['details'])
             self.amount_input.setText(str(self.selected_transaction['amount']))
-            self.original_amount = float(self.selected_transaction['amount'])
 
     def clear_fields(self):
         self.date_input.clear()
         self.details_input.clear()
         self.amount_input.clear()
-        self.original_amount = 0
         self.adjust_button.setEnabled(False)
 
     def adjust_payable(self):
@@ -133,7 +132,7 @@ class AdjustPayableWindow(QWidget):
             return
 
         try:
-            new_amount = float(self.amount_input.text())
+            new_amount = Money.parse(self.amount_input.text())
             if new_amount <= 0:
                 raise ValueError("Amount must be positive.")
         except ValueError:
@@ -141,73 +140,15 @@ class AdjustPayableWindow(QWidget):
             return
 
         new_details = self.details_input.text().strip()
-        transaction_id = self.selected_transaction['id']
-        creditor_id = self.selected_creditor['id']  # Use creditor_id
-        amount_difference = new_amount - self.original_amount
-        transaction_type = self.selected_transaction['type']
 
         try:
             with self.db_manager as db:
-                # --- 1. Update debtor_creditor_transactions ---
-                db.cursor.execute(
-                    """
-                    UPDATE debtor_creditor_transactions
-                    SET details = ?, amount = ?
-                    WHERE id = ?
-                    """,
-                    (new_details, new_amount, transaction_id)
-                )
-
-                # --- 2. Update debtor_creditor amount ---
-                if transaction_type == "Inflow":  # Inflow: We received goods/services
-                    db.cursor.execute(
-                        "UPDATE debtor_creditor SET amount = amount - ? WHERE id = ?",
-                        (amount_difference, creditor_id)  # Subtract difference
-                    )
-                elif transaction_type == "Outflow":  # Outflow: We made a payment
-                    db.cursor.execute(
-                        "UPDATE debtor_creditor SET amount = amount + ? WHERE id = ?",
-                        (amount_difference, creditor_id)  # Add difference
-                    )
-                else:
-                    QMessageBox.critical(self, "Error", f"Invalid transaction type: {transaction_type}")
-                    return
-
-
-                # --- 3. Find corresponding transaction in 'transactions' table ---
-                db.cursor.execute("SELECT * FROM transactions WHERE description = ? AND date = ?", (self.selected_transaction['details'], self.selected_transaction['date']))
-
-                transaction = db.cursor.fetchone()
-                if transaction:
-                    transaction_id_trans = transaction['id']
-                    debited_account_id = transaction['debited']
-                    credited_account_id = transaction['credited']
-
-                    # --- 4. Update the 'transactions' table ---
-                    db.cursor.execute(
-                        """
-                        UPDATE transactions
-                        SET description = ?, amount = ?
-                        WHERE id = ?
-                        """,
-                        (new_details, new_amount, transaction_id_trans)
-                    )
-
-                    # --- 5. Update Account Balances ---
-                    db.cursor.execute(
-                        "UPDATE accounts SET balance = balance + ? WHERE id = ?",
-                        (amount_difference, debited_account_id)
-                    )
-                    db.cursor.execute(
-                        "UPDATE accounts SET balance = balance - ? WHERE id = ?",
-                        (amount_difference, credited_account_id)
-                    )
-                else:
-                    QMessageBox.warning(self,"Error", "Could not find the transaction id in transaction table")
+                # Movement, creditor's amount and the linked ledger posting in one transaction
+                adjust_party_movement(db.cursor, self.selected_transaction['id'], new_details, new_amount)
                 db.commit()
                 QMessageBox.information(self, "Success", "Payable adjusted successfully!")
                 self.close()
 
         except (sqlite3.Error, Exception) as e:
             db.conn.rollback()
-            QMessageBox.critical(self, "Error", str(e))
\ No newline at end of file
+            QMessageBox.critical(self, "Error", str(e))
@@ -0,0 +1,173 @@
+# ar_ap/aging_core.py
+"""
+AR/AP aging: how long each debtor's and creditor's open balance has been
+outstanding as of a date.
+
+A party's balance grows with its charges (outflows for debtors, inflows for
+creditors) and shrinks with the opposite movement. Settlements are applied to
+the oldest charges first, so the open items are the newest charges that add
+up to the balance; each is aged by its date into BUCKETS. Everything is
+computed in one grouped SQL pass over debtor_creditor_transactions, in
+integer cents.
+"""
+import threading
+from collections import OrderedDict, namedtuple
+from create_database import DatabaseManager
+from ledger.ar_ap import DEBTOR
+from utils.money import Money
+
+# (label, first day, last day); None is open-ended
+BUCKETS = (
+    ('0-30', 0, 30),
+    ('31-60', 31, 60),
+    ('61-90', 61, 90),
+    ('90+', 91, None),
+)
+
+# buckets: open amount per BUCKETS entry; balance: as of the date, negative
+# when the party has paid (or been paid) more than it was charged
+AgingRow = namedtuple('AgingRow', 'party_id name kind buckets balance')
+OpenItem = namedtuple('OpenItem', 'id party_id date details amount open_amount age')
+
+CACHED_DATES = 16  # As-of dates kept per database
+
+
+def _bucket_case(index):
+    _, first, last = BUCKETS[index]
+    if last is None:
+        return f"o.age >= {first}"
+    return f"o.age BETWEEN {first} AND {last}"
+
+
+def _open_items_sql(party_filter=""):
+    """
+    CTEs ending in open_items(id, party_id, date, details, cents, open_cents,
+    age) as of :as_of. Charges are walked newest first; each one is open for
+    whatever part of the balance the newer charges do not cover.
+    """
+    return f"""
+        WITH movements AS (
+            SELECT t.id, t.debtor_creditor AS party_id, t.date, t.details,
+                   t.amount AS cents,
+                   (p.account = {DEBTOR}) = (t.type = 'Outflow') AS is_charge
+            FROM debtor_creditor_transactions t
+            JOIN debtor_creditor p ON p.id = t.debtor_creditor
+            WHERE t.date <= :as_of {party_filter}
+        ),
+        balances AS (
+            SELECT party_id, SUM(CASE WHEN is_charge THEN cents ELSE -cents END) AS balance
+            FROM movements
+            GROUP BY party_id
+        ),
+        charges AS (
+            SELECT id, party_id, date, details, cents,
+                   COALESCE(SUM(cents) OVER (
+                       PARTITION BY party_id ORDER BY date DESC, id DESC
+                       ROWS BETWEEN UNBOUNDED PRECEDING AND 1 PRECEDING
+                   ), 0) AS newer_cents
+            FROM movements
+            WHERE is_charge
+        ),
+        open_items AS (
+            SELECT c.id, c.party_id, c.date, c.details, c.cents,
+                   MIN(c.cents, b.balance - c.newer_cents) AS open_cents,
+                   CAST(julianday(:as_of) - julianday(c.date) AS INTEGER) AS age
+            FROM charges c
+            JOIN balances b ON b.party_id = c.party_id
+            WHERE b.balance > c.newer_cents
+        )
+    """
+
+
+def aging_summary(cursor, as_of):
+    """
+    One AgingRow per debtor/creditor, ordered by kind then name, as of the
+    date (a 'YYYY-MM-DD' string or date).
+    """
+    bucket_columns = ",\n".join(
+        f"SUM(CASE WHEN {_bucket_case(i)} THEN o.open_cents ELSE 0 END) AS bucket_{i}"
+        for i in range(len(BUCKETS)))
+    cursor.execute(_open_items_sql() + f"""
+        , party_buckets AS (
+            SELECT o.party_id, {bucket_columns}
+            FROM open_items o
+            GROUP BY o.party_id
+        )
+        SELECT p.id, p.name, p.account, COALESCE(b.balance, 0) AS balance,
+               {", ".join(f"COALESCE(pb.bucket_{i}, 0) AS bucket_{i}" for i in range(len(BUCKETS)))}
+        FROM debtor_creditor p
+        LEFT JOIN balances b ON b.party_id = p.id
+        LEFT JOIN party_buckets pb ON pb.party_id = p.id
+        ORDER BY p.account, p.name
+    """, {'as_of': str(as_of)})
+    return [
+        AgingRow(row['id'], row['name'], int(row['account']),
+                 tuple(Money.from_db(row[f'bucket_{i}']) for i in range(len(BUCKETS))),
+                 Money.from_db(row['balance']))
+        for row in cursor.fetchall()
+    ]
+
+
+def open_items(cursor, as_of, party_id=None, bucket=None, kind=None):
+    """
+    The open items behind aging_summary(), oldest first: one party's
+    (party_id), one kind's (DEBTOR or CREDITOR), or all, optionally only
+    those in BUCKETS[bucket].
+    """
+    params = {'as_of': str(as_of)}
+    party_filter = ""
+    if party_id is not None:
+        party_filter += " AND t.debtor_creditor = :party_id"
+        params['party_id'] = party_id
+    if kind is not None:
+        party_filter += " AND p.account = :kind"
+        params['kind'] = kind
+    query = _open_items_sql(party_filter) + "SELECT * FROM open_items o"
+    if bucket is not None:
+        query += f" WHERE {_bucket_case(bucket)}"
+    cursor.execute(query + " ORDER BY o.date, o.id", params)
+    return [
+        OpenItem(row['id'], row['party_id'], row['date'], row['details'], Money.from_db(row['cents']),
+                 Money.from_db(row['open_cents']), row['age'])
+        for row in cursor.fetchall()
+    ]
+
+
+class AgingCache:
+    """
+    aging_summary() results per (database, as-of date), kept until an AR/AP
+    party or movement changes (ar_ap_revision, bumped by triggers). Only the
+    most recent CACHED_DATES dates per database are kept.
+    """
+
+    def __init__(self, max_dates=CACHED_DATES):
+        self.max_dates = max_dates
+        self._lock = threading.Lock()
+        self._results = {}  # db_path -> OrderedDict(as_of -> (revision, rows))
+
+    def summary(self, as_of, db_name='financial_system.db'):
+        """aging_summary() as of the date, recomputed only when AR/AP data changed since the last call."""
+        as_of = str(as_of)
+        with DatabaseManager(db_name) as db:
+            db.cursor.execute("SELECT revision FROM ar_ap_revision WHERE id = 1")
+            revision = db.cursor.fetchone()[0]
+            with self._lock:
+                cached = self._results.get(db.db_path, {}).get(as_of)
+                if cached and cached[0] == revision:
+                    self._results[db.db_path].move_to_end(as_of)
+                    return cached[1]
+            rows = aging_summary(db.cursor, as_of)
+            with self._lock:
+                results = self._results.setdefault(db.db_path, OrderedDict())
+                results[as_of] = (revision, rows)
+                results.move_to_end(as_of)
+                while len(results) > self.max_dates:
+                    results.popitem(last=False)
+            return rows
+
+    def invalidate(self):
+        with self._lock:
+            self._results.clear()
+
+
+aging_cache = AgingCache()
@@ -5,6 +5,8 @@ from PySide6.QtWidgets import (QWidget, QVBoxLayout, QLabel, QLineEdit, QPushBut
                                QMessageBox, QHBoxLayout, QDialog)
 from create_database import DatabaseManager
 from utils.crud.search_dialog import AdvancedSearchDialog
+from utils.money import Money
+from ledger import PARTY_SOURCE, linked_transaction, reverse_transaction
 
 class CancelPayableWindow(QWidget):
     def __init__(self, main_window):
@@ -144,21 +146,13 @@ class CancelPayableWindow(QWidget):
 
         transaction_id = self.selected_transaction['id']
         creditor_id = self.selected_creditor['id']
-        amount = float(self.selected_transaction['amount'])
+        amount = Money.parse(self.selected_transaction['amount'])
         transaction_type = self.selected_transaction['type']
 
         try:
             with self.db_manager as db:
-                # --- 1. Find corresponding transaction in 'transactions' table ---
-                db.cursor.execute("SELECT * FROM transactions WHERE description = ? AND date = ?", (self.selected_transaction['details'], self.selected_transaction['date']))
-                transaction = db.cursor.fetchone()
-                if not transaction:
-                    QMessageBox.critical(self, "Error", "Could not find corresponding transaction in 'transactions' table.")
-                    return
-
-                transaction_id_trans = transaction['id']
-                debited_account_id = transaction['debited']
-                credited_account_id = transaction['credited']
+                # --- 1. Find the ledger transaction linked to this movement ---
+                transaction_id_trans = linked_transaction(db.cursor, PARTY_SOURCE, transaction_id)['id']
 
                 # --- 2. Delete from debtor_creditor_transactions ---
                 db.cursor.execute(
@@ -181,21 +175,8 @@ class CancelPayableWindow(QWidget):
                     QMessageBox.critical(self, "Error", f"Invalid transaction type: {transaction_type}")
                     return
 
-                # --- 4. Delete from transactions table ---
-                db.cursor.execute(
-                    "DELETE FROM transactions WHERE id = ?",
-                    (transaction_id_trans,)
-                )
-
-                # --- 5. Update Account Balances ---
-                db.cursor.execute(
-                    "UPDATE accounts SET balance = balance - ? WHERE id = ?",
-                    (amount, debited_account_id)
-                )
-                db.cursor.execute(
-                    "UPDATE accounts SET balance = balance + ? WHERE id = ?",
-                    (amount, credited_account_id)
-                )
+                # --- 4. Delete the ledger transaction and reverse its balance impact ---
+                reverse_transaction(db.cursor, transaction_id_trans)
 
                 db.commit()
                 QMessageBox.information(self, "Success", "Payable canceled successfully!")
@@ -1,14 +1,14 @@
 # ar_ap/record_liability_settlement.py
 
 import sqlite3
-import json
-import os
 from PySide6.QtWidgets import (QWidget, QVBoxLayout, QLabel, QLineEdit, QPushButton,
                                QMessageBox, QHBoxLayout, QDialog)
 from PySide6.QtCore import QDate
 from create_database import DatabaseManager
 from utils.crud.date_select import DateSelectWindow
 from utils.crud.search_dialog import AdvancedSearchDialog
+from utils.money import Money
+from ledger import record_party_movement
 from utils.formatters import format_table_name
 
 class RecordLiabilitySettlementWindow(QWidget):
@@ -17,7 +17,6 @@ class RecordLiabilitySettlementWindow(QWidget):
         self.main_window = main_window
         self.setWindowTitle("Record Liability Settlement (Outflow)")
         self.db_manager = DatabaseManager()
-        self.settings_file = os.path.join("data", "ar_ap_settings.json")
         self.selected_creditor = None
         self.selected_asset = None  # We'll use an asset to settle the liability
         self.init_ui()
@@ -123,7 +122,7 @@ class RecordLiabilitySettlementWindow(QWidget):
             QMessageBox.warning(self, "Error", "Please fill in all required fields.")
             return
         try:
-            amount = float(self.amount_input.text())
+            amount = Money.parse(self.amount_input.text())
             if amount <= 0:
                 raise ValueError("Amount must be positive.")
         except ValueError:
@@ -143,42 +142,8 @@ class RecordLiabilitySettlementWindow(QWidget):
 
         try:
             with self.db_manager as db:
-                # --- 1. Insert into debtor_creditor_transactions ---
-                db.cursor.execute(
-                    """
-                    INSERT INTO debtor_creditor_transactions (date, details, amount, debtor_creditor, type)
-                    VALUES (?, ?, ?, ?, ?)
-                    """,
-                    (date, details, amount, creditor_id, transaction_type)
-                )
-
-                # --- 2. Update debtor_creditor amount (Add) ---
-                db.cursor.execute(
-                    "UPDATE debtor_creditor SET amount = amount - ? WHERE id = ?",  # Deduct for outflow
-                    (amount, creditor_id)
-                )
-
-                # --- 3. Load AP account ID from settings ---
-                if not os.path.exists(self.settings_file):
-                    QMessageBox.critical(self, "Error", "AR/AP settings not found.  Please configure them.")
-                    return
-                with open(self.settings_file, "r") as f:
-                    settings = json.load(f)
-                ap_account_id = settings.get("payable_account_id")
-                if not ap_account_id:
-                    QMessageBox.critical(self, "Error", "Accounts Payable account not set in AR/AP settings.")
-                    return
-
-                # --- 4. Insert into transactions table ---
-                db.cursor.execute(
-                    "INSERT INTO transactions (date, description, debited, credited, amount, source_type) VALUES (?, ?, ?, ?, ?, ?)",
-                    (date, details, ap_account_id, asset_id, amount, 'DEBTOR_CREDITOR')  # AP is debited, Asset is credited
-                )
-
-                # --- 5. Update Account Balances ---
-                db.cursor.execute("UPDATE accounts SET balance = balance + ? WHERE id = ?", (amount, ap_account_id))  # Increase AP
-                db.cursor.execute("UPDATE accounts SET balance = balance - ? WHERE id = ?", (amount, asset_id))  # Decrease Asset
-
+                # AR/AP entry, party balance and ledger posting in one transaction
+                record_party_movement(db.cursor, creditor_id, transaction_type, date, details, amount, asset_id)
                 db.commit()
                 QMessageBox.information(self, "Success", "Liability settled successfully!")
                 self.close()
@@ -1,14 +1,14 @@
 # ar_ap/register_asset_transfer_outflow.py
 
 import sqlite3
-import json
-import os
 from PySide6.QtWidgets import (QWidget, QVBoxLayout, QLabel, QLineEdit, QPushButton,
                                QMessageBox, QHBoxLayout, QDialog)
 from PySide6.QtCore import QDate
 from create_database import DatabaseManager
 from utils.crud.date_select import DateSelectWindow
 from utils.crud.search_dialog import AdvancedSearchDialog
+from utils.money import Money
+from ledger import record_party_movement
 from utils.formatters import format_table_name
 
 class RegisterAssetTransferOutflowWindow(QWidget):
@@ -17,7 +17,6 @@ class RegisterAssetTransferOutflowWindow(QWidget):
         self.main_window = main_window
         self.setWindowTitle("Register Asset Transfer (Outflow)")
         self.db_manager = DatabaseManager()
-        self.settings_file = os.path.join("data", "ar_ap_settings.json")
         self.selected_debtor = None
         self.selected_asset = None
         self.init_ui()
@@ -116,7 +115,7 @@ class RegisterAssetTransferOutflowWindow(QWidget):
             QMessageBox.warning(self, "Error", "Please fill in all required fields.")
             return
         try:
-            amount = float(self.amount_input.text())
+            amount = Money.parse(self.amount_input.text())
             if amount <= 0:
                 raise ValueError("Amount must be positive.")
         except ValueError:
@@ -136,42 +135,8 @@ class RegisterAssetTransferOutflowWindow(QWidget):
 
         try:
             with self.db_manager as db:
-                # --- 1. Insert into debtor_creditor_transactions ---
-                db.cursor.execute(
-                    """
-                    INSERT INTO debtor_creditor_transactions (date, details, amount, debtor_creditor, type)
-                    VALUES (?, ?, ?, ?, ?)
-                    """,
-                    (date, details, amount, debtor_id, transaction_type)  # Include type and debtor_id
-                )
-
-                # --- 2. Update debtor_creditor amount ---
-                db.cursor.execute(
-                    "UPDATE debtor_creditor SET amount = amount + ? WHERE id = ?",
-                    (amount, debtor_id)
-                )
-
-                # --- 3. Load AR account ID from settings ---
-                if not os.path.exists(self.settings_file):
-                    QMessageBox.critical(self, "Error", "AR/AP settings not found.  Please configure them.")
-                    return
-                with open(self.settings_file, "r") as f:
-                    settings = json.load(f)
-                ar_account_id = settings.get("receivable_account_id")
-                if not ar_account_id:
-                    QMessageBox.critical(self, "Error", "Accounts Receivable account not set in AR/AP settings.")
-                    return
-
-                # --- 4. Insert into transactions table ---
-                db.cursor.execute(
-                    "INSERT INTO transactions (date, description, debited, credited, amount, source_type) VALUES (?, ?, ?, ?, ?, ?)",
-                    (date, details, ar_account_id, asset_id, amount, 'DEBTOR_CREDITOR')  # Use 'details'
-                )
-
-                # --- 5. Update Account Balances ---
-                db.cursor.execute("UPDATE accounts SET balance = balance + ? WHERE id = ?", (amount, ar_account_id))
-                db.cursor.execute("UPDATE accounts SET balance = balance - ? WHERE id = ?", (amount, asset_id))
-
+                # AR/AP entry, party balance and ledger posting in one transaction
+                record_party_movement(db.cursor, debtor_id, transaction_type, date, details, amount, asset_id)
                 db.commit()
                 QMessageBox.information(self, "Success", "Asset transfer registered successfully!")
                 self.close()
@@ -5,6 +5,7 @@ from PySide6.QtWidgets import (QWidget, QVBoxLayout, QLabel, QPushButton,
                                QMessageBox, QHBoxLayout, QLineEdit, QDialog)
 from utils.crud.search_dialog import AdvancedSearchDialog
 from create_database import DatabaseManager
+from ledger.settings import app_settings
 
 class ARAPSettingsWindow(QWidget):
     def __init__(self, main_window):
@@ -119,9 +120,7 @@ class ARAPSettingsWindow(QWidget):
             data["payable_account_id"] = self.selected_ap_account['id']
 
         try:
-            os.makedirs(os.path.dirname(self.settings_file), exist_ok=True) # Ensure directory
-            with open(self.settings_file, "w") as f:
-                json.dump(data, f, indent=4)
+            app_settings.save(os.path.basename(self.settings_file), data)
             QMessageBox.information(self, "Success", "Settings saved successfully!")
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to save settings: {e}")
\ No newline at end of file
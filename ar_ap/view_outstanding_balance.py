@@ -3,10 +3,17 @@
 import sqlite3
 from PySide6.QtWidgets import (QWidget, QVBoxLayout, QLabel, QTableWidget,
                                QTableWidgetItem, QMessageBox, QDialog,
-                               QHBoxLayout)
-from PySide6.QtCore import Qt
+                               QHBoxLayout, QDateEdit, QPushButton)
+from PySide6.QtCore import Qt, QDate
 from create_database import DatabaseManager
 from utils.formatters import format_table_name
+from utils.money import Money
+from ledger.ar_ap import DEBTOR, CREDITOR
+from ar_ap.aging_core import BUCKETS, aging_cache, open_items
+
+# ID, Name, Balance, then one column per aging bucket
+COLUMNS = ["ID", "Name", "Balance"] + [label for label, _, _ in BUCKETS]
+FIRST_BUCKET_COLUMN = 3
 
 class OutstandingBalanceWindow(QWidget):
     def __init__(self, main_window):
@@ -19,14 +26,26 @@ class OutstandingBalanceWindow(QWidget):
     def init_ui(self):
         layout = QVBoxLayout(self)
 
+        # --- As-of Date ---
+        date_layout = QHBoxLayout()
+        date_layout.addWidget(QLabel("As Of:"))
+        self.as_of_edit = QDateEdit(QDate.currentDate())
+        self.as_of_edit.setCalendarPopup(True)
+        self.as_of_edit.setDisplayFormat("yyyy-MM-dd")
+        date_layout.addWidget(self.as_of_edit)
+        self.refresh_button = QPushButton("Refresh")
+        self.refresh_button.clicked.connect(self.load_data)
+        date_layout.addWidget(self.refresh_button)
+        layout.addLayout(date_layout)
+
         # Debtor Section
         debtor_label = QLabel("Debtors")
         debtor_label.setStyleSheet("font-weight: bold; font-size: 16px;")
         layout.addWidget(debtor_label)
 
         self.debtor_table = QTableWidget()
-        self.debtor_table.setColumnCount(3)  # ID, Name, Amount
-        self.debtor_table.setHorizontalHeaderLabels(["ID", "Name", "Amount"])
+        self.debtor_table.setColumnCount(len(COLUMNS))
+        self.debtor_table.setHorizontalHeaderLabels(COLUMNS)
         self.debtor_table.horizontalHeader().setStretchLastSection(True)
         self.debtor_table.setEditTriggers(QTableWidget.NoEditTriggers)  # Make read-only
         self.debtor_table.cellDoubleClicked.connect(self.show_debtor_transactions)
@@ -38,8 +57,8 @@ class OutstandingBalanceWindow(QWidget):
         layout.addWidget(creditor_label)
 
         self.creditor_table = QTableWidget()
-        self.creditor_table.setColumnCount(3)  # ID, Name, Amount
-        self.creditor_table.setHorizontalHeaderLabels(["ID", "Name", "Amount"])
+        self.creditor_table.setColumnCount(len(COLUMNS))
+        self.creditor_table.setHorizontalHeaderLabels(COLUMNS)
         self.creditor_table.horizontalHeader().setStretchLastSection(True)
         self.creditor_table.setEditTriggers(QTableWidget.NoEditTriggers)  # Make read-only
         self.creditor_table.cellDoubleClicked.connect(self.show_creditor_transactions)
@@ -49,29 +68,26 @@ class OutstandingBalanceWindow(QWidget):
         self.load_data()
 
 
+    def as_of(self):
+        return self.as_of_edit.date().toString("yyyy-MM-dd")
+
     def load_data(self):
+        """Fills both tables with each party's balance and aging buckets as of the selected date."""
         try:
-            with self.db_manager as db:
-                # --- Debtors ---
-                db.cursor.execute("SELECT id, name, amount FROM debtor_creditor WHERE account = 1")
-                debtors = db.cursor.fetchall()
-                self.debtor_table.setRowCount(len(debtors))
-                for row, debtor in enumerate(debtors):
-                    self.debtor_table.setItem(row, 0, QTableWidgetItem(str(debtor['id'])))
-                    self.debtor_table.setItem(row, 1, QTableWidgetItem(debtor['name']))
-                    self.debtor_table.setItem(row, 2, QTableWidgetItem(str(debtor['amount'])))
-
-                # --- Creditors ---
-                db.cursor.execute("SELECT id, name, amount FROM debtor_creditor WHERE account = 2")
-                creditors = db.cursor.fetchall()
-                self.creditor_table.setRowCount(len(creditors))
-                for row, creditor in enumerate(creditors):
-                    self.creditor_table.setItem(row, 0, QTableWidgetItem(str(creditor['id'])))
-                    self.creditor_table.setItem(row, 1, QTableWidgetItem(creditor['name']))
-                    self.creditor_table.setItem(row, 2, QTableWidgetItem(str(creditor['amount'])))
-
+            rows = aging_cache.summary(self.as_of())
         except sqlite3.Error as e:
             QMessageBox.critical(self, "Database Error", str(e))
+            return
+
+        for table, kind in ((self.debtor_table, DEBTOR), (self.creditor_table, CREDITOR)):
+            parties = [row for row in rows if row.kind == kind]
+            table.setRowCount(len(parties))
+            for row_num, party in enumerate(parties):
+                table.setItem(row_num, 0, QTableWidgetItem(str(party.party_id)))
+                table.setItem(row_num, 1, QTableWidgetItem(party.name))
+                table.setItem(row_num, 2, QTableWidgetItem(f"{party.balance:,.2f}"))
+                for i, amount in enumerate(party.buckets):
+                    table.setItem(row_num, FIRST_BUCKET_COLUMN + i, QTableWidgetItem(f"{amount:,.2f}"))
 
     def show_debtor_transactions(self, row, column):
         self.show_transactions(row, column, self.debtor_table, "Debtor")
@@ -82,13 +98,16 @@ class OutstandingBalanceWindow(QWidget):
 
 
     def show_transactions(self, row, column, table, party_type):
-        """Shows transactions for the selected debtor/creditor."""
+        """Shows transactions for the selected debtor/creditor, or its open items when a bucket was clicked."""
         try:
             item = table.item(row, 0)  # Get the ID from the first column
             if not item:
                 return  # Safety check: No item at selected row/col
 
             party_id = int(item.text()) # gets id
+            if column >= FIRST_BUCKET_COLUMN:
+                self.show_bucket_items(party_id, column - FIRST_BUCKET_COLUMN, party_type)
+                return
 
         except ValueError:
             QMessageBox.warning(self, "Error", "Invalid ID")
@@ -113,7 +132,8 @@ class OutstandingBalanceWindow(QWidget):
             with self.db_manager as db:
                 db.cursor.execute("""SELECT id, date, details, amount
                                      FROM debtor_creditor_transactions
-                                     WHERE debtor_creditor = ?""", (party_id,))
+                                     WHERE debtor_creditor = ?
+                                     ORDER BY date, id""", (party_id,))
                 transactions = db.cursor.fetchall()
 
                 transaction_table.setRowCount(len(transactions))
@@ -121,11 +141,42 @@ class OutstandingBalanceWindow(QWidget):
                     transaction_table.setItem(row_num, 0, QTableWidgetItem(str(trans['id'])))
                     transaction_table.setItem(row_num, 1, QTableWidgetItem(trans['date'])) 
                     transaction_table.setItem(row_num, 2, QTableWidgetItem(trans['details']))
-                    transaction_table.setItem(row_num, 3, QTableWidgetItem(str(trans['amount'])))
+                    transaction_table.setItem(row_num, 3, QTableWidgetItem(f"{Money.from_db(trans['amount']):,.2f}"))
 
         except sqlite3.Error as e:
             QMessageBox.critical(dialog, "Database Error", str(e))
             dialog.reject() # closes and returns to the main window
             return
 
-        dialog.exec() # shows window
\ No newline at end of file
+        dialog.exec() # shows window
+
+    def show_bucket_items(self, party_id, bucket, party_type):
+        """Shows the open items making up one party's aging bucket."""
+        as_of = self.as_of()
+        try:
+            with self.db_manager as db:
+                items = open_items(db.cursor, as_of, party_id=party_id, bucket=bucket)
+        except sqlite3.Error as e:
+            QMessageBox.critical(self, "Database Error", str(e))
+            return
+
+        dialog = QDialog(self)
+        dialog.setWindowTitle(f"{party_type} Open Items: {BUCKETS[bucket][0]} days as of {as_of}")
+        layout = QVBoxLayout(dialog)
+
+        items_table = QTableWidget()
+        items_table.setColumnCount(6)
+        items_table.setHorizontalHeaderLabels(["ID", "Date", "Details", "Amount", "Open", "Age (days)"])
+        items_table.horizontalHeader().setStretchLastSection(True)
+        items_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        items_table.setRowCount(len(items))
+        for row_num, open_item in enumerate(items):
+            items_table.setItem(row_num, 0, QTableWidgetItem(str(open_item.id)))
+            items_table.setItem(row_num, 1, QTableWidgetItem(open_item.date))
+            items_table.setItem(row_num, 2, QTableWidgetItem(open_item.details))
+            items_table.setItem(row_num, 3, QTableWidgetItem(f"{open_item.amount:,.2f}"))
+            items_table.setItem(row_num, 4, QTableWidgetItem(f"{open_item.open_amount:,.2f}"))
+            items_table.setItem(row_num, 5, QTableWidgetItem(str(open_item.age)))
+        layout.addWidget(items_table)
+
+        dialog.exec()
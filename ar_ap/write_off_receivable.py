@@ -6,6 +6,8 @@ from PySide6.QtWidgets import (QWidget, QVBoxLayout, QLabel, QLineEdit, QPushBut
 from PySide6.QtCore import QDate
 from create_database import DatabaseManager
 from utils.crud.search_dialog import AdvancedSearchDialog
+from utils.money import Money
+from ledger import PARTY_SOURCE, linked_transaction, reverse_transaction
 from utils.formatters import format_table_name
 
 class WriteOffReceivableWindow(QWidget):
@@ -146,22 +148,13 @@ class WriteOffReceivableWindow(QWidget):
 
         transaction_id = self.selected_transaction['id']
         debtor_id = self.selected_debtor['id']
-        amount = float(self.selected_transaction['amount'])
+        amount = Money.parse(self.selected_transaction['amount'])
         transaction_type = self.selected_transaction['type'] # get transaction type
 
         try:
             with self.db_manager as db:
-                # --- 1. Find corresponding transaction in 'transactions' table ---
-                db.cursor.execute("SELECT * FROM transactions WHERE description = ? AND date = ?", (self.selected_transaction['details'], self.selected_transaction['date']))
-                transaction = db.cursor.fetchone()
-
-                if not transaction:
-                    QMessageBox.critical(self, "Error", "Could not find corresponding transaction in 'transactions' table.")
-                    return
-
-                transaction_id_trans = transaction['id']
-                debited_account_id = transaction['debited']
-                credited_account_id = transaction['credited']
+                # --- 1. Find the ledger transaction linked to this movement ---
+                transaction_id_trans = linked_transaction(db.cursor, PARTY_SOURCE, transaction_id)['id']
 
                 # --- 2. Delete from debtor_creditor_transactions ---
                 db.cursor.execute(
@@ -185,21 +178,8 @@ class WriteOffReceivableWindow(QWidget):
                     QMessageBox.critical(self, "Error", f"Invalid transaction type: {transaction_type}")
                     return
 
-                # --- 4. Delete from transactions table ---
-                db.cursor.execute(
-                    "DELETE FROM transactions WHERE id = ?",
-                    (transaction_id_trans,)
-                )
-
-                # --- 5. Update Account Balances ---
-                db.cursor.execute(
-                    "UPDATE accounts SET balance = balance - ? WHERE id = ?",
-                    (amount, debited_account_id)  # Subtract from debited
-                )
-                db.cursor.execute(
-                    "UPDATE accounts SET balance = balance + ? WHERE id = ?",
-                    (amount, credited_account_id)  # Add to credited
-                )
+                # --- 4. Delete the ledger transaction and reverse its balance impact ---
+                reverse_transaction(db.cursor, transaction_id_trans)
 
                 db.commit()
                 QMessageBox.information(self, "Success", "Receivable written off successfully!")
@@ -0,0 +1,268 @@
+# backup_core.py
+"""
+Deduplicated backups of the data directory, without the GUI: each backup is a
+manifest naming the content-addressed chunks of every file.
+
+List or restore backups with:
+
+    python -m backup_core --restore fintrack_backup_<timestamp>.json --to restored/
+"""
+import os
+import json
+import zlib
+import sqlite3
+import hashlib
+import datetime
+import argparse
+import threading
+from pathlib import Path
+from create_database import SQLITE_SIDECAR_SUFFIXES
+
+MANIFEST_PREFIX = "fintrack_backup_"
+DATABASE_SUFFIXES = ('.db', '.sqlite', '.sqlite3')
+
+
+class ChunkStore:
+    """
+    Content-addressed blob store: each chunk is kept once, zlib-compressed,
+    under chunks/<first two hex digits>/<sha256>. Unchanged data is never
+    written twice, so successive backups only add the chunks that changed.
+    """
+
+    def __init__(self, root, compression_level=1):
+        self.root = Path(root)
+        self.compression_level = compression_level
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, digest):
+        return self.root / digest[:2] / digest
+
+    def put(self, data):
+        """Stores a chunk if it is new. Returns (digest, bytes written)."""
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._path(digest)
+        if path.exists():
+            return digest, 0
+        path.parent.mkdir(exist_ok=True)
+        compressed = zlib.compress(data, self.compression_level)
+        temp_path = path.with_suffix('.tmp')
+        with open(temp_path, 'wb') as f:
+            f.write(compressed)
+        os.replace(temp_path, path)  # A chunk is either complete or absent
+        return digest, len(compressed)
+
+    def get(self, digest):
+        """Returns a chunk's data, checking it against its digest."""
+        with open(self._path(digest), 'rb') as f:
+            data = zlib.decompress(f.read())
+        if hashlib.sha256(data).hexdigest() != digest:
+            raise ValueError(f"Backup chunk {digest} is corrupted.")
+        return data
+
+    def sweep(self, keep):
+        """Deletes every chunk (and leftover temp file) whose digest is not in `keep`. Returns the count."""
+        removed = 0
+        for path in self.root.glob('*/*'):
+            if path.name not in keep:
+                path.unlink()
+                removed += 1
+        return removed
+
+
+class BackupSystem:
+    def __init__(self, parent=None, backup_dir="backups", data_dir="data", max_backups=20,
+                 chunk_size=256 * 1024):
+        """
+        Initialize the backup system.
+
+        Args:
+            parent: The parent window (optional)
+            backup_dir: Directory to store backups
+            data_dir: Directory to backup
+            max_backups: Maximum number of backups (manifests) to keep
+            chunk_size: Size of the deduplicated chunks; a multiple of the SQLite page size
+        """
+        self.parent = parent
+        self.backup_dir = backup_dir
+        self.data_dir = data_dir
+        self.max_backups = max_backups
+        self.chunk_size = chunk_size
+        self.manifest_dir = os.path.join(self.backup_dir, "manifests")
+        self._lock = threading.Lock()  # One backup (and sweep) at a time
+
+        # Create backup directories if they don't exist
+        os.makedirs(self.manifest_dir, exist_ok=True)
+        self.chunks = ChunkStore(os.path.join(self.backup_dir, "chunks"))
+
+    def create_backup(self, progress=None):
+        """
+        Create a point-in-time backup of the data directory.
+
+        Databases are copied with the SQLite online backup API, which gives a
+        consistent snapshot even while the app holds open connections. Every
+        file is split into fixed-size chunks stored once by content, and a JSON
+        manifest records which chunks make up each file.
+
+        Safe to call from a worker thread; concurrent calls run one after the
+        other. progress(done_bytes, total_bytes) is called as chunks are stored.
+        """
+        with self._lock:
+            try:
+                data_path = Path(self.data_dir)
+                if not data_path.exists():
+                    print(f"Warning: Data directory '{self.data_dir}' not found. Backup skipped.")
+                    return False
+
+                created = datetime.datetime.now()
+                manifest_name = self._new_manifest_name(created)
+                manifest = {'created': created.isoformat(timespec='microseconds'),
+                            'chunk_size': self.chunk_size, 'files': {}}
+                files = [file_path for file_path in sorted(data_path.rglob('*'))
+                         if file_path.is_file() and not file_path.name.endswith(SQLITE_SIDECAR_SUFFIXES)]
+                # Database snapshots come out about the size of the file
+                counter = {'done': 0, 'total': sum(file_path.stat().st_size for file_path in files), 'written': 0}
+
+                def on_chunk(size, chunk_written):
+                    counter['done'] += size
+                    counter['written'] += chunk_written
+                    if progress:
+                        progress(min(counter['done'], counter['total']), counter['total'])
+
+                for file_path in files:
+                    arcname = file_path.relative_to(data_path.parent).as_posix()
+                    if file_path.suffix in DATABASE_SUFFIXES:
+                        manifest['files'][arcname] = self._store_database(file_path, on_chunk)
+                    else:
+                        manifest['files'][arcname] = self._store_file(file_path, on_chunk)
+
+                # The manifest is written last, so an interrupted backup leaves no manifest
+                manifest_path = os.path.join(self.manifest_dir, manifest_name)
+                temp_path = manifest_path + ".tmp"
+                with open(temp_path, 'w') as f:
+                    json.dump(manifest, f, indent=1)
+                os.replace(temp_path, manifest_path)
+
+                # Manage backup rotation (keep only max_backups)
+                self._cleanup_old_backups()
+
+                print(f"Backup created successfully: {manifest_path} ({counter['written']:,} new bytes stored)")
+                return True
+
+            except Exception as e:
+                print(f"Error creating backup: {str(e)}")
+                return False
+
+    def _new_manifest_name(self, created):
+        """
+        A manifest name that sorts by creation time. Microseconds keep backups
+        taken within the same second apart; a counter covers clocks that did
+        not advance between two backups.
+        """
+        stamp = created.strftime("%Y%m%d_%H%M%S_%f")
+        manifest_name, number = f"{MANIFEST_PREFIX}{stamp}.json", 1
+        while os.path.exists(os.path.join(self.manifest_dir, manifest_name)):
+            manifest_name, number = f"{MANIFEST_PREFIX}{stamp}_{number}.json", number + 1
+        return manifest_name
+
+    def _store_file(self, file_path, on_chunk):
+        """Chunks a file into the store and returns its manifest entry."""
+        size, digests = 0, []
+        with open(file_path, 'rb') as f:
+            while True:
+                data = f.read(self.chunk_size)
+                if not data:
+                    return {'size': size, 'chunks': digests}
+                digest, written = self.chunks.put(data)
+                digests.append(digest)
+                size += len(data)
+                on_chunk(len(data), written)
+
+    def _store_database(self, db_path, on_chunk):
+        """Snapshots a database with the online backup API, then chunks the snapshot."""
+        snapshot_path = Path(self.backup_dir) / f"{db_path.name}.snapshot"
+        source = sqlite3.connect(f"file:{db_path.resolve().as_posix()}?mode=ro", uri=True)
+        target = sqlite3.connect(snapshot_path)
+        try:
+            source.backup(target)
+        finally:
+            target.close()
+            source.close()
+        try:
+            entry = self._store_file(snapshot_path, on_chunk)
+        finally:
+            os.remove(snapshot_path)
+        entry['sqlite'] = True
+        return entry
+
+    def list_backups(self):
+        """Returns the manifest names, oldest first."""
+        return sorted(f for f in os.listdir(self.manifest_dir)
+                      if f.startswith(MANIFEST_PREFIX) and f.endswith(".json"))
+
+    def restore_backup(self, manifest_name, target_dir):
+        """
+        Rebuild the files of a backup under target_dir (e.g. target_dir/data/...).
+
+        Restore into an empty directory and swap it in while the app is closed;
+        never over the data directory of a running instance.
+        """
+        with open(os.path.join(self.manifest_dir, manifest_name), 'r') as f:
+            manifest = json.load(f)
+        for arcname, entry in manifest['files'].items():
+            file_path = Path(target_dir) / arcname
+            file_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(file_path, 'wb') as out:
+                for digest in entry['chunks']:
+                    out.write(self.chunks.get(digest))
+            if file_path.stat().st_size != entry['size']:
+                raise ValueError(f"Restored {arcname} has the wrong size.")
+        return sorted(manifest['files'])
+
+    def _cleanup_old_backups(self):
+        """Remove old backups if we exceed the maximum number allowed, then unreferenced chunks."""
+        try:
+            # Manifest names sort by timestamp (oldest first)
+            manifests = self.list_backups()
+            while len(manifests) > self.max_backups:
+                oldest_file = os.path.join(self.manifest_dir, manifests.pop(0))
+                os.remove(oldest_file)
+                print(f"Removed old backup: {oldest_file}")
+
+            # Full zip backups from earlier versions rotate out the same way
+            legacy_zips = sorted(f for f in os.listdir(self.backup_dir)
+                                 if f.startswith(MANIFEST_PREFIX) and f.endswith(".zip"))
+            while len(legacy_zips) > self.max_backups:
+                oldest_file = os.path.join(self.backup_dir, legacy_zips.pop(0))
+                os.remove(oldest_file)
+                print(f"Removed old backup: {oldest_file}")
+
+            # Mark and sweep: keep every chunk a remaining manifest refers to
+            referenced = set()
+            for name in manifests:
+                with open(os.path.join(self.manifest_dir, name), 'r') as f:
+                    for entry in json.load(f)['files'].values():
+                        referenced.update(entry['chunks'])
+            removed = self.chunks.sweep(referenced)
+            if removed:
+                print(f"Removed {removed} unreferenced backup chunk(s)")
+
+        except Exception as e:
+            print(f"Error cleaning up old backups: {str(e)}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="List or restore FinTrack backups.")
+    parser.add_argument("--backup-dir", default="backups")
+    parser.add_argument("--restore", metavar="MANIFEST", help="Backup to restore (see the list)")
+    parser.add_argument("--to", metavar="DIR", help="Empty directory to restore into")
+    args = parser.parse_args()
+
+    system = BackupSystem(backup_dir=args.backup_dir)
+    if args.restore:
+        if not args.to:
+            parser.error("--restore needs --to")
+        for restored in system.restore_backup(args.restore, args.to):
+            print(f"Restored {restored}")
+    else:
+        for name in system.list_backups():
+            print(name)
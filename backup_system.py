@@ -1,110 +1,144 @@
 # backup_system.py
-import os
-import zipfile
-import datetime
-import shutil
+import threading
+import time
 from pathlib import Path
+from PySide6.QtWidgets import QApplication, QProgressDialog
+from PySide6.QtCore import Qt, QObject, QTimer, QEvent, Signal, Slot
+from backup_core import BackupSystem
 
-class BackupSystem:
-    def __init__(self, parent=None, backup_dir="backups", data_dir="data", max_backups=20):
-        """
-        Initialize the backup system.
-        
-        Args:
-            parent: The parent window (optional)
-            backup_dir: Directory to store backups
-            data_dir: Directory to backup
-            max_backups: Maximum number of backup files to keep
-        """
-        self.parent = parent
-        self.backup_dir = backup_dir
-        self.data_dir = data_dir
-        self.max_backups = max_backups
-        
-        # Create backup directory if it doesn't exist
-        if not os.path.exists(self.backup_dir):
-            os.makedirs(self.backup_dir)
-    
-    def create_backup(self):
-        """Create a zip backup of the data directory."""
-        try:
-            # Generate timestamped filename
-            timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-            backup_filename = f"fintrack_backup_{timestamp}.zip"
-            backup_path = os.path.join(self.backup_dir, backup_filename)
-            
-            # Create zip file
-            with zipfile.ZipFile(backup_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-                data_path = Path(self.data_dir)
-                
-                # Check if data directory exists
-                if not data_path.exists():
-                    print(f"Warning: Data directory '{self.data_dir}' not found. Backup skipped.")
-                    return False
-                
-                # Add all files in data directory to zip
-                for file_path in data_path.rglob('*'):
-                    if file_path.is_file():
-                        # Store the relative path in the zip
-                        zipf.write(
-                            file_path, 
-                            arcname=str(file_path.relative_to(data_path.parent))
-                        )
-            
-            # Manage backup rotation (keep only max_backups)
-            self._cleanup_old_backups()
-            
-            print(f"Backup created successfully: {backup_path}")
-            return True
-            
-        except Exception as e:
-            print(f"Error creating backup: {str(e)}")
+
+class BackupSignals(QObject):
+    """Signals for the backup worker thread."""
+    progress = Signal(int)
+    finished = Signal(bool)
+
+
+class BackgroundBackup(QObject):
+    """
+    Runs backups on a worker thread so the window never blocks on them.
+
+    While the app is idle (no keyboard or mouse input for idle_seconds) a
+    backup is taken every interval_minutes if the data files changed, which
+    keeps the backup at close a small delta. On close the final backup gets
+    at most close_budget_seconds, behind a "Finishing backup..." indicator;
+    past the budget the app closes anyway. An unfinished backup writes no
+    manifest, so the previous backup stays the latest complete one.
+    """
+
+    def __init__(self, app, window, backup_system=None, interval_minutes=15,
+                 idle_seconds=60, close_budget_seconds=10):
+        super().__init__(window)
+        self.window = window
+        self.backup_system = backup_system or BackupSystem()
+        self.idle_seconds = idle_seconds
+        self.close_budget_seconds = close_budget_seconds
+        self.thread = None
+        self.last_input = time.monotonic()
+        self.last_signature = None  # Data files as of the last successful backup
+        self.signals = BackupSignals()
+        self.signals.finished.connect(self._on_finished)
+
+        app.installEventFilter(self)
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self._on_timer)
+        self.timer.start(int(interval_minutes * 60 * 1000))
+
+    def eventFilter(self, watched, event):
+        if event.type() in (QEvent.KeyPress, QEvent.MouseButtonPress, QEvent.Wheel):
+            self.last_input = time.monotonic()
+        return False
+
+    def is_running(self):
+        return self.thread is not None and self.thread.is_alive()
+
+    def _data_signature(self):
+        """Name, size and modification time of every data file, WAL included."""
+        data_path = Path(self.backup_system.data_dir)
+        if not data_path.exists():
+            return None
+        return tuple((str(p), p.stat().st_size, p.stat().st_mtime_ns)
+                     for p in sorted(data_path.rglob('*')) if p.is_file())
+
+    def start_backup(self):
+        """Starts a backup on the worker thread unless one is running or nothing changed."""
+        if self.is_running():
             return False
-    
-    def _cleanup_old_backups(self):
-        """Remove old backups if we exceed the maximum number allowed."""
+        signature = self._data_signature()
+        if signature is not None and signature == self.last_signature:
+            return False
+        # Daemon: a backup cut short at exit leaves no manifest behind
+        self.thread = threading.Thread(target=self._worker, args=(signature,), daemon=True)
+        self.thread.start()
+        return True
+
+    def _worker(self, signature):
+        def report(done, total):
+            self.signals.progress.emit(int(done * 100 / total) if total else 100)
+        succeeded = self.backup_system.create_backup(progress=report)
+        if succeeded:
+            self.last_signature = signature
+        self.signals.finished.emit(succeeded)
+
+    def _on_timer(self):
+        if time.monotonic() - self.last_input >= self.idle_seconds:
+            self.start_backup()
+
+    @Slot(bool)
+    def _on_finished(self, succeeded):
+        if succeeded and self.window.isVisible():
+            self.window.statusBar().showMessage("Backup saved", 3000)
+
+    def finish_on_close(self):
+        """Takes the final backup, waiting at most close_budget_seconds for it."""
+        self.timer.stop()
+        self.start_backup()
+        if not self.is_running():
+            return
+
+        dialog = QProgressDialog("Finishing backup...", "Close Now", 0, 100, self.window)
+        dialog.setWindowTitle("Backup")
+        dialog.setWindowModality(Qt.WindowModal)
+        dialog.setMinimumDuration(300)  # Only shown if the backup is not done almost at once
+        self.signals.progress.connect(dialog.setValue)
+        deadline = time.monotonic() + self.close_budget_seconds
         try:
-            # Get list of backup files sorted by creation time (oldest first)
-            backup_files = []
-            for f in os.listdir(self.backup_dir):
-                if f.startswith("fintrack_backup_") and f.endswith(".zip"):
-                    full_path = os.path.join(self.backup_dir, f)
-                    if os.path.isfile(full_path):
-                        creation_time = os.path.getctime(full_path)
-                        backup_files.append((full_path, creation_time))
-            
-            # Sort by creation time (oldest first)
-            backup_files.sort(key=lambda x: x[1])
-            
-            # Remove oldest backups if we have too many
-            while len(backup_files) > self.max_backups:
-                oldest_file = backup_files[0][0]
-                os.remove(oldest_file)
-                print(f"Removed old backup: {oldest_file}")
-                backup_files.pop(0)
-                
-        except Exception as e:
-            print(f"Error cleaning up old backups: {str(e)}")
-
-def register_app_close_backup(app, window):
+            while self.is_running() and time.monotonic() < deadline and not dialog.wasCanceled():
+                self.thread.join(0.05)
+                QApplication.processEvents()
+        finally:
+            self.signals.progress.disconnect(dialog.setValue)
+            dialog.close()
+        if self.is_running():
+            print("Backup did not finish within the close budget; the previous backup is kept.")
+
+
+def register_app_close_backup(app, window, interval_minutes=15, idle_seconds=60, close_budget_seconds=10):
     """
-    Register a function to create a backup when the application closes.
-    
+    Register background backups: periodic ones while the app is idle and a
+    final one, bounded by close_budget_seconds, when the application closes.
+
     Args:
         app: QApplication instance
         window: MainWindow instance
+        interval_minutes: Minutes between idle-time backups
+        idle_seconds: Seconds without user input before an idle-time backup may run
+        close_budget_seconds: Longest the close waits for the final backup
     """
-    backup_system = BackupSystem()
-    
+    background_backup = BackgroundBackup(app, window, interval_minutes=interval_minutes,
+                                         idle_seconds=idle_seconds,
+                                         close_budget_seconds=close_budget_seconds)
+    window.background_backup = background_backup
+
     # Store original closeEvent
     original_close_event = window.closeEvent
-    
-    # Define new closeEvent that creates backup before closing
+
+    # Define new closeEvent that finishes the backup before closing
     def closeEvent_with_backup(event):
-        print("Application closing, creating backup...")
-        backup_system.create_backup()
+        print("Application closing, finishing backup...")
+        background_backup.finish_on_close()
         # Call the original closeEvent
         original_close_event(event)
-    
+
     # Replace the closeEvent method
-    window.closeEvent = closeEvent_with_backup
\ No newline at end of file
+    window.closeEvent = closeEvent_with_backup
+    return background_backup
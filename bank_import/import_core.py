@@ -0,0 +1,150 @@
+# bank_import/import_core.py
+"""
+Headless bank statement import: stream a CSV/OFX export, pick counterpart
+accounts from the import rules, skip lines already in the ledger and post
+the rest in committed chunks.
+"""
+from create_database import DatabaseManager
+from bank_import.import_rules import CounterpartMatcher, load_import_settings
+from bank_import.statement_readers import iter_statement
+from ledger import post_entries
+from utils.formatters import statement_hash
+
+CHUNK_SIZE = 500             # Statement lines posted (and committed) together
+HASH_BACKFILL_BATCH = 5000   # Unhashed ledger rows hashed per backfill step
+UNMATCHED_SAMPLE = 20        # Unmatched descriptions kept for the summary
+
+
+def backfill_import_hashes(db, batch_size=HASH_BACKFILL_BATCH):
+    """
+    Hashes ledger rows that have no import_hash. Every posting is hashed when
+    it is written and migration 13 hashed the older ones, so this only finds
+    rows written outside the ledger helpers (e.g. by an older copy of the
+    application on a synced device); the indexed lookup costs nothing
+    otherwise. Commits after every batch. Returns the number of rows hashed.
+    """
+    hashed = 0
+    while True:
+        db.cursor.execute(
+            """
+            UPDATE transactions SET import_hash = statement_hash(date, amount, description)
+            WHERE id IN (SELECT id FROM transactions WHERE import_hash IS NULL LIMIT ?)
+            """,
+            (batch_size,)
+        )
+        if db.cursor.rowcount <= 0:
+            return hashed
+        hashed += db.cursor.rowcount
+        db.commit()
+
+
+def _ledger_counts(cursor, hashes, bank_account_id):
+    """How many ledger rows on the bank account already carry each hash."""
+    counts = {}
+    hashes = list(hashes)
+    for start in range(0, len(hashes), CHUNK_SIZE):
+        batch = hashes[start:start + CHUNK_SIZE]
+        placeholders = ", ".join("?" * len(batch))
+        cursor.execute(
+            f"""
+            SELECT import_hash, COUNT(*) AS total FROM transactions
+            WHERE import_hash IN ({placeholders}) AND (debited = ? OR credited = ?)
+            GROUP BY import_hash
+            """,
+            (*batch, bank_account_id, bank_account_id)
+        )
+        counts.update((row['import_hash'], row['total']) for row in cursor.fetchall())
+    return counts
+
+
+def _post_chunk(cursor, lines, bank_account_id, matcher, occurrences, summary):
+    """Posts one chunk of statement lines, skipping duplicates and unmatched lines."""
+    hashes = [statement_hash(line.date, line.amount, line.description) for line in lines]
+    new_hashes = {h for h in hashes if h not in occurrences}
+    if new_hashes:
+        counts = _ledger_counts(cursor, new_hashes, bank_account_id)
+        for h in new_hashes:
+            # [rows in the ledger before this import, occurrences seen in the statement]
+            occurrences[h] = [counts.get(h, 0), 0]
+
+    entries = []
+    for line, line_hash in zip(lines, hashes):
+        seen = occurrences[line_hash]
+        seen[1] += 1
+        # The n-th identical line is new only if the ledger had fewer than n
+        if seen[1] <= seen[0]:
+            summary['duplicates'] += 1
+            continue
+
+        counterpart = matcher.account_for(line.description)
+        if counterpart is None or counterpart == bank_account_id:
+            summary['unmatched'] += 1
+            if len(summary['unmatched_descriptions']) < UNMATCHED_SAMPLE:
+                summary['unmatched_descriptions'].append(f"{line.date}  {line.amount:,.2f}  {line.description}")
+            continue
+
+        if line.amount > 0:  # Money in: debit the bank account
+            debited, credited = bank_account_id, counterpart
+        else:
+            debited, credited = counterpart, bank_account_id
+        entries.append({'date': line.date, 'description': line.description, 'debited': debited,
+                        'credited': credited, 'amount': abs(line.amount), 'import_hash': line_hash})
+
+    summary['imported'] += post_entries(cursor, entries)
+
+
+def import_statement(path, bank_account_id, settings=None, chunk_size=CHUNK_SIZE,
+                     progress=None, cancelled=None, db_name='financial_system.db'):
+    """
+    Imports a bank statement into the ledger against `bank_account_id`.
+
+    The file is streamed and posted `chunk_size` lines at a time, each chunk in
+    its own commit, so memory stays flat apart from one small entry per
+    distinct line for duplicate counting. A failed or cancelled run keeps the
+    chunks already committed; running it again skips them as duplicates.
+
+    progress(position, total, summary) is called after every commit, and
+    cancelled() (if given) is checked between chunks.
+
+    Returns a summary dict: read, imported, duplicates, unmatched,
+    zero_amount, unmatched_descriptions, hashed (ledger rows backfilled) and
+    cancelled.
+    """
+    settings = settings or load_import_settings()
+    matcher = CounterpartMatcher(settings.get('rules', []), settings.get('default_account_id'))
+    summary = {'read': 0, 'imported': 0, 'duplicates': 0, 'unmatched': 0, 'zero_amount': 0,
+               'unmatched_descriptions': [], 'hashed': 0, 'cancelled': False}
+    position = [0, 0]
+    occurrences = {}
+
+    def reader_progress(done, total):
+        position[0], position[1] = done, total
+
+    def flush(chunk):
+        _post_chunk(db.cursor, chunk, bank_account_id, matcher, occurrences, summary)
+        db.commit()
+        if progress:
+            progress(position[0], position[1], summary)
+
+    with DatabaseManager(db_name) as db:
+        try:
+            summary['hashed'] = backfill_import_hashes(db)
+            chunk = []
+            for line in iter_statement(path, settings.get('csv_mapping'), reader_progress):
+                summary['read'] += 1
+                if not line.amount:
+                    summary['zero_amount'] += 1
+                    continue
+                chunk.append(line)
+                if len(chunk) >= chunk_size:
+                    flush(chunk)
+                    chunk = []
+                    if cancelled and cancelled():
+                        summary['cancelled'] = True
+                        return summary
+            if chunk:
+                flush(chunk)
+        except Exception:
+            db.rollback()  # Only the chunk in progress; earlier chunks stay committed
+            raise
+    return summary
@@ -0,0 +1,64 @@
+# bank_import/import_rules.py
+"""
+Statement import settings: the CSV column mapping and the rules that pick the
+counterpart account of each statement line. Stored in data/import_rules.json:
+
+    {
+        "csv_mapping": {"date_column": "Date", "date_format": "%d/%m/%Y", ...},
+        "rules": [
+            {"pattern": "payroll", "account_id": 12},
+            {"pattern": "^POS .*FUEL", "regex": true, "account_id": 31}
+        ],
+        "default_account_id": 40
+    }
+
+Rules are tried in order and the first match wins; plain patterns match
+anywhere in the description, ignoring case and accents. Lines no rule
+matches go to default_account_id (e.g. a suspense account) when it is set,
+and are left out of the import otherwise.
+"""
+import json
+import os
+import re
+from utils.formatters import normalize_text
+
+IMPORT_RULES_FILE = os.path.join("data", "import_rules.json")
+
+
+def load_import_settings(settings_file=IMPORT_RULES_FILE):
+    """Returns the saved import settings, with empty defaults when the file is missing."""
+    settings = {'csv_mapping': {}, 'rules': [], 'default_account_id': None}
+    if os.path.exists(settings_file):
+        with open(settings_file, "r") as f:
+            settings.update(json.load(f))
+    return settings
+
+
+def save_import_settings(settings, settings_file=IMPORT_RULES_FILE):
+    os.makedirs(os.path.dirname(settings_file), exist_ok=True)
+    with open(settings_file, "w") as f:
+        json.dump(settings, f, indent=4)
+
+
+class CounterpartMatcher:
+    """Picks the counterpart account for a statement description from the rules."""
+
+    def __init__(self, rules, default_account_id=None):
+        self.default_account_id = default_account_id
+        self._rules = []
+        for rule in rules:
+            if rule.get('regex'):
+                pattern = re.compile(rule['pattern'], re.IGNORECASE)
+                test = lambda text, folded, pattern=pattern: pattern.search(text) is not None
+            else:
+                needle = normalize_text(rule['pattern'])
+                test = lambda text, folded, needle=needle: needle in folded
+            self._rules.append((test, int(rule['account_id'])))
+
+    def account_for(self, description):
+        """Counterpart account id, or None when nothing matches and there is no default."""
+        folded = normalize_text(description)
+        for test, account_id in self._rules:
+            if test(description, folded):
+                return account_id
+        return self.default_account_id
@@ -0,0 +1,182 @@
+# bank_import/import_statement.py
+
+import json
+import threading
+from PySide6.QtWidgets import (QWidget, QVBoxLayout, QLabel, QPushButton, QMessageBox,
+                               QHBoxLayout, QLineEdit, QDialog, QFileDialog, QProgressBar)
+from PySide6.QtCore import QObject, Signal, Slot
+from create_database import DatabaseManager
+from utils.crud.search_dialog import AdvancedSearchDialog
+from bank_import.import_core import import_statement
+from bank_import.import_rules import load_import_settings
+
+
+class ImportSignals(QObject):
+    """Signals for the background statement import."""
+    progress = Signal(int, str)
+    finished = Signal(dict)
+    error = Signal(str)
+
+
+class ImportStatementWindow(QWidget):
+    """
+    Imports a CSV or OFX/QFX bank statement into a bank account.
+
+    The import runs on a worker thread and commits every few hundred lines, so
+    the window stays responsive and a cancelled run keeps what was posted.
+    """
+
+    def __init__(self, main_window):
+        super().__init__()
+        self.main_window = main_window
+        self.setWindowTitle("Import Bank Statement")
+        self.db_manager = DatabaseManager()
+        self.selected_bank_account = None
+        self.cancel_requested = threading.Event()
+        self.signals = ImportSignals()
+        self.signals.progress.connect(self._on_progress)
+        self.signals.finished.connect(self._on_finished)
+        self.signals.error.connect(self._on_error)
+        self.init_ui()
+
+    def init_ui(self):
+        layout = QVBoxLayout(self)
+
+        # --- Statement File ---
+        file_layout = QHBoxLayout()
+        file_layout.addWidget(QLabel("Statement File:"))
+        self.file_input = QLineEdit()
+        self.file_input.setReadOnly(True)
+        browse_button = QPushButton("Browse...")
+        browse_button.clicked.connect(self.select_file)
+        file_layout.addWidget(self.file_input)
+        file_layout.addWidget(browse_button)
+        layout.addLayout(file_layout)
+
+        # --- Bank Account ---
+        account_layout = QHBoxLayout()
+        account_layout.addWidget(QLabel("Bank Account:"))
+        self.account_input = QLineEdit()
+        self.account_input.setReadOnly(True)
+        account_button = QPushButton("Search")
+        account_button.clicked.connect(self.select_bank_account)
+        account_layout.addWidget(self.account_input)
+        account_layout.addWidget(account_button)
+        layout.addLayout(account_layout)
+
+        # --- Progress ---
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setRange(0, 100)
+        layout.addWidget(self.progress_bar)
+        self.status_label = QLabel("Choose a statement and the bank account it belongs to.")
+        layout.addWidget(self.status_label)
+
+        button_layout = QHBoxLayout()
+        self.import_button = QPushButton("Import")
+        self.import_button.clicked.connect(self.start_import)
+        self.cancel_button = QPushButton("Cancel")
+        self.cancel_button.setEnabled(False)
+        self.cancel_button.clicked.connect(self.cancel_import)
+        button_layout.addWidget(self.import_button)
+        button_layout.addWidget(self.cancel_button)
+        layout.addLayout(button_layout)
+
+        self.setLayout(layout)
+        self.resize(520, 180)
+
+    def select_file(self):
+        path, _ = QFileDialog.getOpenFileName(
+            self, "Select Bank Statement", "", "Bank Statements (*.csv *.txt *.ofx *.qfx);;All Files (*)")
+        if path:
+            self.file_input.setText(path)
+
+    def select_bank_account(self):
+        search_dialog = AdvancedSearchDialog(
+            field_type='generic',
+            parent=self,
+            db_path=self.db_manager.db_path,
+            table_name='accounts',
+            additional_filter="type_id = 1"  # Current Assets
+        )
+        if search_dialog.exec() == QDialog.Accepted:
+            selected = search_dialog.get_selected_item()
+            if selected:
+                self.selected_bank_account = selected
+                self.account_input.setText(f"{selected['name']} ({selected['code']})")
+
+    def start_import(self):
+        path = self.file_input.text()
+        if not path:
+            QMessageBox.warning(self, "Input Error", "Please select a statement file.")
+            return
+        if not self.selected_bank_account:
+            QMessageBox.warning(self, "Input Error", "Please select the bank account.")
+            return
+        try:
+            settings = load_import_settings()
+        except json.JSONDecodeError:
+            QMessageBox.critical(self, "Error", "Invalid statement import settings file.")
+            return
+        if not settings.get('rules') and not settings.get('default_account_id'):
+            QMessageBox.warning(self, "Settings Required",
+                                "No counterpart rules or default account are set. "
+                                "Please configure them in Statement Import Settings.")
+            return
+
+        self.cancel_requested.clear()
+        self.import_button.setEnabled(False)
+        self.cancel_button.setEnabled(True)
+        self.progress_bar.setValue(0)
+        self.status_label.setText("Importing...")
+        thread = threading.Thread(target=self._import_worker,
+                                  args=(path, self.selected_bank_account['id'], settings))
+        thread.start()  # Not a daemon: let the chunk in progress commit before exit
+
+    def cancel_import(self):
+        self.cancel_requested.set()
+        self.cancel_button.setEnabled(False)
+        self.status_label.setText("Cancelling after the current chunk...")
+
+    # --- Worker thread ---
+    def _import_worker(self, path, bank_account_id, settings):
+        def report(position, total, summary):
+            percent = int(position * 100 / total) if total else 100
+            self.signals.progress.emit(percent, f"{summary['read']:,} lines read, {summary['imported']:,} imported, "
+                                                f"{summary['duplicates']:,} duplicates")
+        try:
+            summary = import_statement(path, bank_account_id, settings, progress=report,
+                                       cancelled=self.cancel_requested.is_set)
+            self.signals.finished.emit(summary)
+        except Exception as e:
+            self.signals.error.emit(f"Import failed: {e}\n\nLines imported before the error were kept; "
+                                    f"importing the file again skips them.")
+
+    # --- GUI thread handlers ---
+    @Slot(int, str)
+    def _on_progress(self, percent, message):
+        self.progress_bar.setValue(percent)
+        self.status_label.setText(message)
+
+    @Slot(dict)
+    def _on_finished(self, summary):
+        self.import_button.setEnabled(True)
+        self.cancel_button.setEnabled(False)
+        if not summary['cancelled']:
+            self.progress_bar.setValue(100)
+        message = (f"Lines read: {summary['read']:,}\n"
+                   f"Imported: {summary['imported']:,}\n"
+                   f"Already in the ledger: {summary['duplicates']:,}\n"
+                   f"No matching rule: {summary['unmatched']:,}\n"
+                   f"Zero amount: {summary['zero_amount']:,}")
+        if summary['unmatched_descriptions']:
+            message += "\n\nUnmatched lines (first few):\n" + "\n".join(summary['unmatched_descriptions'])
+        self.status_label.setText("Import cancelled." if summary['cancelled'] else "Import complete.")
+        QMessageBox.information(self, "Import Cancelled" if summary['cancelled'] else "Import Complete", message)
+
+    @Slot(str)
+    def _on_error(self, message):
+        self.import_button.setEnabled(True)
+        self.cancel_button.setEnabled(False)
+        self.status_label.setText("Import failed.")
+        print(message)
+        QMessageBox.critical(self, "Import Error", message)
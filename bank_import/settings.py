@@ -0,0 +1,248 @@
+# bank_import/settings.py
+
+import json
+import re
+from PySide6.QtWidgets import (QWidget, QVBoxLayout, QLabel, QPushButton, QMessageBox,
+                               QHBoxLayout, QLineEdit, QDialog, QTableWidget, QTableWidgetItem,
+                               QAbstractItemView, QFormLayout, QCheckBox, QGroupBox, QHeaderView)
+from create_database import DatabaseManager
+from utils.crud.search_dialog import AdvancedSearchDialog
+from bank_import.import_rules import load_import_settings, save_import_settings
+from bank_import.statement_readers import DEFAULT_CSV_MAPPING
+
+# CSV mapping fields shown as text boxes: key -> label
+CSV_TEXT_FIELDS = [
+    ('delimiter', "Delimiter:"),
+    ('encoding', "Encoding:"),
+    ('date_column', "Date column:"),
+    ('date_format', "Date format:"),
+    ('description_column', "Description column:"),
+    ('amount_column', "Amount column (signed):"),
+    ('debit_column', "Money out column:"),
+    ('credit_column', "Money in column:"),
+]
+
+
+class StatementImportSettingsWindow(QWidget):
+    """Edits the CSV column mapping and the counterpart account rules for statement imports."""
+
+    def __init__(self, main_window):
+        super().__init__()
+        self.main_window = main_window
+        self.setWindowTitle("Statement Import Settings")
+        self.db_manager = DatabaseManager()
+        self.rules = []  # [{'pattern', 'regex', 'account_id', 'account_name'}]
+        self.default_account = None
+        self.init_ui()
+        self.load_settings()
+
+    def init_ui(self):
+        layout = QVBoxLayout(self)
+
+        # --- CSV Column Mapping ---
+        csv_group = QGroupBox("CSV Columns (header names or 0-based positions)")
+        csv_layout = QFormLayout(csv_group)
+        self.csv_inputs = {}
+        for key, label in CSV_TEXT_FIELDS:
+            self.csv_inputs[key] = QLineEdit()
+            csv_layout.addRow(label, self.csv_inputs[key])
+        self.skip_rows_input = QLineEdit()
+        csv_layout.addRow("Lines before header:", self.skip_rows_input)
+        self.decimal_comma_check = QCheckBox("Amounts use a decimal comma (1.234,56)")
+        csv_layout.addRow(self.decimal_comma_check)
+        layout.addWidget(csv_group)
+
+        # --- Counterpart Rules ---
+        layout.addWidget(QLabel("Counterpart rules (first match wins):"))
+        self.rules_table = QTableWidget()
+        self.rules_table.setColumnCount(3)
+        self.rules_table.setHorizontalHeaderLabels(["Description Contains", "Regex", "Account"])
+        self.rules_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.rules_table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.rules_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        layout.addWidget(self.rules_table)
+
+        rule_buttons = QHBoxLayout()
+        add_rule_button = QPushButton("Add Rule")
+        add_rule_button.clicked.connect(self.add_rule)
+        remove_rule_button = QPushButton("Remove Rule")
+        remove_rule_button.clicked.connect(self.remove_rule)
+        rule_buttons.addWidget(add_rule_button)
+        rule_buttons.addWidget(remove_rule_button)
+        layout.addLayout(rule_buttons)
+
+        # --- Default (suspense) account for unmatched lines ---
+        default_layout = QHBoxLayout()
+        default_layout.addWidget(QLabel("Unmatched lines go to:"))
+        self.default_display = QLineEdit()
+        self.default_display.setReadOnly(True)
+        self.default_display.setPlaceholderText("(not imported)")
+        default_search_button = QPushButton("Search")
+        default_search_button.clicked.connect(self.select_default_account)
+        default_clear_button = QPushButton("Clear")
+        default_clear_button.clicked.connect(self.clear_default_account)
+        default_layout.addWidget(self.default_display)
+        default_layout.addWidget(default_search_button)
+        default_layout.addWidget(default_clear_button)
+        layout.addLayout(default_layout)
+
+        self.save_button = QPushButton("Save")
+        self.save_button.clicked.connect(self.save_settings)
+        layout.addWidget(self.save_button)
+
+        self.setLayout(layout)
+        self.resize(560, 640)
+
+    def search_account(self):
+        """Opens the account search and returns the selected account, or None."""
+        search_dialog = AdvancedSearchDialog(
+            field_type='generic',
+            parent=self,
+            db_path=self.db_manager.db_path,
+            table_name='accounts'
+        )
+        if search_dialog.exec() == QDialog.Accepted:
+            return search_dialog.get_selected_item()
+        return None
+
+    def add_rule(self):
+        dialog = QDialog(self)
+        dialog.setWindowTitle("Add Rule")
+        form = QFormLayout(dialog)
+        pattern_input = QLineEdit()
+        regex_check = QCheckBox("Regular expression")
+        account_display = QLineEdit()
+        account_display.setReadOnly(True)
+        account_button = QPushButton("Select Account")
+        selected = {}
+
+        def select_account():
+            account = self.search_account()
+            if account:
+                selected['account'] = account
+                account_display.setText(f"{account['name']} ({account['code']})")
+
+        account_button.clicked.connect(select_account)
+        account_layout = QHBoxLayout()
+        account_layout.addWidget(account_display)
+        account_layout.addWidget(account_button)
+        form.addRow("Description contains:", pattern_input)
+        form.addRow(regex_check)
+        form.addRow("Account:", account_layout)
+        ok_button = QPushButton("Add")
+        ok_button.clicked.connect(dialog.accept)
+        form.addRow(ok_button)
+
+        if dialog.exec() != QDialog.Accepted:
+            return
+        pattern = pattern_input.text().strip()
+        if not pattern or 'account' not in selected:
+            QMessageBox.warning(self, "Input Error", "A pattern and an account are required.")
+            return
+        if regex_check.isChecked():
+            try:
+                re.compile(pattern)
+            except re.error as e:
+                QMessageBox.warning(self, "Input Error", f"Invalid regular expression: {e}")
+                return
+        account = selected['account']
+        self.rules.append({'pattern': pattern, 'regex': regex_check.isChecked(),
+                           'account_id': account['id'], 'account_name': f"{account['name']} ({account['code']})"})
+        self.update_rules_table()
+
+    def remove_rule(self):
+        row = self.rules_table.currentRow()
+        if row < 0:
+            QMessageBox.warning(self, "No Selection", "Select a rule to remove.")
+            return
+        del self.rules[row]
+        self.update_rules_table()
+
+    def update_rules_table(self):
+        self.rules_table.setRowCount(len(self.rules))
+        for row, rule in enumerate(self.rules):
+            self.rules_table.setItem(row, 0, QTableWidgetItem(rule['pattern']))
+            self.rules_table.setItem(row, 1, QTableWidgetItem("Yes" if rule.get('regex') else ""))
+            self.rules_table.setItem(row, 2, QTableWidgetItem(rule.get('account_name', str(rule['account_id']))))
+
+    def select_default_account(self):
+        account = self.search_account()
+        if account:
+            self.default_account = account
+            self.default_display.setText(f"{account['name']} ({account['code']})")
+
+    def clear_default_account(self):
+        self.default_account = None
+        self.default_display.clear()
+
+    def account_names(self, account_ids):
+        """'name (code)' for each account id, in one query."""
+        if not account_ids:
+            return {}
+        placeholders = ", ".join("?" * len(account_ids))
+        with self.db_manager as db:
+            db.cursor.execute(f"SELECT id, name, code FROM accounts WHERE id IN ({placeholders})", list(account_ids))
+            return {row['id']: f"{row['name']} ({row['code']})" for row in db.cursor.fetchall()}
+
+    def load_settings(self):
+        try:
+            settings = load_import_settings()
+        except json.JSONDecodeError:
+            QMessageBox.critical(self, "Error", "Invalid statement import settings file.")
+            settings = {'csv_mapping': {}, 'rules': [], 'default_account_id': None}
+
+        mapping = {**DEFAULT_CSV_MAPPING, **settings.get('csv_mapping', {})}
+        for key, line_edit in self.csv_inputs.items():
+            value = mapping.get(key)
+            line_edit.setText("" if value is None else str(value))
+        self.skip_rows_input.setText(str(mapping.get('skip_rows', 0)))
+        self.decimal_comma_check.setChecked(bool(mapping.get('decimal_comma')))
+
+        try:
+            default_id = settings.get('default_account_id')
+            names = self.account_names({rule['account_id'] for rule in settings.get('rules', [])}
+                                       | ({default_id} if default_id else set()))
+        except Exception as e:
+            QMessageBox.critical(self, "Database Error", str(e))
+            names = {}
+        self.rules = [{**rule, 'account_name': names.get(rule['account_id'], f"Missing account {rule['account_id']}")}
+                      for rule in settings.get('rules', [])]
+        self.update_rules_table()
+        if default_id:
+            self.default_account = {'id': default_id}
+            self.default_display.setText(names.get(default_id, f"Missing account {default_id}"))
+
+    def save_settings(self):
+        mapping = {}
+        for key, line_edit in self.csv_inputs.items():
+            text = line_edit.text()
+            if key != 'delimiter':
+                text = text.strip()
+            # Column positions are stored as numbers, header names as text
+            mapping[key] = int(text) if key.endswith('_column') and text.isdigit() else (text or None)
+        if not mapping['delimiter'] or not mapping['date_column'] or not mapping['description_column']:
+            QMessageBox.warning(self, "Input Error", "Delimiter, date column and description column are required.")
+            return
+        if not (mapping['amount_column'] or mapping['debit_column'] or mapping['credit_column']):
+            QMessageBox.warning(self, "Input Error", "Set an amount column or money out / money in columns.")
+            return
+        try:
+            mapping['skip_rows'] = int(self.skip_rows_input.text().strip() or 0)
+        except ValueError:
+            QMessageBox.warning(self, "Input Error", "Lines before header must be a whole number.")
+            return
+        mapping['encoding'] = mapping['encoding'] or DEFAULT_CSV_MAPPING['encoding']
+        mapping['date_format'] = mapping['date_format'] or DEFAULT_CSV_MAPPING['date_format']
+        mapping['decimal_comma'] = self.decimal_comma_check.isChecked()
+
+        settings = {
+            'csv_mapping': mapping,
+            'rules': [{'pattern': rule['pattern'], 'regex': bool(rule.get('regex')), 'account_id': rule['account_id']}
+                      for rule in self.rules],
+            'default_account_id': self.default_account['id'] if self.default_account else None,
+        }
+        try:
+            save_import_settings(settings)
+            QMessageBox.information(self, "Success", "Settings saved successfully!")
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to save statement import settings: {e}")
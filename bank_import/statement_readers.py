@@ -0,0 +1,180 @@
+# bank_import/statement_readers.py
+"""
+Streaming readers for bank statement exports.
+
+Each reader is a generator yielding one StatementLine per transaction, so a
+statement is never held in memory as a whole. Readers also report how far
+into the file they are (in characters) for progress bars.
+"""
+import csv
+import os
+import re
+from collections import namedtuple
+from datetime import datetime
+from utils.money import Money
+
+# amount is signed from the bank account's point of view: positive is money in
+StatementLine = namedtuple('StatementLine', 'line_number date amount description reference')
+
+DEFAULT_CSV_MAPPING = {
+    'delimiter': ',',
+    'encoding': 'utf-8-sig',
+    'skip_rows': 0,               # Lines before the header row
+    'date_column': 'Date',        # Header name or 0-based column index
+    'date_format': '%Y-%m-%d',
+    'description_column': 'Description',
+    'amount_column': 'Amount',    # Signed amount column...
+    'debit_column': None,         # ...or separate money-out / money-in columns
+    'credit_column': None,
+    'decimal_comma': False,       # 1.234,56 instead of 1,234.56
+}
+
+OFX_EXTENSIONS = ('.ofx', '.qfx')
+OFX_READ_SIZE = 64 * 1024
+
+
+class StatementError(ValueError):
+    """A statement line or file that cannot be read."""
+
+
+def iter_statement(path, csv_mapping=None, progress=None):
+    """Reads a CSV or OFX/QFX statement, chosen by the file extension."""
+    if os.path.splitext(path)[1].lower() in OFX_EXTENSIONS:
+        return iter_ofx_statement(path, progress)
+    return iter_csv_statement(path, csv_mapping, progress)
+
+
+# --- CSV ---
+def parse_statement_amount(text, decimal_comma=False):
+    """Money from a statement amount such as "-1,234.56", "(12.00)" or "R$ 1.234,56"."""
+    text = (text or '').strip()
+    if not text:
+        return None
+    negative = text.startswith('(') and text.endswith(')')
+    cleaned = re.sub(r'[^\d,.\-+]', '', text)
+    if decimal_comma:
+        cleaned = cleaned.replace('.', '').replace(',', '.')
+    else:
+        cleaned = cleaned.replace(',', '')
+    amount = Money.parse(cleaned)
+    return -amount if negative else amount
+
+
+def _counting_lines(handle, counter):
+    """Yields the file's lines while keeping a running character count."""
+    for line in handle:
+        counter[0] += len(line)
+        yield line
+
+
+def _column_index(header, column, label):
+    if column is None or isinstance(column, int):
+        return column
+    try:
+        return header.index(column)
+    except ValueError:
+        raise StatementError(f"{label} column '{column}' not found in the statement header.")
+
+
+def iter_csv_statement(path, mapping=None, progress=None):
+    """
+    Yields StatementLines from a delimited bank export.
+
+    `mapping` overrides DEFAULT_CSV_MAPPING. `progress`, if given, is called
+    as progress(characters_read, file_size) as the file is consumed.
+    """
+    mapping = {**DEFAULT_CSV_MAPPING, **(mapping or {})}
+    file_size = os.path.getsize(path)
+    counter = [0]
+    with open(path, 'r', encoding=mapping['encoding'], newline='') as handle:
+        lines = _counting_lines(handle, counter)
+        for _ in range(mapping['skip_rows']):
+            next(lines, None)
+        reader = csv.reader(lines, delimiter=mapping['delimiter'])
+        header = [name.strip() for name in next(reader, [])]
+
+        date_index = _column_index(header, mapping['date_column'], "Date")
+        description_index = _column_index(header, mapping['description_column'], "Description")
+        amount_index = _column_index(header, mapping['amount_column'], "Amount") \
+            if not (mapping['debit_column'] or mapping['credit_column']) else None
+        debit_index = _column_index(header, mapping['debit_column'], "Debit")
+        credit_index = _column_index(header, mapping['credit_column'], "Credit")
+
+        for row in reader:
+            if not any(cell.strip() for cell in row):
+                continue
+            try:
+                line_date = datetime.strptime(row[date_index].strip(), mapping['date_format']).strftime('%Y-%m-%d')
+                if amount_index is not None:
+                    amount = parse_statement_amount(row[amount_index], mapping['decimal_comma'])
+                else:
+                    money_out = parse_statement_amount(row[debit_index], mapping['decimal_comma']) if debit_index is not None else None
+                    money_in = parse_statement_amount(row[credit_index], mapping['decimal_comma']) if credit_index is not None else None
+                    amount = (money_in or Money(0)) - abs(money_out or Money(0))
+                description = row[description_index].strip()
+            except (IndexError, ValueError) as e:
+                raise StatementError(f"Line {reader.line_num}: {e}") from e
+            if progress:
+                progress(counter[0], file_size)
+            yield StatementLine(reader.line_num, line_date, amount, description, None)
+
+
+# --- OFX / QFX ---
+_OFX_TAG = re.compile(r'<([^>]+)>([^<]*)')
+
+
+def _ofx_tags(handle, counter):
+    """Yields (TAG, value) pairs from SGML (OFX 1.x) or XML (OFX 2.x) content, read in blocks."""
+    pending = ''
+    while True:
+        block = handle.read(OFX_READ_SIZE)
+        counter[0] += len(block)
+        pending += block
+        if not block:
+            last_tag = len(pending)
+        else:
+            last_tag = pending.rfind('<')  # The last tag may still be incomplete
+            if last_tag <= 0:
+                continue
+        for match in _OFX_TAG.finditer(pending, 0, last_tag):
+            yield match.group(1).strip().upper(), match.group(2).strip()
+        pending = pending[last_tag:]
+        if not block:
+            return
+
+
+def _ofx_date(value):
+    """'20240105120000[-5:EST]' -> '2024-01-05'."""
+    return datetime.strptime(value[:8], '%Y%m%d').strftime('%Y-%m-%d')
+
+
+def _ofx_unescape(value):
+    return (value.replace('&lt;', '<').replace('&gt;', '>')
+                 .replace('&quot;', '"').replace('&apos;', "'").replace('&amp;', '&'))
+
+
+def iter_ofx_statement(path, progress=None):
+    """Yields StatementLines from the STMTTRN records of an OFX or QFX file."""
+    file_size = os.path.getsize(path)
+    counter = [0]
+    record = None
+    count = 0
+    with open(path, 'r', encoding='utf-8', errors='replace') as handle:
+        for tag, value in _ofx_tags(handle, counter):
+            if tag == 'STMTTRN':
+                record = {}
+            elif tag == '/STMTTRN' and record is not None:
+                count += 1
+                try:
+                    line_date = _ofx_date(record['DTPOSTED'])
+                    amount = parse_statement_amount(record['TRNAMT'])
+                except (KeyError, ValueError) as e:
+                    raise StatementError(f"Transaction {count}: missing or invalid {e}") from e
+                name, memo = record.get('NAME', ''), record.get('MEMO', '')
+                description = name if not memo or memo == name else f"{name} - {memo}" if name else memo
+                if progress:
+                    progress(counter[0], file_size)
+                yield StatementLine(count, line_date, amount, description, record.get('FITID'))
+                record = None
+            elif record is not None and not tag.startswith('/'):
+                record[tag] = _ofx_unescape(value)
@@ -0,0 +1,83 @@
+# benchmarks/conftest.py
+"""
+Fixtures for the pytest-benchmark suite: one synthetic ledger per size,
+generated once per session (and reused across runs with --ledger-workdir).
+
+    python -m pytest benchmarks                                   # 10k, 100k and 1M postings
+    python -m pytest benchmarks --ledger-sizes 10000 --benchmark-min-rounds 10
+    python -m pytest benchmarks --ledger-workdir /tmp/ledgers --benchmark-autosave
+"""
+import json
+import os
+import pytest
+from benchmarks.synthetic_ledger import generate_ledger
+from create_database import DatabaseManager, connection_provider
+
+DEFAULT_SIZES = (10_000, 100_000, 1_000_000)
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup('ledger', "synthetic ledger benchmarks")
+    group.addoption('--ledger-sizes', type=int, nargs='+', default=list(DEFAULT_SIZES),
+                    help="Ledger sizes in postings")
+    group.addoption('--ledger-workdir', help="Keep generated ledgers here and reuse them on later runs")
+
+
+def pytest_generate_tests(metafunc):
+    if 'ledger_files' in metafunc.fixturenames:
+        sizes = metafunc.config.getoption('ledger_sizes')
+        metafunc.parametrize('ledger_files', sizes, indirect=True, scope='session',
+                             ids=[f"{size:,}_postings" for size in sizes])
+
+
+@pytest.fixture(scope='session')
+def ledger_files(request, tmp_path_factory):
+    """Generates (or reuses) the ledger for one size; returns (directory, summary)."""
+    size = request.param
+    workdir = request.config.getoption('ledger_workdir')
+    if workdir:
+        size_dir = os.path.join(os.path.abspath(workdir), f"ledger_{size}")
+        os.makedirs(size_dir, exist_ok=True)
+    else:
+        size_dir = str(tmp_path_factory.mktemp(f"ledger_{size}"))
+
+    previous_dir = os.getcwd()
+    os.chdir(size_dir)  # DatabaseManager and the settings files use ./data
+    try:
+        if not os.path.exists(os.path.join('data', 'financial_system.db')):
+            generate_ledger(postings=size, years=5, seed=size)
+        summary = _summary_from_database()
+    finally:
+        connection_provider.close_thread_connections()
+        os.chdir(previous_dir)
+    return size_dir, summary
+
+
+@pytest.fixture
+def ledger(ledger_files, monkeypatch):
+    """Runs the test inside the ledger's directory; yields its summary. Uncommitted writes are discarded."""
+    size_dir, summary = ledger_files
+    monkeypatch.chdir(size_dir)
+    yield summary
+    connection_provider.close_thread_connections()
+
+
+def _summary_from_database():
+    """Reads back what the benchmarks need from a generated (or reused) ledger."""
+    with DatabaseManager() as db:
+        db.cursor.execute("SELECT COUNT(*), MIN(date), MAX(date) FROM transactions")
+        count, start_date, end_date = db.cursor.fetchone()
+        db.cursor.execute("SELECT COUNT(*) FROM debtor_creditor")
+        parties = db.cursor.fetchone()[0]
+    with open(os.path.join('data', 'cashflow_accounts.json')) as f:
+        cash_accounts = json.load(f)
+    with open(os.path.join('data', 'depreciation_account.json')) as f:
+        depreciation_account = json.load(f)['depreciation_account_id']
+    return {
+        'transactions': count,
+        'start_date': start_date,
+        'end_date': end_date,
+        'parties': parties,
+        'cash_accounts': cash_accounts,
+        'depreciation_account': depreciation_account,
+    }
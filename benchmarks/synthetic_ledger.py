@@ -0,0 +1,245 @@
+# benchmarks/synthetic_ledger.py
+"""
+Fills a fresh database with a synthetic but realistic ledger for benchmarking.
+
+Run from the directory that should hold the generated data/ folder:
+
+    python -m benchmarks.synthetic_ledger --postings 100000 --years 5
+"""
+import argparse
+import json
+import os
+import random
+from datetime import date, timedelta
+from create_database import DatabaseManager
+from utils.formatters import normalize_text
+
+# Accounts created per account type
+DEFAULT_CHART = {
+    'Current Asset': 6,
+    'Current Liability': 4,
+    'Long-term Liability': 2,
+    'Equity': 2,
+    'Revenue': 8,
+    'Expense': 40,
+}
+
+# (debited type, credited type, weight, min cents, max cents)
+POSTING_PATTERNS = [
+    ('Expense', 'Current Asset', 60, 500, 50_000),
+    ('Current Asset', 'Revenue', 20, 10_000, 500_000),
+    ('Current Asset', 'Current Asset', 8, 1_000, 200_000),
+    ('Expense', 'Current Liability', 8, 500, 80_000),
+    ('Current Liability', 'Current Asset', 4, 10_000, 300_000),
+]
+
+BATCH_SIZE = 10_000  # Rows per executemany/commit
+
+
+def _create_accounts(db, chart):
+    """Creates the chart of accounts and returns {type name: [account ids]}."""
+    db.cursor.execute("SELECT id, name FROM account_types")
+    type_ids = {row['name']: row['id'] for row in db.cursor.fetchall()}
+
+    accounts_by_type = {}
+    for type_name, count in chart.items():
+        ids = []
+        for number in range(1, count + 1):
+            name = f"{type_name} {number:03d}"
+            db.cursor.execute(
+                """
+                INSERT INTO accounts (code, name, normalized_name, type_id, is_active, balance)
+                VALUES (?, ?, ?, ?, 1, 0)
+                """,
+                (f"{type_ids[type_name]}.{number:04d}", name, normalize_text(name), type_ids[type_name])
+            )
+            ids.append(db.cursor.lastrowid)
+        accounts_by_type[type_name] = ids
+    return accounts_by_type
+
+
+def _insert_transactions(db, rows):
+    """Inserts ledger rows in batches, committing after each one."""
+    for start in range(0, len(rows), BATCH_SIZE):
+        db.cursor.executemany(
+            """
+            INSERT INTO transactions (date, description, debited, credited, amount, source_type)
+            VALUES (?, ?, ?, ?, ?, ?)
+            """,
+            rows[start:start + BATCH_SIZE]
+        )
+        db.commit()
+
+
+def generate_ledger(postings=10_000, years=3, end_date=None, chart=None,
+                    recurring_rules=20, fixed_assets=10, parties=20, seed=0,
+                    db_name='financial_system.db'):
+    """
+    Creates data/<db_name> (relative to the working directory) and fills it with
+    a chart of accounts, `postings` ledger transactions spread over `years` years
+    up to end_date, recurring rules, fixed assets and AR/AP parties. Matching
+    cash flow, depreciation, equity and AR/AP settings files are written next
+    to it.
+
+    Returns a summary dict with the date range and the account ids by role.
+    """
+    rng = random.Random(seed)
+    end_date = end_date or date.today()
+    start_date = end_date - timedelta(days=365 * years)
+    span_days = (end_date - start_date).days
+    chart = dict(chart or DEFAULT_CHART)
+    chart['Fixed Asset'] = max(fixed_assets, 1)  # One account per asset
+
+    db_path = os.path.join('data', db_name)
+    if os.path.exists(db_path):
+        raise FileExistsError(f"{db_path} already exists; generate into an empty directory.")
+
+    with DatabaseManager(db_name) as db:
+        if not db.initialize_database():
+            raise RuntimeError("Could not initialize the synthetic database.")
+
+        accounts = _create_accounts(db, chart)
+        cash_accounts = accounts['Current Asset'][:3]
+        receivable_account = accounts['Current Asset'][-1]
+        payable_account = accounts['Current Liability'][-1]
+        equity_account = accounts['Equity'][0]
+        depreciation_account = accounts['Expense'][0]
+
+        # --- Opening balances ---
+        rows = [
+            (start_date.isoformat(), "Opening balance", cash_account, equity_account,
+             rng.randint(1_000_000, 10_000_000), 'GENERAL')
+            for cash_account in cash_accounts
+        ]
+
+        # --- General ledger postings ---
+        weights = [pattern[2] for pattern in POSTING_PATTERNS]
+        for _ in range(postings):
+            debited_type, credited_type, _, low, high = rng.choices(POSTING_PATTERNS, weights)[0]
+            debited = rng.choice(accounts[debited_type])
+            credited = rng.choice(accounts[credited_type])
+            while credited == debited:
+                credited = rng.choice(accounts[credited_type])
+            posting_date = start_date + timedelta(days=rng.randint(0, span_days))
+            rows.append((posting_date.isoformat(), f"{debited_type} {rng.randint(1, 500)} payment",
+                         debited, credited, rng.randint(low, high), 'GENERAL'))
+
+        # --- Fixed assets and their purchases ---
+        asset_rows = []
+        for number, asset_account in enumerate(accounts['Fixed Asset'][:fixed_assets], start=1):
+            purchase_date = start_date + timedelta(days=rng.randint(0, span_days))
+            cost_cents = rng.randint(100_000, 5_000_000)
+            asset_rows.append((f"Asset {number:03d}", asset_account, purchase_date.isoformat(),
+                               cost_cents / 100, cost_cents / 1000, 'Straight-Line', rng.choice((3, 5, 10))))
+            rows.append((purchase_date.isoformat(), f"Asset {number:03d} - Purchase", asset_account,
+                         rng.choice(cash_accounts), cost_cents, 'FIXED_ASSET'))
+        db.cursor.executemany(
+            """
+            INSERT INTO fixed_assets (asset_name, account_id, purchase_date, original_cost,
+                                      salvage_value, depreciation_method, useful_life_years)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            """,
+            asset_rows
+        )
+
+        # --- AR/AP parties (debtor_creditor.account: 1 = debtor, 2 = creditor) ---
+        for number in range(1, parties + 1):
+            is_debtor = number % 2 == 1
+            name = f"{'Debtor' if is_debtor else 'Creditor'} {number:03d}"
+            db.cursor.execute(
+                "INSERT INTO debtor_creditor (name, normalized_name, account, amount) VALUES (?, ?, ?, 0)",
+                (name, normalize_text(name), 1 if is_debtor else 2)
+            )
+            party_id = db.cursor.lastrowid
+            party_total = 0
+            for _ in range(rng.randint(1, 5)):
+                entry_date = start_date + timedelta(days=rng.randint(0, span_days))
+                cents = rng.randint(5_000, 500_000)
+                party_total += cents
+                details = f"{name}: {'Outflow' if is_debtor else 'Inflow'}"
+                db.cursor.execute(
+                    """
+                    INSERT INTO debtor_creditor_transactions (date, details, amount, debtor_creditor, type)
+                    VALUES (?, ?, ?, ?, ?)
+                    """,
+                    (entry_date.isoformat(), details, cents, party_id, 'Outflow' if is_debtor else 'Inflow')
+                )
+                if is_debtor:
+                    rows.append((entry_date.isoformat(), details, receivable_account,
+                                 rng.choice(accounts['Revenue']), cents, 'DEBTOR_CREDITOR'))
+                else:
+                    rows.append((entry_date.isoformat(), details, rng.choice(accounts['Expense']),
+                                 payable_account, cents, 'DEBTOR_CREDITOR'))
+            db.cursor.execute("UPDATE debtor_creditor SET amount = ? WHERE id = ?", (party_total, party_id))
+
+        # --- Recurring rules (expanded later by the app) ---
+        recurring_rows = []
+        for number in range(1, recurring_rules + 1):
+            rule_start = end_date - timedelta(days=rng.randint(0, 60))
+            recurring_rows.append((f"Recurring {number:03d}", rng.choice(accounts['Expense']),
+                                   rng.choice(cash_accounts), rng.randint(1_000, 100_000),
+                                   rng.choice(('weekly', 'monthly', 'monthly', 'yearly')), None,
+                                   rule_start.isoformat(), None))
+        db.cursor.executemany(
+            """
+            INSERT INTO recurring_transactions (description, debited, credited, amount, frequency,
+                                                interval, start_date, end_date)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            recurring_rows
+        )
+        db.commit()
+
+        # --- Ledger, in date order like real entry ---
+        rows.sort(key=lambda row: row[0])
+        _insert_transactions(db, rows)
+
+        # --- Account balances from the ledger ---
+        db.cursor.execute("""
+            UPDATE accounts
+            SET balance = COALESCE((SELECT SUM(amount) FROM transactions WHERE debited = accounts.id), 0)
+                        - COALESCE((SELECT SUM(amount) FROM transactions WHERE credited = accounts.id), 0)
+        """)
+        db.commit()
+        db.cursor.execute("ANALYZE")
+
+    # --- Settings files the app reads next to the database ---
+    settings = {
+        'cashflow_accounts.json': [str(account_id) for account_id in cash_accounts],
+        'depreciation_account.json': {'depreciation_account_id': str(depreciation_account)},
+        'owner_equity_account.json': {'owner_equity_account_id': str(equity_account)},
+        'ar_ap_settings.json': {'receivable_account_id': str(receivable_account),
+                                'payable_account_id': str(payable_account)},
+    }
+    for file_name, data in settings.items():
+        with open(os.path.join('data', file_name), 'w') as f:
+            json.dump(data, f, indent=4)
+
+    return {
+        'start_date': start_date.isoformat(),
+        'end_date': end_date.isoformat(),
+        'transactions': len(rows),
+        'accounts': accounts,
+        'cash_accounts': cash_accounts,
+        'depreciation_account': depreciation_account,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic ledger in ./data for benchmarking.")
+    parser.add_argument('--postings', type=int, default=10_000, help="General ledger postings to create")
+    parser.add_argument('--years', type=int, default=3, help="Years of history ending today")
+    parser.add_argument('--recurring', type=int, default=20, help="Recurring rules to create")
+    parser.add_argument('--fixed-assets', type=int, default=10, help="Fixed assets to create")
+    parser.add_argument('--parties', type=int, default=20, help="AR/AP parties to create")
+    parser.add_argument('--seed', type=int, default=0, help="Random seed")
+    args = parser.parse_args()
+
+    summary = generate_ledger(postings=args.postings, years=args.years,
+                              recurring_rules=args.recurring, fixed_assets=args.fixed_assets,
+                              parties=args.parties, seed=args.seed)
+    print(f"Generated {summary['transactions']} transactions from {summary['start_date']} to {summary['end_date']}.")
+
+
+if __name__ == '__main__':
+    main()
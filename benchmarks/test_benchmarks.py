@@ -0,0 +1,164 @@
+# benchmarks/test_benchmarks.py
+"""
+Times the report and posting paths against the synthetic ledgers from
+conftest.py, and checks each result so a fast but wrong path fails. Write
+benchmarks roll back before every round, so rounds see the same data.
+"""
+from datetime import date, datetime
+import pytest
+from create_database import DatabaseManager
+from utils.money import Money
+
+pytest.importorskip('pytest_benchmark')
+
+WRITE_ROUNDS = 5
+
+
+@pytest.fixture
+def db(ledger):
+    with DatabaseManager() as db:
+        yield db
+
+
+def account_balances(db, account_ids=None):
+    """{account id: stored balance}; the generator sets these from the ledger."""
+    db.cursor.execute("SELECT id, name, balance FROM accounts")
+    return {row['id']: (row['name'], Money.from_db(row['balance'])) for row in db.cursor.fetchall()
+            if account_ids is None or str(row['id']) in account_ids}
+
+
+# --- Reports ---
+def test_balance_sheet(benchmark, ledger, db):
+    from reports.balance_sheet_core import BalanceSheet
+    balance_sheet = BalanceSheet()
+    sections = benchmark(balance_sheet.calcular_saldos_na_data, ledger['end_date'])
+
+    expected = {name: balance for name, balance in account_balances(db).values()}
+    items = [item for section in sections for item in section]
+    assert items
+    for item in items:
+        assert item['balance'] == expected[item['name']], item['name']
+
+
+def test_income_statement(benchmark, ledger, db):
+    from reports.income_statement_core import generate_income_statement_data
+    year_start = f"{ledger['end_date'][:4]}-01-01"
+    statement = benchmark(generate_income_statement_data, year_start, ledger['end_date'])
+
+    db.cursor.execute("""
+        SELECT at.name,
+               SUM(CASE WHEN t.debited = a.id THEN t.amount ELSE -t.amount END) AS total
+        FROM transactions t
+        JOIN accounts a ON a.id IN (t.debited, t.credited)
+        JOIN account_types at ON at.id = a.type_id
+        WHERE t.date BETWEEN ? AND ? AND at.name IN ('Revenue', 'Expense')
+        GROUP BY at.name
+    """, (year_start, ledger['end_date']))
+    totals = {row['name']: Money.from_db(row['total']) for row in db.cursor.fetchall()}
+    assert statement['Total Revenue'] == -totals.get('Revenue', Money())
+    assert statement['Total Expenses'] == totals.get('Expense', Money())
+    assert statement['Net Income'] == statement['Total Revenue'] - statement['Total Expenses']
+
+
+def test_cashflow(benchmark, ledger, db):
+    from cashflow.actual_cashflow_core import generate_cashflow_data
+    year_start = f"{ledger['end_date'][:4]}-01-01"
+    cashflow = benchmark(generate_cashflow_data, ledger['cash_accounts'], year_start, ledger['end_date'])
+
+    closing = sum((balance for _, balance in account_balances(db, ledger['cash_accounts']).values()), Money())
+    assert cashflow['Ending Balance'] == closing
+    assert cashflow['Total Inflows'] == sum((row['amount'] for row in cashflow['Inflows']), Money())
+
+
+def test_ar_ap_aging(benchmark, ledger, db):
+    from ar_ap.aging_core import aging_summary
+    rows = benchmark(aging_summary, db.cursor, ledger['end_date'])
+
+    assert len(rows) == ledger['parties']
+    for row in rows:
+        if row.balance > 0:
+            assert sum(row.buckets, Money()) == row.balance, row.name
+
+
+# --- Posting ---
+def test_post_future_transactions(benchmark, ledger, db):
+    from ledger import post_future_transactions
+    due_count = max(100, ledger['transactions'] // 100)
+
+    def setup():
+        db.rollback()
+        db.cursor.execute(
+            """
+            INSERT INTO future_transactions (date, description, debited, credited, amount)
+            SELECT date, description, debited, credited, amount
+            FROM transactions ORDER BY id DESC LIMIT ?
+            """,
+            (due_count,)
+        )
+        db.cursor.execute("SELECT id FROM future_transactions ORDER BY id DESC LIMIT ?", (due_count,))
+        return (db.cursor, [row['id'] for row in db.cursor.fetchall()]), {}
+
+    posted = benchmark.pedantic(post_future_transactions, setup=setup, rounds=WRITE_ROUNDS, iterations=1)
+
+    assert len(posted) == due_count
+    db.cursor.execute("SELECT COUNT(*) FROM future_transactions")
+    assert db.cursor.fetchone()[0] == 0
+
+
+def test_post_entries(benchmark, ledger, db):
+    from ledger import post_entries
+    batch_size = 500
+
+    def setup():
+        db.rollback()
+        db.cursor.execute("SELECT debited, credited, amount FROM transactions ORDER BY id DESC LIMIT ?", (batch_size,))
+        entries = [{'description': "Benchmark entry", 'debited': row['debited'], 'credited': row['credited'],
+                    'amount': Money.from_db(row['amount'])} for row in db.cursor.fetchall()]
+        return (db.cursor, entries), {'date': ledger['end_date']}
+
+    posted = benchmark.pedantic(post_entries, setup=setup, rounds=WRITE_ROUNDS, iterations=1)
+
+    assert posted == batch_size
+    db.cursor.execute("SELECT COUNT(*) FROM transactions")
+    assert db.cursor.fetchone()[0] == ledger['transactions'] + batch_size
+
+
+# --- Depreciation ---
+def test_depreciation_schedule(benchmark, ledger, db):
+    from ledger import schedule_depreciation
+    from utils.depreciation_methods import period_of
+    calculation_date = date.fromisoformat(ledger['end_date'])
+
+    def setup():
+        db.rollback()
+        db.cursor.execute("SELECT * FROM fixed_assets")
+        return (db.cursor.fetchall(),), {}
+
+    def run(assets):
+        periods = 0
+        for asset in assets:
+            purchase_date = datetime.strptime(asset['purchase_date'], '%Y-%m-%d').date()
+            periods += schedule_depreciation(db.cursor, asset, 1, period_of(purchase_date, calculation_date),
+                                             ledger['depreciation_account'])
+        return periods
+
+    periods = benchmark.pedantic(run, setup=setup, rounds=WRITE_ROUNDS, iterations=1)
+
+    db.cursor.execute("SELECT COUNT(*) FROM depreciation_schedule")
+    assert periods > 0 and db.cursor.fetchone()[0] == periods
+
+
+def test_portfolio_depreciation(benchmark, ledger, db):
+    from ledger import schedule_portfolio_depreciation
+    calculation_date = date.fromisoformat(ledger['end_date'])
+
+    def setup():
+        db.rollback()
+        return (db.cursor, calculation_date), {'depreciation_account_id': ledger['depreciation_account']}
+
+    periods, errors = benchmark.pedantic(schedule_portfolio_depreciation, setup=setup,
+                                         rounds=WRITE_ROUNDS, iterations=1)
+
+    assert not errors
+    db.cursor.execute("SELECT COUNT(*), COUNT(DISTINCT future_transaction_id) FROM depreciation_schedule")
+    assert tuple(db.cursor.fetchone()) == (periods, periods) and periods > 0
@@ -1,8 +1,6 @@
 # reports/actual_cashflow.py
 
 import sqlite3
-import json
-import os
 from datetime import datetime, timedelta
 from PySide6.QtWidgets import (QWidget, QVBoxLayout, QLabel, QPushButton,
                                QMessageBox, QHBoxLayout, QScrollArea)
@@ -10,6 +8,8 @@ from PySide6.QtCore import Qt
 from create_database import DatabaseManager
 from utils.crud.generic_crud import GenericCRUD
 from utils.formatters import format_table_name
+from cashflow.actual_cashflow_core import generate_cashflow_data
+from ledger.settings import app_settings
 
 class ActualCashflowWindow(QWidget):
     def __init__(self, main_window):
@@ -121,15 +121,11 @@ class ActualCashflowWindow(QWidget):
         """)
 
     def load_cashflow_accounts(self):
-        """Loads the cash flow accounts from the JSON file."""
-        settings_file = os.path.join("data", "cashflow_accounts.json")
-        try:
-            with open(settings_file, "r") as f:
-                accounts = json.load(f)
-                return accounts
-        except (FileNotFoundError, json.JSONDecodeError):
+        """Loads the cash flow accounts from the settings cache."""
+        accounts = app_settings.cashflow_accounts()
+        if not accounts:
             QMessageBox.critical(self, "Error", "Could not load cash flow accounts. Please configure them in settings.")
-            return []
+        return accounts
 
     def select_period(self):
         crud = GenericCRUD("accounting_periods")
@@ -151,93 +147,41 @@ class ActualCashflowWindow(QWidget):
                 item.widget().deleteLater()
 
         try:
-            with self.db_manager as db:
-                string_accounts = [str(account) for account in self.accounts]
-                placeholders = ', '.join(['?'] * len(string_accounts))
-                
-                # Initial balance calculation
-                initial_balance_query = f"""
-                    SELECT 
-                        SUM(CASE WHEN t.debited IN ({placeholders}) THEN t.amount ELSE 0 END) as total_debits,
-                        SUM(CASE WHEN t.credited IN ({placeholders}) THEN t.amount ELSE 0 END) as total_credits
-                    FROM transactions t
-                    WHERE (t.debited IN ({placeholders}) OR t.credited IN ({placeholders}))
-                    AND t.date < ?
-                """
-                params = string_accounts * 4 + [self.period_start]
-                db.cursor.execute(initial_balance_query, params)
-                balance_data = db.cursor.fetchone()
-                
-                initial_balance = 0
-                if balance_data:
-                    total_debits = float(balance_data['total_debits'] or 0)
-                    total_credits = float(balance_data['total_credits'] or 0)
-                    initial_balance = total_debits - total_credits
-                
-                self.initial_balance_label.setText(f"Initial Balance: ${initial_balance:.2f}")
-
-                # Get transactions within the period
-                period_query = f"""
-                    SELECT t.description, t.amount, t.date, t.debited, t.credited
-                    FROM transactions t
-                    WHERE (t.debited IN ({placeholders}) OR t.credited IN ({placeholders}))
-                    AND t.date BETWEEN ? AND ?
-                    ORDER BY t.date
-                """
-                period_params = string_accounts * 2 + [self.period_start, self.period_end]
-                db.cursor.execute(period_query, period_params)
-                transactions = db.cursor.fetchall()
-
-                inflows = []
-                outflows = []
-                total_inflows = 0
-                total_outflows = 0
-
-                for trans in transactions:
-                    description = trans['description']
-                    amount = float(trans['amount'])
-                    debited_account = str(trans['debited'])
-                    credited_account = str(trans['credited'])
-                    
-                    if debited_account in string_accounts:
-                        inflows.append({'description': description, 'amount': amount})
-                        total_inflows += amount
-                    
-                    if credited_account in string_accounts:
-                        outflows.append({'description': description, 'amount': amount})
-                        total_outflows += amount
-
-                # Add inflows section
-                inflow_label = QLabel("Cash Inflows")
-                inflow_label.setStyleSheet("font-size: 16px; font-weight: bold; margin-top: 10px;")
-                self.content_layout.addWidget(inflow_label)
-                
-                if inflows:
-                    for inflow in inflows:
-                        self.add_transaction_line(inflow['description'], inflow['amount'], is_positive=True)
-                else:
-                    self.content_layout.addWidget(QLabel("No cash inflows for this period"))
-
-                # Add outflows section
-                outflow_label = QLabel("Cash Outflows")
-                outflow_label.setStyleSheet("font-size: 16px; font-weight: bold; margin-top: 10px;")
-                self.content_layout.addWidget(outflow_label)
-                
-                if outflows:
-                    for outflow in outflows:
-                        self.add_transaction_line(outflow['description'], outflow['amount'], is_positive=False)
-                else:
-                    self.content_layout.addWidget(QLabel("No cash outflows for this period"))
-
-                # Update totals
-                self.total_inflows_label.setText(f"Total Inflows: ${total_inflows:.2f}")
-                self.total_outflows_label.setText(f"Total Outflows: ${total_outflows:.2f}")
-                net_cashflow = total_inflows - total_outflows
-                self.net_cashflow_label.setText(f"Net Cash Flow: ${net_cashflow:.2f}")
-                
-                # Update ending balance
-                ending_balance = initial_balance + net_cashflow
-                self.ending_balance_label.setText(f"Ending Balance: ${ending_balance:.2f}")
+            report_data = generate_cashflow_data(self.accounts, self.period_start, self.period_end)
+            inflows = report_data['Inflows']
+            outflows = report_data['Outflows']
+
+            self.initial_balance_label.setText(f"Initial Balance: ${report_data['Initial Balance']:.2f}")
+
+            # Add inflows section
+            inflow_label = QLabel("Cash Inflows")
+            inflow_label.setStyleSheet("font-size: 16px; font-weight: bold; margin-top: 10px;")
+            self.content_layout.addWidget(inflow_label)
+            
+            if inflows:
+                for inflow in inflows:
+                    self.add_transaction_line(inflow['description'], inflow['amount'], is_positive=True)
+            else:
+                self.content_layout.addWidget(QLabel("No cash inflows for this period"))
+
+            # Add outflows section
+            outflow_label = QLabel("Cash Outflows")
+            outflow_label.setStyleSheet("font-size: 16px; font-weight: bold; margin-top: 10px;")
+            self.content_layout.addWidget(outflow_label)
+            
+            if outflows:
+                for outflow in outflows:
+                    self.add_transaction_line(outflow['description'], outflow['amount'], is_positive=False)
+            else:
+                self.content_layout.addWidget(QLabel("No cash outflows for this period"))
+
+            # Update totals
+            self.total_inflows_label.setText(f"Total Inflows: ${report_data['Total Inflows']:.2f}")
+            self.total_outflows_label.setText(f"Total Outflows: ${report_data['Total Outflows']:.2f}")
+            self.net_cashflow_label.setText(f"Net Cash Flow: ${report_data['Net Cash Flow']:.2f}")
+            
+            # Update ending balance
+            self.ending_balance_label.setText(f"Ending Balance: ${report_data['Ending Balance']:.2f}")
 
         except sqlite3.Error as e:
             QMessageBox.critical(self, "Database Error", str(e))
@@ -0,0 +1,76 @@
+# cashflow/actual_cashflow_core.py
+from create_database import DatabaseManager
+from utils.money import Money
+
+def generate_cashflow_data(accounts, period_start, period_end):
+    """
+    Generates actual cash flow data for the given cash accounts and period.
+
+    Returns the opening balance, the period's inflows and outflows (lists of
+    {'description', 'amount'}) and their totals. Database errors are raised
+    to the caller.
+    """
+    string_accounts = [str(account) for account in accounts]
+    placeholders = ', '.join(['?'] * len(string_accounts))
+
+    with DatabaseManager() as db:
+        # Initial balance calculation
+        initial_balance_query = f"""
+            SELECT
+                SUM(CASE WHEN t.debited IN ({placeholders}) THEN t.amount ELSE 0 END) as total_debits,
+                SUM(CASE WHEN t.credited IN ({placeholders}) THEN t.amount ELSE 0 END) as total_credits
+            FROM transactions t
+            WHERE (t.debited IN ({placeholders}) OR t.credited IN ({placeholders}))
+            AND t.date < ?
+        """
+        params = string_accounts * 4 + [period_start]
+        db.cursor.execute(initial_balance_query, params)
+        balance_data = db.cursor.fetchone()
+
+        initial_balance = Money()
+        if balance_data:
+            total_debits = Money.from_db(balance_data['total_debits'])
+            total_credits = Money.from_db(balance_data['total_credits'])
+            initial_balance = total_debits - total_credits
+
+        # Get transactions within the period
+        period_query = f"""
+            SELECT t.description, t.amount, t.date, t.debited, t.credited
+            FROM transactions t
+            WHERE (t.debited IN ({placeholders}) OR t.credited IN ({placeholders}))
+            AND t.date BETWEEN ? AND ?
+            ORDER BY t.date
+        """
+        period_params = string_accounts * 2 + [period_start, period_end]
+        db.cursor.execute(period_query, period_params)
+        transactions = db.cursor.fetchall()
+
+    inflows = []
+    outflows = []
+    total_inflows = Money()
+    total_outflows = Money()
+
+    for trans in transactions:
+        description = trans['description']
+        amount = Money.from_db(trans['amount'])
+        debited_account = str(trans['debited'])
+        credited_account = str(trans['credited'])
+
+        if debited_account in string_accounts:
+            inflows.append({'description': description, 'amount': amount})
+            total_inflows += amount
+
+        if credited_account in string_accounts:
+            outflows.append({'description': description, 'amount': amount})
+            total_outflows += amount
+
+    net_cashflow = total_inflows - total_outflows
+    return {
+        'Initial Balance': initial_balance,
+        'Inflows': inflows,
+        'Outflows': outflows,
+        'Total Inflows': total_inflows,
+        'Total Outflows': total_outflows,
+        'Net Cash Flow': net_cashflow,
+        'Ending Balance': initial_balance + net_cashflow
+    }
@@ -9,6 +9,7 @@ from PySide6.QtWidgets import (QWidget, QVBoxLayout, QLabel, QPushButton,
 from PySide6.QtCore import Qt
 from create_database import DatabaseManager
 from utils.crud.search_dialog import AdvancedSearchDialog
+from ledger.settings import app_settings
 
 class CashflowSettingsWindow(QWidget):
     def __init__(self, main_window):
@@ -150,9 +151,7 @@ class CashflowSettingsWindow(QWidget):
         """Saves settings to the JSON file."""
         account_ids = [account['id'] for account in self.accounts_data]  # Extract IDs
         try:
-            os.makedirs(os.path.dirname(self.settings_file), exist_ok=True)
-            with open(self.settings_file, "w") as f:
-                json.dump(account_ids, f, indent=4)  # Save the list of IDs
+            app_settings.save(os.path.basename(self.settings_file), account_ids)  # Save the list of IDs
             QMessageBox.information(self, "Success", "Settings saved successfully!")
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to save settings: {e}")
\ No newline at end of file
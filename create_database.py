@@ -1,7 +1,146 @@
 # create_database.py (Modified)
+import os
 import sqlite3
+import threading
 from pathlib import Path
-from typing import List, Tuple
+from typing import Dict, List, Tuple
+from utils.formatters import statement_hash
+from utils.money import Money
+
+# Files SQLite keeps next to a live database; they are not part of the data set
+SQLITE_SIDECAR_SUFFIXES = ('-wal', '-shm', '-journal')
+
+class ConnectionProvider:
+    """
+    Process-wide source of SQLite connections: one per thread and database file.
+
+    A thread's connection is opened once, tuned with PRAGMAS and reused by every
+    window, dialog and CRUD object on that thread, so opening one no longer costs
+    a file open and a schema parse. Rows come back as sqlite3.Row, and SQL can
+    call statement_hash(date, cents, description).
+
+    Because the connection is shared, each caller commits or rolls back its own
+    work. acquire()/release() count nested users on a thread; the outermost
+    release rolls back anything left uncommitted, and worker threads close their
+    connection there.
+    """
+
+    PRAGMAS = (
+        "PRAGMA journal_mode = WAL",
+        "PRAGMA synchronous = NORMAL",   # Safe with WAL; fsync at checkpoints only
+        "PRAGMA cache_size = -16384",    # 16 MiB page cache
+        "PRAGMA mmap_size = 268435456",  # 256 MiB memory-mapped reads
+        "PRAGMA temp_store = MEMORY",
+    )
+    # Declared foreign keys are enforced (migration 11 fixed the ones that did
+    # not hold); schema migrations turn them off while they rebuild tables
+    ENFORCE_FOREIGN_KEYS = True
+    BUSY_TIMEOUT_SECONDS = 5.0
+
+    def __init__(self):
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._live: Dict[Tuple[int, str], sqlite3.Connection] = {}
+
+    @staticmethod
+    def _key(db_path) -> str:
+        return os.path.abspath(str(db_path))
+
+    def _thread_state(self):
+        if not hasattr(self._local, 'connections'):
+            self._local.connections = {}
+            self._local.depth = {}
+        return self._local
+
+    @staticmethod
+    def _statement_hash(date, cents, description):
+        """statement_hash() for SQL, where amounts are stored in cents."""
+        return statement_hash(date, Money.from_db(cents), description)
+
+    def get_connection(self, db_path) -> sqlite3.Connection:
+        """Return the calling thread's connection to db_path, opening it on first use."""
+        key = self._key(db_path)
+        state = self._thread_state()
+        conn = state.connections.get(key)
+        if conn is None:
+            conn = sqlite3.connect(key, timeout=self.BUSY_TIMEOUT_SECONDS)
+            conn.row_factory = sqlite3.Row
+            for pragma in self.PRAGMAS:
+                conn.execute(pragma)
+            conn.execute(f"PRAGMA foreign_keys = {'ON' if self.ENFORCE_FOREIGN_KEYS else 'OFF'}")
+            conn.create_function('statement_hash', 3, self._statement_hash, deterministic=True)
+            state.connections[key] = conn
+            with self._lock:
+                self._live[(threading.get_ident(), key)] = conn
+        return conn
+
+    def acquire(self, db_path) -> sqlite3.Connection:
+        """get_connection() for a scoped user; pair with release()."""
+        conn = self.get_connection(db_path)
+        state = self._thread_state()
+        key = self._key(db_path)
+        state.depth[key] = state.depth.get(key, 0) + 1
+        return conn
+
+    def release(self, db_path) -> None:
+        """End a scoped use started with acquire()."""
+        key = self._key(db_path)
+        state = self._thread_state()
+        depth = state.depth.get(key, 0) - 1
+        if depth > 0:
+            state.depth[key] = depth
+            return
+        state.depth.pop(key, None)
+        conn = state.connections.get(key)
+        if conn is None:
+            return
+        if conn.in_transaction:
+            conn.rollback()  # Never leave half-done work on a shared connection
+        if threading.current_thread() is not threading.main_thread():
+            self.close_thread_connections()
+
+    def close_thread_connections(self) -> None:
+        """Close every connection owned by the calling thread."""
+        state = self._thread_state()
+        thread_id = threading.get_ident()
+        for key, conn in list(state.connections.items()):
+            conn.close()
+            with self._lock:
+                self._live.pop((thread_id, key), None)
+        state.connections.clear()
+        state.depth.clear()
+
+    def live_connection_count(self) -> int:
+        """Number of open connections across all threads."""
+        alive = {thread.ident for thread in threading.enumerate()}
+        with self._lock:
+            # Threads that ended without closing: their connection is freed with them
+            for thread_id, key in [k for k in self._live if k[0] not in alive]:
+                del self._live[(thread_id, key)]
+            return len(self._live)
+
+    def checkpoint(self, db_path) -> None:
+        """Fold the WAL back into the database file (before copying the file)."""
+        self.get_connection(db_path).execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def restore(self, db_path, source_path) -> None:
+        """
+        Replace db_path's content with the database file at source_path, in
+        place through the SQLite backup API. The file is never renamed while
+        connections or its WAL are live, so open connections stay valid and see
+        the restored data; the WAL is folded in afterwards.
+        """
+        # immutable: read the copy without creating -wal/-shm files next to it
+        source = sqlite3.connect(Path(source_path).resolve().as_uri() + "?immutable=1", uri=True)
+        target = sqlite3.connect(self._key(db_path), timeout=self.BUSY_TIMEOUT_SECONDS)
+        try:
+            source.backup(target)
+            target.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        finally:
+            target.close()
+            source.close()
+
+connection_provider = ConnectionProvider()
 
 class DatabaseManager:
     def __init__(self, db_name: str = 'financial_system.db'):
@@ -9,6 +148,7 @@ class DatabaseManager:
         self.db_path = self.data_dir / db_name
         self.conn = None
         self.cursor = None
+        self._acquired = 0  # Open connect() calls on this instance
 
     def __enter__(self):
         self.connect()
@@ -18,16 +158,17 @@ class DatabaseManager:
         self.close()
 
     def connect(self) -> None:
-        """Establish database connection and set row_factory."""
+        """Take this thread's shared connection (rows are sqlite3.Row)."""
         self.data_dir.mkdir(exist_ok=True)
-        self.conn = sqlite3.connect(self.db_path)
-        self.conn.row_factory = sqlite3.Row  # <--- CRITICAL: Set row_factory here
+        self.conn = connection_provider.acquire(self.db_path)
+        self._acquired += 1
         self.cursor = self.conn.cursor()
 
     def close(self) -> None:
-        """Close database connection."""
-        if self.conn:
-            self.conn.close()
+        """Hand the connection back; uncommitted work is rolled back by the outermost user."""
+        if self.conn and self._acquired:
+            self._acquired -= 1
+            connection_provider.release(self.db_path)
 
     def commit(self) -> None:
         """Commit changes to database"""
@@ -94,7 +235,7 @@ class DatabaseManager:
             name VARCHAR(100) NOT NULL UNIQUE,
             normalized_name VARCHAR(100) NOT NULL UNIQUE,
             account INTEGER,
-            amount DECIMAL(15, 2),
+            amount DECIMAL(15, 2),  -- Cents since schema version 14
             FOREIGN KEY (account) REFERENCES accounts(id)
         );
 
@@ -102,7 +243,7 @@ class DatabaseManager:
             id INTEGER PRIMARY KEY,
             date DATE NOT NULL,
             details TEXT,
-            amount DECIMAL(15, 2),
+            amount DECIMAL(15, 2),  -- Cents since schema version 14
             debtor_creditor INTEGER NOT NULL,
             type VARCHAR(20) NOT NULL,  -- Added 'type' column
             transaction_id INTEGER, -- Link back to the main transaction
@@ -215,6 +356,647 @@ class DatabaseManager:
             );
         """
 
+    @property
+    def create_indexes_sql(self) -> str:
+        """SQL statements to create the secondary indexes used by reports and lookups"""
+        return """
+        -- Ledger lookups by date range (income statement, transaction viewer)
+        CREATE INDEX IF NOT EXISTS idx_transactions_date
+            ON transactions(date);
+
+        -- Per-account lookups, one index for each side of the entry
+        CREATE INDEX IF NOT EXISTS idx_transactions_debited_date
+            ON transactions(debited, date);
+        CREATE INDEX IF NOT EXISTS idx_transactions_credited_date
+            ON transactions(credited, date);
+
+        -- Module filters (GENERAL / DEBTOR_CREDITOR / FIXED_ASSET)
+        CREATE INDEX IF NOT EXISTS idx_transactions_source_type
+            ON transactions(source_type);
+
+        -- Startup check for due future transactions
+        CREATE INDEX IF NOT EXISTS idx_future_transactions_date
+            ON future_transactions(date);
+
+        -- Last scheduled period per asset
+        CREATE INDEX IF NOT EXISTS idx_depreciation_schedule_asset_period
+            ON depreciation_schedule(asset_id, period_end_date);
+        """
+
+    @property
+    def covering_indexes_sql(self) -> str:
+        """SQL statements replacing the per-account indexes with covering ones"""
+        return """
+        -- Carry amount in the per-account indexes so balance aggregation
+        -- never has to visit the table rows
+        DROP INDEX IF EXISTS idx_transactions_debited_date;
+        DROP INDEX IF EXISTS idx_transactions_credited_date;
+        CREATE INDEX IF NOT EXISTS idx_transactions_debited_date_amount
+            ON transactions(debited, date, amount);
+        CREATE INDEX IF NOT EXISTS idx_transactions_credited_date_amount
+            ON transactions(credited, date, amount);
+        """
+
+    @property
+    def rebuild_account_period_balances_sql(self) -> str:
+        """SQL statements to recompute the monthly snapshots from the ledger"""
+        return """
+        DELETE FROM account_period_balances;
+
+        INSERT INTO account_period_balances (account_id, year_month, debit_total, credit_total)
+        SELECT account_id, year_month, SUM(debit_total), SUM(credit_total)
+        FROM (
+            SELECT debited AS account_id, substr(date, 1, 7) AS year_month,
+                   SUM(amount) AS debit_total, 0 AS credit_total
+            FROM transactions
+            GROUP BY debited, substr(date, 1, 7)
+            UNION ALL
+            SELECT credited AS account_id, substr(date, 1, 7) AS year_month,
+                   0 AS debit_total, SUM(amount) AS credit_total
+            FROM transactions
+            GROUP BY credited, substr(date, 1, 7)
+        )
+        GROUP BY account_id, year_month;
+        """
+
+    @property
+    def account_period_balances_sql(self) -> str:
+        """SQL statements for the monthly per-account snapshot table and its triggers"""
+        return self._account_period_balances_sql('REAL')
+
+    def _account_period_balances_sql(self, total_type: str) -> str:
+        return f"""
+        -- Debit/credit totals per account and calendar month ('YYYY-MM')
+        CREATE TABLE IF NOT EXISTS account_period_balances (
+            account_id INTEGER NOT NULL,
+            year_month TEXT NOT NULL,
+            debit_total {total_type} NOT NULL DEFAULT 0,
+            credit_total {total_type} NOT NULL DEFAULT 0,
+            PRIMARY KEY (account_id, year_month),
+            FOREIGN KEY (account_id) REFERENCES accounts(id) ON DELETE CASCADE
+        ) WITHOUT ROWID;
+
+        -- Kept in step with every writer of the ledger
+        CREATE TRIGGER IF NOT EXISTS trg_transactions_period_insert
+        AFTER INSERT ON transactions
+        BEGIN
+            INSERT INTO account_period_balances (account_id, year_month, debit_total, credit_total)
+            VALUES (NEW.debited, substr(NEW.date, 1, 7), NEW.amount, 0)
+            ON CONFLICT (account_id, year_month)
+            DO UPDATE SET debit_total = debit_total + excluded.debit_total;
+            INSERT INTO account_period_balances (account_id, year_month, debit_total, credit_total)
+            VALUES (NEW.credited, substr(NEW.date, 1, 7), 0, NEW.amount)
+            ON CONFLICT (account_id, year_month)
+            DO UPDATE SET credit_total = credit_total + excluded.credit_total;
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS trg_transactions_period_delete
+        AFTER DELETE ON transactions
+        BEGIN
+            UPDATE account_period_balances SET debit_total = debit_total - OLD.amount
+            WHERE account_id = OLD.debited AND year_month = substr(OLD.date, 1, 7);
+            UPDATE account_period_balances SET credit_total = credit_total - OLD.amount
+            WHERE account_id = OLD.credited AND year_month = substr(OLD.date, 1, 7);
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS trg_transactions_period_update
+        AFTER UPDATE OF date, debited, credited, amount ON transactions
+        BEGIN
+            UPDATE account_period_balances SET debit_total = debit_total - OLD.amount
+            WHERE account_id = OLD.debited AND year_month = substr(OLD.date, 1, 7);
+            UPDATE account_period_balances SET credit_total = credit_total - OLD.amount
+            WHERE account_id = OLD.credited AND year_month = substr(OLD.date, 1, 7);
+            INSERT INTO account_period_balances (account_id, year_month, debit_total, credit_total)
+            VALUES (NEW.debited, substr(NEW.date, 1, 7), NEW.amount, 0)
+            ON CONFLICT (account_id, year_month)
+            DO UPDATE SET debit_total = debit_total + excluded.debit_total;
+            INSERT INTO account_period_balances (account_id, year_month, debit_total, credit_total)
+            VALUES (NEW.credited, substr(NEW.date, 1, 7), 0, NEW.amount)
+            ON CONFLICT (account_id, year_month)
+            DO UPDATE SET credit_total = credit_total + excluded.credit_total;
+        END;
+        """ + self.rebuild_account_period_balances_sql
+
+    @property
+    def recurring_watermark_sql(self) -> str:
+        """SQL statements switching recurring rules to on-demand expansion"""
+        return """
+        -- Last date whose occurrences have been written to future_transactions
+        ALTER TABLE recurring_transactions ADD COLUMN generated_until DATE;
+
+        -- Rules used to be expanded decades ahead. Keep the next 90 days
+        -- (the rolling horizon), up to each rule's end, and let the recurrence
+        -- engine take over from there; rules starting later have nothing
+        -- generated yet. The occurrences past the watermark are dropped by
+        -- migration 12, once migration 8 has linked them to their rule.
+        UPDATE recurring_transactions SET generated_until = w.until
+        FROM (
+            SELECT id, CASE WHEN start_date > until THEN NULL ELSE until END AS until
+            FROM (
+                SELECT id, start_date, MIN(date('now', '+90 days'), COALESCE(end_date, '9999-12-31')) AS until
+                FROM recurring_transactions
+            )
+        ) AS w
+        WHERE recurring_transactions.id = w.id;
+        """
+
+    @property
+    def recurring_horizon_sql(self) -> str:
+        """SQL statements clamping recurring watermarks and dropping the occurrences past them"""
+        return """
+        -- Migration 4 once moved every watermark to the horizon, past the end
+        -- of finished rules and before the start of later ones
+        UPDATE recurring_transactions SET generated_until = end_date
+        WHERE end_date IS NOT NULL AND generated_until > end_date;
+        UPDATE recurring_transactions SET generated_until = NULL
+        WHERE generated_until < start_date;
+
+        -- Occurrences of a rule past its watermark are left over from the old
+        -- expansion; the recurrence engine writes them again when they come due
+        DELETE FROM future_transactions
+        WHERE source_ref = 'recurring_transactions'
+          AND EXISTS (
+              SELECT 1 FROM recurring_transactions r
+              WHERE r.id = future_transactions.source_id
+                AND (r.generated_until IS NULL OR future_transactions.date > r.generated_until)
+          );
+        """
+
+    # Tables whose free-text column is indexed for search: table -> text column
+    # (migrations 5 and 6 only; the tables later gained source columns)
+    FIRST_FULL_TEXT_SOURCES = {
+        'transactions': ('description',),
+        'future_transactions': ('description',),
+        'debtor_creditor_transactions': ('details',),
+    }
+    # Tables with a search index: table -> every text column a search should
+    # find words in (dates, amounts, ids and import hashes are searched with LIKE)
+    FULL_TEXT_SOURCES = {
+        'transactions': ('description', 'source_type', 'source_ref'),
+        'future_transactions': ('description', 'source_ref'),
+        'debtor_creditor_transactions': ('details', 'type'),
+    }
+
+    @property
+    def full_text_search_sql(self) -> str:
+        """SQL statements for the FTS5 search indexes and their sync triggers"""
+        return self._full_text_search_sql(self.FIRST_FULL_TEXT_SOURCES)
+
+    @property
+    def full_text_columns_sql(self) -> str:
+        """SQL statements re-creating the search indexes over every searchable text column"""
+        statements = []
+        for table in self.FULL_TEXT_SOURCES:
+            fts = f"{table}_fts"
+            statements.append(f"""
+        DROP TRIGGER IF EXISTS trg_{fts}_insert;
+        DROP TRIGGER IF EXISTS trg_{fts}_delete;
+        DROP TRIGGER IF EXISTS trg_{fts}_update;
+        DROP TABLE IF EXISTS {fts};
+        """)
+        return "".join(statements) + self._full_text_search_sql(self.FULL_TEXT_SOURCES)
+
+    def _full_text_search_sql(self, sources: Dict[str, Tuple[str, ...]]) -> str:
+        statements = []
+        for table, columns in sources.items():
+            fts = f"{table}_fts"
+            statements.append(f"""
+        -- {table} ({', '.join(columns)}), tokenized lower-cased and accent-stripped
+        -- (same folding as utils.formatters.normalize_text)
+        CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5(
+            {', '.join(columns)},
+            content='{table}',
+            content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2',
+            prefix='2 3'
+        );
+        """)
+            statements.append(self._full_text_triggers_sql(table, columns))
+            statements.append(f"""
+        INSERT INTO {fts} ({fts}) VALUES ('rebuild');
+        """)
+        return "".join(statements)
+
+    @staticmethod
+    def _full_text_triggers_sql(table: str, columns: Tuple[str, ...]) -> str:
+        fts = f"{table}_fts"
+        names = ', '.join(columns)
+        new_values = ', '.join(f"NEW.{column}" for column in columns)
+        old_values = ', '.join(f"OLD.{column}" for column in columns)
+        return f"""
+        CREATE TRIGGER IF NOT EXISTS trg_{fts}_insert
+        AFTER INSERT ON {table}
+        BEGIN
+            INSERT INTO {fts} (rowid, {names}) VALUES (NEW.id, {new_values});
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS trg_{fts}_delete
+        AFTER DELETE ON {table}
+        BEGIN
+            INSERT INTO {fts} ({fts}, rowid, {names}) VALUES ('delete', OLD.id, {old_values});
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS trg_{fts}_update
+        AFTER UPDATE OF id, {names} ON {table}
+        BEGIN
+            INSERT INTO {fts} ({fts}, rowid, {names}) VALUES ('delete', OLD.id, {old_values});
+            INSERT INTO {fts} (rowid, {names}) VALUES (NEW.id, {new_values});
+        END;
+        """
+
+    @property
+    def money_cents_sql(self) -> str:
+        """SQL statements moving ledger amounts and account balances to integer cents"""
+        return """
+        -- Each account's balance minus its ledger net (opening balances, past
+        -- drift), captured before amounts are rounded so it survives the switch
+        CREATE TEMP TABLE account_balance_offsets AS
+        SELECT a.id AS account_id,
+               CAST(round((COALESCE(a.balance, 0) - COALESCE(d.total, 0) + COALESCE(c.total, 0)) * 100) AS INTEGER) AS offset_cents
+        FROM accounts a
+        LEFT JOIN (SELECT debited AS account_id, SUM(amount) AS total FROM transactions GROUP BY debited) d
+            ON d.account_id = a.id
+        LEFT JOIN (SELECT credited AS account_id, SUM(amount) AS total FROM transactions GROUP BY credited) c
+            ON c.account_id = a.id;
+
+        -- SQLite cannot change a column's type in place: copy into INTEGER tables
+        CREATE TABLE transactions_cents (
+            id INTEGER PRIMARY KEY,
+            date TEXT NOT NULL,
+            description TEXT,
+            debited INTEGER NOT NULL,
+            credited INTEGER NOT NULL,
+            amount INTEGER NOT NULL,  -- Cents
+            source_type TEXT DEFAULT 'GENERAL' NOT NULL CHECK (source_type IN ('GENERAL', 'DEBTOR_CREDITOR', 'FIXED_ASSET')),
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (debited) REFERENCES accounts(id),
+            FOREIGN KEY (credited) REFERENCES accounts(id)
+        );
+        INSERT INTO transactions_cents
+            (id, date, description, debited, credited, amount, source_type, created_at, updated_at)
+        SELECT id, date, description, debited, credited, CAST(round(amount * 100) AS INTEGER),
+               source_type, created_at, updated_at
+        FROM transactions;
+        DROP TABLE transactions;
+        ALTER TABLE transactions_cents RENAME TO transactions;
+
+        CREATE TABLE future_transactions_cents (
+            id INTEGER PRIMARY KEY,
+            date TEXT NOT NULL,
+            description TEXT,
+            debited INTEGER NOT NULL,
+            credited INTEGER NOT NULL,
+            amount INTEGER NOT NULL,  -- Cents
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (debited) REFERENCES accounts(id),
+            FOREIGN KEY (credited) REFERENCES accounts(id)
+        );
+        INSERT INTO future_transactions_cents
+            (id, date, description, debited, credited, amount, created_at, updated_at)
+        SELECT id, date, description, debited, credited, CAST(round(amount * 100) AS INTEGER),
+               created_at, updated_at
+        FROM future_transactions;
+        DROP TABLE future_transactions;
+        ALTER TABLE future_transactions_cents RENAME TO future_transactions;
+
+        CREATE TABLE template_transaction_details_cents (
+            id INTEGER PRIMARY KEY,
+            template_transaction_id INTEGER NOT NULL,
+            debited INTEGER NOT NULL,
+            credited INTEGER NOT NULL,
+            amount INTEGER NOT NULL,  -- Cents
+            FOREIGN KEY (template_transaction_id) REFERENCES template_transactions(id) ON DELETE CASCADE,
+            FOREIGN KEY (debited) REFERENCES accounts(id),
+            FOREIGN KEY (credited) REFERENCES accounts(id)
+        );
+        INSERT INTO template_transaction_details_cents
+            (id, template_transaction_id, debited, credited, amount)
+        SELECT id, template_transaction_id, debited, credited, CAST(round(amount * 100) AS INTEGER)
+        FROM template_transaction_details;
+        DROP TABLE template_transaction_details;
+        ALTER TABLE template_transaction_details_cents RENAME TO template_transaction_details;
+
+        CREATE TABLE recurring_transactions_cents (
+            id INTEGER PRIMARY KEY,
+            description TEXT,
+            debited INTEGER NOT NULL,
+            credited INTEGER NOT NULL,
+            amount INTEGER NOT NULL,  -- Cents
+            frequency TEXT NOT NULL,  -- 'weekly', 'monthly', 'yearly', or 'days'
+            interval INTEGER,          -- Number of days, if frequency is 'days'
+            start_date DATE NOT NULL,
+            end_date DATE,            -- NULL for no end date
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            generated_until DATE,
+            FOREIGN KEY (debited) REFERENCES accounts(id),
+            FOREIGN KEY (credited) REFERENCES accounts(id)
+        );
+        INSERT INTO recurring_transactions_cents
+            (id, description, debited, credited, amount, frequency, interval,
+             start_date, end_date, created_at, updated_at, generated_until)
+        SELECT id, description, debited, credited, CAST(round(amount * 100) AS INTEGER), frequency, interval,
+               start_date, end_date, created_at, updated_at, generated_until
+        FROM recurring_transactions;
+        DROP TABLE recurring_transactions;
+        ALTER TABLE recurring_transactions_cents RENAME TO recurring_transactions;
+
+        -- Balances in cents: the kept offset plus the (now exact) ledger net
+        UPDATE accounts SET balance = (
+            SELECT o.offset_cents
+                 + COALESCE((SELECT SUM(amount) FROM transactions WHERE debited = accounts.id), 0)
+                 - COALESCE((SELECT SUM(amount) FROM transactions WHERE credited = accounts.id), 0)
+            FROM account_balance_offsets o
+            WHERE o.account_id = accounts.id
+        );
+        DROP TABLE account_balance_offsets;
+
+        -- Dropping the old tables took their indexes and triggers along
+        CREATE INDEX IF NOT EXISTS idx_transactions_date
+            ON transactions(date);
+        CREATE INDEX IF NOT EXISTS idx_transactions_debited_date_amount
+            ON transactions(debited, date, amount);
+        CREATE INDEX IF NOT EXISTS idx_transactions_credited_date_amount
+            ON transactions(credited, date, amount);
+        CREATE INDEX IF NOT EXISTS idx_transactions_source_type
+            ON transactions(source_type);
+        CREATE INDEX IF NOT EXISTS idx_future_transactions_date
+            ON future_transactions(date);
+
+        DROP TABLE account_period_balances;
+        """ + self._account_period_balances_sql('INTEGER') \
+            + self._full_text_triggers_sql('transactions', self.FIRST_FULL_TEXT_SOURCES['transactions']) \
+            + self._full_text_triggers_sql('future_transactions', self.FIRST_FULL_TEXT_SOURCES['future_transactions'])
+
+    @property
+    def import_hash_sql(self) -> str:
+        return """
+        -- Duplicate-detection key for statement imports: a hash of (date, amount,
+        -- description). Written with every posting and edit since migration 13,
+        -- which hashed the rows posted before.
+        ALTER TABLE transactions ADD COLUMN import_hash TEXT;
+
+        CREATE INDEX IF NOT EXISTS idx_transactions_import_hash
+            ON transactions(import_hash);
+        """
+
+    def _add_missing_column_sql(self, table: str, column: str, declaration: str) -> str:
+        """ALTER TABLE adding the column, or nothing when the table already has it.
+
+        create_tables_sql only creates missing tables, so files created by older
+        versions can lack columns it declares.
+        """
+        self.cursor.execute(f"PRAGMA table_info({table})")
+        if any(row[1] == column for row in self.cursor.fetchall()):
+            return ""
+        return f"ALTER TABLE {table} ADD COLUMN {column} {declaration};"
+
+    @property
+    def source_links_sql(self) -> str:
+        """SQL statements linking postings to the asset, recurring rule or AR/AP movement they belong to"""
+        return f"""
+        -- Older files predate debtor_creditor_transactions.transaction_id
+        {self._add_missing_column_sql('debtor_creditor_transactions', 'transaction_id', 'INTEGER REFERENCES transactions(id)')}
+
+        -- source_ref names the table (fixed_assets, recurring_transactions,
+        -- debtor_creditor_transactions) and source_id the row; NULL for
+        -- postings entered on their own
+        ALTER TABLE transactions ADD COLUMN source_ref TEXT;
+        ALTER TABLE transactions ADD COLUMN source_id INTEGER;
+        ALTER TABLE future_transactions ADD COLUMN source_ref TEXT;
+        ALTER TABLE future_transactions ADD COLUMN source_id INTEGER;
+
+        -- Cascades look rows up by (source_ref, source_id); unlinked rows stay out of the index
+        CREATE INDEX IF NOT EXISTS idx_transactions_source
+            ON transactions(source_ref, source_id) WHERE source_ref IS NOT NULL;
+        CREATE INDEX IF NOT EXISTS idx_future_transactions_source
+            ON future_transactions(source_ref, source_id) WHERE source_ref IS NOT NULL;
+
+        -- Backfill, most exact match first. AR/AP: the n-th movement with a
+        -- given date, details and amount pairs with the n-th posting with that
+        -- date, description and amount. Older versions posted AR/AP movements
+        -- as GENERAL, so those pair too, after the DEBTOR_CREDITOR ones
+        CREATE TEMP TABLE party_links AS
+        WITH movements AS (
+            SELECT id, date, details, CAST(round(amount * 100) AS INTEGER) AS cents,
+                   ROW_NUMBER() OVER (
+                       PARTITION BY date, details, CAST(round(amount * 100) AS INTEGER) ORDER BY id
+                   ) AS n
+            FROM debtor_creditor_transactions
+        ),
+        postings AS (
+            SELECT id, date, description, amount,
+                   ROW_NUMBER() OVER (
+                       PARTITION BY date, description, amount ORDER BY source_type = 'GENERAL', id
+                   ) AS n
+            FROM transactions
+            WHERE source_type IN ('DEBTOR_CREDITOR', 'GENERAL')
+        )
+        SELECT m.id AS movement_id, p.id AS transaction_id
+        FROM movements m
+        JOIN postings p ON p.date = m.date AND p.description IS m.details AND p.amount = m.cents AND p.n = m.n;
+
+        UPDATE transactions SET source_ref = 'debtor_creditor_transactions', source_id = l.movement_id
+        FROM party_links l
+        WHERE transactions.id = l.transaction_id;
+        UPDATE debtor_creditor_transactions SET transaction_id = l.transaction_id
+        FROM party_links l
+        WHERE debtor_creditor_transactions.id = l.movement_id
+          AND debtor_creditor_transactions.transaction_id IS NULL;
+        DROP TABLE party_links;
+
+        -- Fixed assets: postings on the asset's own account whose
+        -- description names the asset (purchase, import, depreciation).
+        -- Rows naming several assets ("Notebook", "Notebook Stand") stay unlinked
+        UPDATE transactions SET source_ref = 'fixed_assets', source_id = m.asset_id
+        FROM (
+            SELECT t.id, MIN(a.asset_id) AS asset_id
+            FROM transactions t
+            JOIN fixed_assets a
+              ON a.account_id IN (t.debited, t.credited) AND instr(t.description, a.asset_name) > 0
+            WHERE t.source_ref IS NULL
+            GROUP BY t.id
+            HAVING COUNT(*) = 1
+        ) AS m
+        WHERE transactions.id = m.id;
+        UPDATE future_transactions SET source_ref = 'fixed_assets', source_id = m.asset_id
+        FROM (
+            SELECT f.id, MIN(a.asset_id) AS asset_id
+            FROM future_transactions f
+            JOIN fixed_assets a
+              ON a.account_id IN (f.debited, f.credited) AND instr(f.description, a.asset_name) > 0
+            WHERE f.source_ref IS NULL
+            GROUP BY f.id
+            HAVING COUNT(*) = 1
+        ) AS m
+        WHERE future_transactions.id = m.id;
+
+        -- Recurring rules: pending occurrences with the rule's accounts and description
+        UPDATE future_transactions SET source_ref = 'recurring_transactions', source_id = (
+            SELECT MIN(r.id) FROM recurring_transactions r
+            WHERE r.debited = future_transactions.debited
+              AND r.credited = future_transactions.credited
+              AND r.description IS future_transactions.description
+        )
+        WHERE source_ref IS NULL
+          AND EXISTS (
+              SELECT 1 FROM recurring_transactions r
+              WHERE r.debited = future_transactions.debited
+                AND r.credited = future_transactions.credited
+                AND r.description IS future_transactions.description
+          );
+        """
+
+    @property
+    def ar_ap_aging_sql(self) -> str:
+        """SQL statements backing the AR/AP aging report"""
+        statements = ["""
+        -- One party's movements in date order (aging, drill-down)
+        CREATE INDEX IF NOT EXISTS idx_debtor_creditor_transactions_party_date
+            ON debtor_creditor_transactions(debtor_creditor, date);
+
+        -- Bumped by every change to AR/AP parties or movements, so cached
+        -- aging results know when they are stale
+        CREATE TABLE IF NOT EXISTS ar_ap_revision (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            revision INTEGER NOT NULL
+        );
+        INSERT OR IGNORE INTO ar_ap_revision (id, revision) VALUES (1, 0);
+        """]
+        for table in ('debtor_creditor', 'debtor_creditor_transactions'):
+            statements.append(self._ar_ap_revision_triggers_sql(table))
+        return "".join(statements)
+
+    @staticmethod
+    def _ar_ap_revision_triggers_sql(table: str) -> str:
+        return "".join(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_{table}_revision_{event.lower()}
+        AFTER {event} ON {table}
+        BEGIN
+            UPDATE ar_ap_revision SET revision = revision + 1 WHERE id = 1;
+        END;
+        """ for event in ('INSERT', 'UPDATE', 'DELETE'))
+
+    @property
+    def foreign_keys_sql(self) -> str:
+        """SQL statements rebuilding the tables whose declared foreign keys did not hold"""
+        return """
+        -- debtor_creditor.account is the party kind (1 = debtor, 2 = creditor),
+        -- not an account id: drop its foreign key
+        CREATE TABLE debtor_creditor_keyed (
+            id INTEGER PRIMARY KEY,
+            name VARCHAR(100) NOT NULL UNIQUE,
+            normalized_name VARCHAR(100) NOT NULL UNIQUE,
+            account INTEGER,  -- 1 = debtor, 2 = creditor
+            amount DECIMAL(15, 2)
+        );
+        INSERT INTO debtor_creditor_keyed (id, name, normalized_name, account, amount)
+        SELECT id, name, normalized_name, account, amount FROM debtor_creditor;
+        DROP TABLE debtor_creditor;
+        ALTER TABLE debtor_creditor_keyed RENAME TO debtor_creditor;
+        """ + self._ar_ap_revision_triggers_sql('debtor_creditor') + """
+
+        -- depreciation_schedule.transaction_id mixed posted transactions (import
+        -- openings) with pending future_transactions ids. The pending one moves
+        -- to future_transaction_id; transaction_id is the posted transaction.
+        CREATE TABLE depreciation_schedule_keyed (
+            schedule_id INTEGER PRIMARY KEY,
+            asset_id INTEGER NOT NULL,
+            period_start_date DATE NOT NULL,  -- Start of the period
+            period_end_date DATE NOT NULL,    -- End of the period
+            depreciation_expense DECIMAL(19, 4) NOT NULL,
+            accumulated_depreciation DECIMAL(19, 4) NOT NULL,
+            book_value DECIMAL(19, 4) NOT NULL,  -- Book value at period end
+            units_produced_period INTEGER,  --  Units produced THIS period (for UP method)
+            transaction_id INTEGER,         -- The posted transaction of this period
+            future_transaction_id INTEGER,  -- Its pending future transaction until posted
+            FOREIGN KEY (asset_id) REFERENCES fixed_assets(asset_id),
+            FOREIGN KEY (transaction_id) REFERENCES transactions(id) ON DELETE SET NULL,
+            FOREIGN KEY (future_transaction_id) REFERENCES future_transactions(id) ON DELETE SET NULL
+        );
+        INSERT INTO depreciation_schedule_keyed (
+            schedule_id, asset_id, period_start_date, period_end_date, depreciation_expense,
+            accumulated_depreciation, book_value, units_produced_period, transaction_id, future_transaction_id
+        )
+        SELECT s.schedule_id, s.asset_id, s.period_start_date, s.period_end_date, s.depreciation_expense,
+               s.accumulated_depreciation, s.book_value, s.units_produced_period,
+               CASE
+                   WHEN f.id IS NOT NULL THEN NULL
+                   WHEN t.id IS NOT NULL THEN t.id
+                   -- Posted depreciation: the asset's credit posted on the period start
+                   ELSE (SELECT p.id FROM transactions p
+                         WHERE p.source_ref = 'fixed_assets' AND p.source_id = s.asset_id
+                           AND p.date = s.period_start_date AND p.credited = a.account_id
+                         ORDER BY p.id DESC LIMIT 1)
+               END,
+               f.id
+        FROM depreciation_schedule s
+        LEFT JOIN fixed_assets a ON a.asset_id = s.asset_id
+        LEFT JOIN future_transactions f
+            ON f.id = s.transaction_id AND f.source_ref = 'fixed_assets' AND f.source_id = s.asset_id
+        LEFT JOIN transactions t
+            ON t.id = s.transaction_id AND t.source_ref = 'fixed_assets' AND t.source_id = s.asset_id;
+        DROP TABLE depreciation_schedule;
+        ALTER TABLE depreciation_schedule_keyed RENAME TO depreciation_schedule;
+
+        CREATE INDEX IF NOT EXISTS idx_depreciation_schedule_asset_period
+            ON depreciation_schedule(asset_id, period_end_date);
+        -- Looked up by the ON DELETE actions and by posting
+        CREATE INDEX IF NOT EXISTS idx_depreciation_schedule_transaction
+            ON depreciation_schedule(transaction_id);
+        CREATE INDEX IF NOT EXISTS idx_depreciation_schedule_future_transaction
+            ON depreciation_schedule(future_transaction_id);
+
+        -- Snapshots go with their account
+        DROP TABLE account_period_balances;
+        """ + self._account_period_balances_sql('INTEGER')
+
+    @property
+    def import_hash_backfill_sql(self) -> str:
+        """SQL statements hashing the ledger rows posted before every posting carried its import hash"""
+        return """
+        -- statement_hash() is registered on every connection by ConnectionProvider
+        UPDATE transactions SET import_hash = statement_hash(date, amount, description)
+        WHERE import_hash IS NULL;
+        """
+
+    @property
+    def ar_ap_cents_sql(self) -> str:
+        """SQL statements moving AR/AP amounts to integer cents, like the ledger"""
+        return """
+        -- The DECIMAL columns have NUMERIC affinity, so whole cents are stored
+        -- as INTEGER in place; the tables keep their keys, triggers and indexes
+        UPDATE debtor_creditor SET amount = CAST(round(COALESCE(amount, 0) * 100) AS INTEGER);
+        UPDATE debtor_creditor_transactions SET amount = CAST(round(amount * 100) AS INTEGER)
+        WHERE amount IS NOT NULL;
+        """
+
+    @property
+    def schema_migrations(self) -> List[Tuple[int, str]]:
+        """Versioned schema changes, applied in order on top of create_tables_sql.
+
+        The applied version is stored in PRAGMA user_version, so each script runs
+        exactly once per database file.
+        """
+        return [
+            (1, self.create_indexes_sql),
+            (2, self.covering_indexes_sql),
+            (3, self.account_period_balances_sql),
+            (4, self.recurring_watermark_sql),
+            (5, self.full_text_search_sql),
+            (6, self.money_cents_sql),
+            (7, self.import_hash_sql),
+            (8, self.source_links_sql),
+            (9, self.ar_ap_aging_sql),
+            (10, self.full_text_columns_sql),
+            (11, self.foreign_keys_sql),
+            (12, self.recurring_horizon_sql),
+            (13, self.import_hash_backfill_sql),
+            (14, self.ar_ap_cents_sql),
+        ]
+
     @property
     def default_account_types(self) -> List[Tuple[str, str, str]]:
         """Default account types data"""
@@ -236,6 +1018,9 @@ class DatabaseManager:
             # Create tables
             self.cursor.executescript(self.create_tables_sql)
 
+            # Bring indexes and later schema changes up to date
+            self.apply_migrations()
+
             # Insert default account types if they don't exist
             self.cursor.execute("SELECT COUNT(*) FROM account_types")
             if self.cursor.fetchone()[0] == 0:
@@ -254,6 +1039,31 @@ class DatabaseManager:
             self.rollback()
             return False
 
+    def get_schema_version(self) -> int:
+        """Return the schema version recorded in the database file."""
+        self.cursor.execute("PRAGMA user_version")
+        return self.cursor.fetchone()[0]
+
+    def apply_migrations(self) -> int:
+        """Apply pending schema migrations and return the resulting version."""
+        current_version = self.get_schema_version()
+        for version, script in self.schema_migrations:
+            if version <= current_version:
+                continue
+            # Run each step and its version bump as one transaction, with
+            # foreign keys off so tables can be rebuilt (the pragma is a no-op
+            # inside a transaction). PRAGMA does not accept bound parameters.
+            self.cursor.executescript(
+                f"PRAGMA foreign_keys = OFF;\nBEGIN;\n{script}\nPRAGMA user_version = {int(version)};\nCOMMIT;"
+            )
+            current_version = version
+        self.cursor.execute(f"PRAGMA foreign_keys = {'ON' if ConnectionProvider.ENFORCE_FOREIGN_KEYS else 'OFF'}")
+        return current_version
+
+    def rebuild_account_period_balances(self) -> None:
+        """Recompute account_period_balances from the transactions table."""
+        self.cursor.executescript(f"BEGIN;\n{self.rebuild_account_period_balances_sql}\nCOMMIT;")
+
 def create_database():
     """Factory function to create and initialize the database"""
     with DatabaseManager() as db:
@@ -1,8 +1,6 @@
 # fixed_assets/import_fixed_asset.py
 
 import sqlite3
-import json
-import os
 from PySide6.QtWidgets import (QWidget, QVBoxLayout, QLabel, QLineEdit, QPushButton,
                                QMessageBox, QHBoxLayout, QDialog, QComboBox)
 from PySide6.QtCore import QDate
@@ -10,8 +8,11 @@ from create_database import DatabaseManager
 from utils.crud.date_select import DateSelectWindow
 from utils.crud.search_dialog import AdvancedSearchDialog
 from utils.formatters import format_table_name, normalize_text
-from utils.depreciation_methods import calculate_depreciation
-from datetime import datetime, date, timedelta
+from utils.depreciation_methods import period_of
+from utils.money import Money
+from ledger import ASSET_SOURCE, LedgerError, asset_schedule, post_transaction, schedule_depreciation
+from ledger.settings import app_settings
+from datetime import datetime
 
 class ImportFixedAssetWindow(QWidget):
     def __init__(self, main_window):
@@ -125,7 +126,7 @@ class ImportFixedAssetWindow(QWidget):
             selected = search_dialog.get_selected_item()
             if selected:
                 # --- CRITICAL: Check Account Balance ---
-                if float(selected['balance']) != 0.0:
+                if Money.parse(selected['balance']):
                     QMessageBox.warning(self, "Error", "This account has a non-zero balance and cannot be imported as a fixed asset.")
                     return
 
@@ -290,47 +291,24 @@ class ImportFixedAssetWindow(QWidget):
                 )
                 asset_id = db.cursor.lastrowid
 
-                # --- Calculate Accumulated Depreciation up to Period Start ---
-                accumulated_depreciation = 0.0
-                current_book_value = original_cost
+                db.cursor.execute("SELECT * FROM fixed_assets WHERE asset_id = ?", (asset_id,))
+                asset = db.cursor.fetchone()
 
-                # Calculate number of FULL months from purchase to period start
-                months_to_depreciate = (period_start_date.year - purchase_date.year) * 12 + (period_start_date.month - purchase_date.month)
+                # --- Accumulated Depreciation up to Period Start ---
+                # Number of FULL months from purchase to period start
+                months_to_depreciate = period_of(purchase_date, period_start_date) - 1
                 if months_to_depreciate < 0:
                     QMessageBox.warning(self,"Error", "The period can't be prior to the purchase date")
+                    db.conn.rollback()
                     return
-                # Calculate depreciation for each full month
-                #print(f"months {months_to_depreciate}") #for debugging
-                for month in range(months_to_depreciate):
-
-                    depreciation_for_month, error = calculate_depreciation(
-                        depreciation_method,
-                        original_cost,
-                        salvage_value,
-                        life=useful_life_years,
-                        rate=depreciation_rate,
-                        total_units=total_estimated_units,
-                        current_book_value = current_book_value,
-                        period = month + 1
-                    )
-                    if error:
-                        QMessageBox.critical(self, "Depreciation Calculation Error", error)
-                        db.conn.rollback()
-                        return
-                    if depreciation_method != "Units of Production":
-                         depreciation_for_month = depreciation_for_month / 12
-                    #print(f"dep month {depreciation_for_month}") # For debugging
-
-                    accumulated_depreciation += depreciation_for_month
-                    current_book_value -= depreciation_for_month  # Update book value
-
-                    if current_book_value <= salvage_value:
-                        current_book_value = salvage_value
-                        depreciation_for_month = 0
-                        break  # Stop depreciating once salvage value is reached
-
-                # Ensure book value doesn't go below salvage
-                current_book_value = max(current_book_value, salvage_value)
+                try:
+                    schedule = asset_schedule(asset)
+                except LedgerError as e:
+                    QMessageBox.critical(self, "Depreciation Calculation Error", str(e))
+                    db.conn.rollback()
+                    return
+                accumulated_depreciation = schedule.accumulated(months_to_depreciate)
+                current_book_value = schedule.book_value(months_to_depreciate)
 
 
                 # --- Insert into depreciation_schedule ---
@@ -350,28 +328,20 @@ class ImportFixedAssetWindow(QWidget):
 
 
                 # --- Create Initial Transaction ---
-                settings_file = os.path.join("data", "owner_equity_account.json")
-                if not os.path.exists(settings_file):
-                    QMessageBox.critical(self, "Error", "Owner's Equity account not set.  Please configure it in Fixed Asset Settings.")
-                    db.conn.rollback()  # Rollback changes!
-                    return
-                with open(settings_file, "r") as f:
-                    settings = json.load(f)
-                equity_account_id = settings.get("owner_equity_account_id")
-                if not equity_account_id:
-                    QMessageBox.critical(self, "Error", "Owner's Equity account not set in Fixed Asset Settings.")
+                try:
+                    equity_account_id = app_settings.account('owner_equity_account_id', db.cursor)
+                except LedgerError as e:
+                    QMessageBox.critical(self, "Error", str(e))
                     db.conn.rollback()  # Rollback changes!
                     return
 
 
-                db.cursor.execute(
-                    """
-                    INSERT INTO transactions (date, description, debited, credited, amount)
-                    VALUES (?, ?, ?, ?, ?)
-                    """,
-                    (period_start_date_str, f"{asset_name} - Imported", account_id, equity_account_id, current_book_value) # use current book
+                # Post at the current book value; updates both account balances
+                transaction_id = post_transaction(
+                    db.cursor, period_start_date_str, f"{asset_name} - Imported",
+                    account_id, equity_account_id, current_book_value,
+                    source_type='FIXED_ASSET', source_ref=ASSET_SOURCE, source_id=asset_id
                 )
-                transaction_id = db.cursor.lastrowid
 
                 # --- update transaction id ---
                 db.cursor.execute(
@@ -380,111 +350,17 @@ class ImportFixedAssetWindow(QWidget):
                 )
 
 
-                # --- Update Account Balances ---
-                db.cursor.execute("UPDATE accounts SET balance = balance + ? WHERE id = ?", (current_book_value, account_id))
-                db.cursor.execute("UPDATE accounts SET balance = balance - ? WHERE id = ?", (current_book_value, equity_account_id))
-
                 # --- Schedule Future Depreciation ---
                 # Load depreciation expense account ID from settings
-                depreciation_settings_file = os.path.join("data", "depreciation_account.json")
-                if not os.path.exists(depreciation_settings_file):
-                    QMessageBox.critical(self, "Error", "Depreciation account not set. Please configure in settings")
+                try:
+                    depreciation_account_id = app_settings.account('depreciation_account_id', db.cursor)
+                except LedgerError as e:
+                    QMessageBox.critical(self, "Error", str(e))
                     db.conn.rollback()
                     return
-                with open(depreciation_settings_file, "r") as f:
-                    dep_settings = json.load(f)
-
-                depreciation_account_id = dep_settings.get("depreciation_account_id")
-
-                if not depreciation_account_id:
-                    QMessageBox.critical(self, "Error", "Depreciation account not set in settings.")
-                    db.conn.rollback()
-                    return
-                current_date = period_start_date
-                if current_date.month == 12: # adds one to period
-                    current_date = date(current_date.year + 1, 1, 1)
-                else:
-                    current_date = date(current_date.year, current_date.month + 1, 1)
-                period = months_to_depreciate + 1 # the months it has passed + the start of period
-
-                # --- MODIFIED LOOP ---
-                while True:  # Loop indefinitely, but with multiple exit conditions
-                    if useful_life_years is not None and period > useful_life_years * 12:
-                        break  # Stop if we've exceeded the useful life in months
-
-                    if current_book_value <= salvage_value:
-                        break # stops calculating if current value is less or equal to salvage
-
-                    # Calculate depreciation for the period
-                    depreciation_amount, error = calculate_depreciation(
-                        method=depreciation_method,
-                        cost=original_cost,
-                        salvage_value=salvage_value,
-                        life=useful_life_years,
-                        rate=depreciation_rate,
-                        total_units=total_estimated_units,
-                        current_book_value = current_book_value,
-                        period = period #send the period to calculation
-                    )
-                    if error:
-                      QMessageBox.warning(self,"Depreciation Calculation Error", error)
-                      db.conn.rollback()
-                      return
-                    if depreciation_method != "Units of Production":
-                         depreciation_amount = depreciation_amount / 12
-
-                    current_book_value -= depreciation_amount  # Update book value
-                    current_book_value = max(current_book_value, salvage_value) # to avoid going less than salvage
-
-                    accumulated_depreciation += depreciation_amount
-
-
-                    # Get period end date (last day of the current month)
-                    if current_date.month == 12:
-                        period_end_date = date(current_date.year, 12, 31)
-                    else:
-                        period_end_date = date(current_date.year, current_date.month + 1, 1) - timedelta(days=1)
-
-
-                    # Insert into depreciation_schedule
-                    db.cursor.execute(
-                        """
-                        INSERT INTO depreciation_schedule (
-                            asset_id, period_start_date, period_end_date,
-                            depreciation_expense, accumulated_depreciation, book_value
-                        )
-                        VALUES (?, ?, ?, ?, ?, ?)
-                        """,
-                        (asset_id, current_date.strftime('%Y-%m-%d'), period_end_date.strftime('%Y-%m-%d'),
-                         depreciation_amount, accumulated_depreciation, current_book_value)
-                    )
-                    schedule_id = db.cursor.lastrowid
-
-                    # Insert into future_transactions
-                    db.cursor.execute(
-                        """
-                        INSERT INTO future_transactions (date, description, debited, credited, amount)
-                        VALUES (?, ?, ?, ?, ?)
-                        """,
-                        (current_date.strftime('%Y-%m-%d'), f"Depreciation - {asset_name}",
-                         depreciation_account_id, account_id, depreciation_amount)
-                    )
-                    transaction_id = db.cursor.lastrowid
-
-                    # --- update transaction id ---
-                    db.cursor.execute(
-                    "UPDATE depreciation_schedule SET transaction_id = ? WHERE schedule_id = ?",
-                    (transaction_id, schedule_id)
-                    )
-
-                    # Move to the next month
-                    if current_date.month == 12:
-                        current_date = date(current_date.year + 1, 1, 1)
-                    else:
-                        current_date = date(current_date.year, current_date.month + 1, 1)
-
-                    period += 1 # adds one to period.
-
+                # From the period start month to the end of the asset's schedule
+                schedule_depreciation(db.cursor, asset, months_to_depreciate + 1,
+                                      depreciation_account_id=depreciation_account_id)
 
                 db.commit()
                 QMessageBox.information(self, "Success", "Fixed asset imported and depreciation scheduled successfully!")
@@ -0,0 +1,120 @@
+# fixed_assets/month_end_core.py
+"""
+Headless month-end depreciation: continue every active fixed asset's
+depreciation schedule from its last depreciation_schedule row through a
+calculation date, committing every few dozen assets. Each chunk's schedules
+are computed together by the portfolio engine (ledger.depreciation).
+
+Run it without the GUI with:
+
+    python -m fixed_assets.month_end_core --date 2025-06-30
+"""
+import argparse
+import sqlite3
+import time
+from datetime import date
+from create_database import DatabaseManager
+from ledger import LedgerError
+from ledger.depreciation import compute_portfolio, plan_portfolio
+from ledger.scheduling import depreciation_account, write_depreciation_rows
+
+CHUNK_SIZE = 50  # Assets scheduled (and committed) together
+
+
+def run_month_end_depreciation(calculation_date, chunk_size=CHUNK_SIZE, progress=None, cancelled=None,
+                               db_name='financial_system.db'):
+    """
+    Schedules depreciation through calculation_date for every fixed asset not
+    disposed of by then.
+
+    Each asset is written under its own savepoint, so a failing asset is
+    rolled back alone and reported; chunks of chunk_size assets are
+    committed together. progress(done, total, summary) is called after each
+    chunk and cancelled() is checked between chunks. Running the job again
+    continues where a cancelled or failed run stopped.
+
+    Returns a summary dict: assets (active assets), scheduled (assets that
+    got rows), periods, up_to_date, failed, cancelled, elapsed seconds and
+    results, one {'asset_id', 'asset_name', 'periods', 'seconds', 'error'}
+    per asset that was processed or could not be planned. Raises LedgerError
+    when the depreciation account is not configured.
+    """
+    started = time.perf_counter()
+    summary = {'assets': 0, 'scheduled': 0, 'periods': 0, 'up_to_date': 0, 'failed': 0,
+               'cancelled': False, 'elapsed': 0.0, 'results': []}
+
+    with DatabaseManager(db_name) as db:
+        depreciation_account_id = depreciation_account(db.cursor)
+        runs, errors = plan_portfolio(db.cursor, calculation_date, active_only=True)
+        db.cursor.execute(
+            "SELECT COUNT(*) FROM fixed_assets WHERE disposal_date IS NULL OR disposal_date = '' OR disposal_date > ?",
+            (calculation_date.strftime('%Y-%m-%d'),))
+        summary['assets'] = db.cursor.fetchone()[0]
+        summary['up_to_date'] = summary['assets'] - len(runs) - len(errors)
+
+        if errors:
+            db.cursor.execute(f"SELECT asset_id, asset_name FROM fixed_assets WHERE asset_id IN "
+                              f"({', '.join('?' * len(errors))})", list(errors))
+            names = {row['asset_id']: row['asset_name'] for row in db.cursor.fetchall()}
+            for asset_id, error in errors.items():
+                summary['results'].append({'asset_id': asset_id, 'asset_name': names.get(asset_id, ''),
+                                           'periods': 0, 'seconds': 0.0, 'error': error})
+            summary['failed'] += len(errors)
+
+        for chunk_start in range(0, len(runs), chunk_size):
+            if cancelled and cancelled():
+                summary['cancelled'] = True
+                break
+            if not db.conn.in_transaction:
+                db.cursor.execute("BEGIN")  # Keeps the savepoints below inside the chunk's transaction
+            chunk = runs[chunk_start:chunk_start + chunk_size]
+            for run, computed in zip(chunk, compute_portfolio(chunk)):
+                summary['results'].append(
+                    _schedule_asset(db.cursor, run, computed, depreciation_account_id, summary))
+            db.commit()
+            if progress:
+                progress(min(chunk_start + chunk_size, len(runs)), len(runs), summary)
+
+    summary['elapsed'] = time.perf_counter() - started
+    return summary
+
+
+def _schedule_asset(cursor, run, computed, depreciation_account_id, summary):
+    """Writes one asset's computed (rows, accumulated before them) under a savepoint."""
+    asset = run.asset
+    result = {'asset_id': asset['asset_id'], 'asset_name': asset['asset_name'], 'periods': 0,
+              'seconds': 0.0, 'error': None}
+    started = time.perf_counter()
+    cursor.execute("SAVEPOINT month_end_asset")
+    try:
+        rows, previous = computed
+        result['periods'] = write_depreciation_rows(cursor, [(asset, rows, previous)], depreciation_account_id)
+        cursor.execute("RELEASE month_end_asset")
+        summary['scheduled'] += 1
+        summary['periods'] += result['periods']
+    except (LedgerError, sqlite3.Error) as e:
+        cursor.execute("ROLLBACK TO month_end_asset")
+        cursor.execute("RELEASE month_end_asset")
+        result['error'] = str(e)
+        summary['failed'] += 1
+    result['seconds'] = time.perf_counter() - started
+    return result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Schedule month-end depreciation for every active fixed asset.")
+    parser.add_argument("--date", type=date.fromisoformat, default=date.today(),
+                        help="Calculation date, YYYY-MM-DD (default: today)")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="Assets committed together")
+    parser.add_argument("--db", default='financial_system.db', help="Database file in data/")
+    args = parser.parse_args()
+
+    result = run_month_end_depreciation(
+        args.date, args.chunk_size, db_name=args.db,
+        progress=lambda done, total, _: print(f"{done}/{total} assets"))
+    for item in result['results']:
+        outcome = f"error: {item['error']}" if item['error'] else f"{item['periods']} periods"
+        print(f"{item['asset_id']:>6}  {item['asset_name'][:40]:<40}  {item['seconds'] * 1000:8.2f} ms  {outcome}")
+    print(f"{result['scheduled']} assets scheduled ({result['periods']} periods), "
+          f"{result['up_to_date']} already up to date, {result['failed']} failed "
+          f"of {result['assets']} active assets in {result['elapsed']:.2f}s")
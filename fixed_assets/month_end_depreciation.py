@@ -0,0 +1,148 @@
+# fixed_assets/month_end_depreciation.py
+
+import threading
+from PySide6.QtWidgets import (QWidget, QVBoxLayout, QLabel, QPushButton, QMessageBox, QHBoxLayout,
+                               QDateEdit, QProgressBar, QTableWidget, QTableWidgetItem, QHeaderView)
+from PySide6.QtCore import QObject, Signal, Slot, QDate
+from ledger import LedgerError
+from fixed_assets.month_end_core import run_month_end_depreciation
+
+
+class MonthEndSignals(QObject):
+    """Signals for the background month-end depreciation run."""
+    progress = Signal(int, str)
+    finished = Signal(dict)
+    error = Signal(str)
+
+
+class MonthEndDepreciationWindow(QWidget):
+    """
+    Brings the depreciation schedule of every active fixed asset up to a date.
+
+    The run happens on a worker thread and commits every few dozen assets; an
+    asset that fails is skipped and listed with the others' timings.
+    """
+
+    def __init__(self, main_window):
+        super().__init__()
+        self.main_window = main_window
+        self.setWindowTitle("Run Month-End Depreciation")
+        self.cancel_requested = threading.Event()
+        self.signals = MonthEndSignals()
+        self.signals.progress.connect(self._on_progress)
+        self.signals.finished.connect(self._on_finished)
+        self.signals.error.connect(self._on_error)
+        self.init_ui()
+
+    def init_ui(self):
+        layout = QVBoxLayout(self)
+
+        # --- Calculation Date ---
+        date_layout = QHBoxLayout()
+        date_layout.addWidget(QLabel("Depreciate Up To:"))
+        self.calculation_date_edit = QDateEdit(QDate.currentDate())
+        self.calculation_date_edit.setCalendarPopup(True)
+        self.calculation_date_edit.setDisplayFormat("yyyy-MM-dd")
+        date_layout.addWidget(self.calculation_date_edit)
+        layout.addLayout(date_layout)
+
+        # --- Progress ---
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setRange(0, 100)
+        layout.addWidget(self.progress_bar)
+        self.status_label = QLabel("Schedules depreciation for every asset not yet disposed of.")
+        layout.addWidget(self.status_label)
+
+        # --- Per-asset Results ---
+        self.results_table = QTableWidget(0, 4)
+        self.results_table.setHorizontalHeaderLabels(["Asset", "Periods", "Time (ms)", "Result"])
+        self.results_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.results_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        layout.addWidget(self.results_table)
+
+        button_layout = QHBoxLayout()
+        self.run_button = QPushButton("Run")
+        self.run_button.clicked.connect(self.start_run)
+        self.cancel_button = QPushButton("Cancel")
+        self.cancel_button.setEnabled(False)
+        self.cancel_button.clicked.connect(self.cancel_run)
+        button_layout.addWidget(self.run_button)
+        button_layout.addWidget(self.cancel_button)
+        layout.addLayout(button_layout)
+
+        self.setLayout(layout)
+        self.resize(640, 420)
+
+    def start_run(self):
+        calculation_date = self.calculation_date_edit.date().toPython()
+        self.cancel_requested.clear()
+        self.run_button.setEnabled(False)
+        self.cancel_button.setEnabled(True)
+        self.progress_bar.setValue(0)
+        self.results_table.setRowCount(0)
+        self.status_label.setText("Scheduling depreciation...")
+        thread = threading.Thread(target=self._run_worker, args=(calculation_date,))
+        thread.start()  # Not a daemon: let the chunk in progress commit before exit
+
+    def cancel_run(self):
+        self.cancel_requested.set()
+        self.cancel_button.setEnabled(False)
+        self.status_label.setText("Cancelling after the current chunk...")
+
+    # --- Worker thread ---
+    def _run_worker(self, calculation_date):
+        def report(done, total, summary):
+            percent = int(done * 100 / total) if total else 100
+            self.signals.progress.emit(percent, f"{done:,} of {total:,} assets, {summary['periods']:,} periods "
+                                                f"scheduled, {summary['failed']:,} failed")
+        try:
+            summary = run_month_end_depreciation(calculation_date, progress=report,
+                                                 cancelled=self.cancel_requested.is_set)
+            self.signals.finished.emit(summary)
+        except LedgerError as e:
+            self.signals.error.emit(str(e))
+        except Exception as e:
+            self.signals.error.emit(f"Month-end depreciation failed: {e}\n\nAssets committed before the error "
+                                    f"were kept; running it again continues from there.")
+
+    # --- GUI thread handlers ---
+    @Slot(int, str)
+    def _on_progress(self, percent, message):
+        self.progress_bar.setValue(percent)
+        self.status_label.setText(message)
+
+    @Slot(dict)
+    def _on_finished(self, summary):
+        self.run_button.setEnabled(True)
+        self.cancel_button.setEnabled(False)
+        if not summary['cancelled']:
+            self.progress_bar.setValue(100)
+
+        # Failures first, then the slowest assets
+        results = sorted(summary['results'], key=lambda r: (r['error'] is None, -r['seconds']))
+        self.results_table.setRowCount(len(results))
+        for row, result in enumerate(results):
+            self.results_table.setItem(row, 0, QTableWidgetItem(f"{result['asset_name']} (ID: {result['asset_id']})"))
+            self.results_table.setItem(row, 1, QTableWidgetItem(str(result['periods'])))
+            self.results_table.setItem(row, 2, QTableWidgetItem(f"{result['seconds'] * 1000:.2f}"))
+            self.results_table.setItem(row, 3, QTableWidgetItem(result['error'] or "Scheduled"))
+
+        message = (f"Active assets: {summary['assets']:,}\n"
+                   f"Scheduled: {summary['scheduled']:,} ({summary['periods']:,} periods)\n"
+                   f"Already up to date: {summary['up_to_date']:,}\n"
+                   f"Failed: {summary['failed']:,}\n"
+                   f"Time: {summary['elapsed']:.2f}s")
+        self.status_label.setText("Run cancelled." if summary['cancelled'] else "Month-end depreciation complete.")
+        if summary['failed']:
+            QMessageBox.warning(self, "Depreciation Scheduled with Errors", message)
+        else:
+            QMessageBox.information(self, "Run Cancelled" if summary['cancelled'] else "Depreciation Scheduled",
+                                    message)
+
+    @Slot(str)
+    def _on_error(self, message):
+        self.run_button.setEnabled(True)
+        self.cancel_button.setEnabled(False)
+        self.status_label.setText("Month-end depreciation failed.")
+        print(message)
+        QMessageBox.critical(self, "Depreciation Error", message)
@@ -1,8 +1,6 @@
 # fixed_assets/multiple_account_purchase.py
 
 import sqlite3
-import json
-import os
 from PySide6.QtWidgets import (QWidget, QVBoxLayout, QLabel, QLineEdit, QPushButton,
                                QMessageBox, QHBoxLayout, QDialog, QComboBox,
                                QTableWidget, QTableWidgetItem, QAbstractItemView, QDialogButtonBox)
@@ -11,8 +9,9 @@ from create_database import DatabaseManager
 from utils.crud.date_select import DateSelectWindow
 from utils.crud.search_dialog import AdvancedSearchDialog
 from utils.formatters import format_table_name, normalize_text
-from utils.depreciation_methods import calculate_depreciation
-from datetime import datetime, date, timedelta #for date handling
+from utils.money import Money
+from ledger import ASSET_SOURCE, LedgerError, post_entries, schedule_asset_depreciation
+from ledger.settings import app_settings
 
 
 class MultipleAccountPurchaseWindow(QWidget):
@@ -213,7 +212,7 @@ class MultipleAccountPurchaseWindow(QWidget):
             return
 
         try:
-            amount = float(amount_text)
+            amount = Money.parse(amount_text)
             if amount <= 0:
                 raise ValueError("Amount must be positive.")
         except ValueError:
@@ -279,7 +278,7 @@ class MultipleAccountPurchaseWindow(QWidget):
     def update_amount_and_table(self, transaction, new_amount, row, dialog):
         """Updates the transaction data and the table with the new amount."""
         try:
-            amount = float(new_amount)
+            amount = Money.parse(new_amount)
             if amount <= 0:
                 raise ValueError("Amount must be positive.")
             transaction['amount'] = amount
@@ -320,7 +319,6 @@ class MultipleAccountPurchaseWindow(QWidget):
         asset_name = self.name_input.text().strip()
         asset_code = self.code_input.text().strip()
         purchase_date_str = self.date_input.text()
-        purchase_date = datetime.strptime(purchase_date_str, '%Y-%m-%d').date()
         depreciation_method = self.method_combo.currentText()
 
         useful_life_years = None
@@ -359,7 +357,7 @@ class MultipleAccountPurchaseWindow(QWidget):
 
         # --- Total Amount Check ---
         total_payment = sum(account_data['amount'] for account_data in self.accounts_data)
-        if total_payment != original_cost:
+        if total_payment != Money.parse(self.cost_input.text()):
             QMessageBox.warning(self, "Error", "The sum of payment account amounts must equal the original cost.")
             return
 
@@ -399,123 +397,34 @@ class MultipleAccountPurchaseWindow(QWidget):
                 )
                 asset_id = db.cursor.lastrowid
 
-                # --- Create Transactions (one for each payment account) ---
-                for account_data in self.accounts_data:
-                    payment_account_id = account_data['account']['id']
-                    payment_amount = account_data['amount']
-                    description = f"{asset_name} - Purchase ({account_data['account']['name']})"
-
-                    db.cursor.execute(
-                        """
-                        INSERT INTO transactions (date, description, debited, credited, amount)
-                        VALUES (?, ?, ?, ?, ?)
-                        """,
-                        (purchase_date_str, description, account_id, payment_account_id, payment_amount)
-                    )
-
-                    # --- Update Account Balances ---
-                    db.cursor.execute("UPDATE accounts SET balance = balance + ? WHERE id = ?", (payment_amount, account_id))
-                    db.cursor.execute("UPDATE accounts SET balance = balance - ? WHERE id = ?", (payment_amount, payment_account_id))
+                # --- Create Transactions (one for each payment account), posted as one batch ---
+                post_entries(db.cursor, [
+                    {
+                        'description': f"{asset_name} - Purchase ({account_data['account']['name']})",
+                        'debited': account_id,
+                        'credited': account_data['account']['id'],
+                        'amount': account_data['amount'],
+                    }
+                    for account_data in self.accounts_data
+                ], date=purchase_date_str, source_type='FIXED_ASSET', source_ref=ASSET_SOURCE, source_id=asset_id)
 
                  # --- Schedule Future Depreciation ---
                 # Load depreciation expense account ID from settings
-                depreciation_settings_file = os.path.join("data", "depreciation_account.json")
-                if not os.path.exists(depreciation_settings_file):
-                    QMessageBox.critical(self, "Error", "Depreciation account not set. Please configure in settings")
+                try:
+                    depreciation_account_id = app_settings.account('depreciation_account_id', db.cursor)
+                except LedgerError as e:
+                    QMessageBox.critical(self, "Error", str(e))
                     db.conn.rollback()
                     return
-                with open(depreciation_settings_file, "r") as f:
-                    dep_settings = json.load(f)
-
-                depreciation_account_id = dep_settings.get("depreciation_account_id")
 
-                if not depreciation_account_id:
-                    QMessageBox.critical(self, "Error", "Depreciation account not set in settings.")
+                # Monthly rows and future transactions for the asset's whole life
+                try:
+                    schedule_asset_depreciation(db.cursor, asset_id, depreciation_account_id=depreciation_account_id)
+                except LedgerError as e:
+                    QMessageBox.warning(self, "Depreciation Calculation Error", str(e))
                     db.conn.rollback()
                     return
 
-                current_date = purchase_date # start from purchase date
-                current_book_value = original_cost
-                accumulated_depreciation = 0
-                period = 1
-
-                while True:  # Loop indefinitely, with explicit exit conditions
-                    # Calculate depreciation for the period
-                    depreciation_amount, error = calculate_depreciation(
-                        method=depreciation_method,
-                        cost=original_cost,
-                        salvage_value=salvage_value,
-                        life=useful_life_years,
-                        rate=depreciation_rate,
-                        total_units=total_estimated_units,
-                        current_book_value = current_book_value,
-                        period = period #send the period to calculation
-                    )
-                    if error:
-                      QMessageBox.warning(self,"Depreciation Calculation Error", error)
-                      db.conn.rollback()
-                      return
-                    if depreciation_method != "Units of Production":
-                         depreciation_amount = depreciation_amount / 12
-
-                    current_book_value -= depreciation_amount  # Update book value
-                    current_book_value = max(current_book_value, salvage_value)
-                    accumulated_depreciation += depreciation_amount
-
-                    # Get period end date (last day of the current month)
-                    if current_date.month == 12:
-                        period_end_date = date(current_date.year, 12, 31)
-                    else:
-                        period_end_date = date(current_date.year, current_date.month + 1, 1) - timedelta(days=1)
-
-
-                    # Insert into depreciation_schedule
-                    db.cursor.execute(
-                        """
-                        INSERT INTO depreciation_schedule (
-                            asset_id, period_start_date, period_end_date,
-                            depreciation_expense, accumulated_depreciation, book_value
-                        )
-                        VALUES (?, ?, ?, ?, ?, ?)
-                        """,
-                        (asset_id, current_date.strftime('%Y-%m-%d'), period_end_date.strftime('%Y-%m-%d'),
-                         depreciation_amount, accumulated_depreciation, current_book_value)
-                    )
-                    schedule_id = db.cursor.lastrowid
-
-                    # Insert into future_transactions
-                    db.cursor.execute(
-                        """
-                        INSERT INTO future_transactions (date, description, debited, credited, amount)
-                        VALUES (?, ?, ?, ?, ?)
-                        """,
-                        (current_date.strftime('%Y-%m-%d'), f"Depreciation - {asset_name}",
-                         depreciation_account_id, account_id, depreciation_amount)
-                    )
-                    transaction_id = db.cursor.lastrowid
-
-                    # --- update transaction id ---
-                    db.cursor.execute(
-                    "UPDATE depreciation_schedule SET transaction_id = ? WHERE schedule_id = ?",
-                    (transaction_id, schedule_id)
-                    )
-
-                   # ---  Move to the *next* month ---  THIS IS THE KEY FIX
-                    if current_date.month == 12:
-                        next_month = 1
-                        next_year = current_date.year + 1
-                    else:
-                        next_month = current_date.month + 1
-                        next_year = current_date.year
-                    current_date = date(next_year, next_month, purchase_date.day) # using purchase date
-
-
-                    period += 1
-                    if current_book_value == salvage_value: # stops calculating depreciation
-                      break
-                    if useful_life_years is not None and period > useful_life_years * 12:
-                        break  # Stop if we exceed the useful life in months
-
                 db.commit()
                 QMessageBox.information(self, "Success", "Fixed asset purchased and registered successfully!")
                 self.close()
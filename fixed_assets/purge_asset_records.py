@@ -5,6 +5,8 @@ from PySide6.QtWidgets import (QWidget, QVBoxLayout, QLabel, QPushButton,
                                QMessageBox, QDialog)
 from create_database import DatabaseManager
 from utils.crud.search_dialog import AdvancedSearchDialog
+from utils.money import Money
+from ledger import ASSET_SOURCE, reverse_linked_transactions, delete_linked_future_transactions
 
 class PurgeAssetRecordsWindow(QWidget):
     def __init__(self, main_window):
@@ -66,32 +68,11 @@ class PurgeAssetRecordsWindow(QWidget):
 
         try:
             with self.db_manager as db:
-                # --- 1. Find and Reverse Transactions in 'transactions' table---
-                db.cursor.execute("SELECT id, debited, credited, amount FROM transactions WHERE description LIKE ?",
-                                   (f"%{self.selected_asset['asset_name']}%",))
-                transactions = db.cursor.fetchall()
-                for trans in transactions:
-                    # Reverse the transaction's effect on account balances
-                    db.cursor.execute(
-                        "UPDATE accounts SET balance = balance - ? WHERE id = ?",
-                        (trans['amount'], trans['debited'])
-                    )
-                    db.cursor.execute(
-                        "UPDATE accounts SET balance = balance + ? WHERE id = ?",
-                        (trans['amount'], trans['credited'])
-                    )
-                    # Delete the transaction
-                    db.cursor.execute("DELETE FROM transactions WHERE id = ?", (trans['id'],))
-
-                # --- 2. Find and Delete Future Transactions ---
-                db.cursor.execute("SELECT id, debited, credited, amount FROM future_transactions WHERE description LIKE ?",
-                                   (f"%{self.selected_asset['asset_name']}%",))
-                future_transactions = db.cursor.fetchall()
-
-                for trans in future_transactions:
-
-                    # Delete from 'future_transactions'
-                    db.cursor.execute("DELETE FROM future_transactions WHERE id = ?", (trans['id'],))
+                # --- 1. Reverse the asset's ledger transactions (purchase, import, posted depreciation) ---
+                reverse_linked_transactions(db.cursor, ASSET_SOURCE, asset_id)
+
+                # --- 2. Delete its scheduled depreciation ---
+                delete_linked_future_transactions(db.cursor, ASSET_SOURCE, asset_id)
 
                 # --- 3. Delete from depreciation_schedule ---
                 db.cursor.execute("DELETE FROM depreciation_schedule WHERE asset_id = ?", (asset_id,))
@@ -101,14 +82,13 @@ class PurgeAssetRecordsWindow(QWidget):
 
                 # --- 5. Check Account Balance and Delete (if zero) ---
                 db.cursor.execute("SELECT balance FROM accounts WHERE id = ?", (account_id,))
-                account_balance = db.cursor.fetchone()['balance']
+                account_balance = Money.from_db(db.cursor.fetchone()['balance'])
 
-                # Use a tolerance for floating-point comparison
-                tolerance = 1e-9  # A small tolerance value
-                if abs(float(account_balance)) < tolerance:  # Check if *close* to zero
+                # Balances are whole cents, so zero is an exact comparison
+                if not account_balance:
                     db.cursor.execute("DELETE FROM accounts WHERE id = ?", (account_id,))
                 else:
-                    QMessageBox.critical(self, "Error", f"Account balance is not zero ({account_balance}). Cannot delete account.")
+                    QMessageBox.critical(self, "Error", f"Account balance is not zero ({account_balance:,.2f}). Cannot delete account.")
                     db.conn.rollback()
                     return
 
@@ -5,6 +5,7 @@ from PySide6.QtWidgets import (QWidget, QVBoxLayout, QLabel, QPushButton,
                                QMessageBox, QHBoxLayout, QLineEdit, QDialog)
 from utils.crud.search_dialog import AdvancedSearchDialog
 from create_database import DatabaseManager
+from ledger.settings import app_settings
 
 class FixedAssetSettingsWindow(QWidget):
     def __init__(self, main_window):
@@ -124,9 +125,7 @@ class FixedAssetSettingsWindow(QWidget):
             equity_data["owner_equity_account_id"] = self.selected_equity_account['id']
 
         try:
-            os.makedirs(os.path.dirname(self.equity_settings_file), exist_ok=True)
-            with open(self.equity_settings_file, "w") as f:
-                json.dump(equity_data, f, indent=4)
+            app_settings.save(os.path.basename(self.equity_settings_file), equity_data)
             #QMessageBox.information(self, "Success", "Equity settings saved successfully!") #not needed
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to save equity settings: {e}")
@@ -138,9 +137,7 @@ class FixedAssetSettingsWindow(QWidget):
             depreciation_data["depreciation_account_id"] = self.selected_depreciation_account['id']
 
         try:
-            os.makedirs(os.path.dirname(self.depreciation_settings_file), exist_ok=True)
-            with open(self.depreciation_settings_file, "w") as f:
-                json.dump(depreciation_data, f, indent=4)
+            app_settings.save(os.path.basename(self.depreciation_settings_file), depreciation_data)
             QMessageBox.information(self, "Success", "Settings saved successfully!")
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to save depreciation settings: {e}")
\ No newline at end of file
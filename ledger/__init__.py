@@ -0,0 +1,20 @@
+# ledger/__init__.py
+"""
+Headless ledger services: posting, reversing, scheduling and reporting.
+
+Nothing here imports Qt, so these run from scripts, batch jobs and worker
+threads as well as from the widgets. Write functions take a sqlite3 cursor
+(rows as sqlite3.Row, as DatabaseManager provides) and never commit; the
+caller owns the transaction. Rule violations raise LedgerError.
+"""
+from ledger.errors import LedgerError
+from ledger.posting import (apply_balances, post_transaction, post_entries, update_transaction,
+                            reverse_transaction, post_future_transactions,
+                            ASSET_SOURCE, RECURRING_SOURCE, PARTY_SOURCE)
+from ledger.links import (linked_transactions, linked_transaction, reverse_linked_transactions,
+                          delete_linked_future_transactions)
+from ledger.ar_ap import record_party_movement, adjust_party_movement
+from ledger.scheduling import (schedule_future_transaction, due_future_transactions,
+                               schedule_depreciation, schedule_asset_depreciation,
+                               asset_schedule, book_value_on)
+from ledger.depreciation import schedule_portfolio_depreciation
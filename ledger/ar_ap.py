@@ -0,0 +1,120 @@
+# ledger/ar_ap.py
+
+from ledger.errors import LedgerError
+from ledger.links import linked_transaction
+from ledger.posting import PARTY_SOURCE, post_transaction, update_transaction
+from ledger.settings import app_settings
+from utils.money import Money
+
+# debtor_creditor.account flag
+DEBTOR = 1
+CREDITOR = 2
+
+
+def control_account(party_kind, cursor=None):
+    """Accounts Receivable (debtors) or Accounts Payable (creditors) account id from the AR/AP settings."""
+    if party_kind == DEBTOR:
+        return app_settings.account('receivable_account_id', cursor)
+    return app_settings.account('payable_account_id', cursor)
+
+
+def _checked_movement(movement, amount):
+    if movement not in ("Inflow", "Outflow"):
+        raise LedgerError(f"Invalid transaction type: {movement}")
+    amount = Money.parse(amount)
+    if amount <= 0:
+        raise LedgerError("Amount must be positive.")
+    return amount
+
+
+def _party_change(party_kind, movement, amount):
+    """How a movement changes the party's outstanding amount."""
+    grows = (party_kind == DEBTOR) == (movement == "Outflow")
+    return amount if grows else -amount
+
+
+def record_party_movement(cursor, party_id, movement, date, details, amount, asset_id):
+    """
+    Records an AR/AP movement and its ledger posting. Does not commit.
+
+    movement is "Inflow" (the asset account is debited) or "Outflow" (the asset
+    account is credited); the other side is the party's control account. A
+    debtor's outstanding amount grows with outflows and a creditor's with
+    inflows; the opposite movement settles it.
+
+    The movement and its posting are linked both ways: the posting's
+    source_id is the movement and the movement's transaction_id the posting.
+
+    Returns the id of the ledger transaction.
+    """
+    amount = _checked_movement(movement, amount)
+
+    cursor.execute("SELECT account FROM debtor_creditor WHERE id = ?", (party_id,))
+    party = cursor.fetchone()
+    if not party:
+        raise LedgerError(f"Debtor/creditor ID {party_id} not found.")
+    party_kind = int(party['account'])
+    control_account_id = control_account(party_kind, cursor)
+
+    party_change = _party_change(party_kind, movement, amount)
+
+    cursor.execute(
+        """
+        INSERT INTO debtor_creditor_transactions (date, details, amount, debtor_creditor, type)
+        VALUES (?, ?, ?, ?, ?)
+        """,
+        (date, details, amount, party_id, movement)
+    )
+    movement_id = cursor.lastrowid
+    cursor.execute(
+        "UPDATE debtor_creditor SET amount = amount + ? WHERE id = ?",
+        (party_change, party_id)
+    )
+
+    if movement == "Inflow":
+        debited, credited = asset_id, control_account_id
+    else:
+        debited, credited = control_account_id, asset_id
+    transaction_id = post_transaction(cursor, date, details, debited, credited, amount, source_type='DEBTOR_CREDITOR',
+                                      source_ref=PARTY_SOURCE, source_id=movement_id)
+    cursor.execute("UPDATE debtor_creditor_transactions SET transaction_id = ? WHERE id = ?",
+                   (transaction_id, movement_id))
+    return transaction_id
+
+
+def adjust_party_movement(cursor, movement_id, details, amount):
+    """
+    Changes an AR/AP movement's details and amount, moving the difference
+    through the party's outstanding amount and the linked ledger posting
+    (whose accounts and date are kept). Everything is validated before the
+    first write. Does not commit.
+
+    Returns the id of the ledger transaction.
+    """
+    cursor.execute(
+        """
+        SELECT m.type, m.amount, m.debtor_creditor, p.account
+        FROM debtor_creditor_transactions m
+        JOIN debtor_creditor p ON p.id = m.debtor_creditor
+        WHERE m.id = ?
+        """,
+        (movement_id,)
+    )
+    original = cursor.fetchone()
+    if not original:
+        raise LedgerError(f"AR/AP movement ID {movement_id} not found.")
+    amount = _checked_movement(original['type'], amount)
+    transaction = linked_transaction(cursor, PARTY_SOURCE, movement_id)
+    difference = amount - Money.from_db(original['amount'])
+
+    cursor.execute(
+        "UPDATE debtor_creditor_transactions SET details = ?, amount = ? WHERE id = ?",
+        (details, amount, movement_id)
+    )
+    cursor.execute(
+        "UPDATE debtor_creditor SET amount = amount + ? WHERE id = ?",
+        (_party_change(int(original['account']), original['type'], difference), original['debtor_creditor'])
+    )
+    update_transaction(cursor, transaction['id'], transaction['date'], details,
+                       transaction['debited'], transaction['credited'], amount)
+    return transaction['id']
@@ -0,0 +1,148 @@
+# ledger/depreciation.py
+"""
+Whole-portfolio depreciation.
+
+schedule_portfolio_depreciation() brings the depreciation schedule of every
+asset up to a calculation date in one pass. Each asset's DepreciationSchedule
+is in closed form, so the accumulated depreciation of every asset and month
+is evaluated as one matrix (one row per asset, one column per month) and the
+rows are written with executemany.
+
+NumPy is optional: without it the same values come from each schedule's
+rows().
+"""
+from collections import namedtuple
+from datetime import datetime
+from ledger.scheduling import depreciation_account, write_depreciation_rows
+from utils.depreciation_methods import DepreciationSchedule, period_of
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# One asset's run: periods first..last of its schedule
+AssetRun = namedtuple('AssetRun', 'asset schedule first last')
+
+
+# --- Planning ---
+def plan_portfolio(cursor, calculation_date, asset_ids=None, active_only=False):
+    """
+    Loads the assets (all, or asset_ids; with active_only, not those disposed
+    of by calculation_date) and returns (runs, errors): an AssetRun for each
+    asset with periods left to schedule up to calculation_date, and
+    {asset_id: error code} for assets that cannot be depreciated.
+    """
+    conditions, params = [], []
+    if asset_ids is not None:
+        asset_ids = list(asset_ids)
+        conditions.append(f"asset_id IN ({', '.join('?' * len(asset_ids))})")
+        params.extend(asset_ids)
+    if active_only:
+        conditions.append("(disposal_date IS NULL OR disposal_date = '' OR disposal_date > ?)")
+        params.append(calculation_date.strftime('%Y-%m-%d'))
+    where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+    cursor.execute(f"SELECT * FROM fixed_assets{where} ORDER BY asset_id", params)
+    assets = cursor.fetchall()
+
+    # Last scheduled period of every asset in one scan
+    cursor.execute("SELECT asset_id, MAX(period_end_date) FROM depreciation_schedule GROUP BY asset_id")
+    last_ends = {row[0]: row[1] for row in cursor.fetchall()}
+
+    runs, errors = [], {}
+    for asset in assets:
+        try:
+            schedule = DepreciationSchedule.for_asset(asset)
+        except ValueError as e:
+            errors[asset['asset_id']] = str(e)
+            continue
+        purchase_date = datetime.strptime(asset['purchase_date'], '%Y-%m-%d').date()
+        last_end = last_ends.get(asset['asset_id'])
+        first = 1 if last_end is None else \
+            period_of(purchase_date, datetime.strptime(last_end, '%Y-%m-%d').date()) + 1
+        last = min(period_of(purchase_date, calculation_date), schedule.end_period)
+        if first <= last:
+            runs.append(AssetRun(asset, schedule, first, last))
+    return runs, errors
+
+
+# --- Computation ---
+def _compute_python(runs):
+    return [(run.schedule.rows(run.first, run.last), run.schedule.accumulated(run.first - 1)) for run in runs]
+
+
+def _compute_numpy(runs):
+    """
+    DepreciationSchedule.accumulated() for every run at once. Column 0 holds
+    the period before each run's first, the next columns its periods.
+    """
+    schedules = [run.schedule for run in runs]
+
+    def column(values):
+        return np.array(values, dtype=float)[:, None]
+
+    width = max(run.last - run.first for run in runs) + 2
+    end = column([s.end_period for s in schedules])
+    periods = np.clip(column([run.first - 1 for run in runs]) + np.arange(width), 0, end)
+
+    cost = column([s.cost for s in schedules])
+    salvage = column([s.salvage_value for s in schedules])
+    depreciable = column([s.depreciable for s in schedules])
+    life = column([s.life or 1 for s in schedules])
+    straight = column([s.method == 'Straight-Line' for s in schedules]) > 0
+    declining = column([s.declining for s in schedules]) > 0
+
+    # Straight line and sum of the years' digits
+    linear = depreciable * periods / np.maximum(end, 1)
+    years, months = np.divmod(periods, 12)
+    digits = (life * (life + 1)) / 2
+    syd = depreciable * (years * life - years * (years - 1) / 2 + months * (life - years) / 12) / digits
+
+    # Declining balance: full-rate decay, then 11/12 of the excess over salvage per month
+    factor = column([s.monthly_factor or 1.0 for s in schedules])
+    switch = column([s.switch_period if s.switch_period is not None else np.inf for s in schedules])
+    switch_value = column([s.switch_value or 0.0 for s in schedules])
+    with np.errstate(over='ignore', invalid='ignore'):
+        decayed = np.where(periods <= switch, cost * factor ** periods,
+                           salvage + (switch_value - salvage) * (11 / 12) ** (periods - np.minimum(switch, periods)))
+    accumulated = np.where(declining, cost - decayed, np.where(straight, linear, syd))
+
+    accumulated = np.where(periods >= end, column([s.final_accumulated for s in schedules]), accumulated)
+    accumulated = np.where(periods <= 0, 0.0, accumulated)
+
+    results = []
+    for i, run in enumerate(runs):
+        values = accumulated[i, :run.last - run.first + 2].tolist()
+        rows = [(run.first + j, values[j + 1] - values[j], values[j + 1], run.schedule.cost - values[j + 1])
+                for j in range(len(values) - 1)]
+        results.append((rows, values[0]))
+    return results
+
+
+def compute_portfolio(runs):
+    """[(rows, accumulated before the first row)] per run, rows shaped like DepreciationSchedule.rows()."""
+    if not runs:
+        return []
+    return _compute_numpy(runs) if NUMPY_AVAILABLE else _compute_python(runs)
+
+
+# --- Writing ---
+def schedule_portfolio_depreciation(cursor, calculation_date, asset_ids=None, depreciation_account_id=None):
+    """
+    Schedules depreciation for every asset (or asset_ids) from its last
+    scheduled month through calculation_date: depreciation_schedule rows and
+    their future_transactions, linked by future_transaction_id. Does not commit.
+
+    Returns (periods scheduled, {asset_id: error code}); assets with an error
+    are left untouched.
+    """
+    if depreciation_account_id is None:
+        depreciation_account_id = depreciation_account(cursor)
+
+    runs, errors = plan_portfolio(cursor, calculation_date, asset_ids)
+    results = compute_portfolio(runs)
+    periods = write_depreciation_rows(
+        cursor, [(run.asset, rows, previous) for run, (rows, previous) in zip(runs, results)],
+        depreciation_account_id)
+    return periods, errors
@@ -0,0 +1,4 @@
+# ledger/errors.py
+
+class LedgerError(ValueError):
+    """A business rule rejected a ledger operation (the message is user-facing)."""
@@ -0,0 +1,61 @@
+# ledger/links.py
+"""
+Postings linked to the row they belong to.
+
+transactions and future_transactions carry source_ref (the table, one of
+posting.SOURCE_REFS) and source_id (the row id), indexed together, so a
+cascade finds exactly the rows of an asset, recurring rule or AR/AP movement
+without scanning descriptions.
+"""
+from ledger.errors import LedgerError
+from ledger.posting import checked_source
+
+
+def linked_transactions(cursor, source_ref, source_id):
+    """Ledger transactions linked to the given row, oldest first."""
+    source_ref, source_id = checked_source(source_ref, source_id)
+    cursor.execute("SELECT * FROM transactions WHERE source_ref = ? AND source_id = ? ORDER BY date, id",
+                   (source_ref, source_id))
+    return cursor.fetchall()
+
+
+def linked_transaction(cursor, source_ref, source_id):
+    """The one ledger transaction linked to the given row (an AR/AP movement's posting). Raises LedgerError if none."""
+    linked = linked_transactions(cursor, source_ref, source_id)
+    if not linked:
+        raise LedgerError(f"No ledger transaction is linked to {source_ref} row {source_id}.")
+    return linked[0]
+
+
+def reverse_linked_transactions(cursor, source_ref, source_id):
+    """
+    Deletes every ledger transaction linked to the given row and takes their
+    impact out of the account balances, one aggregated UPDATE for all touched
+    accounts. Does not commit. Returns the number of transactions removed.
+    """
+    source_ref, source_id = checked_source(source_ref, source_id)
+    cursor.execute("""
+        UPDATE accounts
+        SET balance = balance - deltas.delta
+        FROM (
+            SELECT account_id, SUM(delta) AS delta
+            FROM (
+                SELECT debited AS account_id, amount AS delta
+                FROM transactions WHERE source_ref = ? AND source_id = ?
+                UNION ALL
+                SELECT credited AS account_id, -amount AS delta
+                FROM transactions WHERE source_ref = ? AND source_id = ?
+            )
+            GROUP BY account_id
+        ) AS deltas
+        WHERE accounts.id = deltas.account_id
+    """, (source_ref, source_id, source_ref, source_id))
+    cursor.execute("DELETE FROM transactions WHERE source_ref = ? AND source_id = ?", (source_ref, source_id))
+    return cursor.rowcount
+
+
+def delete_linked_future_transactions(cursor, source_ref, source_id):
+    """Deletes the future transactions linked to the given row. Does not commit. Returns the count."""
+    source_ref, source_id = checked_source(source_ref, source_id)
+    cursor.execute("DELETE FROM future_transactions WHERE source_ref = ? AND source_id = ?", (source_ref, source_id))
+    return cursor.rowcount
@@ -0,0 +1,268 @@
+# ledger/posting.py
+
+from ledger.errors import LedgerError
+from recurring_transactions.recurrence import RECURRING_SOURCE
+from utils.formatters import statement_hash
+from utils.money import Money
+
+SOURCE_TYPES = ('GENERAL', 'DEBTOR_CREDITOR', 'FIXED_ASSET')
+
+# source_ref values: the table holding the row a posting belongs to (source_id is its id).
+# RECURRING_SOURCE lives with the recurrence engine, which writes it.
+ASSET_SOURCE = 'fixed_assets'
+PARTY_SOURCE = 'debtor_creditor_transactions'
+SOURCE_REFS = (ASSET_SOURCE, RECURRING_SOURCE, PARTY_SOURCE)
+
+
+def _checked_amount(debited, credited, amount):
+    """Validates a double entry and returns its amount as Money."""
+    if debited is None or credited is None:
+        raise LedgerError("Both debited and credited accounts are required.")
+    if debited == credited:
+        raise LedgerError("Debited and credited accounts cannot be the same.")
+    try:
+        amount = Money.parse(amount)
+    except (ValueError, TypeError):
+        raise LedgerError(f"Invalid amount: {amount!r}")
+    if amount <= 0:
+        raise LedgerError("Amount must be a positive number (greater than 0).")
+    return amount
+
+
+def checked_source(source_ref, source_id):
+    """Validates a (source_ref, source_id) link; both are None for unlinked postings."""
+    if source_ref is None and source_id is None:
+        return None, None
+    if source_ref not in SOURCE_REFS:
+        raise LedgerError(f"Invalid source reference: {source_ref}")
+    try:
+        return source_ref, int(source_id)
+    except (TypeError, ValueError):
+        raise LedgerError(f"Invalid source id for {source_ref}: {source_id!r}")
+
+
+def apply_balances(cursor, debited, credited, amount):
+    """Adds a posting's impact to the two account balances (debit +, credit -)."""
+    cursor.execute("UPDATE accounts SET balance = balance + ? WHERE id = ?", (amount, debited))
+    cursor.execute("UPDATE accounts SET balance = balance - ? WHERE id = ?", (amount, credited))
+
+
+def post_transaction(cursor, date, description, debited, credited, amount, source_type='GENERAL',
+                     source_ref=None, source_id=None):
+    """
+    Inserts one ledger transaction and updates both account balances.
+
+    `amount` is in major units (text, number or Money). source_ref/source_id
+    link the posting to the row it belongs to (see SOURCE_REFS), so cascades
+    find it by key. The row gets its statement import hash. Does not commit.
+    Returns the new transaction id.
+    """
+    amount = _checked_amount(debited, credited, amount)
+    if source_type not in SOURCE_TYPES:
+        raise LedgerError(f"Invalid source type: {source_type}")
+    source_ref, source_id = checked_source(source_ref, source_id)
+    cursor.execute(
+        """
+        INSERT INTO transactions (date, description, debited, credited, amount, source_type, source_ref, source_id,
+                                  import_hash)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+        (date, description, debited, credited, amount, source_type, source_ref, source_id,
+         statement_hash(date, amount, description))
+    )
+    transaction_id = cursor.lastrowid
+    apply_balances(cursor, debited, credited, amount)
+    return transaction_id
+
+
+def post_entries(cursor, entries, date=None, source_type='GENERAL', source_ref=None, source_id=None):
+    """
+    Posts a batch of ledger transactions in one go. Does not commit, so the
+    caller's commit makes the whole batch atomic.
+
+    Each entry is a dict with 'description', 'debited', 'credited' and 'amount'
+    (major units), plus optional 'date', 'source_type', 'source_ref' and
+    'source_id' overriding the batch defaults and an optional precomputed
+    'import_hash' (statement_hash() otherwise). The whole batch is validated before anything is written; the rows
+    go in with a single executemany and each touched account gets one UPDATE
+    with its aggregated delta.
+
+    Returns the number of transactions posted.
+    """
+    rows = []
+    deltas = {}
+    for index, entry in enumerate(entries, start=1):
+        label = entry.get('description') or f"entry {index}"
+        try:
+            debited, credited = int(entry['debited']), int(entry['credited'])
+        except (KeyError, ValueError, TypeError):
+            raise LedgerError(f"{label}: both debited and credited account IDs are required.")
+        try:
+            amount = _checked_amount(debited, credited, entry.get('amount'))
+        except LedgerError as e:
+            raise LedgerError(f"{label}: {e}") from e
+        entry_date = entry.get('date') or date
+        if not entry_date:
+            raise LedgerError(f"{label}: a date is required.")
+        entry_source = entry.get('source_type') or source_type
+        if entry_source not in SOURCE_TYPES:
+            raise LedgerError(f"{label}: invalid source type: {entry_source}")
+        try:
+            entry_ref, entry_id = checked_source(entry.get('source_ref', source_ref),
+                                                 entry.get('source_id', source_id))
+        except LedgerError as e:
+            raise LedgerError(f"{label}: {e}") from e
+
+        description = entry.get('description', '')
+        rows.append((entry_date, description, debited, credited, amount, entry_source, entry_ref, entry_id,
+                     entry.get('import_hash') or statement_hash(entry_date, amount, description)))
+        deltas[debited] = deltas.get(debited, Money(0)) + amount
+        deltas[credited] = deltas.get(credited, Money(0)) - amount
+
+    if not rows:
+        return 0
+
+    # --- Every account must exist before anything is written ---
+    account_ids = list(deltas)
+    placeholders = ", ".join("?" * len(account_ids))
+    cursor.execute(f"SELECT id FROM accounts WHERE id IN ({placeholders})", account_ids)
+    missing = set(account_ids) - {row[0] for row in cursor.fetchall()}
+    if missing:
+        raise LedgerError(f"Unknown account ID(s): {', '.join(str(i) for i in sorted(missing))}")
+
+    cursor.executemany(
+        """
+        INSERT INTO transactions (date, description, debited, credited, amount, source_type,
+                                  source_ref, source_id, import_hash)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+        rows
+    )
+    # --- One balance UPDATE per touched account ---
+    cursor.executemany(
+        "UPDATE accounts SET balance = balance + ? WHERE id = ?",
+        [(delta, account_id) for account_id, delta in deltas.items() if delta]
+    )
+    return len(rows)
+
+
+def update_transaction(cursor, transaction_id, date, description, debited, credited, amount):
+    """
+    Rewrites a ledger transaction, moving its balance impact from the old
+    accounts/amount to the new ones. source_type is left unchanged and the
+    statement import hash follows the new values. Does not commit.
+    """
+    amount = _checked_amount(debited, credited, amount)
+    cursor.execute("SELECT debited, credited, amount FROM transactions WHERE id = ?", (transaction_id,))
+    original = cursor.fetchone()
+    if not original:
+        raise LedgerError(f"Transaction ID {transaction_id} not found.")
+
+    # Swap debit and credit to take the original impact back out
+    apply_balances(cursor, original['credited'], original['debited'], Money.from_db(original['amount']))
+    cursor.execute(
+        """
+        UPDATE transactions
+        SET date = ?, description = ?, debited = ?, credited = ?, amount = ?, updated_at = CURRENT_TIMESTAMP,
+            import_hash = ?
+        WHERE id = ?
+        """,
+        (date, description, debited, credited, amount, statement_hash(date, amount, description), transaction_id)
+    )
+    apply_balances(cursor, debited, credited, amount)
+
+
+def reverse_transaction(cursor, transaction_id):
+    """
+    Deletes a ledger transaction and takes its impact out of the account
+    balances. Does not commit. Returns the deleted row as a dictionary.
+    """
+    cursor.execute("SELECT * FROM transactions WHERE id = ?", (transaction_id,))
+    original = cursor.fetchone()
+    if not original:
+        raise LedgerError(f"Transaction ID {transaction_id} no longer exists.")
+    original = dict(original)
+
+    apply_balances(cursor, original['credited'], original['debited'], Money.from_db(original['amount']))
+    cursor.execute("DELETE FROM transactions WHERE id = ?", (transaction_id,))
+    return original
+
+
+def post_future_transactions(cursor, transaction_ids):
+    """
+    Moves the given future transactions into the main transactions table as one
+    set-based operation: a single INSERT ... SELECT, one aggregated balance UPDATE
+    for every touched account and a single DELETE. Source links are carried
+    over and import hashes computed by the connection's statement_hash().
+    Does not commit.
+
+    Returns the posted rows as dictionaries, including 'debited_name' and
+    'credited_name' for the summary dialog.
+    """
+    cursor.execute("CREATE TEMP TABLE IF NOT EXISTS due_future_transactions (id INTEGER PRIMARY KEY)")
+    cursor.execute("DELETE FROM due_future_transactions")
+    cursor.executemany("INSERT OR IGNORE INTO due_future_transactions (id) VALUES (?)",
+                       [(transaction_id,) for transaction_id in transaction_ids])
+
+    try:
+        # --- Collect details (with account names) for the summary ---
+        cursor.execute("""
+            SELECT f.*, da.name AS debited_name, ca.name AS credited_name
+            FROM future_transactions f
+            JOIN due_future_transactions d ON d.id = f.id
+            LEFT JOIN accounts da ON da.id = f.debited
+            LEFT JOIN accounts ca ON ca.id = f.credited
+            ORDER BY f.date, f.id
+        """)
+        posted = [dict(row) for row in cursor.fetchall()]
+        if not posted:
+            return []
+
+        # --- Insert into main transactions table (original timestamps and source links kept) ---
+        cursor.execute("""
+            INSERT INTO transactions (date, description, debited, credited, amount, source_ref, source_id,
+                                      import_hash, created_at, updated_at)
+            SELECT f.date, f.description, f.debited, f.credited, f.amount, f.source_ref, f.source_id,
+                   statement_hash(f.date, f.amount, f.description), f.created_at, f.updated_at
+            FROM future_transactions f
+            JOIN due_future_transactions d ON d.id = f.id
+            ORDER BY f.date, f.id
+        """)
+
+        # --- Update Account Balances, one aggregated delta per account ---
+        cursor.execute("""
+            UPDATE accounts
+            SET balance = balance + deltas.delta
+            FROM (
+                SELECT account_id, SUM(delta) AS delta
+                FROM (
+                    SELECT f.debited AS account_id, f.amount AS delta
+                    FROM future_transactions f
+                    JOIN due_future_transactions d ON d.id = f.id
+                    UNION ALL
+                    SELECT f.credited AS account_id, -f.amount AS delta
+                    FROM future_transactions f
+                    JOIN due_future_transactions d ON d.id = f.id
+                )
+                GROUP BY account_id
+            ) AS deltas
+            WHERE accounts.id = deltas.account_id
+        """)
+
+        # --- Link posted depreciation periods to their new transaction ---
+        cursor.execute("""
+            UPDATE depreciation_schedule
+            SET transaction_id = (
+                SELECT t.id FROM future_transactions f
+                JOIN transactions t ON t.source_ref = f.source_ref AND t.source_id = f.source_id AND t.date = f.date
+                WHERE f.id = depreciation_schedule.future_transaction_id
+                ORDER BY t.id DESC LIMIT 1
+            )
+            WHERE future_transaction_id IN (SELECT id FROM due_future_transactions)
+        """)
+
+        # --- Delete from future_transactions (their schedule links are cleared by ON DELETE SET NULL) ---
+        cursor.execute("DELETE FROM future_transactions WHERE id IN (SELECT id FROM due_future_transactions)")
+        return posted
+    finally:
+        cursor.execute("DELETE FROM due_future_transactions")
@@ -0,0 +1,29 @@
+# ledger/reporting.py
+
+from cashflow.actual_cashflow_core import generate_cashflow_data
+from reports.balance_sheet_core import BalanceSheet
+from reports.income_statement_core import generate_income_statement_data
+
+
+def balance_sheet(as_of):
+    """
+    Account balances at `as_of` grouped for the balance sheet: a dict of
+    section name -> [{'name', 'balance'}] with Money balances.
+    """
+    report = BalanceSheet()
+    try:
+        sections = report.calcular_saldos_na_data(as_of)
+    finally:
+        report.close_connection()
+    names = ('Current Assets', 'Fixed Assets', 'Current Liabilities', 'Long-term Liabilities', 'Equity')
+    return dict(zip(names, sections))
+
+
+def income_statement(start_date, end_date):
+    """Revenues, expenses and net income for the period (None on database errors)."""
+    return generate_income_statement_data(start_date, end_date)
+
+
+def cashflow(accounts, start_date, end_date):
+    """Opening balance, inflows, outflows and totals of the given cash accounts for the period."""
+    return generate_cashflow_data(accounts, start_date, end_date)
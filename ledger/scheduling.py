@@ -0,0 +1,164 @@
+# ledger/scheduling.py
+
+from datetime import date, datetime, timedelta
+from ledger.errors import LedgerError
+from ledger.posting import ASSET_SOURCE, checked_source
+from ledger.settings import app_settings
+from recurring_transactions.recurrence import materialize_recurring_transactions
+from utils.depreciation_methods import DepreciationSchedule, period_of
+from utils.money import Money
+
+
+def depreciation_account(cursor=None):
+    """Depreciation expense account id from the fixed asset settings."""
+    return app_settings.account('depreciation_account_id', cursor)
+
+
+def schedule_future_transaction(cursor, date, description, debited, credited, amount,
+                                source_ref=None, source_id=None):
+    """Queues a transaction in future_transactions (amount in major units), optionally linked to its source row. Returns its id."""
+    source_ref, source_id = checked_source(source_ref, source_id)
+    cursor.execute(
+        """
+        INSERT INTO future_transactions (date, description, debited, credited, amount, source_ref, source_id)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+        """,
+        (date, description, debited, credited, Money.parse(amount), source_ref, source_id)
+    )
+    return cursor.lastrowid
+
+
+def due_future_transactions(cursor, today=None):
+    """
+    Expands recurring rules up to the rolling horizon and returns the future
+    transactions due on or before `today` as dictionaries. Does not commit.
+    """
+    today = today or date.today().strftime('%Y-%m-%d')
+    materialize_recurring_transactions(cursor)
+    cursor.execute("SELECT * FROM future_transactions WHERE date <= ? ORDER BY date, id", (today,))
+    return [dict(row) for row in cursor.fetchall()]
+
+
+# --- Depreciation ---
+def asset_schedule(asset):
+    """The closed-form DepreciationSchedule of a fixed_assets row. Raises LedgerError with the error code."""
+    try:
+        return DepreciationSchedule.for_asset(asset)
+    except ValueError as e:
+        raise LedgerError(str(e))
+
+
+def book_value_on(asset, on_date):
+    """An asset's book value at the end of on_date's month, from its schedule alone."""
+    purchase_date = datetime.strptime(asset['purchase_date'], '%Y-%m-%d').date()
+    return asset_schedule(asset).book_value(period_of(purchase_date, on_date))
+
+
+def month_bounds(purchase_date, period, cache=None):
+    """
+    ('YYYY-MM-DD', 'YYYY-MM-DD') start and end of an asset's depreciation
+    period; period 1 starts on the purchase date itself, later ones on the 1st.
+    """
+    index = purchase_date.year * 12 + purchase_date.month - 2 + period
+    bounds = cache.get(index) if cache is not None else None
+    if bounds is None:
+        year, month = divmod(index, 12)
+        next_year, next_month = divmod(index + 1, 12)
+        last_day = date(next_year, next_month + 1, 1) - timedelta(days=1)
+        bounds = (f"{year:04d}-{month + 1:02d}-01", last_day.strftime('%Y-%m-%d'))
+        if cache is not None:
+            cache[index] = bounds
+    if period == 1:
+        return purchase_date.strftime('%Y-%m-%d'), bounds[1]
+    return bounds
+
+
+def write_depreciation_rows(cursor, runs, depreciation_account_id):
+    """
+    Bulk-writes depreciation_schedule rows and their future_transactions,
+    linked by future_transaction_id (and the transactions to the asset by source_id). runs holds (asset, rows, previous accumulated)
+    with rows as DepreciationSchedule.rows() returns them. Each transaction
+    is the difference of the rounded accumulated totals, so the postings add
+    up to the accumulated depreciation to the cent. Returns the row count.
+    """
+    months = {}
+    schedule_rows = []
+    for asset, rows, previous in runs:
+        purchase_date = datetime.strptime(asset['purchase_date'], '%Y-%m-%d').date()
+        description = f"Depreciation - {asset['asset_name']}"
+        posted = Money.parse(previous)
+        for period, expense, accumulated, book_value in rows:
+            start, end = month_bounds(purchase_date, period, months)
+            total = Money.parse(accumulated)
+            # SQLite assigns the id; lastrowid links the schedule row to it
+            cursor.execute(
+                """
+                INSERT INTO future_transactions (date, description, debited, credited, amount, source_ref, source_id)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                """,
+                (start, description, depreciation_account_id, asset['account_id'], total - posted,
+                 ASSET_SOURCE, asset['asset_id'])
+            )
+            schedule_rows.append((asset['asset_id'], start, end, expense, accumulated, book_value, cursor.lastrowid))
+            posted = total
+
+    cursor.executemany(
+        """
+        INSERT INTO depreciation_schedule (
+            asset_id, period_start_date, period_end_date,
+            depreciation_expense, accumulated_depreciation, book_value, future_transaction_id
+        )
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+        """, schedule_rows)
+    return len(schedule_rows)
+
+
+def schedule_depreciation(cursor, asset, first_period, last_period=None, depreciation_account_id=None):
+    """
+    Writes an asset's depreciation_schedule rows and their future_transactions
+    for periods first_period..last_period (default: to the end of its
+    schedule). Does not commit.
+
+    Returns the number of periods scheduled. Raises LedgerError with the
+    calculation error code if the asset cannot be depreciated.
+    """
+    if depreciation_account_id is None:
+        depreciation_account_id = depreciation_account(cursor)
+    schedule = asset_schedule(asset)
+    rows = schedule.rows(first_period, last_period)
+    if not rows:
+        return 0
+    return write_depreciation_rows(cursor, [(asset, rows, schedule.accumulated(first_period - 1))],
+                                   depreciation_account_id)
+
+
+def next_depreciation_period(cursor, asset):
+    """The first period after the asset's last scheduled row (1 if it has none)."""
+    cursor.execute("SELECT MAX(period_end_date) FROM depreciation_schedule WHERE asset_id = ?",
+                   (asset['asset_id'],))
+    last_end = cursor.fetchone()[0]
+    if last_end is None:
+        return 1
+    purchase_date = datetime.strptime(asset['purchase_date'], '%Y-%m-%d').date()
+    return period_of(purchase_date, datetime.strptime(last_end, '%Y-%m-%d').date()) + 1
+
+
+def schedule_asset_depreciation(cursor, asset_id, calculation_date=None, depreciation_account_id=None):
+    """
+    Continues an asset's depreciation schedule from its last scheduled month (or
+    its purchase date) through calculation_date's month, or to the end of its
+    schedule when calculation_date is None. Does not commit.
+
+    Returns the number of periods scheduled; 0 means it was already up to date.
+    """
+    cursor.execute("SELECT * FROM fixed_assets WHERE asset_id = ?", (asset_id,))
+    asset = cursor.fetchone()
+    if not asset:
+        raise LedgerError("Asset not found.")
+
+    last_period = None
+    if calculation_date is not None:
+        purchase_date = datetime.strptime(asset['purchase_date'], '%Y-%m-%d').date()
+        last_period = period_of(purchase_date, calculation_date)
+    return schedule_depreciation(cursor, asset, next_depreciation_period(cursor, asset), last_period,
+                                 depreciation_account_id)
@@ -0,0 +1,147 @@
+# ledger/settings.py
+
+import json
+import os
+import threading
+from collections import namedtuple
+from ledger.errors import LedgerError
+
+SETTINGS_DIR = 'data'
+
+# Account settings: key -> (JSON file in SETTINGS_DIR, label used in errors)
+ACCOUNT_SETTINGS = {
+    'receivable_account_id': ('ar_ap_settings.json', "Accounts Receivable account"),
+    'payable_account_id': ('ar_ap_settings.json', "Accounts Payable account"),
+    'depreciation_account_id': ('depreciation_account.json', "Depreciation expense account"),
+    'owner_equity_account_id': ('owner_equity_account.json', "Owner's Equity account"),
+}
+CASHFLOW_SETTINGS = 'cashflow_accounts.json'  # A plain list of account ids
+
+# One consistent view of every account setting (ids are ints, None when unset)
+AccountSettings = namedtuple('AccountSettings', list(ACCOUNT_SETTINGS) + ['cashflow_account_ids'])
+
+
+def _account_id(value):
+    try:
+        return int(value) if value not in (None, '') else None
+    except (TypeError, ValueError):
+        return None
+
+
+class SettingsService:
+    """
+    Application-wide cache of the account settings files.
+
+    The files are parsed once into an AccountSettings snapshot. Each access
+    only stats them, and reloads all of them when one was saved or changed on
+    disk (e.g. by a sync download), so posting code does no JSON parsing.
+    Ids handed out with a cursor are checked against `accounts` once per
+    revision: a reload, or accounts_changed() after an account is deleted or
+    the database replaced, starts a new one.
+    """
+
+    def __init__(self, settings_dir=SETTINGS_DIR):
+        self.settings_dir = settings_dir
+        self._lock = threading.Lock()
+        self._snapshot = None
+        self._signature = None
+        self._revision = 0
+        self._validated = set()  # Account ids known to exist in this revision
+
+    def _files(self):
+        names = {file_name for file_name, _ in ACCOUNT_SETTINGS.values()}
+        names.add(CASHFLOW_SETTINGS)
+        return sorted(names)
+
+    def _read_signature(self):
+        signature = []
+        for file_name in self._files():
+            try:
+                stat = os.stat(os.path.join(self.settings_dir, file_name))
+                signature.append((stat.st_size, stat.st_mtime_ns))
+            except OSError:
+                signature.append(None)
+        return tuple(signature)
+
+    def _load_file(self, file_name):
+        try:
+            with open(os.path.join(self.settings_dir, file_name), "r") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"Warning: settings file {file_name} unreadable: {e}")
+            return None
+
+    def snapshot(self):
+        """The current AccountSettings, reloaded only when a settings file changed."""
+        signature = self._read_signature()
+        with self._lock:
+            if self._snapshot is None or signature != self._signature:
+                files = {file_name: self._load_file(file_name) for file_name in self._files()}
+                values = {}
+                for key, (file_name, _) in ACCOUNT_SETTINGS.items():
+                    data = files[file_name]
+                    values[key] = _account_id(data.get(key)) if isinstance(data, dict) else None
+                cashflow = files[CASHFLOW_SETTINGS]
+                values['cashflow_account_ids'] = tuple(
+                    account_id for account_id in map(_account_id, cashflow if isinstance(cashflow, list) else [])
+                    if account_id is not None)
+                self._snapshot = AccountSettings(**values)
+                self._signature = signature
+                self._new_revision()
+            return self._snapshot
+
+    def account(self, key, cursor=None):
+        """
+        The account id stored under `key` (one of ACCOUNT_SETTINGS). Raises
+        LedgerError when it is not configured, or, given a cursor, when the
+        account no longer exists.
+        """
+        label = ACCOUNT_SETTINGS[key][1]
+        account_id = getattr(self.snapshot(), key)
+        if account_id is None:
+            raise LedgerError(f"{label} not set. Please configure it in settings.")
+        if cursor is None:
+            return account_id
+        with self._lock:
+            revision, validated = self._revision, account_id in self._validated
+        if not validated:
+            cursor.execute("SELECT 1 FROM accounts WHERE id = ?", (account_id,))
+            if cursor.fetchone() is None:
+                raise LedgerError(f"{label} (id {account_id}) no longer exists. Please configure it in settings.")
+            with self._lock:
+                if self._revision == revision:  # Not checked against accounts that changed meanwhile
+                    self._validated.add(account_id)
+        return account_id
+
+    def cashflow_accounts(self):
+        """Ids of the accounts shown in the cash flow report."""
+        return list(self.snapshot().cashflow_account_ids)
+
+    def save(self, file_name, data):
+        """Writes a settings file atomically and drops the cached snapshot."""
+        os.makedirs(self.settings_dir, exist_ok=True)
+        settings_file = os.path.join(self.settings_dir, file_name)
+        temp_path = settings_file + ".tmp"
+        with open(temp_path, "w") as f:
+            json.dump(data, f, indent=4)
+        os.replace(temp_path, settings_file)
+        self.invalidate()
+
+    def invalidate(self):
+        with self._lock:
+            self._snapshot = None
+
+    def accounts_changed(self):
+        """Forgets which account ids were found in `accounts`; call after deleting accounts or replacing the database."""
+        with self._lock:
+            self._new_revision()
+
+    def _new_revision(self):
+        # Callers hold self._lock
+        self._revision += 1
+        self._validated = set()
+
+
+app_settings = SettingsService()
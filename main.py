@@ -1,13 +1,13 @@
 # libraries
 import sys
-from PySide6.QtWidgets import QApplication
+from PySide6.QtWidgets import QApplication, QMessageBox
 from PySide6.QtGui import QIcon
 import os
 
 # modules
-from create_database import create_database
+from create_database import create_database, connection_provider
 from main_window import MainWindow
-from process_future_transactions import process_future_transactions
+from process_future_transactions import FutureTransactionsProcessor
 from backup_system import register_app_close_backup  # Import the backup system
 
 
@@ -19,19 +19,29 @@ else:
 ICON_PATH = os.path.join(BASE_DIR, "data", "base.ico")
 
 if __name__ == "__main__":
-    # Initialize database
-    database_init_create = create_database()
-
     # Start application
     app = QApplication(sys.argv)
     app.setWindowIcon(QIcon(ICON_PATH))
+
+    # Initialize database; a file left on an older schema would break every posting
+    if not create_database():
+        QMessageBox.critical(None, "Database Error",
+                             "The database could not be created or upgraded. See the console output for details.")
+        sys.exit(1)
+
     window = MainWindow()
     window.show()
 
-    # Process future transactions
-    process_future_transactions(window)
+    # Process future transactions in the background once the event loop runs
+    window.future_transactions_processor = FutureTransactionsProcessor(window)
+    window.future_transactions_processor.start()
     
     # Register backup on application close
     register_app_close_backup(app, window)
 
-    sys.exit(app.exec())
\ No newline at end of file
+    exit_code = app.exec()
+
+    # Closing the last connection folds the WAL back into the database file
+    print(f"Closing {connection_provider.live_connection_count()} database connection(s)")
+    connection_provider.close_thread_connections()
+    sys.exit(exit_code)
\ No newline at end of file
@@ -7,6 +7,8 @@ from fixed_assets.settings import FixedAssetSettingsWindow
 from fixed_assets.single_account_purchase import SingleAccountPurchaseWindow
 from fixed_assets.multiple_account_purchase import MultipleAccountPurchaseWindow
 from fixed_assets.purge_asset_records import PurgeAssetRecordsWindow  # Import
+from fixed_assets.calculate_depreciation import CalculateDepreciationWindow
+from fixed_assets.month_end_depreciation import MonthEndDepreciationWindow
 
 class FixedAssetActions:
     def __init__(self, main_window):
@@ -32,6 +34,15 @@ class FixedAssetActions:
         import_asset_action.triggered.connect(self.open_import_fixed_asset)
         fixed_asset_menu.addAction(import_asset_action)
 
+        # --- Depreciation Actions ---
+        calculate_depreciation_action = QAction("Calculate Depreciation", self.main_window)
+        calculate_depreciation_action.triggered.connect(self.open_calculate_depreciation)
+        fixed_asset_menu.addAction(calculate_depreciation_action)
+
+        month_end_action = QAction("Run Month-End Depreciation", self.main_window)
+        month_end_action.triggered.connect(self.open_month_end_depreciation)
+        fixed_asset_menu.addAction(month_end_action)
+
         # --- Add Settings Action ---
         settings_action = QAction("Settings", self.main_window)
         settings_action.triggered.connect(self.open_settings)
@@ -48,6 +59,14 @@ class FixedAssetActions:
         self.import_asset_window = ImportFixedAssetWindow(self.main_window)
         self.import_asset_window.show()
 
+    def open_calculate_depreciation(self):
+        self.calculate_depreciation_window = CalculateDepreciationWindow(self.main_window)
+        self.calculate_depreciation_window.show()
+
+    def open_month_end_depreciation(self):
+        self.month_end_window = MonthEndDepreciationWindow(self.main_window)
+        self.month_end_window.show()
+
     def open_settings(self):
         self.settings_window = FixedAssetSettingsWindow(self.main_window)
         self.settings_window.show()
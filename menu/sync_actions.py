@@ -1,19 +1,20 @@
 # menu/sync_actions.py
 import os
-import io
 import hashlib
 import threading
-import time
 import json
 from PySide6.QtWidgets import QMenu, QMessageBox, QDialog, QVBoxLayout, QLabel, QLineEdit
 from PySide6.QtWidgets import QDialogButtonBox, QFormLayout, QCheckBox, QComboBox, QProgressBar
 from PySide6.QtWidgets import QListWidget, QPushButton, QHBoxLayout, QWidget, QFileDialog
 from PySide6.QtCore import Qt, Signal, QObject
+from create_database import DatabaseManager, connection_provider
+from sync.engine import SyncEngine
+from sync.storage import GoogleDriveStorage
+from sync.transfers import TransferScheduler
 
 # Google Drive imports
 try:
     from googleapiclient.discovery import build
-    from googleapiclient.http import MediaFileUpload, MediaIoBaseDownload
     from google.oauth2 import service_account
     GOOGLE_DRIVE_AVAILABLE = True
 except ImportError:
@@ -25,6 +26,7 @@ class WorkerSignals(QObject):
     finished = Signal()
     error = Signal(str)
     file_status = Signal(str)
+    transfer_stats = Signal(float, float)  # bytes per second, ETA in seconds (-1 while unknown)
 
 class DriveSync:
     """Google Drive synchronization functionality."""
@@ -34,168 +36,72 @@ class DriveSync:
         self.SCOPES = ['https://www.googleapis.com/auth/drive']
         self.DRIVE_FOLDER_ID = '1ZqSLWL7POqp0gufYuMxFdyHX0sjDKMtJ'  # Default folder ID
         self.LOCAL_DIR = 'data'  # Default local directory
+        self.CACHE_DIR = 'sync_cache'  # Local sync manifests, kept outside the synced directory
         self.drive_service = None
+        self._credentials = None
+        self._credentials_file = None
+        self._engine = None
 
     def authenticate(self, service_account_file):
         """Authenticate with Google Drive."""
         if not os.path.exists(service_account_file):
             raise FileNotFoundError(f"Credentials file not found at {service_account_file}")
 
+        if self.drive_service is not None and service_account_file == self._credentials_file:
+            return True  # Already authenticated this session
         try:
             creds = service_account.Credentials.from_service_account_file(
                 service_account_file, scopes=self.SCOPES)
             self.drive_service = build('drive', 'v3', credentials=creds)
+            self._credentials = creds
+            self._credentials_file = service_account_file
+            self._engine = None
             return True
         except Exception as e:
             print(f"Authentication error: {e}")
             return False
 
-    def get_remote_file(self, file_name, folder_id):
+    def engine(self, local_dir, folder_id):
         """
-        Returns remote file metadata (including MD5 checksum) for a given file name in the specified folder.
-        If the file does not exist remotely, returns None.
+        The sync engine for this folder pair. It is kept for the session, so the
+        remote folder is listed once rather than on every dialog.
         """
-        query = f"name = '{file_name}' and '{folder_id}' in parents and trashed = false"
-        results = self.drive_service.files().list(
-            q=query, fields="files(id, name, md5Checksum)").execute()
-        items = results.get('files', [])
-        return items[0] if items else None
-
-    def get_remote_files(self, folder_id):
-        """
-        Lists all files in the specified Google Drive folder.
-        Returns a list of file metadata including id, name, and MD5 checksum.
-        """
-        query = f"'{folder_id}' in parents and trashed = false"
-        results = self.drive_service.files().list(
-            q=query, fields="files(id, name, md5Checksum)").execute()
-        return results.get('files', [])
-
-    def get_local_md5(self, file_path):
-        """
-        Computes the MD5 hash for the local file.
-        """
-        md5_hash = hashlib.md5()
-        with open(file_path, "rb") as f:
-            for chunk in iter(lambda: f.read(4096), b""):
-                md5_hash.update(chunk)
-        return md5_hash.hexdigest()
-
-    def upload_file(self, local_file_path, folder_id, signals=None):
-        """
-        Uploads a new file or updates an existing one on Google Drive.
-        """
-        file_name = os.path.basename(local_file_path)
-        remote_file = self.get_remote_file(file_name, folder_id)
-
-        if signals:
-            signals.file_status.emit(f"Processing: {file_name}")
-
-        try:
-            media = MediaFileUpload(local_file_path, resumable=True)
-            if remote_file:
-                if signals:
-                    signals.file_status.emit(f"Updating: {file_name}")
-                file = self.drive_service.files().update(
-                    fileId=remote_file['id'], media_body=media).execute()
-            else:
-                if signals:
-                    signals.file_status.emit(f"Uploading: {file_name}")
-                file_metadata = {'name': file_name, 'parents': [folder_id]}
-                file = self.drive_service.files().create(
-                    body=file_metadata, media_body=media, fields='id').execute()
-
-            if signals:
-                signals.file_status.emit(f"Completed: {file_name}")
-            return True
-        except Exception as e:
-            if signals:
-                signals.error.emit(f"Error with {file_name}: {str(e)}")
-            return False
-
-    def download_file(self, remote_file, local_file_path, signals=None):
-        """
-        Downloads a file from Google Drive and writes it to the local path.
-        """
-        file_name = os.path.basename(local_file_path)
-        if signals:
-            signals.file_status.emit(f"Downloading: {file_name}")
-
-        try:
-            request = self.drive_service.files().get_media(fileId=remote_file['id'])
-            fh = io.BytesIO()
-            downloader = MediaIoBaseDownload(fh, request)
-            done = False
-
-            while not done:
-                status, done = downloader.next_chunk()
-                if signals:
-                    signals.progress.emit(int(status.progress() * 100))
-
-            # Ensure directory exists
-            os.makedirs(os.path.dirname(local_file_path), exist_ok=True)
-
-            with open(local_file_path, "wb") as f:
-                f.write(fh.getvalue())
-
-            if signals:
-                signals.file_status.emit(f"Completed: {file_name}")
-            return True
-        except Exception as e:
-            if signals:
-                signals.error.emit(f"Error with {file_name}: {str(e)}")
-            return False
-
-    def get_sync_status(self, local_dir, folder_id):
+        if (self._engine is None or self._engine.local_dir != local_dir
+                or self._engine.storage.folder_id != folder_id):
+            cache_key = hashlib.sha1(f"{os.path.abspath(local_dir)}|{folder_id}".encode('utf-8')).hexdigest()[:16]
+            creds = self._credentials
+            storage = GoogleDriveStorage(self.drive_service, folder_id,
+                                         service_factory=lambda: build('drive', 'v3', credentials=creds))
+            self._engine = SyncEngine(storage, local_dir, os.path.join(self.CACHE_DIR, f"manifest_{cache_key}.json"))
+        return self._engine
+
+    def get_sync_status(self, local_dir, folder_id, refresh=False):
         """
         Get comprehensive sync status between local and remote files.
         Returns:
         - files_to_upload: Files that exist locally and need to be uploaded or updated
         - files_to_download: Files that exist remotely but not locally or have different content
         """
-        files_to_upload = []
-        files_to_download = []
-
-        # Ensure local directory exists
-        if not os.path.exists(local_dir):
-            os.makedirs(local_dir, exist_ok=True)
-
-        # Get all remote files
-        remote_files = self.get_remote_files(folder_id)
-        remote_files_dict = {file['name']: file for file in remote_files}
-
-        # Check local files against remote
-        local_files = [f for f in os.listdir(local_dir) if os.path.isfile(os.path.join(local_dir, f))]
-        for file_name in local_files:
-            local_file_path = os.path.join(local_dir, file_name)
-            local_md5 = self.get_local_md5(local_file_path)
-
-            if file_name in remote_files_dict:
-                # File exists both locally and remotely
-                remote_md5 = remote_files_dict[file_name].get('md5Checksum', '')
-                if local_md5 != remote_md5:
-                    # Content differs, needs update
-                    files_to_upload.append((file_name, remote_files_dict[file_name]))
-            else:
-                # File exists locally but not remotely
-                files_to_upload.append((file_name, None))
-
-        # Check remote files not found locally
-        for file_name, remote_file in remote_files_dict.items():
-            local_file_path = os.path.join(local_dir, file_name)
-
-            if not os.path.exists(local_file_path):
-                # File exists remotely but not locally
-                files_to_download.append((file_name, remote_file))
-            else:
-                # but might need download if remote is newer
-                local_md5 = self.get_local_md5(local_file_path)
-                remote_md5 = remote_file.get('md5Checksum', '')
+        return self.engine(local_dir, folder_id).status(refresh)
 
-                if local_md5 != remote_md5:
-                    files_to_download.append((file_name, remote_file))
+    def transfer(self, local_dir, folder_id, direction, file_names, signals=None):
+        """
+        Uploads or downloads (direction) the named files in parallel; databases
+        move as a chunk delta and interrupted downloads resume. Returns the
+        number of files transferred.
+        """
+        def report(done, total, rate, eta):
+            if signals:
+                signals.progress.emit(int(done * 100 / total) if total else 100)
+                signals.transfer_stats.emit(rate, -1.0 if eta is None else eta)
 
-        return files_to_upload, files_to_download
+        scheduler = TransferScheduler(self.engine(local_dir, folder_id), report=report,
+                                      status=signals.file_status.emit if signals else None)
+        failed = scheduler.run(direction, file_names)
+        if signals:
+            for file_name, error in failed.items():
+                signals.error.emit(f"Error with {file_name}: {error}")
+        return len(file_names) - len(failed)
 
 
 class SyncActions:
@@ -372,6 +278,12 @@ class SyncActions:
 
     def _perform_upload(self, dialog, progress_bar, status_label, files_list):
         """Perform the upload operation in a background thread."""
+        # Make the database file self-contained (WAL folded in) before hashing/uploading
+        try:
+            connection_provider.checkpoint(DatabaseManager().db_path)
+        except Exception as e:
+            print(f"Warning: WAL checkpoint before upload failed: {e}")
+
         files_to_upload, _ = self.drive_sync.get_sync_status(
             self.settings['local_dir'], self.settings['drive_folder_id'])
 
@@ -385,24 +297,31 @@ class SyncActions:
         signals.file_status.connect(status_label.setText)
         signals.finished.connect(lambda: self._upload_finished(dialog))
         signals.error.connect(lambda msg: QMessageBox.warning(dialog, "Upload Error", msg))
+        signals.transfer_stats.connect(lambda rate, eta: self._show_transfer_stats(progress_bar, rate, eta))
 
-        total_files = len(files_to_upload)
+        file_names = [file for file, _ in files_to_upload]
 
         def upload_thread_func():
-            successful = 0
-            for i, (file, _) in enumerate(files_to_upload):
-                local_file_path = os.path.join(self.settings['local_dir'], file)
-                signals.progress.emit(int((i / total_files) * 100))
-                if self.drive_sync.upload_file(local_file_path, self.settings['drive_folder_id'], signals):
-                    successful += 1
+            signals.file_status.emit(f"Uploading {len(file_names)} files...")
+            successful = self.drive_sync.transfer(self.settings['local_dir'], self.settings['drive_folder_id'],
+                                                  'upload', file_names, signals)
             signals.progress.emit(100)
-            signals.file_status.emit(f"Upload completed: {successful}/{total_files} files uploaded")
+            signals.file_status.emit(f"Upload completed: {successful}/{len(file_names)} files uploaded")
             signals.finished.emit()
 
         thread = threading.Thread(target=upload_thread_func)
         thread.daemon = True
         thread.start()
 
+    @staticmethod
+    def _show_transfer_stats(progress_bar, rate, eta):
+        """Shows throughput and time left on the progress bar."""
+        text = f"%p%  {rate / (1024 * 1024):.1f} MB/s"
+        if eta >= 0:
+            minutes, seconds = divmod(int(eta), 60)
+            text += f", {minutes}:{seconds:02d} left"
+        progress_bar.setFormat(text)
+
     def _upload_finished(self, dialog):
         """Handle upload completion."""
         QMessageBox.information(dialog, "Upload Complete", "Your files have been uploaded to Google Drive.")
@@ -474,6 +393,12 @@ class SyncActions:
 
     def _perform_download(self, dialog, progress_bar, status_label, files_list):
         """Perform the download operation in a background thread."""
+        # Fold the WAL in so local chunks are compared (and reused) against current data
+        try:
+            connection_provider.checkpoint(DatabaseManager().db_path)
+        except Exception as e:
+            print(f"Warning: WAL checkpoint before download failed: {e}")
+
         _, files_to_download = self.drive_sync.get_sync_status(
             self.settings['local_dir'], self.settings['drive_folder_id'])
 
@@ -487,18 +412,16 @@ class SyncActions:
         signals.file_status.connect(status_label.setText)
         signals.finished.connect(lambda: self._download_finished(dialog))
         signals.error.connect(lambda msg: QMessageBox.warning(dialog, "Download Error", msg))
+        signals.transfer_stats.connect(lambda rate, eta: self._show_transfer_stats(progress_bar, rate, eta))
 
-        total_files = len(files_to_download)
+        file_names = [file for file, _ in files_to_download]
 
         def download_thread_func():
-            successful = 0
-            for i, (file, remote) in enumerate(files_to_download):
-                local_file_path = os.path.join(self.settings['local_dir'], file)
-                signals.progress.emit(int((i / total_files) * 100))
-                if self.drive_sync.download_file(remote, local_file_path, signals):
-                    successful += 1
+            signals.file_status.emit(f"Downloading {len(file_names)} files...")
+            successful = self.drive_sync.transfer(self.settings['local_dir'], self.settings['drive_folder_id'],
+                                                  'download', file_names, signals)
             signals.progress.emit(100)
-            signals.file_status.emit(f"Download completed: {successful}/{total_files} files downloaded")
+            signals.file_status.emit(f"Download completed: {successful}/{len(file_names)} files downloaded")
             signals.finished.emit()
 
         thread = threading.Thread(target=download_thread_func)
@@ -541,7 +464,7 @@ class SyncActions:
 
         refresh_button = QPushButton("Refresh")
         refresh_button.clicked.connect(lambda: self._update_sync_status(
-            upload_list, download_list, status_label))
+            upload_list, download_list, status_label, refresh=True))
         layout.addWidget(refresh_button)
 
         button_box = QDialogButtonBox(QDialogButtonBox.Close)
@@ -554,13 +477,13 @@ class SyncActions:
         dialog.resize(500, 500)
         dialog.exec()
 
-    def _update_sync_status(self, upload_list, download_list, status_label):
-        """Update the sync status lists."""
+    def _update_sync_status(self, upload_list, download_list, status_label, refresh=False):
+        """Update the sync status lists (refresh re-lists the Drive folder)."""
         status_label.setText("Checking sync status...")
 
         try:
             files_to_upload, files_to_download = self.drive_sync.get_sync_status(
-                self.settings['local_dir'], self.settings['drive_folder_id'])
+                self.settings['local_dir'], self.settings['drive_folder_id'], refresh)
 
             upload_list.clear()
             if files_to_upload:
@@ -12,6 +12,10 @@ from utils.crud.date_select import DateSelectWindow
 from utils.crud.search_dialog import AdvancedSearchDialog
 # Import the new filter dialog
 from utils.crud.transaction_filter_dialog import TransactionFilterDialog
+from utils.money import Money
+from ledger import post_entries
+from bank_import.import_statement import ImportStatementWindow
+from bank_import.settings import StatementImportSettingsWindow
 # from utils.formatters import format_table_name # Import formatter if needed directly
 
 
@@ -42,6 +46,13 @@ class TransactionsActions:
         self.delete_transaction_action = self.transactions_menu.addAction("Delete Transaction")
         self.delete_transaction_action.triggered.connect(self.delete_transaction) # Calls CRUD.delete (with source_type check)
 
+        self.transactions_menu.addSeparator()
+        self.import_statement_action = self.transactions_menu.addAction("Import Bank Statement")
+        self.import_statement_action.triggered.connect(self.import_bank_statement)
+
+        self.import_settings_action = self.transactions_menu.addAction("Statement Import Settings")
+        self.import_settings_action.triggered.connect(self.open_import_settings)
+
     def add_transaction(self):
         """Opens the standard transaction creation dialog via CRUD."""
         # CRUD's _save_record handles setting source_type='GENERAL' for new records
@@ -74,6 +85,16 @@ class TransactionsActions:
         # and prevent deletion if not 'GENERAL'.
         self.transactions_crud.delete(self.main_window)
 
+    def import_bank_statement(self):
+        """Opens the CSV/OFX bank statement import window."""
+        self.import_statement_window = ImportStatementWindow(self.main_window)
+        self.import_statement_window.show()
+
+    def open_import_settings(self):
+        """Opens the column mapping and counterpart rules for statement imports."""
+        self.import_settings_window = StatementImportSettingsWindow(self.main_window)
+        self.import_settings_window.show()
+
     # --- Template Transaction Logic ---
 
     def add_transaction_from_template(self):
@@ -159,7 +180,7 @@ class TransactionsActions:
                     'description': trans_row['description'],
                     'debited': trans_row['debited'],
                     'credited': trans_row['credited'],
-                    'amount': str(trans_row['amount']), # Store amount as string initially for editing
+                    'amount': str(Money.from_db(trans_row['amount'])), # Store amount as string (major units) for editing
                     'debit_name': trans_row['debit_name'],
                     'debit_code': trans_row['debit_code'],
                     'credit_name': trans_row['credit_name'],
@@ -174,7 +195,7 @@ class TransactionsActions:
                 table.setItem(row_idx, 2, QTableWidgetItem(f"{trans_row['credit_name']} ({trans_row['credit_code']})"))
 
                 # Format amount nicely for display in the table
-                try: amount_display_str = "{:,.2f}".format(float(trans_row['amount']))
+                try: amount_display_str = "{:,.2f}".format(Money.from_db(trans_row['amount']))
                 except (ValueError, TypeError): amount_display_str = str(trans_row['amount'] or '0.00') # Fallback
                 amount_item_display = QTableWidgetItem(amount_display_str)
                 amount_item_display.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter) # Align amount right
@@ -330,8 +351,8 @@ class TransactionsActions:
                  raise ValueError("Description cannot be empty.")
 
             # Validate amount string can be converted to a positive float
-            new_amount_float = float(new_amount_str) # This will raise ValueError if invalid format
-            if new_amount_float <= 0:
+            new_amount = Money.parse(new_amount_str) # This will raise ValueError if invalid format
+            if new_amount <= 0:
                 raise ValueError("Amount must be a positive number.")
 
             # Validate Account IDs
@@ -368,7 +389,7 @@ class TransactionsActions:
             table.setItem(row, 2, QTableWidgetItem(new_credited_display))
 
             # Format amount for display in the table again
-            amount_display_item = QTableWidgetItem("{:,.2f}".format(new_amount_float))
+            amount_display_item = QTableWidgetItem("{:,.2f}".format(new_amount))
             amount_display_item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
             table.setItem(row, 3, amount_display_item)
 
@@ -407,52 +428,18 @@ class TransactionsActions:
 
             cursor.execute("BEGIN") # Start a database transaction
 
-            created_count = 0
-            # Iterate through the prepared data stored in the instance list
-            for transaction_data in self.transaction_data_for_creation:
-                try:
-                    # Final validation just before insertion (redundant but safe)
-                    amount_float = float(transaction_data['amount'])
-                    if amount_float <= 0:
-                        raise ValueError(f"Invalid amount ({amount_float}) in final data for '{transaction_data.get('description', 'N/A')}'.")
-                    if not transaction_data.get('debited') or not transaction_data.get('credited'):
-                         raise ValueError(f"Missing account ID in final data for '{transaction_data.get('description', 'N/A')}'.")
-
-                    # Prepare the final data dictionary for the SQL INSERT statement
-                    data_to_insert = {
-                        'date': selected_date,
-                        'description': transaction_data['description'],
-                        'debited': transaction_data['debited'],
-                        'credited': transaction_data['credited'],
-                        'amount': amount_float,
-                        'source_type': 'GENERAL' # <<< Explicitly set source type to 'GENERAL' for template transactions
-                    }
-
-                    # Execute the INSERT statement
-                    cursor.execute(
-                        """INSERT INTO transactions (date, description, debited, credited, amount, source_type)
-                           VALUES (:date, :description, :debited, :credited, :amount, :source_type)""",
-                        data_to_insert
-                    )
-                    # last_inserted_id = cursor.lastrowid # Optional: Get the ID if needed
-
-                    # Update account balances using the reliable CRUD helper method
-                    self.transactions_crud._update_account_balance(data_to_insert['debited'], data_to_insert['amount'], 'add')
-                    self.transactions_crud._update_account_balance(data_to_insert['credited'], data_to_insert['amount'], 'subtract')
-                    created_count += 1
-
-                except (ValueError, TypeError, KeyError) as item_error:
-                    # If an error occurs processing any single item, raise it to trigger a rollback of the entire batch
-                    raise ValueError(f"Error processing transaction item '{transaction_data.get('description', 'N/A')}': {item_error}") from item_error
-
-
-            # If the loop completes without raising an exception, commit the transaction
+            # Validate the whole batch, then insert it and update balances in bulk;
+            # template transactions are 'GENERAL'
+            created_count = post_entries(cursor, self.transaction_data_for_creation,
+                                         date=selected_date, source_type='GENERAL')
+
+            # Commit only once the whole batch has been posted
             conn.commit()
             QMessageBox.information(self.main_window, "Success", f"{created_count} transaction(s) created successfully from template!")
             self.transaction_data_for_creation = [] # Clear the temporary data list after successful creation
 
         except (sqlite3.Error, ValueError, TypeError) as e:
-            # Catch database errors or value errors from processing/validation
+            # Catch database errors or validation errors (LedgerError is a ValueError)
             if conn: # Check if connection was established before trying to rollback
                 conn.rollback() # Rollback the entire transaction on any error
             error_msg = f"Failed to create transactions from template: {str(e)}"
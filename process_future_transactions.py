@@ -2,14 +2,127 @@
 
 import sqlite3
 from datetime import date, timedelta # Need timedelta for postpone validation
+import threading
 from PySide6.QtWidgets import (QMessageBox, QDialogButtonBox, QTableWidget,
                                QTableWidgetItem, QDialog, QVBoxLayout, QPushButton,
-                               QLabel, QLineEdit, QHBoxLayout, QHeaderView)
-from PySide6.QtCore import Qt, QDate # Import QDate
+                               QLabel, QLineEdit, QHBoxLayout, QHeaderView, QProgressBar)
+from PySide6.QtCore import Qt, QDate, QObject, Signal, Slot # Import QDate
 from create_database import DatabaseManager
 from utils.crud.search_dialog import AdvancedSearchDialog # Ensure this import is correct
 from utils.formatters import format_table_name          # Ensure this import is correct
 from utils.crud.date_select import DateSelectWindow     # Ensure this import is correct
+from ledger import due_future_transactions, post_future_transactions
+from utils.money import Money
+
+class FutureTransactionSignals(QObject):
+    """Signals for the background future-transaction worker."""
+    fetched = Signal(list)
+    posted = Signal(list)
+    error = Signal(str)
+
+
+class FutureTransactionsProcessor(QObject):
+    """
+    Startup pass over due future transactions that keeps the GUI responsive.
+
+    Fetching and posting run on worker threads with their own connections; the
+    management and summary dialogs run on the GUI thread once results arrive.
+    A busy indicator is shown in the main window's status bar meanwhile.
+    """
+
+    def __init__(self, main_window):
+        super().__init__(main_window)
+        self.main_window = main_window
+        self.progress_bar = None
+        self.signals = FutureTransactionSignals()
+        self.signals.fetched.connect(self._on_fetched)
+        self.signals.posted.connect(self._on_posted)
+        self.signals.error.connect(self._on_error)
+
+    def start(self):
+        """Starts the background fetch of due future transactions."""
+        self._show_progress("Checking future transactions...")
+        thread = threading.Thread(target=self._fetch_worker)
+        thread.daemon = True
+        thread.start()
+
+    # --- Worker threads ---
+    def _fetch_worker(self):
+        try:
+            with DatabaseManager() as db:
+                due_transactions = fetch_due_future_transactions(db)
+            self.signals.fetched.emit(due_transactions)
+        except Exception as e:
+            self.signals.error.emit(f"Error checking future transactions: {e}")
+
+    def _post_worker(self, transaction_ids):
+        db_manager = DatabaseManager()
+        try:
+            with db_manager as db:
+                posted = post_future_transactions(db.cursor, transaction_ids)
+                db.commit()
+            self.signals.posted.emit(posted)
+        except Exception as e:
+            if db_manager.conn:
+                try:
+                    db_manager.conn.rollback()
+                except sqlite3.Error:
+                    pass
+            self.signals.error.emit(f"Error processing future transactions: {e}")
+
+    # --- GUI thread handlers ---
+    @Slot(list)
+    def _on_fetched(self, due_transactions):
+        self._hide_progress()
+        if not due_transactions:
+            print("No future transactions to process.")
+            return
+
+        with DatabaseManager() as db:
+            if not manage_future_transactions(self.main_window, due_transactions, db):
+                print("Future transaction processing cancelled by user.")
+                return
+
+        if not due_transactions:
+            print("No transactions remaining after management.")
+            return
+
+        self._show_progress(f"Posting {len(due_transactions)} future transactions...")
+        # Not a daemon: a posting pass in progress should finish before the app exits
+        thread = threading.Thread(target=self._post_worker,
+                                  args=([trans['id'] for trans in due_transactions],))
+        thread.start()
+
+    @Slot(list)
+    def _on_posted(self, posted):
+        self._hide_progress()
+        if not posted:
+            print("No transactions were ultimately processed in this run.")
+            return
+        with DatabaseManager() as db:
+            show_processed_summary_dialog(self.main_window, posted, db.cursor)
+
+    @Slot(str)
+    def _on_error(self, message):
+        self._hide_progress()
+        print(message)
+        QMessageBox.critical(self.main_window, "Processing Error", message)
+
+    def _show_progress(self, message):
+        status_bar = self.main_window.statusBar()
+        if self.progress_bar is None:
+            self.progress_bar = QProgressBar()
+            self.progress_bar.setRange(0, 0)  # Busy indicator
+            self.progress_bar.setMaximumWidth(200)
+            status_bar.addPermanentWidget(self.progress_bar)
+        self.progress_bar.show()
+        status_bar.showMessage(message)
+
+    def _hide_progress(self):
+        if self.progress_bar is not None:
+            self.progress_bar.hide()
+        self.main_window.statusBar().clearMessage()
+
 
 def process_future_transactions(parent=None):
     """
@@ -28,18 +141,12 @@ def process_future_transactions(parent=None):
             db.conn.row_factory = sqlite3.Row
             db.cursor = db.conn.cursor()
 
-            db.cursor.execute("SELECT * FROM future_transactions WHERE date <= ?", (today,))
-            future_transactions = db.cursor.fetchall()
-
-            if not future_transactions:
+            # --- Store transactions for potential editing ---
+            transactions_to_process = fetch_due_future_transactions(db, today)
+            if not transactions_to_process:
                 print("No future transactions to process.")
                 return
 
-            # --- Store transactions for potential editing ---
-            # Convert Row objects to standard dictionaries for easier modification
-            transactions_to_process = [dict(row) for row in future_transactions]
-            print(f"Fetched {len(transactions_to_process)} potential future transactions.")
-
             # --- Show Edit/Manage Dialog ---
             if parent and transactions_to_process:
                  # Pass the list *by reference* so the dialog can modify it
@@ -54,45 +161,11 @@ def process_future_transactions(parent=None):
                 return
 
             print(f"Processing {len(transactions_to_process)} remaining future transactions...")
-            for transaction_dict in transactions_to_process:
-                # Optional Safety Check: Verify the transaction still exists in the DB before processing.
-                # This prevents errors if it was deleted by another process between fetch and process.
-                db.cursor.execute("SELECT 1 FROM future_transactions WHERE id = ?", (transaction_dict['id'],))
-                if db.cursor.fetchone() is None:
-                    print(f"Skipping transaction ID {transaction_dict['id']} as it no longer exists in future_transactions table.")
-                    continue
-
-                # --- Insert into main transactions table ---
-                db.cursor.execute(
-                    """
-                    INSERT INTO transactions (date, description, debited, credited, amount, created_at, updated_at)
-                    VALUES (?, ?, ?, ?, ?, ?, ?)
-                    """,
-                    (transaction_dict['date'], transaction_dict['description'], transaction_dict['debited'],
-                     transaction_dict['credited'], transaction_dict['amount'],
-                     transaction_dict['created_at'], transaction_dict['updated_at']) # Use original timestamps
-                )
-                print(f"Inserted transaction ID {transaction_dict['id']} (originally future) into main transactions table.")
-
-                # --- Update Account Balances ---
-                db.cursor.execute(
-                    "UPDATE accounts SET balance = balance + ? WHERE id = ?",
-                    (transaction_dict['amount'], transaction_dict['debited'])
-                )
-                db.cursor.execute(
-                    "UPDATE accounts SET balance = balance - ? WHERE id = ?",
-                    (transaction_dict['amount'], transaction_dict['credited'])
-                )
-                print(f"Updated account balances for transaction ID {transaction_dict['id']}.")
-
-                # --- Delete from future_transactions ---
-                db.cursor.execute("DELETE FROM future_transactions WHERE id = ?", (transaction_dict['id'],))
-                print(f"Deleted transaction ID {transaction_dict['id']} from future_transactions table.")
-
-
-                # --- Store Details for final summary ---
-                processed_transactions.append(transaction_dict) # append processed transaction details
-
+            # Rows deleted by another process since the fetch are skipped by the join
+            processed_transactions = post_future_transactions(
+                db.cursor, [transaction_dict['id'] for transaction_dict in transactions_to_process]
+            )
+            print(f"Posted {len(processed_transactions)} future transactions to the main transactions table.")
 
             db.commit()
             print("Committed database changes for processed future transactions.")
@@ -130,10 +203,17 @@ def process_future_transactions(parent=None):
          if parent:
               QMessageBox.critical(parent, "Processing Error", f"An unexpected error occurred: {e}")
 
-    finally:
-        # Ensure row factory is reset if necessary, although context manager should handle connection closing
-        if db_manager.conn:
-            db_manager.conn.row_factory = None # Reset to default if needed
+
+def fetch_due_future_transactions(db, today=None):
+    """
+    Expands recurring rules up to the rolling horizon (committing the new rows) and
+    returns the future transactions due on or before `today` as dictionaries.
+    """
+    due_transactions = due_future_transactions(db.cursor, today)
+    db.commit()  # Keep the rows generated from recurring rules
+    if due_transactions:
+        print(f"Fetched {len(due_transactions)} potential future transactions.")
+    return due_transactions
 
 
 def get_account_name(cursor, account_id):
@@ -155,7 +235,7 @@ def show_processed_summary_dialog(parent, processed_transactions, db_cursor):
      if not parent:
          print("Processed Transactions (Console Output):")
          for trans in processed_transactions:
-             print(f"  Date: {trans['date']}, Desc: {trans['description']}, Amount: {trans['amount']}")
+             print(f"  Date: {trans['date']}, Desc: {trans['description']}, Amount: {Money.from_db(trans['amount'])}")
          return
 
      dialog = QDialog(parent)
@@ -172,16 +252,16 @@ def show_processed_summary_dialog(parent, processed_transactions, db_cursor):
      table.setAlternatingRowColors(True)
 
      for row, trans in enumerate(processed_transactions):
-         # Fetch account names here for the summary display
-         debited_account_name = get_account_name(db_cursor, trans.get('debited')) # Use .get for safety
-         credited_account_name = get_account_name(db_cursor, trans.get('credited'))
+         # Account names come pre-joined from post_future_transactions
+         debited_account_name = trans.get('debited_name') or get_account_name(db_cursor, trans.get('debited'))
+         credited_account_name = trans.get('credited_name') or get_account_name(db_cursor, trans.get('credited'))
 
          table.setItem(row, 0, QTableWidgetItem(trans.get('date', 'N/A')))
          table.setItem(row, 1, QTableWidgetItem(trans.get('description', 'N/A')))
 
          amount_str = "N/A"
          try:
-             amount_val = float(trans.get('amount', 0))
+             amount_val = Money.from_db(trans.get('amount'))  # Stored as cents
              amount_str = f"{amount_val:,.2f}"
          except (ValueError, TypeError):
              pass # Keep "N/A" or default if conversion fails
@@ -278,7 +358,7 @@ def manage_future_transactions(parent, transactions_list, db):
             # Column 5: Amount (Formatted)
             amount_str = "N/A"
             try:
-                amount_val = float(trans_dict.get('amount', 0))
+                amount_val = Money.from_db(trans_dict.get('amount'))  # Stored as cents
                 amount_str = f"{amount_val:,.2f}" # Format with commas and 2 decimal places
             except (ValueError, TypeError):
                  print(f"Warning: Could not format amount for row {row_idx}. Value: {trans_dict.get('amount')}")
@@ -390,7 +470,7 @@ def manage_future_transactions(parent, transactions_list, db):
 
         # Amount Input
         edit_layout.addWidget(QLabel("Amount:"))
-        amount_input = QLineEdit(str(trans_dict.get('amount', '0.0'))) # Use string representation
+        amount_input = QLineEdit(str(Money.from_db(trans_dict.get('amount')))) # Major units for editing
         edit_layout.addWidget(amount_input)
 
         # --- OK/Cancel Buttons for the Edit Sub-Dialog ---
@@ -414,9 +494,9 @@ def manage_future_transactions(parent, transactions_list, db):
         updates the dictionary in transactions_list, and refreshes the main table.
         """
         try:
-            # Validate amount: must be convertible to float and positive
-            new_amount_float = float(new_amount_str)
-            if new_amount_float <= 0:
+            # Validate amount: must parse to whole cents and be positive
+            new_amount = Money.parse(new_amount_str)
+            if new_amount <= 0:
                 QMessageBox.warning(edit_dialog, "Invalid Amount", "Amount must be a positive number.")
                 return # Keep edit dialog open
 
@@ -439,7 +519,7 @@ def manage_future_transactions(parent, transactions_list, db):
                     UPDATE future_transactions
                     SET description = ?, debited = ?, credited = ?, amount = ?, updated_at = CURRENT_TIMESTAMP
                     WHERE id = ?
-                """, (new_description, new_debited_id, new_credited_id, new_amount_float, target_transaction_id))
+                """, (new_description, new_debited_id, new_credited_id, new_amount, target_transaction_id))
                 db.commit() # Commit the change immediately for edits
                 print(f"Successfully updated future_transaction ID {target_transaction_id} in database.")
             except sqlite3.Error as e:
@@ -452,7 +532,7 @@ def manage_future_transactions(parent, transactions_list, db):
             transactions_list[row]['description'] = new_description
             transactions_list[row]['debited'] = new_debited_id
             transactions_list[row]['credited'] = new_credited_id
-            transactions_list[row]['amount'] = new_amount_float
+            transactions_list[row]['amount'] = new_amount.cents
             # Note: No need to update 'date' here, handled by Postpone
 
             populate_table()  # Refresh the main management table view
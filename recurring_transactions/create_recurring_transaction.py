@@ -8,7 +8,8 @@ from create_database import DatabaseManager
 from utils.crud.date_select import DateSelectWindow
 from utils.crud.search_dialog import AdvancedSearchDialog
 from utils.formatters import format_table_name
-from datetime import datetime, date, timedelta
+from recurring_transactions.recurrence import materialize_recurring_transactions
+from utils.money import Money
 
 class CreateRecurringTransactionWindow(QWidget):
     def __init__(self, main_window):
@@ -193,7 +194,7 @@ class CreateRecurringTransactionWindow(QWidget):
           return
 
       try:
-          amount = float(self.amount_input.text())
+          amount = Money.parse(self.amount_input.text())
           if amount <= 0:
               raise ValueError("Amount must be positive.")
       except ValueError:
@@ -233,59 +234,8 @@ class CreateRecurringTransactionWindow(QWidget):
               )
               recurring_transaction_id = db.cursor.lastrowid
 
-              # --- Calculate and Create Future Transactions ---
-              current_date = datetime.strptime(start_date_str, '%Y-%m-%d').date()
-              if end_date_str:
-                  end_date = datetime.strptime(end_date_str, '%Y-%m-%d').date()
-              else:
-                  end_date = date.today() + timedelta(days=365*70)  # 70 years from now
-
-              while current_date <= end_date:
-                  # Insert into future_transactions
-                  db.cursor.execute(
-                      """
-                      INSERT INTO future_transactions (date, description, debited, credited, amount)
-                      VALUES (?, ?, ?, ?, ?)
-                      """,
-                      (current_date.strftime('%Y-%m-%d'), description, debited_account_id,
-                       credited_account_id, amount)
-                  )
-
-                  # Advance to the next date based on frequency
-                  if frequency == "daily":
-                      current_date += timedelta(days=1)
-                  elif frequency == "weekly":
-                      current_date += timedelta(weeks=1)
-                  elif frequency == "monthly":
-                      # Get the original day, but limit it to the max days in the target month
-                      year = current_date.year + (1 if current_date.month == 12 else 0)
-                      month = 1 if current_date.month == 12 else current_date.month + 1
-                      
-                      # Calculate the last day of the target month
-                      if month == 2:  # February
-                          last_day = 29 if (year % 4 == 0 and (year % 100 != 0 or year % 400 == 0)) else 28
-                      elif month in [4, 6, 9, 11]:  # 30-day months
-                          last_day = 30
-                      else:  # 31-day months
-                          last_day = 31
-                      
-                      # Use the original day, but don't exceed the last day of the month
-                      day = min(current_date.day, last_day)
-                      current_date = date(year, month, day)
-                  elif frequency == "yearly":
-                      # Get original month and day
-                      original_month = current_date.month
-                      original_day = current_date.day
-                      
-                      # Handle Feb 29 for non-leap years
-                      if original_month == 2 and original_day == 29:
-                          next_year = current_date.year + 1
-                          if not (next_year % 4 == 0 and (next_year % 100 != 0 or next_year % 400 == 0)):
-                              original_day = 28
-                      
-                      current_date = date(current_date.year + 1, original_month, original_day)
-                  elif frequency == "days":
-                      current_date += timedelta(days=interval)
+              # --- Expand occurrences up to the rolling horizon ---
+              materialize_recurring_transactions(db.cursor, recurring_id=recurring_transaction_id)
 
               db.commit()
               QMessageBox.information(self, "Success", "Recurring transaction created successfully!")
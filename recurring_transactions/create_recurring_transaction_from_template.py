@@ -8,7 +8,8 @@ from PySide6.QtCore import QDate
 from create_database import DatabaseManager
 from utils.crud.date_select import DateSelectWindow
 from utils.crud.search_dialog import AdvancedSearchDialog
-from datetime import datetime, date, timedelta
+from recurring_transactions.recurrence import materialize_recurring_transactions
+from utils.money import Money
 
 class CreateRecurringTransactionFromTemplateWindow(QDialog):  # Fix 1: Use QDialog instead of QWidget
     def __init__(self, main_window):
@@ -140,7 +141,7 @@ class CreateRecurringTransactionFromTemplateWindow(QDialog):  # Fix 1: Use QDial
             self.transactions_table.setItem(row, 0, QTableWidgetItem(trans['description']))
             self.transactions_table.setItem(row, 1, QTableWidgetItem(f"{trans['debit_name']} ({trans['debit_code']})"))
             self.transactions_table.setItem(row, 2, QTableWidgetItem(f"{trans['credit_name']} ({trans['credit_code']})"))
-            self.transactions_table.setItem(row, 3, QTableWidgetItem(str(trans['amount'])))
+            self.transactions_table.setItem(row, 3, QTableWidgetItem(str(Money.from_db(trans['amount']))))
 
     def select_start_date(self):
         date_dialog = DateSelectWindow()
@@ -180,9 +181,6 @@ class CreateRecurringTransactionFromTemplateWindow(QDialog):  # Fix 1: Use QDial
 
         try:
             with self.db_manager as db:
-                start_date = datetime.strptime(start_date_str, '%Y-%m-%d').date()
-                end_date = datetime.strptime(end_date_str, '%Y-%m-%d').date() if end_date_str else date.today() + timedelta(days=365*70)
-
                 for trans in self.template_transactions:
                     # Get account IDs from template data
                     db.cursor.execute("SELECT id FROM accounts WHERE code = ?", (trans['debit_code'],))
@@ -202,37 +200,8 @@ class CreateRecurringTransactionFromTemplateWindow(QDialog):  # Fix 1: Use QDial
                     ))
                     recurring_id = db.cursor.lastrowid
 
-                    # Generate future transactions
-                    current_date = start_date
-                    while current_date <= end_date:
-                        db.cursor.execute("""
-                            INSERT INTO future_transactions (date, description, debited, credited, amount)
-                            VALUES (?, ?, ?, ?, ?)
-                        """, (
-                            current_date.strftime('%Y-%m-%d'), trans['description'],
-                            debited_id, credited_id, trans['amount']
-                        ))
-
-                        # Calculate next date
-                        if frequency == "daily":
-                            current_date += timedelta(days=1)
-                        elif frequency == "weekly":
-                            current_date += timedelta(weeks=1)
-                        elif frequency == "monthly":
-                            year = current_date.year + (current_date.month == 12)
-                            month = 1 if current_date.month == 12 else current_date.month + 1
-                            last_day = 31 if month in [1,3,5,7,8,10,12] else 30
-                            if month == 2:
-                                last_day = 29 if (year % 4 == 0 and (year % 100 != 0 or year % 400 == 0)) else 28
-                            day = min(current_date.day, last_day)
-                            current_date = date(year, month, day)
-                        elif frequency == "yearly":
-                            try:
-                                current_date = date(current_date.year + 1, current_date.month, current_date.day)
-                            except ValueError:
-                                current_date = date(current_date.year + 1, current_date.month, 28)
-                        elif frequency == "days":
-                            current_date += timedelta(days=interval)
+                    # Expand occurrences up to the rolling horizon
+                    materialize_recurring_transactions(db.cursor, recurring_id=recurring_id)
 
                 db.commit()
                 QMessageBox.information(self, "Success", "Recurring transactions created from template!")
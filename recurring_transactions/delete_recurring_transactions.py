@@ -5,6 +5,7 @@ from PySide6.QtWidgets import (QDialog, QVBoxLayout, QLabel, QLineEdit, QPushBut
                                QMessageBox, QHBoxLayout) # Changed QWidget to QDialog
 from create_database import DatabaseManager
 from utils.crud.search_dialog import AdvancedSearchDialog
+from ledger import RECURRING_SOURCE, delete_linked_future_transactions
 
 class DeleteRecurringTransactionWindow(QDialog): # Changed QWidget to QDialog
     def __init__(self, main_window):
@@ -66,19 +67,10 @@ class DeleteRecurringTransactionWindow(QDialog): # Changed QWidget to QDialog
 
         try:
             with self.db_manager as db:
-                # Fetch debited, credited, and description to delete future transactions
-                db.cursor.execute("SELECT debited, credited, description FROM recurring_transactions WHERE id = ?", (self.selected_recurring_transaction_id,))
-                transaction_details = db.cursor.fetchone()
-                if transaction_details:
-                    debited_id = transaction_details['debited']
-                    credited_id = transaction_details['credited']
-                    description = transaction_details['description']
-
-                    # Delete future transactions first
-                    db.cursor.execute(
-                        "DELETE FROM future_transactions WHERE debited = ? AND credited = ? AND description = ?",
-                        (debited_id, credited_id, description)
-                    )
+                db.cursor.execute("SELECT 1 FROM recurring_transactions WHERE id = ?", (self.selected_recurring_transaction_id,))
+                if db.cursor.fetchone():
+                    # Delete the occurrences generated from this rule first
+                    delete_linked_future_transactions(db.cursor, RECURRING_SOURCE, self.selected_recurring_transaction_id)
 
                     # Delete the recurring transaction
                     delete_query = "DELETE FROM recurring_transactions WHERE id = ?"
@@ -7,7 +7,8 @@ from PySide6.QtCore import QDate
 from create_database import DatabaseManager
 from utils.crud.date_select import DateSelectWindow
 from utils.crud.search_dialog import AdvancedSearchDialog
-from datetime import datetime, date, timedelta
+from recurring_transactions.recurrence import update_recurring_rule
+from utils.money import Money
 
 class EditRecurringTransactionWindow(QWidget):
     def __init__(self, main_window):
@@ -203,7 +204,7 @@ class EditRecurringTransactionWindow(QWidget):
                 self.credited_input.clear()
                 self.selected_credit_account = None
 
-        self.amount_input.setText(str(recurring_transaction_data['amount']))
+        self.amount_input.setText(str(Money.from_db(recurring_transaction_data['amount'])))
         self.frequency_combo.setCurrentText(recurring_transaction_data['frequency'])
         if recurring_transaction_data['frequency'] == 'days' and recurring_transaction_data['interval'] is not None:
             self.interval_input = self.interval_input if hasattr(self, 'interval_input') and self.interval_input else QLineEdit() # Ensure interval_input exists
@@ -309,7 +310,7 @@ class EditRecurringTransactionWindow(QWidget):
             return
 
         try:
-            amount = float(self.amount_input.text())
+            amount = Money.parse(self.amount_input.text())
             if amount <= 0:
                 raise ValueError("Amount must be positive.")
         except ValueError:
@@ -335,78 +336,16 @@ class EditRecurringTransactionWindow(QWidget):
 
         try:
             with self.db_manager as db:
-                # --- Fetch original details BEFORE UPDATE ---
-                db.cursor.execute("SELECT description, debited, credited FROM recurring_transactions WHERE id = ?", (self.selected_recurring_transaction_id,))
-                original_transaction_data = db.cursor.fetchone()
-                if original_transaction_data:
-                    original_description = original_transaction_data['description']
-                    original_debited_id = original_transaction_data['debited']
-                    original_credited_id = original_transaction_data['credited']
-                else:
+                db.cursor.execute("SELECT 1 FROM recurring_transactions WHERE id = ?", (self.selected_recurring_transaction_id,))
+                if not db.cursor.fetchone():
                     QMessageBox.critical(self, "Database Error", "Could not retrieve original transaction details.")
                     return
 
-                # Update recurring_transactions table (No changes here)
-                db.cursor.execute(
-                    """
-                    UPDATE recurring_transactions
-                    SET description = ?, debited = ?, credited = ?, amount = ?,
-                        frequency = ?, interval = ?, start_date = ?, end_date = ?,
-                        updated_at = CURRENT_TIMESTAMP
-                    WHERE id = ?
-                    """,
-                    (description, debited_account_id, credited_account_id, amount,
-                     frequency, interval, start_date_str, end_date_str, self.selected_recurring_transaction_id)
-                )
-
-                # --- Delete ALL existing future transactions related to THIS recurring transaction ---
-                # Using original details to ensure all related future transactions are deleted
-                db.cursor.execute(
-                    "DELETE FROM future_transactions WHERE debited = ? AND credited = ? AND description = ?",
-                    (original_debited_id, original_credited_id, original_description)
-                )
-
-
-                # --- Regenerate Future Transactions (No changes here) ---
-                current_date = datetime.strptime(start_date_str, '%Y-%m-%d').date()
-                if end_date_str:
-                    end_date = datetime.strptime(end_date_str, '%Y-%m-%d').date()
-                else:
-                    end_date = date.today() + timedelta(days=365*70) # 70 years
-
-                while current_date <= end_date:
-                    db.cursor.execute(
-                        """
-                        INSERT INTO future_transactions (date, description, debited, credited, amount)
-                        VALUES (?, ?, ?, ?, ?)
-                        """,
-                        (current_date.strftime('%Y-%m-%d'), description, debited_account_id,
-                         credited_account_id, amount)
-                    )
-                    # Advance to the next date based on frequency (same logic as before)
-                    if frequency == "daily":
-                        current_date += timedelta(days=1)
-                    elif frequency == "weekly":
-                        current_date += timedelta(weeks=1)
-                    elif frequency == "monthly":
-                        year = current_date.year + (1 if current_date.month == 12 else 0)
-                        month = 1 if current_date.month == 12 else current_date.month + 1
-                        last_day = 31 if month in [1,3,5,7,8,10,12] else 30
-                        if month == 2:
-                            last_day = 29 if (year % 4 == 0 and (year % 100 != 0 or year % 400 == 0)) else 28
-                        day = min(current_date.day, last_day)
-                        current_date = date(year, month, day)
-                    elif frequency == "yearly":
-                        original_month = current_date.month
-                        original_day = current_date.day
-                        if original_month == 2 and original_day == 29:
-                            next_year = current_date.year + 1
-                            if not (next_year % 4 == 0 and (next_year % 100 != 0 or next_year % 400 == 0)):
-                                original_day = 28
-                        current_date = date(current_date.year + 1, original_month, original_day)
-
-                    elif frequency == "days":
-                        current_date += timedelta(days=interval)
+                # Update the rule and regenerate its occurrences from today on; past-due
+                # and postponed occurrences stay pending for the due-posting flow
+                update_recurring_rule(db.cursor, self.selected_recurring_transaction_id,
+                                      description, debited_account_id, credited_account_id, amount,
+                                      frequency, interval, start_date_str, end_date_str)
 
                 db.commit()
                 QMessageBox.information(self, "Success", "Recurring transaction updated successfully and future transactions regenerated!")
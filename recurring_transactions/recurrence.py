@@ -0,0 +1,206 @@
+# recurring_transactions/recurrence.py
+
+import calendar
+from datetime import date, datetime, timedelta
+
+# How far ahead recurring rules are expanded into future_transactions
+RECURRING_HORIZON_DAYS = 90
+
+FREQUENCIES = ("daily", "weekly", "monthly", "yearly", "days")
+
+# future_transactions.source_ref of generated occurrences (source_id is the rule id)
+RECURRING_SOURCE = 'recurring_transactions'
+
+
+def _parse_date(value):
+    """Parse a 'YYYY-MM-DD' string (or pass a date through)."""
+    if value is None or isinstance(value, date):
+        return value
+    return datetime.strptime(str(value)[:10], '%Y-%m-%d').date()
+
+
+def _add_months(start_date, months):
+    """Shift start_date by whole months, clamping the day to the target month's length."""
+    month_index = start_date.month - 1 + months
+    year = start_date.year + month_index // 12
+    month = month_index % 12 + 1
+    day = min(start_date.day, calendar.monthrange(year, month)[1])
+    return date(year, month, day)
+
+
+def occurrence_date(start_date, frequency, interval, index):
+    """
+    Returns the date of occurrence number `index` (0 = start_date) of a rule.
+
+    Occurrences are always computed from the start date, so a monthly rule that
+    starts on the 31st falls on the last day of shorter months and goes back to
+    the 31st afterwards instead of drifting.
+    """
+    if frequency == "daily":
+        return start_date + timedelta(days=index)
+    elif frequency == "weekly":
+        return start_date + timedelta(weeks=index)
+    elif frequency == "days":
+        if not interval or interval <= 0:
+            raise ValueError("Interval must be a positive number of days.")
+        return start_date + timedelta(days=index * interval)
+    elif frequency == "monthly":
+        return _add_months(start_date, index)
+    elif frequency == "yearly":
+        return _add_months(start_date, 12 * index)
+    raise ValueError(f"Invalid frequency: {frequency}")
+
+
+def _first_index_after(start_date, frequency, interval, after):
+    """Index of the first occurrence strictly after `after`."""
+    if after is None or after < start_date:
+        return 0
+    elapsed_days = (after - start_date).days
+    if frequency == "daily":
+        index = elapsed_days
+    elif frequency == "weekly":
+        index = elapsed_days // 7
+    elif frequency == "days":
+        index = elapsed_days // interval
+    elif frequency == "monthly":
+        index = (after.year - start_date.year) * 12 + after.month - start_date.month
+    elif frequency == "yearly":
+        index = after.year - start_date.year
+    else:
+        raise ValueError(f"Invalid frequency: {frequency}")
+    # The estimate may land on or before `after`; step forward until past it
+    index = max(index, 0)
+    while occurrence_date(start_date, frequency, interval, index) <= after:
+        index += 1
+    return index
+
+
+def iter_occurrences(start_date, frequency, interval=None, after=None, until=None):
+    """
+    Yields the occurrence dates of a rule that fall after `after` (exclusive)
+    and up to `until` (inclusive).
+    """
+    start_date = _parse_date(start_date)
+    after = _parse_date(after)
+    until = _parse_date(until)
+    index = _first_index_after(start_date, frequency, interval, after)
+    while True:
+        current_date = occurrence_date(start_date, frequency, interval, index)
+        if until is not None and current_date > until:
+            return
+        yield current_date
+        index += 1
+
+
+def materialize_recurring_transactions(cursor, horizon_date=None, recurring_id=None):
+    """
+    Expands recurring rules into future_transactions up to a rolling horizon.
+
+    Each rule keeps a watermark in recurring_transactions.generated_until: the
+    last date whose occurrences have already been written. Only occurrences
+    after the watermark are inserted, and the watermark is then moved to the
+    horizon (or the rule's end date), so running this repeatedly never misses
+    or duplicates an occurrence. The caller is responsible for committing.
+
+    Returns the number of future transactions inserted.
+    """
+    horizon = _parse_date(horizon_date) or date.today() + timedelta(days=RECURRING_HORIZON_DAYS)
+
+    query = """
+        SELECT id, description, debited, credited, amount, frequency, interval,
+               start_date, end_date, generated_until
+        FROM recurring_transactions
+        WHERE (generated_until IS NULL OR generated_until < ?)
+          AND (end_date IS NULL OR generated_until IS NULL OR generated_until < end_date)
+    """
+    params = [horizon.strftime('%Y-%m-%d')]
+    if recurring_id is not None:
+        query += " AND id = ?"
+        params.append(recurring_id)
+    cursor.execute(query, params)
+    rules = cursor.fetchall()
+
+    inserted = 0
+    for rule in rules:
+        (rule_id, description, debited, credited, amount, frequency, interval,
+         start_date, end_date, generated_until) = tuple(rule)
+
+        until = horizon
+        end_date = _parse_date(end_date)
+        if end_date is not None and end_date < until:
+            until = end_date
+
+        rows = [
+            (occurrence.strftime('%Y-%m-%d'), description, debited, credited, amount, RECURRING_SOURCE, rule_id)
+            for occurrence in iter_occurrences(start_date, frequency, interval,
+                                               after=generated_until, until=until)
+        ]
+        if rows:
+            cursor.executemany(
+                """
+                INSERT INTO future_transactions (date, description, debited, credited, amount, source_ref, source_id)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                """,
+                rows
+            )
+            inserted += len(rows)
+
+        cursor.execute(
+            "UPDATE recurring_transactions SET generated_until = ? WHERE id = ?",
+            (until.strftime('%Y-%m-%d'), rule_id)
+        )
+
+    return inserted
+
+
+def update_recurring_rule(cursor, recurring_id, description, debited, credited, amount,
+                          frequency, interval, start_date, end_date, today=None):
+    """
+    Saves an edited rule and regenerates its occurrences from today on.
+
+    The pending occurrences the old rule generated for today or later are
+    replaced by the new rule's. Past-due ones still waiting to be posted and
+    ones the user postponed (moved off the rule's dates) are left for the
+    due-posting flow. The caller is responsible for committing.
+
+    Returns the number of future transactions inserted.
+    """
+    today = _parse_date(today) or date.today()
+    cursor.execute(
+        "SELECT start_date, frequency, interval, end_date, generated_until FROM recurring_transactions WHERE id = ?",
+        (recurring_id,)
+    )
+    old_start, old_frequency, old_interval, old_end, old_generated_until = tuple(cursor.fetchone())
+
+    # --- Old occurrences from today on (only up to what was generated) ---
+    replaced = []
+    if old_generated_until is not None:
+        until = _parse_date(old_generated_until)
+        if old_end is not None:
+            until = min(until, _parse_date(old_end))
+        replaced = [
+            (RECURRING_SOURCE, recurring_id, occurrence.strftime('%Y-%m-%d'))
+            for occurrence in iter_occurrences(old_start, old_frequency, old_interval,
+                                               after=today - timedelta(days=1), until=until)
+        ]
+
+    cursor.execute(
+        """
+        UPDATE recurring_transactions
+        SET description = ?, debited = ?, credited = ?, amount = ?,
+            frequency = ?, interval = ?, start_date = ?, end_date = ?,
+            updated_at = CURRENT_TIMESTAMP
+        WHERE id = ?
+        """,
+        (description, debited, credited, amount, frequency, interval, start_date, end_date, recurring_id)
+    )
+    cursor.executemany("DELETE FROM future_transactions WHERE source_ref = ? AND source_id = ? AND date = ?",
+                       replaced)
+
+    # --- Regenerate from today with the new definition ---
+    yesterday = today - timedelta(days=1)
+    generated_until = yesterday.strftime('%Y-%m-%d') if _parse_date(start_date) <= yesterday else None
+    cursor.execute("UPDATE recurring_transactions SET generated_until = ? WHERE id = ?",
+                   (generated_until, recurring_id))
+    return materialize_recurring_transactions(cursor, today + timedelta(days=RECURRING_HORIZON_DAYS),
+                                              recurring_id=recurring_id)
@@ -1,43 +1,59 @@
 # reports/balance_sheet_core.py
-import sqlite3
-from create_database import DatabaseManager  # Or your DB manager path
+from create_database import DatabaseManager, connection_provider  # Or your DB manager path
+from utils.money import Money
 
 class BalanceSheet:
     def __init__(self):
         self.db_manager = DatabaseManager()
-        # Use the context manager for connection handling if preferred,
-        # otherwise connect directly as before.
-        # For this example, sticking to the original direct connection style.
-        self.conn = sqlite3.connect(self.db_manager.db_path)
-        # CRITICAL: Ensure row_factory is set for dictionary-like access
-        self.conn.row_factory = sqlite3.Row
+        # Shared per-thread connection; rows come back as sqlite3.Row
+        self.conn = connection_provider.get_connection(self.db_manager.db_path)
         self.cursor = self.conn.cursor()
 
     def calcular_saldos_na_data(self, data):
         """Calculates account balances up to a specified date, ordered by account code."""
 
+        # Closed months come from the account_period_balances snapshots; only the
+        # partial month up to the requested date is read from the ledger. Debit and
+        # credit sides are aggregated separately so each GROUP BY can use its own
+        # (account, date, amount) index, then folded into one total per account.
+        year_month = str(data)[:7]
+        month_start = f"{year_month}-01"
         query = """
+        WITH account_movements AS (
+            SELECT account_id, SUM(debit_total - credit_total) AS total
+            FROM account_period_balances
+            WHERE year_month < ?
+            GROUP BY account_id
+            UNION ALL
+            SELECT debited AS account_id, SUM(amount) AS total
+            FROM transactions
+            WHERE date >= ? AND date <= ?
+            GROUP BY debited
+            UNION ALL
+            SELECT credited AS account_id, -SUM(amount) AS total
+            FROM transactions
+            WHERE date >= ? AND date <= ?
+            GROUP BY credited
+        ),
+        account_totals AS (
+            SELECT account_id, SUM(total) AS balance
+            FROM account_movements
+            GROUP BY account_id
+        )
         SELECT
             a.id, -- Keep id if needed elsewhere, otherwise optional here
             a.name,
             a.code, -- Fetch the code
             at.name as account_type,
             at.normal_balance,
-            SUM(CASE
-                WHEN t.debited = a.id THEN t.amount
-                WHEN t.credited = a.id THEN -t.amount
-                ELSE 0
-            END) AS balance
+            COALESCE(tot.balance, 0) AS balance
         FROM accounts a
-        LEFT JOIN transactions t ON (a.id = t.debited OR a.id = t.credited) AND t.date <= ?
         JOIN account_types at ON a.type_id = at.id
-        WHERE a.type_id IN (
-            SELECT id FROM account_types WHERE name IN (
-                'Current Asset', 'Fixed Asset',
-                'Current Liability', 'Long-term Liability', 'Equity'
-            )
+        LEFT JOIN account_totals tot ON tot.account_id = a.id
+        WHERE at.name IN (
+            'Current Asset', 'Fixed Asset',
+            'Current Liability', 'Long-term Liability', 'Equity'
         ) -- Filter only relevant account types for balance sheet
-        GROUP BY a.id, a.name, a.code, at.name, at.normal_balance -- Group by all selected non-aggregated columns
         -- ORDER BY account type group first, then by code within the group
         ORDER BY
             CASE at.name
@@ -51,7 +67,7 @@ class BalanceSheet:
             a.code ASC; -- Sort by code ascending within each type
         """
 
-        self.cursor.execute(query, (data,))
+        self.cursor.execute(query, (year_month, month_start, data, month_start, data))
         accounts = self.cursor.fetchall() # Fetches all accounts, now sorted correctly
 
         # Initialize lists
@@ -64,7 +80,7 @@ class BalanceSheet:
         # Iterate through the *pre-sorted* accounts list and distribute them
         for conta in accounts:
             # Prepare the dictionary item (no need for code here unless interface needs it later)
-            item = {'name': conta['name'], 'balance': conta['balance'] or 0} # Use 0 if balance is None
+            item = {'name': conta['name'], 'balance': Money.from_db(conta['balance'])} # Stored as cents
 
             if conta['account_type'] == 'Current Asset':
                 ativos_circulantes.append(item)
@@ -85,12 +101,6 @@ class BalanceSheet:
         return ativos_circulantes, ativos_fixos, passivos_circulantes, passivos_nao_circulantes, patrimonio
 
     def close_connection(self):
-        """Close db connection if it's open."""
-        if self.conn:
-            try:
-                self.conn.close()
-                self.conn = None # Prevent trying to close again
-                self.cursor = None
-            except sqlite3.ProgrammingError:
-                 # Ignore error if connection is already closed
-                 pass
\ No newline at end of file
+        """Release the db connection (the thread's shared one stays open for reuse)."""
+        self.conn = None
+        self.cursor = None
\ No newline at end of file
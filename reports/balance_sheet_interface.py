@@ -8,11 +8,7 @@ from utils.crud.generic_crud import GenericCRUD
 from utils.formatters import format_table_name
 from .income_statement_core import generate_income_statement_data
 from PySide6.QtGui import QPalette, QColor
-
-# Define a small epsilon for zero comparison (half a cent)
-ZERO_THRESHOLD = 0.005
-# Define a smaller threshold for display formatting zero check
-DISPLAY_ZERO_THRESHOLD = 0.0001
+from utils.money import Money
 
 class BalanceSheetWindow(QWidget):
     def __init__(self, main_window):
@@ -199,22 +195,15 @@ class BalanceSheetWindow(QWidget):
     # --- CORRECTED FORMATTING LOGIC ---
     def format_amount(self, amount, is_right_side=False):
         """
-        Formats amount for display.
+        Formats a Money amount for display.
         - Uses parentheses for negative/contra balances.
-        - Rounds to 2 decimal places for display.
-        - Treats values very close to 0 as $ 0.00.
         - is_right_side: True for Liabilities & Equity, False for Assets.
                          Affects interpretation of positive/negative amount.
         """
-        # Treat amounts very close to zero as exactly zero for display
-        if abs(amount) < DISPLAY_ZERO_THRESHOLD:
+        # Amounts are exact cents, so zero is exactly zero
+        if not amount:
             return "$ 0.00"
-
-        # Round the non-zero amount for display
-        rounded_amount = round(amount, 2)
-        # Check again after rounding, as rounding could result in 0.00
-        if abs(rounded_amount) < DISPLAY_ZERO_THRESHOLD:
-             return "$ 0.00"
+        rounded_amount = amount
 
         if is_right_side:
             # L&E side:
@@ -241,9 +230,9 @@ class BalanceSheetWindow(QWidget):
 
     def add_line_item(self, section, name, amount, is_right_side=False):
         """Add a line item to a section only if amount is not effectively zero."""
-        # --- Check against the threshold FOR HIDING ---
-        if abs(amount) < ZERO_THRESHOLD:
-            return 0 # Return 0 so it doesn't affect sums, but don't display
+        # --- Hide zero balances ---
+        if not amount:
+            return Money() # Zero so it doesn't affect sums, but don't display
 
         # --- Proceed only if amount is significant enough to display ---
         item = QWidget()
@@ -322,7 +311,7 @@ class BalanceSheetWindow(QWidget):
 
             # Get income statement data for the period
             income_data = generate_income_statement_data(self.period_start, self.period_end)
-            net_income = income_data['Net Income'] if income_data else 0
+            net_income = income_data['Net Income'] if income_data else Money()
 
             # Clear previous content
             for section in [self.current_assets_section, self.fixed_assets_section,
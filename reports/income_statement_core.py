@@ -1,5 +1,6 @@
 import sqlite3
 from create_database import DatabaseManager
+from utils.money import Money
 
 def generate_income_statement_data(start_date, end_date):
     """
@@ -30,13 +31,13 @@ def generate_income_statement_data(start_date, end_date):
 
             revenues = []
             expenses = []
-            total_revenue = 0
-            total_expenses = 0
+            total_revenue = Money()
+            total_expenses = Money()
 
             for row in transactions:
                 account_name = row['account_name']
                 account_type = row['account_type']
-                balance = row['balance']
+                balance = Money.from_db(row['balance'])  # Exact sum of cents
 
                 if account_type == 'Revenue':
                     # Revenue accounts normally have credit balances (negative in our query)
@@ -0,0 +1,329 @@
+# sync/engine.py
+"""
+Delta sync between a local data directory and a RemoteStorage folder.
+
+Ordinary files are transferred whole when their MD5 differs. SQLite databases
+are stored remotely as content-addressed chunks plus a small manifest
+(<name>.manifest.json listing the chunk hashes in order), so an upload sends
+only the chunks the remote lacks and a download fetches only the chunks the
+local file lacks.
+"""
+import hashlib
+import json
+import os
+import threading
+from functools import partial
+from create_database import SQLITE_SIDECAR_SUFFIXES, connection_provider
+from ledger.settings import app_settings
+from sync.manifest import SyncManifest
+from sync.storage import file_md5
+from sync.transfers import TransferJob, TransferJournal
+
+DATABASE_SUFFIXES = ('.db', '.sqlite', '.sqlite3')
+CHUNK_SIZE = 1024 * 1024  # A multiple of the SQLite page size
+MANIFEST_SUFFIX = '.manifest.json'
+CHUNK_INFIX = '.chunk.'
+
+
+def is_database(name):
+    return name.endswith(DATABASE_SUFFIXES)
+
+
+class SyncEngine:
+    """
+    Compares and transfers files between local_dir and a RemoteStorage.
+
+    The remote folder is listed once and the listing is kept up to date by
+    this engine's own transfers; pass refresh=True to pick up changes made
+    elsewhere. Local hashes come from the SyncManifest cache at manifest_path.
+
+    upload()/download() move one file in the calling thread; upload_jobs() and
+    download_jobs() plan the same work for a TransferScheduler.
+    """
+
+    def __init__(self, storage, local_dir, manifest_path, chunk_size=CHUNK_SIZE, journal_path=None):
+        self.storage = storage
+        self.local_dir = local_dir
+        self.manifest = SyncManifest(manifest_path)
+        self.journal = TransferJournal(journal_path or os.path.splitext(manifest_path)[0] + ".transfers.json")
+        self.chunk_size = chunk_size
+        self._lock = threading.RLock()  # Guards the listing and the manifest cache across transfer threads
+        self._remote = None             # Raw remote listing for this session
+        self._remote_manifests = {}     # Manifest file MD5 -> parsed database manifest
+
+    # --- Remote listing ---
+    def remote_files(self, refresh=False):
+        """Raw remote listing {name: remote file}, fetched once per session."""
+        if self._remote is None or refresh:
+            self._remote = self.storage.list_files()
+        return self._remote
+
+    def _remote_manifest(self, manifest_file):
+        key = manifest_file.get('md5Checksum') or manifest_file['id']
+        if key not in self._remote_manifests:
+            self._remote_manifests[key] = json.loads(self.storage.download_bytes(manifest_file))
+        return self._remote_manifests[key]
+
+    def logical_remote_files(self, refresh=False):
+        """
+        Remote files as they appear locally: a chunked database shows up under
+        its own name with the MD5 of the whole file, and chunks are hidden.
+        """
+        files = {}
+        for name, remote in self.remote_files(refresh).items():
+            if CHUNK_INFIX in name:
+                continue
+            if name.endswith(MANIFEST_SUFFIX):
+                db_name = name[:-len(MANIFEST_SUFFIX)]
+                manifest = self._remote_manifest(remote)
+                # A chunked copy takes precedence over an older whole-file upload
+                files[db_name] = {'id': remote['id'], 'name': db_name, 'md5Checksum': manifest['md5'],
+                                  'size': str(manifest['size']), 'manifest': manifest}
+            elif name not in files:
+                files[name] = remote
+        return files
+
+    # --- Status ---
+    def local_files(self):
+        """Files in the local directory; SQLite's -wal/-shm files belong to the running app, never sync them."""
+        os.makedirs(self.local_dir, exist_ok=True)
+        return [f for f in sorted(os.listdir(self.local_dir))
+                if os.path.isfile(os.path.join(self.local_dir, f)) and not f.endswith(SQLITE_SIDECAR_SUFFIXES)]
+
+    def status(self, refresh=False):
+        """
+        Returns (files_to_upload, files_to_download) as lists of (name, remote
+        file or None). A file whose content differs on each side is in both.
+        """
+        remote_files = self.logical_remote_files(refresh)
+        files_to_upload, files_to_download = [], []
+        local_names = set()
+        for name in self.local_files():
+            local_names.add(name)
+            local_md5 = self.manifest.local_md5(name, os.path.join(self.local_dir, name))
+            remote = remote_files.get(name)
+            if remote is None:
+                files_to_upload.append((name, None))
+            elif local_md5 != remote.get('md5Checksum', ''):
+                files_to_upload.append((name, remote))
+                files_to_download.append((name, remote))
+        for name, remote in remote_files.items():
+            if name not in local_names:
+                files_to_download.append((name, remote))
+        self.manifest.save()
+        return files_to_upload, files_to_download
+
+    # --- Upload ---
+    def upload(self, name):
+        """Uploads one local file in this thread. Returns the number of bytes sent."""
+        return self._run_now(*self.upload_jobs(name))
+
+    def upload_jobs(self, name):
+        """
+        Plans an upload as (jobs, finish): jobs may run in any order and in
+        parallel, finish() runs once they all succeeded.
+
+        A database upload resumes by itself: chunks that reached the remote
+        before an interruption are in the listing and are not sent again.
+        """
+        file_path = os.path.join(self.local_dir, name)
+        if is_database(name):
+            return self._database_upload_jobs(name, file_path)
+
+        def run():
+            with self._lock:
+                md5 = self.manifest.local_md5(name, file_path)
+                remote = self.remote_files().get(name)
+            result = self.storage.upload_file(file_path, name, remote)
+            with self._lock:
+                self._remote[name] = result
+                self.manifest.record_transfer(name, file_path, md5, result['id'], result.get('md5Checksum'))
+            return os.path.getsize(file_path)
+
+        return [TransferJob(name, os.path.getsize(file_path), run)], self._save_manifest
+
+    def _database_upload_jobs(self, name, file_path):
+        remote = self.remote_files()
+        chunk_prefix = f"{name}{CHUNK_INFIX}"
+        md5_hash = hashlib.md5()
+        chunks, jobs, planned = [], [], set()
+        offset = 0
+
+        with open(file_path, 'rb') as f:
+            for data in iter(lambda: f.read(self.chunk_size), b""):
+                md5_hash.update(data)
+                digest = hashlib.sha256(data).hexdigest()
+                chunks.append(digest)
+                if chunk_prefix + digest not in remote and digest not in planned:
+                    planned.add(digest)
+                    jobs.append(TransferJob(name, len(data), partial(
+                        self._upload_chunk, name, file_path, offset, len(data), digest)))
+                offset += len(data)
+
+        manifest = {'file': name, 'size': offset, 'md5': md5_hash.hexdigest(),
+                    'chunk_size': self.chunk_size, 'chunks': chunks}
+
+        def finish():
+            # The manifest goes up only once every chunk it lists is there
+            data = json.dumps(manifest).encode('utf-8')
+            manifest_name = name + MANIFEST_SUFFIX
+            result = self.storage.upload_bytes(data, manifest_name, remote.get(manifest_name))
+            with self._lock:
+                remote[manifest_name] = result
+                self._remote_manifests[result.get('md5Checksum') or result['id']] = manifest
+
+            # Chunks no longer referenced by the manifest
+            referenced = set(chunks)
+            for chunk_name in [n for n in remote if n.startswith(chunk_prefix)]:
+                if chunk_name[len(chunk_prefix):] not in referenced:
+                    self.storage.delete(remote.pop(chunk_name))
+
+            with self._lock:
+                self.manifest.record_transfer(name, file_path, manifest['md5'], result['id'], manifest['md5'])
+            self._save_manifest()
+
+        return jobs, finish
+
+    def _upload_chunk(self, name, file_path, offset, length, digest):
+        with open(file_path, 'rb') as f:
+            f.seek(offset)
+            data = f.read(length)
+        if hashlib.sha256(data).hexdigest() != digest:
+            raise ValueError(f"{name} changed during the upload; sync it again.")
+        chunk_name = f"{name}{CHUNK_INFIX}{digest}"
+        result = self.storage.upload_bytes(data, chunk_name)
+        with self._lock:
+            self._remote[chunk_name] = result
+        return length
+
+    # --- Download ---
+    def download(self, name):
+        """Downloads one remote file over the local copy in this thread. Returns the bytes received."""
+        return self._run_now(*self.download_jobs(name))
+
+    def download_jobs(self, name):
+        """
+        Plans a download as (jobs, finish). Data is streamed into
+        <name>.download and, once verified, renamed over the local file or,
+        for a local database, restored into it (see _install_download).
+
+        A database download is journaled chunk by chunk: if it is interrupted,
+        the next download of the same remote version keeps the chunks already
+        written and fetches only the rest.
+        """
+        remote = self.logical_remote_files()[name]
+        file_path = os.path.join(self.local_dir, name)
+        temp_path = file_path + ".download"
+        os.makedirs(self.local_dir, exist_ok=True)
+        if 'manifest' in remote:
+            return self._database_download_jobs(name, file_path, temp_path, remote)
+
+        def run():
+            self.storage.download_file(remote, temp_path)
+            return os.path.getsize(temp_path)
+
+        def finish():
+            self._install_download(name, temp_path, file_path)
+            self._record_download(name, file_path, remote)
+
+        return [TransferJob(name, int(remote.get('size') or 0), run)], finish
+
+    def _database_download_jobs(self, name, file_path, temp_path, remote):
+        manifest = remote['manifest']
+        chunk_size, size = manifest['chunk_size'], manifest['size']
+        key = f"download:{name}"
+
+        session = self.journal.get(key)
+        if (session and session['md5'] == manifest['md5'] and os.path.exists(temp_path)
+                and os.path.getsize(temp_path) == size):
+            done = set(session['done'])  # Resume the interrupted download
+        else:
+            with open(temp_path, 'wb') as f:
+                f.truncate(size)
+            self.journal.start(key, manifest['md5'])
+            done = set()
+
+        # Chunks the local copy already has are copied instead of downloaded
+        local_offsets = {}
+        if os.path.exists(file_path):
+            with open(file_path, 'rb') as f:
+                offset = 0
+                for data in iter(lambda: f.read(chunk_size), b""):
+                    local_offsets.setdefault(hashlib.sha256(data).hexdigest(), offset)
+                    offset += len(data)
+
+        jobs = []
+        for index, digest in enumerate(manifest['chunks']):
+            if index in done:
+                continue
+            length = min(chunk_size, size - index * chunk_size)
+            local_offset = local_offsets.get(digest)
+            jobs.append(TransferJob(name, 0 if local_offset is not None else length, partial(
+                self._download_chunk, name, key, file_path, temp_path, index, digest, chunk_size, local_offset)))
+
+        def finish():
+            if file_md5(temp_path) != manifest['md5']:
+                self.journal.finish(key)
+                os.remove(temp_path)
+                raise ValueError(f"Downloaded {name} does not match its manifest.")
+            self._install_download(name, temp_path, file_path)
+            self.journal.finish(key)
+            self._record_download(name, file_path, remote)
+
+        return jobs, finish
+
+    def _download_chunk(self, name, key, file_path, temp_path, index, digest, chunk_size, local_offset):
+        received = 0
+        if local_offset is not None:
+            with open(file_path, 'rb') as f:
+                f.seek(local_offset)
+                data = f.read(chunk_size)
+        else:
+            chunk = self.remote_files().get(f"{name}{CHUNK_INFIX}{digest}")
+            if chunk is None:
+                raise ValueError(f"Remote chunk {digest} of {name} is missing; upload {name} again.")
+            data = self.storage.download_bytes(chunk)
+            received = len(data)
+        if hashlib.sha256(data).hexdigest() != digest:
+            raise ValueError(f"Chunk {digest} of {name} failed verification.")
+        with open(temp_path, 'r+b') as f:
+            f.seek(index * chunk_size)
+            f.write(data)
+        self.journal.mark_done(key, index)
+        return received
+
+    @staticmethod
+    def _install_download(name, temp_path, file_path):
+        """
+        Puts a verified download in place. A database that exists locally may
+        be open with a live WAL, so it is restored into rather than replaced.
+        """
+        if not is_database(name):
+            os.replace(temp_path, file_path)
+            return
+        if os.path.exists(file_path):
+            connection_provider.restore(file_path, temp_path)
+            os.remove(temp_path)
+        else:
+            # A leftover WAL would be replayed onto the new file
+            for suffix in SQLITE_SIDECAR_SUFFIXES:
+                if os.path.exists(file_path + suffix):
+                    os.remove(file_path + suffix)
+            os.replace(temp_path, file_path)
+        app_settings.accounts_changed()  # The configured accounts may not exist in the downloaded ledger
+
+    def _record_download(self, name, file_path, remote):
+        with self._lock:
+            self.manifest.record_transfer(name, file_path, remote['md5Checksum'], remote['id'], remote['md5Checksum'])
+        self._save_manifest()
+
+    # --- Helpers ---
+    def _save_manifest(self):
+        with self._lock:
+            self.manifest.save()
+
+    @staticmethod
+    def _run_now(jobs, finish):
+        moved = sum(job.run() for job in jobs)
+        finish()
+        return moved
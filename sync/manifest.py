@@ -0,0 +1,52 @@
+# sync/manifest.py
+
+import json
+import os
+from sync.storage import file_md5
+
+
+class SyncManifest:
+    """
+    Local cache of what is known about each synced file:
+    {name: {'size', 'mtime_ns', 'md5', 'remote_id', 'remote_md5'}}.
+
+    A file is only re-hashed when its size or modification time changed, and
+    remote_md5 records what the remote held after the last transfer, so an
+    untouched file on both sides needs no hashing at all.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.entries = {}
+        if os.path.exists(path):
+            try:
+                with open(path, 'r') as f:
+                    self.entries = json.load(f)
+            except (OSError, json.JSONDecodeError):
+                print(f"Warning: sync manifest {path} unreadable, rebuilding it.")
+
+    def local_md5(self, name, file_path):
+        """MD5 of a local file, from the cache when size and mtime are unchanged."""
+        stat = os.stat(file_path)
+        entry = self.entries.get(name)
+        if entry and entry.get('size') == stat.st_size and entry.get('mtime_ns') == stat.st_mtime_ns:
+            return entry['md5']
+        md5 = file_md5(file_path)
+        self.entries[name] = {**(entry or {}), 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'md5': md5}
+        return md5
+
+    def record_transfer(self, name, file_path, md5, remote_id, remote_md5):
+        """Notes that the local file and the remote copy now hold the same content."""
+        stat = os.stat(file_path)
+        self.entries[name] = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'md5': md5,
+                              'remote_id': remote_id, 'remote_md5': remote_md5}
+
+    def forget(self, name):
+        self.entries.pop(name, None)
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        temp_path = self.path + ".tmp"
+        with open(temp_path, 'w') as f:
+            json.dump(self.entries, f, indent=1)
+        os.replace(temp_path, self.path)
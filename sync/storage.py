@@ -0,0 +1,169 @@
+# sync/storage.py
+"""
+Remote storage behind the sync engine.
+
+SyncEngine only talks to a RemoteStorage, so Google Drive can be swapped for
+LocalFolderStorage (a plain directory) when trying things out or testing.
+Remote files are described by dicts with 'id', 'name', 'md5Checksum' and
+'size', the shape Google Drive returns.
+"""
+import hashlib
+import io
+import os
+import threading
+from pathlib import Path
+
+HASH_BUFFER_SIZE = 1024 * 1024
+
+
+def file_md5(file_path):
+    """MD5 of a file, read in large buffers."""
+    md5_hash = hashlib.md5()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(HASH_BUFFER_SIZE), b""):
+            md5_hash.update(block)
+    return md5_hash.hexdigest()
+
+
+class RemoteStorage:
+    """A flat folder of named files somewhere else."""
+
+    def list_files(self):
+        """Returns {name: remote file dict} for every file in the folder."""
+        raise NotImplementedError
+
+    def upload_file(self, local_file_path, name, remote=None):
+        """Creates `name` (or replaces `remote`) with a local file's content. Returns the remote file dict."""
+        raise NotImplementedError
+
+    def upload_bytes(self, data, name, remote=None):
+        """Like upload_file, from bytes in memory."""
+        raise NotImplementedError
+
+    def download_file(self, remote, local_file_path, progress=None):
+        """Writes a remote file to a local path; progress(fraction) while it downloads."""
+        raise NotImplementedError
+
+    def download_bytes(self, remote):
+        raise NotImplementedError
+
+    def delete(self, remote):
+        raise NotImplementedError
+
+
+class GoogleDriveStorage(RemoteStorage):
+    """
+    One Google Drive folder, through an authenticated Drive v3 service.
+
+    A Drive service (its HTTP connection) must not be shared between threads,
+    so when transfers run in parallel each thread builds its own through
+    service_factory(); without a factory drive_service is used everywhere.
+    """
+
+    FIELDS = "id, name, md5Checksum, size"
+
+    def __init__(self, drive_service, folder_id, service_factory=None):
+        self._main_service = drive_service
+        self._main_thread = threading.get_ident()
+        self.folder_id = folder_id
+        self.service_factory = service_factory
+        self._local = threading.local()
+
+    @property
+    def drive_service(self):
+        if self.service_factory is None or threading.get_ident() == self._main_thread:
+            return self._main_service
+        if getattr(self._local, 'service', None) is None:
+            self._local.service = self.service_factory()
+        return self._local.service
+
+    def list_files(self):
+        files = {}
+        page_token = None
+        query = f"'{self.folder_id}' in parents and trashed = false"
+        while True:
+            results = self.drive_service.files().list(
+                q=query, fields=f"nextPageToken, files({self.FIELDS})",
+                pageSize=1000, pageToken=page_token).execute()
+            for item in results.get('files', []):
+                files[item['name']] = item
+            page_token = results.get('nextPageToken')
+            if not page_token:
+                return files
+
+    def _upload(self, media, name, remote):
+        if remote:
+            return self.drive_service.files().update(
+                fileId=remote['id'], media_body=media, fields=self.FIELDS).execute()
+        file_metadata = {'name': name, 'parents': [self.folder_id]}
+        return self.drive_service.files().create(
+            body=file_metadata, media_body=media, fields=self.FIELDS).execute()
+
+    def upload_file(self, local_file_path, name, remote=None):
+        from googleapiclient.http import MediaFileUpload
+        return self._upload(MediaFileUpload(local_file_path, resumable=True), name, remote)
+
+    def upload_bytes(self, data, name, remote=None):
+        from googleapiclient.http import MediaIoBaseUpload
+        media = MediaIoBaseUpload(io.BytesIO(data), mimetype='application/octet-stream', resumable=True)
+        return self._upload(media, name, remote)
+
+    def _download_to(self, remote, handle, progress=None):
+        from googleapiclient.http import MediaIoBaseDownload
+        request = self.drive_service.files().get_media(fileId=remote['id'])
+        downloader = MediaIoBaseDownload(handle, request)
+        done = False
+        while not done:
+            status, done = downloader.next_chunk()
+            if progress and status:
+                progress(status.progress())
+
+    def download_file(self, remote, local_file_path, progress=None):
+        with open(local_file_path, "wb") as f:
+            self._download_to(remote, f, progress)
+
+    def download_bytes(self, remote):
+        buffer = io.BytesIO()
+        self._download_to(remote, buffer)
+        return buffer.getvalue()
+
+    def delete(self, remote):
+        self.drive_service.files().delete(fileId=remote['id']).execute()
+
+
+class LocalFolderStorage(RemoteStorage):
+    """A local directory standing in for the remote folder (file ids are the names)."""
+
+    def __init__(self, root):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def _describe(self, path):
+        return {'id': path.name, 'name': path.name, 'md5Checksum': file_md5(path),
+                'size': str(path.stat().st_size)}
+
+    def list_files(self):
+        return {path.name: self._describe(path) for path in self.root.iterdir() if path.is_file()}
+
+    def upload_file(self, local_file_path, name, remote=None):
+        with open(local_file_path, "rb") as f:
+            return self.upload_bytes(f.read(), name, remote)
+
+    def upload_bytes(self, data, name, remote=None):
+        path = self.root / (remote['id'] if remote else name)
+        temp_path = path.with_name(path.name + ".part")
+        temp_path.write_bytes(data)
+        os.replace(temp_path, path)
+        return self._describe(path)
+
+    def download_file(self, remote, local_file_path, progress=None):
+        with open(local_file_path, "wb") as f:
+            f.write(self.download_bytes(remote))
+        if progress:
+            progress(1.0)
+
+    def download_bytes(self, remote):
+        return (self.root / remote['id']).read_bytes()
+
+    def delete(self, remote):
+        (self.root / remote['id']).unlink()
@@ -0,0 +1,167 @@
+# sync/transfers.py
+"""
+Parallel transfer scheduling for the sync engine.
+
+SyncEngine splits every upload or download into independent jobs (a chunk or
+a whole small file) plus a finish step. TransferScheduler runs the jobs of
+many files on a bounded thread pool, finishes each file once its jobs are
+done and reports throughput and ETA. Download progress is journaled to disk,
+so an interrupted sync resumes where it stopped.
+"""
+import json
+import os
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# size: bytes the job moves over the network (0 for local copies)
+# run(): performs it and returns the bytes actually moved
+TransferJob = namedtuple('TransferJob', 'name size run')
+
+MAX_WORKERS = 4
+
+
+class TransferJournal:
+    """
+    Resumable transfer sessions persisted as JSON: {key: {'md5', 'done': [...]}}.
+
+    Marked progress is written at most every flush_interval seconds (and on
+    flush), so a crash costs at most that much repeated work.
+    """
+
+    def __init__(self, path, flush_interval=1.0):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.sessions = {}
+        self._lock = threading.Lock()
+        self._last_flush = 0.0
+        self._dirty = False
+        if os.path.exists(path):
+            try:
+                with open(path, 'r') as f:
+                    self.sessions = json.load(f)
+            except (OSError, json.JSONDecodeError):
+                print(f"Warning: transfer journal {path} unreadable, starting over.")
+
+    def get(self, key):
+        with self._lock:
+            return self.sessions.get(key)
+
+    def start(self, key, md5):
+        """Begins (or restarts) a session for content with the given MD5."""
+        with self._lock:
+            self.sessions[key] = {'md5': md5, 'done': []}
+            self._dirty = True
+        self.flush()
+
+    def mark_done(self, key, item):
+        with self._lock:
+            self.sessions[key]['done'].append(item)
+            self._dirty = True
+            due = time.monotonic() - self._last_flush >= self.flush_interval
+        if due:
+            self.flush()
+
+    def finish(self, key):
+        with self._lock:
+            self.sessions.pop(key, None)
+            self._dirty = True
+        self.flush()
+
+    def flush(self):
+        with self._lock:
+            if not self._dirty:
+                return
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            temp_path = self.path + ".tmp"
+            with open(temp_path, 'w') as f:
+                json.dump(self.sessions, f)
+            os.replace(temp_path, self.path)
+            self._dirty = False
+            self._last_flush = time.monotonic()
+
+
+class TransferScheduler:
+    """
+    Runs uploads or downloads of several files on a bounded thread pool.
+
+    report(done_bytes, total_bytes, bytes_per_second, eta_seconds) is called
+    after every finished job (eta_seconds is None until a rate is known) and
+    status(text) when a file completes or fails. Both are called from the
+    thread running run().
+    """
+
+    def __init__(self, engine, max_workers=MAX_WORKERS, report=None, status=None):
+        self.engine = engine
+        self.max_workers = max_workers
+        self.report = report
+        self.status = status
+
+    def _status(self, text):
+        if self.status:
+            self.status(text)
+
+    def run(self, direction, names):
+        """
+        Transfers the named files ('upload' or 'download'). Returns
+        {name: error message} for the files that failed; the others are done.
+        """
+        plan = self.engine.upload_jobs if direction == 'upload' else self.engine.download_jobs
+        failed = {}
+        files = {}  # name -> [jobs left, finish]
+        jobs = []
+        for name in names:
+            try:
+                file_jobs, finish = plan(name)
+            except Exception as e:
+                failed[name] = str(e)
+                self._status(f"Error with {name}: {e}")
+                continue
+            files[name] = [len(file_jobs), finish]
+            jobs.extend(file_jobs)
+
+        total = sum(job.size for job in jobs)
+        done = 0
+        started = time.monotonic()
+        try:
+            # Files with nothing left to move only need finishing
+            for name, (left, finish) in files.items():
+                if left == 0:
+                    self._finish(name, finish, failed)
+
+            with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                futures = {pool.submit(job.run): job for job in jobs}
+                for future in as_completed(futures):
+                    job = futures[future]
+                    if future.cancelled():
+                        continue
+                    try:
+                        done += future.result()
+                    except Exception as e:
+                        if job.name not in failed:
+                            failed[job.name] = str(e)
+                            self._status(f"Error with {job.name}: {e}")
+                            # Jobs of a failed file that have not started are dropped
+                            for other, other_job in futures.items():
+                                if other_job.name == job.name:
+                                    other.cancel()
+                    files[job.name][0] -= 1
+                    if files[job.name][0] == 0 and job.name not in failed:
+                        self._finish(job.name, files[job.name][1], failed)
+                    if self.report:
+                        elapsed = time.monotonic() - started
+                        rate = done / elapsed if elapsed > 0 else 0.0
+                        eta = (total - done) / rate if rate > 0 else None
+                        self.report(done, total, rate, eta)
+        finally:
+            self.engine.journal.flush()
+        return failed
+
+    def _finish(self, name, finish, failed):
+        try:
+            finish()
+            self._status(f"Completed: {name}")
+        except Exception as e:
+            failed[name] = str(e)
+            self._status(f"Error with {name}: {e}")
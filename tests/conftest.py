@@ -0,0 +1,40 @@
+# tests/conftest.py
+import shutil
+from datetime import date
+from pathlib import Path
+import pytest
+from benchmarks.synthetic_ledger import generate_ledger
+from create_database import DatabaseManager, connection_provider, create_database
+
+SHIPPED_DATA = Path(__file__).resolve().parent.parent / 'data'
+
+
+@pytest.fixture
+def database(tmp_path, monkeypatch):
+    """A freshly created and fully migrated data/financial_system.db in a temporary working directory."""
+    monkeypatch.chdir(tmp_path)  # DatabaseManager and the settings files use ./data
+    assert create_database()
+    with DatabaseManager() as db:
+        yield db
+    connection_provider.close_thread_connections()
+
+
+@pytest.fixture
+def shipped_database(tmp_path, monkeypatch):
+    """A migrated copy of the shipped data/ folder (database and settings files)."""
+    if not (SHIPPED_DATA / 'financial_system.db').exists():
+        pytest.skip("no shipped database")
+    shutil.copytree(SHIPPED_DATA, tmp_path / 'data', ignore=shutil.ignore_patterns('*.db-wal', '*.db-shm'))
+    monkeypatch.chdir(tmp_path)
+    assert create_database()
+    with DatabaseManager() as db:
+        yield db
+    connection_provider.close_thread_connections()
+
+
+@pytest.fixture
+def synthetic_ledger(tmp_path, monkeypatch):
+    """A small generated ledger; yields generate_ledger()'s summary."""
+    monkeypatch.chdir(tmp_path)
+    yield generate_ledger(postings=5_000, years=2, end_date=date(2025, 6, 30), seed=1)
+    connection_provider.close_thread_connections()
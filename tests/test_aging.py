@@ -0,0 +1,98 @@
+# tests/test_aging.py
+import pytest
+from ar_ap.aging_core import AgingCache, aging_summary, open_items
+from ledger.ar_ap import CREDITOR, DEBTOR
+from utils.money import Money
+
+AS_OF = '2025-06-30'
+
+
+@pytest.fixture
+def parties(database):
+    """Add a movement with add(party, date, amount, type); returns (add, {name: id})."""
+    ids = {}
+    for name, kind in (('Debtor A', DEBTOR), ('Debtor B', DEBTOR), ('Creditor C', CREDITOR)):
+        database.cursor.execute("INSERT INTO debtor_creditor (name, normalized_name, account, amount) "
+                                "VALUES (?, ?, ?, 0)", (name, name.lower(), kind))
+        ids[name] = database.cursor.lastrowid
+
+    def add(name, date, amount, movement):
+        database.cursor.execute("INSERT INTO debtor_creditor_transactions (date, details, amount, debtor_creditor, type) "
+                                "VALUES (?, ?, ?, ?, ?)", (date, f"{name} {movement}", Money.parse(amount), ids[name], movement))
+        database.commit()
+
+    return add, ids
+
+
+def rows_by_name(database):
+    return {row.name: row for row in aging_summary(database.cursor, AS_OF)}
+
+
+def test_partial_payments_settle_the_oldest_charges_first(database, parties):
+    add, ids = parties
+    add('Debtor A', '2025-03-01', 100, 'Outflow')  # 121 days old
+    add('Debtor A', '2025-05-15', 200, 'Outflow')  # 46 days
+    add('Debtor A', '2025-06-20', 50, 'Outflow')   # 10 days
+    add('Debtor A', '2025-06-25', 130, 'Inflow')   # Pays March in full and 30 of May
+
+    row = rows_by_name(database)['Debtor A']
+    assert row.balance == Money.parse('220')
+    assert row.buckets == (Money.parse('50'), Money.parse('170'), Money(0), Money(0))
+    assert [(item.date, item.amount, item.open_amount, item.age)
+            for item in open_items(database.cursor, AS_OF, party_id=ids['Debtor A'])] == [
+        ('2025-05-15', Money.parse('200'), Money.parse('170'), 46),
+        ('2025-06-20', Money.parse('50'), Money.parse('50'), 10),
+    ]
+
+
+def test_creditor_charges_are_inflows(database, parties):
+    add, _ = parties
+    add('Creditor C', '2025-02-01', 80, 'Inflow')
+    add('Creditor C', '2025-06-01', 20, 'Outflow')
+
+    row = rows_by_name(database)['Creditor C']
+    assert row.kind == CREDITOR
+    assert row.balance == Money.parse('60')
+    assert row.buckets == (Money(0), Money(0), Money(0), Money.parse('60'))
+
+
+def test_overpayment_leaves_a_negative_balance_and_no_open_items(database, parties):
+    add, ids = parties
+    add('Debtor B', '2025-04-01', 75.5, 'Outflow')
+    add('Debtor B', '2025-04-10', 100, 'Inflow')
+
+    row = rows_by_name(database)['Debtor B']
+    assert row.balance == Money.parse('-24.50')
+    assert row.buckets == (Money(0),) * 4
+    assert open_items(database.cursor, AS_OF, party_id=ids['Debtor B']) == []
+
+
+def test_movements_after_the_as_of_date_are_ignored(database, parties):
+    add, _ = parties
+    add('Debtor A', '2025-06-01', 40, 'Outflow')
+    add('Debtor A', '2025-07-05', 40, 'Inflow')
+    assert rows_by_name(database)['Debtor A'].balance == Money.parse('40')
+
+
+def test_cache_is_refreshed_after_a_movement(database, parties):
+    add, _ = parties
+    cache = AgingCache()
+    add('Debtor A', '2025-06-01', 40, 'Outflow')
+    first = cache.summary(AS_OF)
+    assert cache.summary(AS_OF) is first  # Served from the cache
+
+    add('Debtor A', '2025-06-10', 15, 'Inflow')
+    refreshed = {row.name: row for row in cache.summary(AS_OF)}
+    assert refreshed['Debtor A'].balance == Money.parse('25')
+
+    database.cursor.execute("DELETE FROM debtor_creditor_transactions")
+    database.commit()
+    assert {row.name: row for row in cache.summary(AS_OF)}['Debtor A'].balance == Money(0)
+
+
+def test_cache_keeps_the_latest_dates(database, parties):
+    cache = AgingCache(max_dates=2)
+    first = cache.summary('2025-01-31')
+    cache.summary('2025-02-28')
+    cache.summary('2025-03-31')
+    assert cache.summary('2025-01-31') is not first  # Evicted and recomputed
@@ -0,0 +1,83 @@
+# tests/test_ar_ap.py
+import pytest
+from ledger import LedgerError, adjust_party_movement, record_party_movement
+from ledger.ar_ap import CREDITOR, DEBTOR
+from ledger.settings import app_settings
+from utils.money import Money
+
+CASH, RECEIVABLE, PAYABLE = 1, 2, 3
+
+
+@pytest.fixture
+def ar_ap(database):
+    """Cash, receivable and payable accounts, the AR/AP settings, a debtor (1) and a creditor (2)."""
+    cursor = database.cursor
+    for account_id, name in ((CASH, 'Cash'), (RECEIVABLE, 'Receivable'), (PAYABLE, 'Payable')):
+        cursor.execute("INSERT INTO accounts (id, code, name, normalized_name, type_id) VALUES (?, ?, ?, ?, 1)",
+                       (account_id, str(account_id), name, name.lower()))
+    for name, kind in (('Debtor', DEBTOR), ('Creditor', CREDITOR)):
+        cursor.execute("INSERT INTO debtor_creditor (name, normalized_name, account, amount) VALUES (?, ?, ?, 0)",
+                       (name, name.lower(), kind))
+    database.commit()
+    app_settings.save('ar_ap_settings.json', {'receivable_account_id': str(RECEIVABLE),
+                                              'payable_account_id': str(PAYABLE)})
+    yield database
+    app_settings.invalidate()
+
+
+def state(cursor, movement_id):
+    """(movement amount, party amount, posting amount, {account: balance}) as Money."""
+    cursor.execute("SELECT m.amount, p.amount FROM debtor_creditor_transactions m "
+                   "JOIN debtor_creditor p ON p.id = m.debtor_creditor WHERE m.id = ?", (movement_id,))
+    movement, party = cursor.fetchone()
+    cursor.execute("SELECT amount FROM transactions WHERE source_ref = 'debtor_creditor_transactions' "
+                   "AND source_id = ?", (movement_id,))
+    posting = cursor.fetchone()[0]
+    cursor.execute("SELECT id, balance FROM accounts")
+    balances = {row['id']: Money.from_db(row['balance']) for row in cursor.fetchall()}
+    return Money.from_db(movement), Money.from_db(party), Money.from_db(posting), balances
+
+
+def movement_id(cursor, transaction_id):
+    cursor.execute("SELECT source_id FROM transactions WHERE id = ?", (transaction_id,))
+    return cursor.fetchone()[0]
+
+
+@pytest.mark.parametrize('party_id, movement, control, party_sign', [
+    (1, 'Outflow', RECEIVABLE, 1),   # Amount lent to a debtor
+    (1, 'Inflow', RECEIVABLE, -1),   # Debtor paying back
+    (2, 'Inflow', PAYABLE, 1),       # Amount owed to a creditor
+    (2, 'Outflow', PAYABLE, -1),     # Paying the creditor
+])
+def test_adjustment_moves_the_difference_everywhere(ar_ap, party_id, movement, control, party_sign):
+    cursor = ar_ap.cursor
+    transaction_id = record_party_movement(cursor, party_id, movement, '2025-03-01', 'Original', '100', CASH)
+    movement_row = movement_id(cursor, transaction_id)
+
+    assert adjust_party_movement(cursor, movement_row, 'Adjusted', '130.25') == transaction_id
+    expected = Money.parse('130.25')
+    cash_sign = 1 if movement == 'Inflow' else -1  # Inflows debit the cash account
+    movement_amount, party_amount, posting_amount, balances = state(cursor, movement_row)
+    assert (movement_amount, party_amount, posting_amount) == (expected, party_sign * expected, expected)
+    assert (balances[CASH], balances[control]) == (cash_sign * expected, -cash_sign * expected)
+    cursor.execute("SELECT description, date FROM transactions WHERE id = ?", (transaction_id,))
+    assert tuple(cursor.fetchone()) == ('Adjusted', '2025-03-01')
+
+
+def test_invalid_movement_type_writes_nothing(ar_ap):
+    cursor = ar_ap.cursor
+    transaction_id = record_party_movement(cursor, 1, 'Outflow', '2025-03-01', 'Original', '100', CASH)
+    movement_row = movement_id(cursor, transaction_id)
+    cursor.execute("UPDATE debtor_creditor_transactions SET type = 'Transfer' WHERE id = ?", (movement_row,))
+    before = state(cursor, movement_row)
+
+    with pytest.raises(LedgerError, match="Invalid transaction type"):
+        adjust_party_movement(cursor, movement_row, 'Adjusted', '130')
+    assert state(cursor, movement_row) == before
+
+
+def test_non_positive_amount_is_rejected(ar_ap):
+    cursor = ar_ap.cursor
+    transaction_id = record_party_movement(cursor, 1, 'Outflow', '2025-03-01', 'Original', '100', CASH)
+    with pytest.raises(LedgerError, match="positive"):
+        adjust_party_movement(cursor, movement_id(cursor, transaction_id), 'Adjusted', '0')
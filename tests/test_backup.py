@@ -0,0 +1,126 @@
+# tests/test_backup.py
+import datetime
+import json
+import sqlite3
+import threading
+import zlib
+import pytest
+import backup_core
+from backup_core import BackupSystem, ChunkStore
+
+CHUNK_SIZE = 16 * 1024
+
+
+@pytest.fixture
+def backups(database, tmp_path):
+    """A BackupSystem over the test database's data directory, with a fuller ledger to chunk."""
+    database.cursor.executemany(
+        "INSERT INTO accounts (code, name, normalized_name, type_id) VALUES (?, ?, ?, 1)",
+        [(str(n), f"Account {n} " + "x" * 200, f"account {n}") for n in range(1, 400)])
+    database.commit()
+    return BackupSystem(backup_dir=str(tmp_path / 'backups'), data_dir=str(tmp_path / 'data'),
+                        chunk_size=CHUNK_SIZE)
+
+
+def chunk_files(backup_system):
+    return {path.name for path in backup_system.chunks.root.glob('*/*')}
+
+
+def manifest(backup_system, name):
+    with open(backup_system.manifest_dir + '/' + name) as f:
+        return json.load(f)
+
+
+def test_chunk_store_keeps_each_chunk_once(tmp_path):
+    store = ChunkStore(tmp_path / 'chunks')
+    digest, written = store.put(b'page' * 1000)
+    assert written > 0
+    assert store.put(b'page' * 1000) == (digest, 0)
+    assert store.get(digest) == b'page' * 1000
+
+
+def test_unchanged_data_adds_no_chunks(backups, database):
+    assert backups.create_backup()
+    first = chunk_files(backups)
+    assert backups.create_backup()
+    assert chunk_files(backups) == first
+
+    database.cursor.execute("UPDATE accounts SET name = 'Renamed' WHERE id = 1")
+    database.commit()
+    assert backups.create_backup()
+    added = chunk_files(backups) - first
+    assert 0 < len(added) < len(first) / 2
+    assert len(backups.list_backups()) == 3
+
+
+def test_backups_in_the_same_instant_get_their_own_manifest(backups, monkeypatch):
+    class FrozenDatetime(datetime.datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return cls(2025, 6, 30, 12, 0, 0, 123456)
+
+    monkeypatch.setattr(backup_core.datetime, 'datetime', FrozenDatetime)
+    assert backups.create_backup() and backups.create_backup()
+    assert backups.list_backups() == ['fintrack_backup_20250630_120000_123456.json',
+                                      'fintrack_backup_20250630_120000_123456_1.json']
+
+
+def test_rotation_sweeps_unreferenced_chunks(backups, database):
+    backups.max_backups = 1
+    assert backups.create_backup()
+    database.cursor.execute("DELETE FROM accounts WHERE id > 200")
+    database.commit()
+    assert backups.create_backup()
+
+    [kept] = backups.list_backups()
+    referenced = {digest for entry in manifest(backups, kept)['files'].values() for digest in entry['chunks']}
+    assert chunk_files(backups) == referenced
+
+
+def test_restore_rebuilds_the_snapshot_byte_for_byte(backups, database, tmp_path):
+    assert backups.create_backup()
+    # The same online-backup snapshot of the (unchanged) database, taken directly
+    snapshot = sqlite3.connect(tmp_path / 'snapshot.db')
+    database.conn.backup(snapshot)
+    snapshot.close()
+
+    restored = backups.restore_backup(backups.list_backups()[-1], tmp_path / 'restored')
+    assert 'data/financial_system.db' in restored
+    restored_db = tmp_path / 'restored' / 'data' / 'financial_system.db'
+    assert restored_db.read_bytes() == (tmp_path / 'snapshot.db').read_bytes()
+    for name in restored:
+        if not name.endswith('.db'):
+            assert (tmp_path / 'restored' / name).read_bytes() == (tmp_path / name).read_bytes()
+
+
+def test_restore_rejects_a_corrupted_chunk(backups, tmp_path):
+    assert backups.create_backup()
+    path = next(backups.chunks.root.glob('*/*'))
+    path.write_bytes(zlib.compress(b'tampered'))
+    with pytest.raises(ValueError, match="corrupted"):
+        backups.restore_backup(backups.list_backups()[-1], tmp_path / 'restored')
+
+
+def test_progress_is_reported_up_to_the_total(backups):
+    reports = []
+    assert backups.create_backup(progress=lambda done, total: reports.append((done, total)))
+    assert reports and reports == sorted(reports)
+    done, total = reports[-1]
+    assert done == total > 0
+
+
+def test_concurrent_backups_run_one_after_the_other(backups):
+    """An idle-time backup on a worker and the close-time one can overlap; each still completes."""
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(backups.create_backup())) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == [True] * 3
+    names = backups.list_backups()
+    assert len(set(names)) == 3
+    referenced = {digest for name in names for entry in manifest(backups, name)['files'].values()
+                  for digest in entry['chunks']}
+    assert chunk_files(backups) == referenced
@@ -0,0 +1,87 @@
+# tests/test_balance_sheet.py
+"""
+Differential test: the per-side aggregation in BalanceSheet.calcular_saldos_na_data
+(monthly snapshots plus the partial month) must give the same balances as the
+original single query that LEFT JOINs transactions on debited OR credited.
+"""
+from datetime import date, timedelta
+from create_database import DatabaseManager
+from reports.balance_sheet_core import BalanceSheet
+from utils.money import Money
+
+ACCOUNT_TYPES = ('Current Asset', 'Fixed Asset', 'Current Liability', 'Long-term Liability', 'Equity')
+
+# The query calcular_saldos_na_data used before the rewrite, kept as the reference
+OR_JOIN_QUERY = """
+    SELECT
+        a.id,
+        a.name,
+        a.code,
+        at.name as account_type,
+        at.normal_balance,
+        SUM(CASE
+            WHEN t.debited = a.id THEN t.amount
+            WHEN t.credited = a.id THEN -t.amount
+            ELSE 0
+        END) AS balance
+    FROM accounts a
+    LEFT JOIN transactions t ON (a.id = t.debited OR a.id = t.credited) AND t.date <= ?
+    JOIN account_types at ON a.type_id = at.id
+    WHERE a.type_id IN (
+        SELECT id FROM account_types WHERE name IN (
+            'Current Asset', 'Fixed Asset',
+            'Current Liability', 'Long-term Liability', 'Equity'
+        )
+    )
+    GROUP BY a.id, a.name, a.code, at.name, at.normal_balance
+    ORDER BY
+        CASE at.name
+            WHEN 'Current Asset' THEN 1
+            WHEN 'Fixed Asset' THEN 2
+            WHEN 'Current Liability' THEN 3
+            WHEN 'Long-term Liability' THEN 4
+            WHEN 'Equity' THEN 5
+            ELSE 99
+        END,
+        a.code ASC
+"""
+
+
+def or_join_balances(as_of):
+    with DatabaseManager() as db:
+        db.cursor.execute(OR_JOIN_QUERY, (as_of,))
+        return [(row['account_type'], row['name'], Money.from_db(row['balance'])) for row in db.cursor.fetchall()]
+
+
+def balance_sheet_balances(as_of):
+    sections = BalanceSheet().calcular_saldos_na_data(as_of)
+    return [(account_type, item['name'], item['balance'])
+            for account_type, items in zip(ACCOUNT_TYPES, sections) for item in items]
+
+
+def as_of_dates(first, last):
+    """Month ends, mid-months and the days around the ledger's range."""
+    first, last = date.fromisoformat(first), date.fromisoformat(last)
+    dates = {first - timedelta(days=1), first, last, last + timedelta(days=40)}
+    day = first.replace(day=1)
+    while day <= last:
+        next_month = (day + timedelta(days=32)).replace(day=1)
+        dates.update({day, day + timedelta(days=14), next_month - timedelta(days=1)})
+        day = next_month
+    return sorted(dates)
+
+
+def assert_same_balances(db):
+    db.cursor.execute("SELECT MIN(date), MAX(date) FROM transactions")
+    first, last = db.cursor.fetchone()
+    for as_of in as_of_dates(first, last):
+        assert balance_sheet_balances(as_of.isoformat()) == or_join_balances(as_of.isoformat()), as_of
+
+
+def test_matches_or_join_on_shipped_database(shipped_database):
+    assert_same_balances(shipped_database)
+
+
+def test_matches_or_join_on_synthetic_ledger(synthetic_ledger):
+    with DatabaseManager() as db:
+        assert_same_balances(db)
@@ -0,0 +1,145 @@
+# tests/test_bank_import.py
+import pytest
+from bank_import.import_core import backfill_import_hashes, import_statement
+from bank_import.import_rules import CounterpartMatcher
+from bank_import.statement_readers import StatementError, iter_statement
+from ledger import post_transaction, update_transaction
+from utils.money import Money
+
+CSV_STATEMENT = """\
+Date,Description,Amount
+2025-03-01,PAYROLL ACME,"2,500.00"
+2025-03-02,Padaria São João,-12.50
+2025-03-02,Padaria São João,-12.50
+2025-03-03,POS 1234 FUEL STATION,(80.00)
+2025-03-04,Unknown shop,-5.00
+2025-03-05,Zero fee,0.00
+"""
+
+CSV_DEBIT_CREDIT = """\
+Extrato conta corrente
+Data;Histórico;Saída;Entrada
+05/03/2025;Aluguel;1.200,00;
+06/03/2025;Pix recebido;;350,75
+"""
+
+OFX_STATEMENT = """\
+OFXHEADER:100
+DATA:OFXSGML
+<OFX><BANKMSGSRSV1><STMTTRNRS><STMTRS><BANKTRANLIST>
+<STMTTRN><TRNTYPE>DEBIT<DTPOSTED>20250307120000[-3:BRT]<TRNAMT>-42.10<FITID>A1<NAME>Market &amp; Co<MEMO>Groceries</STMTTRN>
+<STMTTRN><TRNTYPE>CREDIT<DTPOSTED>20250308<TRNAMT>100.00<FITID>A2<NAME>Refund<MEMO>Refund</STMTTRN>
+</BANKTRANLIST></STMTRS></STMTTRNRS></BANKMSGSRSV1></OFX>
+"""
+
+RULES = [
+    {'pattern': 'payroll', 'account_id': 2},
+    {'pattern': 'padaria sao joao', 'account_id': 3},
+    {'pattern': '^POS .*FUEL', 'regex': True, 'account_id': 4},
+]
+
+
+@pytest.fixture
+def accounts(database):
+    """Bank (1), salary (2), food (3) and fuel (4) accounts."""
+    for code, name in enumerate(('Bank', 'Salary', 'Food', 'Fuel'), start=1):
+        database.cursor.execute("INSERT INTO accounts (code, name, normalized_name, type_id) VALUES (?, ?, ?, 1)",
+                                (str(code), name, name.lower()))
+    database.commit()
+    return database
+
+
+def write(tmp_path, name, text, encoding='utf-8'):
+    path = tmp_path / name
+    path.write_text(text, encoding=encoding)
+    return str(path)
+
+
+def lines(path, mapping=None):
+    return [(line.date, line.amount, line.description) for line in iter_statement(path, mapping)]
+
+
+def test_csv_reader_signed_amounts(tmp_path):
+    assert lines(write(tmp_path, 'statement.csv', CSV_STATEMENT))[:4] == [
+        ('2025-03-01', Money.parse('2500'), 'PAYROLL ACME'),
+        ('2025-03-02', Money.parse('-12.50'), 'Padaria São João'),
+        ('2025-03-02', Money.parse('-12.50'), 'Padaria São João'),
+        ('2025-03-03', Money.parse('-80'), 'POS 1234 FUEL STATION'),
+    ]
+
+
+def test_csv_reader_debit_and_credit_columns(tmp_path):
+    mapping = {'delimiter': ';', 'skip_rows': 1, 'date_column': 'Data', 'date_format': '%d/%m/%Y',
+               'description_column': 'Histórico', 'debit_column': 'Saída', 'credit_column': 'Entrada',
+               'decimal_comma': True}
+    assert lines(write(tmp_path, 'extrato.csv', CSV_DEBIT_CREDIT), mapping) == [
+        ('2025-03-05', Money.parse('-1200'), 'Aluguel'),
+        ('2025-03-06', Money.parse('350.75'), 'Pix recebido'),
+    ]
+
+
+def test_csv_reader_reports_missing_columns(tmp_path):
+    with pytest.raises(StatementError, match="Amount column"):
+        lines(write(tmp_path, 'statement.csv', "Date,Description,Value\n2025-03-01,x,1\n"))
+
+
+def test_ofx_reader(tmp_path):
+    assert lines(write(tmp_path, 'statement.ofx', OFX_STATEMENT)) == [
+        ('2025-03-07', Money.parse('-42.10'), 'Market & Co - Groceries'),
+        ('2025-03-08', Money.parse('100'), 'Refund'),
+    ]
+
+
+def test_rules_match_in_order_then_default():
+    matcher = CounterpartMatcher(RULES + [{'pattern': 'acme', 'account_id': 9}], default_account_id=7)
+    assert matcher.account_for('Payroll ACME') == 2        # First match wins
+    assert matcher.account_for('PADARIA SÃO JOÃO') == 3    # Case and accents ignored
+    assert matcher.account_for('POS 99 FUEL') == 4
+    assert matcher.account_for('FUEL POS') == 7            # Anchored regex; falls back to the default
+    assert CounterpartMatcher(RULES).account_for('FUEL POS') is None
+
+
+def test_import_skips_lines_already_in_the_ledger(accounts, tmp_path):
+    path = write(tmp_path, 'statement.csv', CSV_STATEMENT)
+    settings = {'rules': RULES}
+
+    first = import_statement(path, 1, settings)
+    assert (first['read'], first['imported'], first['duplicates'], first['unmatched'], first['zero_amount']) == \
+        (6, 4, 0, 1, 1)
+    assert first['unmatched_descriptions'] == ['2025-03-04  -5.00  Unknown shop']
+
+    again = import_statement(path, 1, settings)
+    assert (again['imported'], again['duplicates'], again['hashed']) == (0, 4, 0)
+
+    accounts.cursor.execute("SELECT balance FROM accounts WHERE id = 1")
+    assert Money.from_db(accounts.cursor.fetchone()[0]) == Money.parse('2500') - Money.parse('105')
+
+
+def test_repeated_lines_count_against_the_ledger(accounts, tmp_path):
+    # One of the two identical bakery lines was entered by hand, in different case and spacing
+    post_transaction(accounts.cursor, '2025-03-02', 'PADARIA  SAO JOAO', 3, 1, '12.50')
+    accounts.commit()
+
+    summary = import_statement(write(tmp_path, 'statement.csv', CSV_STATEMENT), 1, {'rules': RULES})
+    assert (summary['imported'], summary['duplicates']) == (3, 1)
+
+
+def test_edited_posting_is_matched_by_its_new_values(accounts, tmp_path):
+    transaction_id = post_transaction(accounts.cursor, '2025-03-01', 'Salary', 1, 2, '2400')
+    update_transaction(accounts.cursor, transaction_id, '2025-03-01', 'Payroll ACME', 1, 2, '2500')
+    accounts.commit()
+
+    summary = import_statement(write(tmp_path, 'statement.csv', CSV_STATEMENT), 1, {'rules': RULES})
+    assert (summary['duplicates'], summary['hashed']) == (1, 0)
+
+
+def test_rows_written_without_a_hash_are_backfilled(accounts):
+    accounts.cursor.executemany(
+        "INSERT INTO transactions (date, description, debited, credited, amount) VALUES (?, ?, 1, 2, ?)",
+        [('2025-03-01', f"Row {n}", 100 * n) for n in range(1, 6)])
+    accounts.commit()
+
+    assert backfill_import_hashes(accounts, batch_size=2) == 5
+    assert backfill_import_hashes(accounts) == 0
+    accounts.cursor.execute("SELECT COUNT(*) FROM transactions WHERE import_hash IS NULL")
+    assert accounts.cursor.fetchone()[0] == 0
@@ -0,0 +1,69 @@
+# tests/test_depreciation.py
+import pytest
+import ledger.depreciation
+from ledger.depreciation import AssetRun, compute_portfolio
+from utils.depreciation_methods import HALF_CENT, DepreciationSchedule, calculate_depreciation
+
+
+def month_loop(method, cost, salvage_value, life=None, rate=None):
+    """
+    [(period, accumulated, book value)] charging calculate_depreciation's annual
+    amount / 12 month by month, to within half a cent of salvage or the end of
+    the useful life; the last month takes the remainder.
+    """
+    rows, book_value, period = [], cost, 0
+    while True:
+        period += 1
+        amount, error = calculate_depreciation(method, cost, salvage_value, life=life, rate=rate,
+                                               current_book_value=book_value, period=(period - 1) // 12 + 1)
+        assert error is None
+        book_value -= amount / 12
+        last = book_value - salvage_value < HALF_CENT or (life and period == life * 12)
+        if last:
+            book_value = salvage_value
+        rows.append((period, cost - book_value, book_value))
+        if last:
+            return rows
+
+
+@pytest.mark.parametrize('method, cost, salvage_value, life, rate', [
+    ('Straight-Line', 1200, 200, 5, None),
+    ("Sum of the Years' Digit", 10000, 1000, 5, None),
+    ('Declining Balance', 3510, 1500, 7, 0.15),  # Shipped notebook, cut off by its life
+    ('Declining Balance', 2000, 100, None, 0.3),
+    ('Double-Declining Balance', 5000, 500, 5, None),
+    ('Double-Declining Balance', 900, 0, 3, None),
+])
+def test_closed_form_matches_month_loop(method, cost, salvage_value, life, rate):
+    schedule = DepreciationSchedule(method, cost, salvage_value, life=life, rate=rate)
+    expected = month_loop(method, cost, salvage_value, life=life, rate=rate)
+
+    rows = schedule.rows()
+    assert schedule.end_period == len(expected)
+    assert [row[0] for row in rows] == [row[0] for row in expected]
+    for (_, _, accumulated, book_value), (period, loop_accumulated, loop_book_value) in zip(rows, expected):
+        assert accumulated == pytest.approx(loop_accumulated, abs=1e-6), period
+        assert book_value == pytest.approx(loop_book_value, abs=1e-6), period
+    assert schedule.book_value(schedule.end_period) == pytest.approx(salvage_value)
+
+
+def test_portfolio_engines_agree(monkeypatch):
+    """The NumPy portfolio matrix gives each schedule's own rows, from any first period and past the end."""
+    pytest.importorskip('numpy')
+    schedules = [
+        DepreciationSchedule('Straight-Line', 1200, 200, life=5),
+        DepreciationSchedule("Sum of the Years' Digit", 10000, 1000, life=5),
+        DepreciationSchedule('Declining Balance', 3510, 1500, life=7, rate=0.15),
+        DepreciationSchedule('Declining Balance', 2000, 100, rate=0.3),
+        DepreciationSchedule('Double-Declining Balance', 900, 0, life=3),
+    ]
+    runs = [AssetRun(None, schedule, first, min(first + 30, schedule.end_period))
+            for schedule in schedules for first in (1, 13, schedule.end_period - 2)]
+
+    vectorized = compute_portfolio(runs)
+    monkeypatch.setattr(ledger.depreciation, 'NUMPY_AVAILABLE', False)
+    for (rows, previous), (expected_rows, expected_previous) in zip(vectorized, compute_portfolio(runs)):
+        assert previous == pytest.approx(expected_previous, abs=1e-6)
+        assert [row[0] for row in rows] == [row[0] for row in expected_rows]
+        for row, expected in zip(rows, expected_rows):
+            assert row[1:] == pytest.approx(expected[1:], abs=1e-6)
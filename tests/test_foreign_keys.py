@@ -0,0 +1,50 @@
+# tests/test_foreign_keys.py
+import sqlite3
+import threading
+import pytest
+from create_database import connection_provider
+from ledger import post_transaction
+
+
+def test_shipped_database_satisfies_its_foreign_keys(shipped_database):
+    cursor = shipped_database.cursor
+    assert cursor.execute("PRAGMA foreign_keys").fetchone()[0] == 1
+    assert cursor.execute("PRAGMA foreign_key_check").fetchall() == []
+
+
+def test_worker_thread_connections_enforce_foreign_keys(database):
+    results = []
+
+    def worker():
+        conn = connection_provider.get_connection(database.db_path)
+        results.append(conn.execute("PRAGMA foreign_keys").fetchone()[0])
+        connection_provider.close_thread_connections()
+
+    thread = threading.Thread(target=worker)
+    thread.start()
+    thread.join()
+    assert results == [1]
+
+
+def test_orphans_are_rejected(database):
+    cursor = database.cursor
+    cursor.execute("INSERT INTO accounts (code, name, normalized_name, type_id) VALUES ('1', 'Cash', 'cash', 1)")
+    cursor.execute("INSERT INTO accounts (code, name, normalized_name, type_id) VALUES ('2', 'Sales', 'sales', 6)")
+    with pytest.raises(sqlite3.IntegrityError):
+        post_transaction(cursor, '2025-01-01', "Unknown account", 1, 99, '10.00')
+
+    post_transaction(cursor, '2025-01-01', "Sale", 1, 2, '10.00')
+    with pytest.raises(sqlite3.IntegrityError):
+        cursor.execute("DELETE FROM accounts WHERE id = 2")  # Still used by the ledger
+
+
+def test_account_without_ledger_rows_can_be_deleted(database):
+    cursor = database.cursor
+    cursor.execute("INSERT INTO accounts (code, name, normalized_name, type_id) VALUES ('1', 'Cash', 'cash', 1)")
+    cursor.execute("INSERT INTO accounts (code, name, normalized_name, type_id) VALUES ('2', 'Sales', 'sales', 6)")
+    transaction_id = post_transaction(cursor, '2025-01-01', "Sale", 1, 2, '10.00')
+    cursor.execute("DELETE FROM transactions WHERE id = ?", (transaction_id,))
+
+    # Its zeroed monthly snapshot rows go with it
+    cursor.execute("DELETE FROM accounts WHERE id = 2")
+    assert cursor.execute("SELECT COUNT(*) FROM account_period_balances WHERE account_id = 2").fetchone()[0] == 0
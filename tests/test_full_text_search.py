@@ -0,0 +1,57 @@
+# tests/test_full_text_search.py
+import re
+from create_database import DatabaseManager
+from utils.formatters import fts_match_expression
+
+
+def search(cursor, table, text):
+    """Ids a word search finds, through the same join as AdvancedSearchDialog."""
+    cursor.execute(
+        f"SELECT {table}.id FROM {table} "
+        f"JOIN (SELECT rowid AS fts_rowid, rank AS fts_rank FROM {table}_fts "
+        f"WHERE {table}_fts MATCH ?) AS fts_match ON {table}.id = fts_match.fts_rowid "
+        "ORDER BY fts_match.fts_rank",
+        (fts_match_expression(text),)
+    )
+    return {row[0] for row in cursor.fetchall()}
+
+
+def test_type_and_source_words_are_indexed(shipped_database):
+    cursor = shipped_database.cursor
+    for table, column in [('debtor_creditor_transactions', 'type'),
+                          ('transactions', 'source_type'),
+                          ('transactions', 'source_ref'),
+                          ('future_transactions', 'source_ref')]:
+        cursor.execute(f"SELECT DISTINCT {column} FROM {table} WHERE {column} IS NOT NULL")
+        values = [row[0] for row in cursor.fetchall()]
+        assert values, (table, column)
+        for value in values:
+            cursor.execute(f"SELECT id FROM {table} WHERE {column} = ?", (value,))
+            expected = {row[0] for row in cursor.fetchall()}
+            assert expected <= search(cursor, table, value.lower()), (table, value)
+
+
+def test_index_follows_edits(database):
+    cursor = database.cursor
+    cursor.execute("INSERT INTO accounts (code, name, normalized_name, type_id) VALUES ('1', 'Cash', 'cash', 1)")
+    cursor.execute("INSERT INTO transactions (date, description, debited, credited, amount, source_type) "
+                   "VALUES ('2025-01-01', 'Coffee beans', 1, 1, 100, 'GENERAL')")
+    row_id = cursor.lastrowid
+    assert search(cursor, 'transactions', 'general') == {row_id}
+
+    cursor.execute("UPDATE transactions SET source_type = 'FIXED_ASSET' WHERE id = ?", (row_id,))
+    assert search(cursor, 'transactions', 'general') == set()
+    assert search(cursor, 'transactions', 'fixed asset') == {row_id}
+    assert search(cursor, 'transactions', 'coffee') == {row_id}
+
+
+def test_word_search_does_not_scan(synthetic_ledger):
+    with DatabaseManager() as db:
+        for table in DatabaseManager.FULL_TEXT_SOURCES:
+            db.cursor.execute(
+                f"EXPLAIN QUERY PLAN SELECT {table}.* FROM {table} "
+                f"JOIN (SELECT rowid AS fts_rowid, rank AS fts_rank FROM {table}_fts "
+                f"WHERE {table}_fts MATCH ?) AS fts_match ON {table}.id = fts_match.fts_rowid "
+                "ORDER BY fts_match.fts_rank", ('"inflow"*',))
+            plan = [row[3] for row in db.cursor.fetchall()]
+            assert not [step for step in plan if re.match(rf"SCAN {table}\b", step)], "\n".join(plan)
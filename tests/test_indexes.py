@@ -0,0 +1,63 @@
+# tests/test_indexes.py
+"""
+The hot report and lookup queries must search the ledger tables through their
+indexes. Each case runs the shipped code against a freshly migrated database,
+captures the SELECTs it issues and checks their EXPLAIN QUERY PLAN.
+"""
+import re
+import pytest
+from ar_ap.aging_core import open_items
+from cashflow.actual_cashflow_core import generate_cashflow_data
+from ledger import PARTY_SOURCE, linked_transactions
+from ledger.scheduling import due_future_transactions, next_depreciation_period
+from reports.balance_sheet_core import BalanceSheet
+from reports.income_statement_core import generate_income_statement_data
+
+# Tables (and the alias the queries give them) that must never be scanned in full
+LEDGER_TABLES = {'transactions', 'future_transactions', 'debtor_creditor_transactions', 'depreciation_schedule', 't'}
+
+CASES = [
+    ('balance_sheet', lambda db: BalanceSheet().calcular_saldos_na_data('2025-06-15'),
+     {'idx_transactions_date'}),
+    ('income_statement', lambda db: generate_income_statement_data('2025-01-01', '2025-06-30'),
+     {'idx_transactions_date'}),
+    ('cashflow', lambda db: generate_cashflow_data([1, 2], '2025-01-01', '2025-06-30'),
+     {'idx_transactions_debited_date_amount', 'idx_transactions_credited_date_amount'}),
+    ('due_future_transactions', lambda db: due_future_transactions(db.cursor, '2025-06-30'),
+     {'idx_future_transactions_date'}),
+    ('next_depreciation_period', lambda db: next_depreciation_period(db.cursor, {'asset_id': 1, 'purchase_date': '2025-01-01'}),
+     {'idx_depreciation_schedule_asset_period'}),
+    ('linked_transactions', lambda db: linked_transactions(db.cursor, PARTY_SOURCE, 1),
+     {'idx_transactions_source'}),
+    ('aging_drill_down', lambda db: open_items(db.cursor, '2025-06-30', party_id=1),
+     {'idx_debtor_creditor_transactions_party_date'}),
+]
+
+
+def executed_queries(conn, call):
+    """The SELECT statements (with their values inlined) that call() runs on conn."""
+    statements = []
+    conn.set_trace_callback(statements.append)
+    try:
+        call()
+    finally:
+        conn.set_trace_callback(None)
+    return [s for s in statements if s.lstrip().upper().startswith(('SELECT', 'WITH'))]
+
+
+def query_plan(conn, sql):
+    return [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}")]
+
+
+@pytest.mark.parametrize('call, indexes', [case[1:] for case in CASES], ids=[case[0] for case in CASES])
+def test_hot_query_uses_index(database, call, indexes):
+    queries = executed_queries(database.conn, lambda: call(database))
+    assert queries, "the call ran no queries"
+
+    plan = [step for sql in queries for step in query_plan(database.conn, sql)]
+    used = {index for index in indexes if any(index in step for step in plan)}
+    assert used == indexes, f"missing {indexes - used} in plan:\n" + "\n".join(plan)
+
+    scans = [step for step in plan
+             if (match := re.match(r"SCAN (\w+)", step)) and match.group(1) in LEDGER_TABLES]
+    assert not scans, "full scan of a ledger table:\n" + "\n".join(plan)
@@ -0,0 +1,85 @@
+# tests/test_links.py
+import pytest
+from create_database import DatabaseManager
+from ledger import (ASSET_SOURCE, PARTY_SOURCE, RECURRING_SOURCE, LedgerError, delete_linked_future_transactions,
+                    linked_transaction, linked_transactions, post_transaction, record_party_movement,
+                    reverse_linked_transactions, schedule_future_transaction)
+from ledger.settings import app_settings
+from utils.money import Money
+
+
+@pytest.fixture
+def ledger(synthetic_ledger):
+    """The synthetic ledger, its first fixed asset and two cash accounts."""
+    app_settings.invalidate()
+    with DatabaseManager() as db:
+        asset_id = db.cursor.execute("SELECT MIN(asset_id) FROM fixed_assets").fetchone()[0]
+        yield db, asset_id, synthetic_ledger['cash_accounts'][:2]
+    app_settings.invalidate()
+
+
+def balances(cursor):
+    cursor.execute("SELECT id, balance FROM accounts")
+    return {row['id']: Money.from_db(row['balance']) for row in cursor.fetchall()}
+
+
+def test_reversal_removes_only_the_linked_postings(ledger):
+    db, asset_id, (cash, bank) = ledger
+    cursor = db.cursor
+    before = balances(cursor)
+    # Same description as the asset's own postings, but not linked to it
+    unlinked = post_transaction(cursor, '2025-06-01', "Depreciation", bank, cash, '1.00')
+    for day in ('2025-04-01', '2025-05-01', '2025-06-01'):
+        post_transaction(cursor, day, "Depreciation", bank, cash, '10.00', source_ref=ASSET_SOURCE, source_id=asset_id)
+    post_transaction(cursor, '2025-06-01', "Depreciation", cash, bank, '2.50', source_ref=ASSET_SOURCE,
+                     source_id=asset_id + 1)
+
+    assert [row['date'] for row in linked_transactions(cursor, ASSET_SOURCE, asset_id)][-3:] == [
+        '2025-04-01', '2025-05-01', '2025-06-01']
+    linked = len(linked_transactions(cursor, ASSET_SOURCE, asset_id))
+    assert reverse_linked_transactions(cursor, ASSET_SOURCE, asset_id) == linked
+    assert linked_transactions(cursor, ASSET_SOURCE, asset_id) == []
+    assert cursor.execute("SELECT COUNT(*) FROM transactions WHERE id = ?", (unlinked,)).fetchone()[0] == 1
+
+    after = balances(cursor)
+    assert after[bank] - before[bank] == Money.parse('-1.50')
+    assert after[cash] - before[cash] == Money.parse('1.50')
+
+
+def test_future_transactions_are_deleted_by_link(ledger):
+    db, asset_id, (cash, bank) = ledger
+    cursor = db.cursor
+    kept = schedule_future_transaction(cursor, '2025-07-01', "Rent", bank, cash, '5.00')
+    for day in ('2025-07-01', '2025-08-01'):
+        schedule_future_transaction(cursor, day, "Rent", bank, cash, '5.00', source_ref=RECURRING_SOURCE,
+                                    source_id=1)
+
+    assert delete_linked_future_transactions(cursor, RECURRING_SOURCE, 1) >= 2
+    cursor.execute("SELECT COUNT(*) FROM future_transactions WHERE source_ref = ? AND source_id = 1",
+                   (RECURRING_SOURCE,))
+    assert cursor.fetchone()[0] == 0
+    assert cursor.execute("SELECT COUNT(*) FROM future_transactions WHERE id = ?", (kept,)).fetchone()[0] == 1
+
+
+def test_movement_stays_linked_after_its_posting_is_renamed(ledger):
+    db, _, (cash, _) = ledger
+    cursor = db.cursor
+    party_id = cursor.execute("SELECT MIN(id) FROM debtor_creditor").fetchone()[0]
+    transaction_id = record_party_movement(cursor, party_id, 'Outflow', '2025-06-01', "Loan", '20', cash)
+    movement_id = cursor.execute("SELECT source_id FROM transactions WHERE id = ?", (transaction_id,)).fetchone()[0]
+
+    cursor.execute("UPDATE transactions SET description = 'Renamed' WHERE id = ?", (transaction_id,))
+    assert linked_transaction(cursor, PARTY_SOURCE, movement_id)['id'] == transaction_id
+    cursor.execute("SELECT transaction_id FROM debtor_creditor_transactions WHERE id = ?", (movement_id,))
+    assert cursor.fetchone()[0] == transaction_id
+
+
+def test_links_are_validated(ledger):
+    db, asset_id, (cash, bank) = ledger
+    cursor = db.cursor
+    with pytest.raises(LedgerError, match="No ledger transaction is linked"):
+        linked_transaction(cursor, PARTY_SOURCE, 999999)
+    with pytest.raises(LedgerError, match="Invalid source reference"):
+        linked_transactions(cursor, 'accounts', 1)
+    with pytest.raises(LedgerError, match="Invalid source id"):
+        post_transaction(cursor, '2025-06-01', "Depreciation", bank, cash, '1.00', source_ref=ASSET_SOURCE)
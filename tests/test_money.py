@@ -0,0 +1,74 @@
+# tests/test_money.py
+import re
+from decimal import Decimal
+import pytest
+from ar_ap.aging_core import aging_summary
+from create_database import DatabaseManager, connection_provider
+from utils.money import MAJOR_UNIT_COLUMNS, MONEY_COLUMNS, Money
+
+
+@pytest.mark.parametrize('number', [5, 5.0, Decimal('5.00'), 0, 0.5, 1234.56, 0.3, 100.1, -12.34])
+def test_equal_numbers_hash_alike(number):
+    money = Money.parse(number)
+    assert money == number
+    assert hash(money) == hash(number)
+    assert number in {money} and money in {number}
+
+
+def test_floats_compare_as_typed():
+    assert Money.parse('1234.56') == 1234.56
+    assert Money.parse('0.30') == 0.3 and Money.parse('100.10') == 100.1
+    assert Money.parse('0.10') + Money.parse('0.20') == 0.3
+    assert Money.parse('5.00') != 5.004
+    assert Money.parse('5.00') < 5.004
+
+
+def test_numbers_compare_in_major_units():
+    assert Money(500) != 500  # An int is major units, not cents
+    assert Money(0) == 0 and not Money(0) < 0
+    assert Money.parse('0.10') == Decimal('0.1')
+
+
+MONEY_NAMES = re.compile(r'amount|balance|_total|cost|value|price|expense|accumulated')
+
+
+def test_every_money_column_has_one_unit(database):
+    """Amount columns are either cents (MONEY_COLUMNS) or major units (MAJOR_UNIT_COLUMNS), never unclassified."""
+    cursor = database.cursor
+    cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE '%fts%'")
+    found = set()
+    for table in [row['name'] for row in cursor.fetchall()]:
+        cursor.execute(f"PRAGMA table_info({table})")
+        found |= {(table, row['name']) for row in cursor.fetchall()
+                  if MONEY_NAMES.search(row['name']) and not row['type'].upper().startswith(('TEXT', 'VARCHAR'))}
+
+    cents = {(table, column) for table, columns in MONEY_COLUMNS.items() for column in columns}
+    major = {(table, column) for table, columns in MAJOR_UNIT_COLUMNS.items() for column in columns}
+    assert not cents & major
+    assert found == cents | major
+
+
+def test_migration_moves_ar_ap_amounts_to_cents(tmp_path, monkeypatch):
+    """AR/AP amounts written in major units before schema version 14 are read back as the same Money."""
+    monkeypatch.chdir(tmp_path)
+    with DatabaseManager('old.db') as db:
+        cursor = db.cursor
+        cursor.executescript(db.create_tables_sql)
+        for version, script in db.schema_migrations:
+            if version < 14:
+                cursor.executescript(f"BEGIN;\n{script}\nPRAGMA user_version = {version};\nCOMMIT;")
+        cursor.execute("INSERT INTO debtor_creditor (name, normalized_name, account, amount) "
+                       "VALUES ('Debtor', 'debtor', 1, 0.3)")
+        cursor.executemany("INSERT INTO debtor_creditor_transactions (date, details, amount, debtor_creditor, type) "
+                           "VALUES ('2025-06-01', ?, ?, 1, ?)",
+                           [('Lent', 100.1, 'Outflow'), ('Repaid', 99.8, 'Inflow')])
+        db.commit()
+
+        assert db.apply_migrations() == db.schema_migrations[-1][0]
+        cursor.execute("SELECT amount, typeof(amount) FROM debtor_creditor_transactions ORDER BY id")
+        assert [tuple(row) for row in cursor.fetchall()] == [(10010, 'integer'), (9980, 'integer')]
+        cursor.execute("SELECT amount FROM debtor_creditor")
+        assert Money.from_db(cursor.fetchone()[0]) == Money.parse('0.30')
+        [row] = aging_summary(cursor, '2025-06-30')
+        assert row.balance == Money.parse('0.30')
+    connection_provider.close_thread_connections()
@@ -0,0 +1,64 @@
+# tests/test_month_end.py
+from datetime import date, datetime
+import pytest
+import ledger.depreciation
+from create_database import DatabaseManager
+from fixed_assets.month_end_core import run_month_end_depreciation
+from ledger import ASSET_SOURCE
+from utils.depreciation_methods import DepreciationSchedule, period_of
+from utils.money import Money
+
+CALCULATION_DATE = date(2025, 6, 30)
+METHODS = [('Straight-Line', None), ("Sum of the Years' Digit", None),
+           ('Double-Declining Balance', None), ('Declining Balance', 0.3)]
+
+
+@pytest.fixture(params=['python', 'numpy'])
+def engine(request, monkeypatch):
+    """Runs the portfolio engine with and without NumPy."""
+    if request.param == 'numpy':
+        pytest.importorskip('numpy')
+    monkeypatch.setattr(ledger.depreciation, 'NUMPY_AVAILABLE', request.param == 'numpy')
+
+
+def test_month_end_posts_the_per_asset_schedules(synthetic_ledger, engine):
+    with DatabaseManager() as db:
+        db.cursor.execute("SELECT asset_id FROM fixed_assets ORDER BY asset_id")
+        for index, row in enumerate(db.cursor.fetchall()):
+            method, rate = METHODS[index % len(METHODS)]
+            db.cursor.execute("UPDATE fixed_assets SET depreciation_method = ?, depreciation_rate = ? WHERE asset_id = ?",
+                              (method, rate, row['asset_id']))
+        db.commit()
+
+    summary = run_month_end_depreciation(CALCULATION_DATE, chunk_size=3)
+    assert summary['failed'] == 0 and summary['scheduled'] == summary['assets']
+
+    with DatabaseManager() as db:
+        db.cursor.execute("SELECT * FROM fixed_assets ORDER BY asset_id")
+        for asset in db.cursor.fetchall():
+            schedule = DepreciationSchedule.for_asset(asset)
+            purchase_date = datetime.strptime(asset['purchase_date'], '%Y-%m-%d').date()
+            last = min(period_of(purchase_date, CALCULATION_DATE), schedule.end_period)
+
+            db.cursor.execute("SELECT COUNT(*), MAX(accumulated_depreciation) FROM depreciation_schedule "
+                              "WHERE asset_id = ?", (asset['asset_id'],))
+            periods, accumulated = db.cursor.fetchone()
+            assert periods == last
+            assert accumulated == pytest.approx(schedule.accumulated(last), abs=1e-6)
+
+            db.cursor.execute("SELECT SUM(amount) FROM future_transactions WHERE source_ref = ? AND source_id = ?",
+                              (ASSET_SOURCE, asset['asset_id']))
+            assert Money.from_db(db.cursor.fetchone()[0]) == Money.parse(schedule.accumulated(last))
+
+
+def test_month_end_continues_where_it_stopped(synthetic_ledger):
+    run_month_end_depreciation(date(2024, 12, 31))
+    summary = run_month_end_depreciation(CALCULATION_DATE)
+    again = run_month_end_depreciation(CALCULATION_DATE)
+    assert summary['periods'] > 0
+    assert again['periods'] == 0 and again['up_to_date'] == again['assets']
+
+    with DatabaseManager() as db:
+        db.cursor.execute("SELECT asset_id, period_start_date, COUNT(*) FROM depreciation_schedule "
+                          "GROUP BY asset_id, period_start_date HAVING COUNT(*) > 1")
+        assert db.cursor.fetchall() == []
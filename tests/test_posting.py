@@ -0,0 +1,194 @@
+# tests/test_posting.py
+import threading
+from datetime import date
+import pytest
+from create_database import DatabaseManager, connection_provider
+from ledger import (ASSET_SOURCE, LedgerError, due_future_transactions, post_entries, post_future_transactions,
+                    post_transaction, reverse_transaction, schedule_future_transaction, schedule_portfolio_depreciation,
+                    update_transaction)
+from ledger.settings import app_settings
+from utils.formatters import statement_hash
+from utils.money import Money
+
+# account_period_balances as the ledger says it should be
+SNAPSHOT_QUERY = """
+    SELECT account_id, year_month, SUM(debit_total), SUM(credit_total)
+    FROM (
+        SELECT debited AS account_id, substr(date, 1, 7) AS year_month, amount AS debit_total, 0 AS credit_total
+        FROM transactions
+        UNION ALL
+        SELECT credited, substr(date, 1, 7), 0, amount FROM transactions
+    )
+    GROUP BY account_id, year_month
+"""
+
+
+@pytest.fixture
+def ledger(synthetic_ledger):
+    """The synthetic ledger's cursor and two cash accounts; the settings cache is reset around it."""
+    app_settings.invalidate()
+    with DatabaseManager() as db:
+        yield db, synthetic_ledger['cash_accounts'][:2]
+    app_settings.invalidate()
+
+
+def snapshots(cursor):
+    cursor.execute("SELECT account_id, year_month, debit_total, credit_total FROM account_period_balances "
+                   "WHERE debit_total != 0 OR credit_total != 0")
+    return {tuple(row) for row in cursor.fetchall()}
+
+
+def balances(cursor):
+    cursor.execute("SELECT id, balance FROM accounts")
+    return {row['id']: Money.from_db(row['balance']) for row in cursor.fetchall()}
+
+
+def ledger_balances(cursor):
+    """Account balances recomputed from the ledger rows."""
+    cursor.execute("""
+        SELECT a.id, COALESCE((SELECT SUM(amount) FROM transactions WHERE debited = a.id), 0)
+                   - COALESCE((SELECT SUM(amount) FROM transactions WHERE credited = a.id), 0)
+        FROM accounts a
+    """)
+    return {row[0]: Money.from_db(row[1]) for row in cursor.fetchall()}
+
+
+def count(cursor, table):
+    return cursor.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+
+# --- Monthly snapshots ---
+def test_snapshots_follow_every_ledger_writer(ledger):
+    db, (cash, bank) = ledger
+    cursor = db.cursor
+    assert snapshots(cursor) == {tuple(row) for row in cursor.execute(SNAPSHOT_QUERY).fetchall()}
+
+    moved = post_transaction(cursor, '2025-06-10', "Transfer", cash, bank, '250.00')
+    update_transaction(cursor, moved, '2025-04-02', "Transfer, back-dated", bank, cash, '99.99')
+    reverse_transaction(cursor, post_transaction(cursor, '2025-05-05', "Mistake", cash, bank, '10.00'))
+    post_entries(cursor, [{'description': "Batch", 'debited': cash, 'credited': bank, 'amount': '1.01'}] * 3,
+                 date='2025-02-28')
+    future_id = schedule_future_transaction(cursor, '2025-01-31', "Due", bank, cash, '42.00')
+    post_future_transactions(cursor, [future_id])
+
+    assert snapshots(cursor) == {tuple(row) for row in cursor.execute(SNAPSHOT_QUERY).fetchall()}
+    assert balances(cursor) == ledger_balances(cursor)
+
+
+# --- Batch posting ---
+def test_post_entries_posts_the_batch(ledger):
+    db, (cash, bank) = ledger
+    cursor = db.cursor
+    before, transactions = balances(cursor), count(cursor, 'transactions')
+    entries = [
+        {'description': "Deposit", 'debited': bank, 'credited': cash, 'amount': '100.10'},
+        {'description': "Fee", 'debited': cash, 'credited': bank, 'amount': 0.3, 'date': '2025-06-02'},
+        {'description': "Imported", 'debited': bank, 'credited': cash, 'amount': '5', 'import_hash': 'given'},
+    ]
+
+    assert post_entries(cursor, entries, date='2025-06-01', source_type='DEBTOR_CREDITOR') == 3
+    assert balances(cursor)[bank] - before[bank] == Money.parse('104.80')
+    assert balances(cursor)[cash] - before[cash] == Money.parse('-104.80')
+    cursor.execute("SELECT date, description, amount, source_type, import_hash FROM transactions "
+                   "WHERE id > (SELECT MAX(id) - 3 FROM transactions) ORDER BY id")
+    assert [tuple(row) for row in cursor.fetchall()] == [
+        ('2025-06-01', "Deposit", 10010, 'DEBTOR_CREDITOR', statement_hash('2025-06-01', Money(10010), "Deposit")),
+        ('2025-06-02', "Fee", 30, 'DEBTOR_CREDITOR', statement_hash('2025-06-02', Money(30), "Fee")),
+        ('2025-06-01', "Imported", 500, 'DEBTOR_CREDITOR', 'given'),
+    ]
+    assert count(cursor, 'transactions') == transactions + 3
+
+
+@pytest.mark.parametrize('bad_entry, message', [
+    ({'description': "Bad", 'debited': 1, 'credited': 1, 'amount': '5'}, "Bad: "),
+    ({'description': "Bad", 'debited': 1, 'amount': '5'}, "Bad: both debited and credited"),
+    ({'description': "Bad", 'debited': 1, 'credited': 2, 'amount': '-5'}, "Bad: "),
+    ({'description': "Bad", 'debited': 1, 'credited': 999999, 'amount': '5'}, "Unknown account ID"),
+    ({'description': "Bad", 'debited': 1, 'credited': 2, 'amount': '5', 'source_ref': 'accounts',
+      'source_id': 1}, "Bad: Invalid source reference"),
+])
+def test_post_entries_validates_the_whole_batch_first(ledger, bad_entry, message):
+    db, (cash, bank) = ledger
+    cursor = db.cursor
+    before, transactions = balances(cursor), count(cursor, 'transactions')
+    good = {'description': "Good", 'debited': cash, 'credited': bank, 'amount': '5'}
+
+    with pytest.raises(LedgerError, match=message):
+        post_entries(cursor, [good, bad_entry, good], date='2025-06-01')
+    assert (balances(cursor), count(cursor, 'transactions')) == (before, transactions)
+
+
+# --- Posting due future transactions ---
+def test_post_future_transactions_moves_only_the_given_rows(ledger):
+    db, (cash, bank) = ledger
+    cursor = db.cursor
+    asset_id = cursor.execute("SELECT MIN(asset_id) FROM fixed_assets").fetchone()[0]
+    due = [schedule_future_transaction(cursor, '2025-06-01', "Due", bank, cash, '12.34', ASSET_SOURCE, asset_id),
+           schedule_future_transaction(cursor, '2025-06-02', "Due too", cash, bank, '2.00')]
+    kept = schedule_future_transaction(cursor, '2025-06-03', "Not yet", bank, cash, '7.00')
+    before, transactions = balances(cursor), count(cursor, 'transactions')
+
+    posted = post_future_transactions(cursor, due + [due[0], 999999])  # Duplicates and unknown ids are ignored
+    assert [row['id'] for row in posted] == due
+    assert posted[0]['debited_name'] and posted[0]['credited_name']
+    assert balances(cursor)[bank] - before[bank] == Money.parse('10.34')
+    assert count(cursor, 'transactions') == transactions + 2
+    cursor.execute("SELECT id FROM future_transactions WHERE id IN (?, ?, ?)", due + [kept])
+    assert [row[0] for row in cursor.fetchall()] == [kept]
+
+    cursor.execute("SELECT description, amount, source_ref, source_id, import_hash FROM transactions "
+                   "WHERE date = '2025-06-01' AND description = 'Due'")
+    assert tuple(cursor.fetchone()) == ("Due", 1234, ASSET_SOURCE, asset_id,
+                                        statement_hash('2025-06-01', Money(1234), "Due"))
+    assert post_future_transactions(cursor, []) == []
+
+
+def test_posting_links_the_depreciation_period(ledger):
+    db, _ = ledger
+    cursor = db.cursor
+    asset_id = cursor.execute("SELECT MIN(asset_id) FROM fixed_assets").fetchone()[0]
+    schedule_portfolio_depreciation(cursor, date(2025, 6, 30), asset_ids=[asset_id])
+    cursor.execute("SELECT schedule_id, future_transaction_id FROM depreciation_schedule "
+                   "WHERE asset_id = ? ORDER BY period_end_date LIMIT 1", (asset_id,))
+    schedule_id, future_id = cursor.fetchone()
+
+    post_future_transactions(cursor, [future_id])
+    cursor.execute("SELECT transaction_id, future_transaction_id FROM depreciation_schedule WHERE schedule_id = ?",
+                   (schedule_id,))
+    transaction_id, pending = cursor.fetchone()
+    assert pending is None
+    cursor.execute("SELECT source_ref, source_id FROM transactions WHERE id = ?", (transaction_id,))
+    assert tuple(cursor.fetchone()) == (ASSET_SOURCE, asset_id)
+
+
+# --- Startup processing on a worker thread ---
+def test_due_rows_are_fetched_and_posted_on_a_worker_thread(ledger):
+    """What the startup processor's fetch and post workers do, each on its own thread and connection."""
+    db, (cash, bank) = ledger
+    schedule_future_transaction(db.cursor, '2025-06-01', "Due", bank, cash, '3.00')
+    db.commit()
+    results = {}
+
+    def fetch():
+        with DatabaseManager() as worker_db:
+            results['due'] = due_future_transactions(worker_db.cursor, '2025-06-30')
+            worker_db.commit()  # Keeps the rows expanded from the recurring rules
+        connection_provider.close_thread_connections()
+
+    def post():
+        with DatabaseManager() as worker_db:
+            results['posted'] = post_future_transactions(worker_db.cursor, [row['id'] for row in results['due']])
+            worker_db.commit()
+        connection_provider.close_thread_connections()
+
+    for target in (fetch, post):
+        thread = threading.Thread(target=target)
+        thread.start()
+        thread.join()
+
+    assert results['due'] and all(row['date'] <= '2025-06-30' for row in results['due'])
+    assert "Due" in {row['description'] for row in results['due']}
+    assert len(results['posted']) == len(results['due'])
+    # The GUI thread's connection sees the committed work
+    assert db.cursor.execute("SELECT COUNT(*) FROM future_transactions WHERE date <= '2025-06-30'").fetchone()[0] == 0
+    assert balances(db.cursor) == ledger_balances(db.cursor)
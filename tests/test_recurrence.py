@@ -0,0 +1,103 @@
+# tests/test_recurrence.py
+from datetime import date, timedelta
+import pytest
+from create_database import DatabaseManager, connection_provider
+from recurring_transactions.recurrence import (RECURRING_SOURCE, materialize_recurring_transactions,
+                                               update_recurring_rule)
+
+
+@pytest.fixture
+def monthly_rule(database):
+    """A monthly rule from 2025-01-15, expanded through 2025-06-30; returns its id."""
+    cursor = database.cursor
+    for code in ('1', '2', '3'):
+        cursor.execute("INSERT INTO accounts (code, name, normalized_name, type_id, is_active, balance) "
+                       "VALUES (?, ?, ?, 1, 1, 0)", (code, f"Account {code}", f"account {code}"))
+    cursor.execute(
+        """
+        INSERT INTO recurring_transactions (description, debited, credited, amount, frequency, interval, start_date)
+        VALUES ('Rent', 1, 2, 10000, 'monthly', NULL, '2025-01-15')
+        """
+    )
+    rule_id = cursor.lastrowid
+    materialize_recurring_transactions(cursor, '2025-06-30', recurring_id=rule_id)
+    return rule_id
+
+
+def pending(cursor, rule_id):
+    cursor.execute("SELECT date, description, credited FROM future_transactions "
+                   "WHERE source_ref = ? AND source_id = ? ORDER BY date", (RECURRING_SOURCE, rule_id))
+    return [tuple(row) for row in cursor.fetchall()]
+
+
+def test_edit_keeps_past_due_and_postponed_occurrences(database, monthly_rule):
+    cursor = database.cursor
+    # At startup on 2025-03-20 the user left March unposted and postponed February to the 25th
+    cursor.execute("DELETE FROM future_transactions WHERE date = '2025-01-15'")  # Posted
+    cursor.execute("UPDATE future_transactions SET date = '2025-03-25' WHERE date = '2025-02-15'")
+
+    update_recurring_rule(cursor, monthly_rule, 'Office rent', 1, 3, 12000, 'monthly', None,
+                          '2025-01-15', '2025-05-31', today=date(2025, 3, 20))
+
+    assert pending(cursor, monthly_rule) == [
+        ('2025-03-15', 'Rent', 2),         # Past due, still waiting to be posted
+        ('2025-03-25', 'Rent', 2),         # Postponed
+        ('2025-04-15', 'Office rent', 3),  # Regenerated from the edited rule
+        ('2025-05-15', 'Office rent', 3),
+    ]
+
+
+def test_edit_regenerates_a_rule_starting_later(database, monthly_rule):
+    update_recurring_rule(database.cursor, monthly_rule, 'Rent', 1, 2, 10000, 'weekly', None,
+                          '2025-04-01', None, today=date(2025, 3, 20))
+
+    dates = [row[0] for row in pending(database.cursor, monthly_rule)]
+    # The old January-March occurrences are past due and kept; April on is weekly
+    assert dates[:3] == ['2025-01-15', '2025-02-15', '2025-03-15']
+    assert dates[3:6] == ['2025-04-01', '2025-04-08', '2025-04-15']
+    assert '2025-05-15' not in dates  # The old monthly occurrence is gone
+
+
+def test_migrations_clamp_watermarks_and_drop_linked_occurrences(tmp_path, monkeypatch):
+    """A database from before on-demand expansion (schema version 3) upgraded to the current schema."""
+    monkeypatch.chdir(tmp_path)
+    today = date.today()
+
+    def day(offset):
+        return (today + timedelta(days=offset)).isoformat()
+
+    with DatabaseManager('old.db') as db:
+        cursor = db.cursor
+        cursor.executescript(db.create_tables_sql)
+        for version, script in db.schema_migrations[:3]:
+            cursor.executescript(f"BEGIN;\n{script}\nPRAGMA user_version = {version};\nCOMMIT;")
+        cursor.executemany("INSERT INTO account_types (name, normal_balance, description) VALUES (?, ?, ?)",
+                           db.default_account_types)
+        for code in ('1', '2'):
+            cursor.execute("INSERT INTO accounts (code, name, normalized_name, type_id) VALUES (?, ?, ?, 1)",
+                           (code, f"Account {code}", f"account {code}"))
+        rules = {'running': (day(-60), None), 'finished': (day(-400), day(-30)), 'later': (day(200), None)}
+        for description, (start_date, end_date) in rules.items():
+            cursor.execute("INSERT INTO recurring_transactions (description, debited, credited, amount, frequency, "
+                           "start_date, end_date) VALUES (?, 1, 2, 100, 'monthly', ?, ?)",
+                           (description, start_date, end_date))
+        # Occurrences written decades ahead by the old expansion, and a one-off posting on the same accounts
+        cursor.executemany("INSERT INTO future_transactions (date, description, debited, credited, amount) "
+                           "VALUES (?, ?, 1, 2, 100)",
+                           [(day(-45), 'finished'), (day(-10), 'running'), (day(20), 'running'),
+                            (day(400), 'running'), (day(5000), 'running'), (day(200), 'later'),
+                            (day(230), 'later'), (day(400), 'Deposit')])
+        db.commit()
+
+        assert db.apply_migrations() == db.schema_migrations[-1][0]
+        cursor.execute("SELECT description, generated_until FROM recurring_transactions")
+        assert dict(cursor.fetchall()) == {'running': day(90), 'finished': day(-30), 'later': None}
+        cursor.execute("SELECT date, description FROM future_transactions ORDER BY date")
+        assert [tuple(row) for row in cursor.fetchall()] == [
+            (day(-45), 'finished'), (day(-10), 'running'), (day(20), 'running'), (day(400), 'Deposit')]
+
+        # The engine continues from the watermarks without repeating an occurrence
+        materialize_recurring_transactions(cursor, day(90))
+        cursor.execute("SELECT COUNT(*) FROM future_transactions WHERE description = 'running'")
+        assert cursor.fetchone()[0] == 2
+    connection_provider.close_thread_connections()
@@ -0,0 +1,45 @@
+# tests/test_search_worker.py
+import threading
+import pytest
+
+pytest.importorskip('PySide6')
+from utils.crud.search_dialog import SearchWorker  # noqa: E402
+
+SLOW_QUERY = ("WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < 200000000) "
+              "SELECT COUNT(*) FROM n")
+
+
+@pytest.fixture
+def worker(database):
+    """A SearchWorker on the test database; yields (worker, {generation: rows}, {generation: arrival event})."""
+    database.cursor.executemany("INSERT INTO accounts (code, name, normalized_name, type_id) VALUES (?, ?, ?, 1)",
+                                [(str(n), f"Account {n}", f"account {n}") for n in range(1, 6)])
+    database.commit()
+    search_worker = SearchWorker(database.db_path, row_limit=3)
+    results, arrived = {}, {1: threading.Event(), 2: threading.Event()}
+
+    def on_results(generation, rows):
+        results[generation] = rows
+        arrived[generation].set()
+
+    search_worker.signals.results.connect(on_results)
+    yield search_worker, results, arrived
+    search_worker.stop()
+    search_worker.thread.join(5)
+
+
+def test_results_come_back_with_their_generation(worker):
+    search_worker, results, arrived = worker
+    search_worker.submit(1, "SELECT code FROM accounts ORDER BY id", ())
+    assert arrived[1].wait(5)
+    assert results == {1: [('1',), ('2',), ('3',), ('4',)]}  # row_limit + 1 tells the dialog there are more
+
+
+def test_newer_query_interrupts_the_running_one(worker):
+    search_worker, results, arrived = worker
+    search_worker.submit(1, SLOW_QUERY, ())
+    search_worker.submit(2, "SELECT name FROM accounts WHERE code = ?", ('5',))
+    # Well before the slow query could have counted to the end
+    assert arrived[2].wait(5)
+    assert results[2] == [('Account 5',)]
+    assert not arrived[1].is_set()
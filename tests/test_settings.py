@@ -0,0 +1,43 @@
+# tests/test_settings.py
+import pytest
+from ledger import LedgerError
+from ledger.settings import SettingsService
+
+
+@pytest.fixture
+def settings(database):
+    service = SettingsService()
+    database.cursor.execute("INSERT INTO accounts (code, name, normalized_name, type_id) VALUES ('9', 'Spare', 'spare', 1)")
+    account_id = database.cursor.lastrowid
+    database.commit()
+    service.save('depreciation_account.json', {'depreciation_account_id': str(account_id)})
+    return service, account_id
+
+
+def test_account_is_checked_once_per_revision(database, settings):
+    service, account_id = settings
+    assert service.account('depreciation_account_id', database.cursor) == account_id
+
+    queries = []
+    database.conn.set_trace_callback(queries.append)
+    try:
+        service.account('depreciation_account_id', database.cursor)
+    finally:
+        database.conn.set_trace_callback(None)
+    assert queries == []
+
+
+def test_deleted_account_is_reported_after_accounts_changed(database, settings):
+    service, account_id = settings
+    service.account('depreciation_account_id', database.cursor)
+    database.cursor.execute("DELETE FROM accounts WHERE id = ?", (account_id,))
+    database.commit()
+
+    service.accounts_changed()
+    with pytest.raises(LedgerError, match="no longer exists"):
+        service.account('depreciation_account_id', database.cursor)
+
+
+def test_unset_account_is_reported(database):
+    with pytest.raises(LedgerError, match="not set"):
+        SettingsService().account('depreciation_account_id', database.cursor)
@@ -0,0 +1,107 @@
+# tests/test_sync.py
+import os
+import shutil
+import sqlite3
+from create_database import DatabaseManager, connection_provider
+from sync.engine import SyncEngine
+from sync.storage import LocalFolderStorage, file_md5
+from sync.transfers import TransferScheduler
+
+DB_NAME = 'financial_system.db'
+CHUNK_SIZE = 64 * 1024
+
+
+def engine(tmp_path, storage, local_dir, device):
+    return SyncEngine(storage, str(local_dir), str(tmp_path / f"cache_{device}" / "manifest.json"),
+                      chunk_size=CHUNK_SIZE)
+
+
+def edit_copy(path, description):
+    """Changes one ledger row in a database copy, the way another device would."""
+    conn = sqlite3.connect(path)
+    conn.execute("UPDATE transactions SET description = ? WHERE id = 1", (description,))
+    conn.commit()
+    conn.close()
+
+
+class FailingStorage(LocalFolderStorage):
+    """Fails every chunk download after the first `allowed`, like a dropped connection."""
+
+    def __init__(self, root, allowed):
+        super().__init__(root)
+        self.allowed = allowed
+        self.downloads = 0
+
+    def download_bytes(self, remote):
+        self.downloads += 1
+        if self.downloads > self.allowed:
+            raise ConnectionError("connection lost")
+        return super().download_bytes(remote)
+
+
+def test_delta_round_trip_into_an_open_database(synthetic_ledger, tmp_path):
+    storage = LocalFolderStorage(tmp_path / 'remote')
+    db_path = os.path.join('data', DB_NAME)
+
+    # This device uploads; another device downloads, edits one row and uploads the delta
+    connection_provider.checkpoint(DatabaseManager().db_path)
+    size = os.path.getsize(db_path)
+    local = engine(tmp_path, storage, 'data', 'local')
+    assert local.upload(DB_NAME) == size
+    other_dir = tmp_path / 'other'
+    other = engine(tmp_path, storage, other_dir, 'other')
+    other.download(DB_NAME)
+    edit_copy(other_dir / DB_NAME, 'Edited elsewhere')
+    assert other.upload(DB_NAME) < size / 4
+
+    # Meanwhile this device has an open connection and uncheckpointed WAL content
+    with DatabaseManager() as db:
+        db.cursor.execute("UPDATE transactions SET description = 'Edited here' WHERE id = 2")
+        db.commit()
+        conn = db.conn
+        assert os.path.getsize(db_path + '-wal') > 0
+
+        local.status(refresh=True)
+        assert local.download(DB_NAME) < size / 4  # Unchanged chunks come from the local file
+
+        # The open connection sees the downloaded content, not its old WAL
+        rows = dict(conn.execute("SELECT id, description FROM transactions WHERE id IN (1, 2)").fetchall())
+        assert rows[1] == 'Edited elsewhere' and rows[2] != 'Edited here'
+        assert conn.execute("PRAGMA integrity_check").fetchone()[0] == 'ok'
+    assert os.path.getsize(db_path + '-wal') == 0
+    assert not os.path.exists(db_path + '.download')
+    files_to_upload, files_to_download = local.status()
+    assert DB_NAME not in dict(files_to_upload) and DB_NAME not in dict(files_to_download)
+
+
+def test_interrupted_download_resumes(synthetic_ledger, tmp_path):
+    connection_provider.checkpoint(DatabaseManager().db_path)
+    engine(tmp_path, LocalFolderStorage(tmp_path / 'remote'), 'data', 'local').upload(DB_NAME)
+    target_dir = tmp_path / 'new_device'
+
+    failing = FailingStorage(tmp_path / 'remote', allowed=1 + 4)  # The manifest, then 4 chunks
+    first = engine(tmp_path, failing, target_dir, 'new')
+    failed = TransferScheduler(first, max_workers=1).run('download', [DB_NAME])
+    assert DB_NAME in failed and not (target_dir / DB_NAME).exists()
+    chunk_count = len(first.logical_remote_files()[DB_NAME]['manifest']['chunks'])
+
+    # A new session with the same cache fetches only the chunks that were not written
+    resumed_storage = FailingStorage(tmp_path / 'remote', allowed=chunk_count)
+    resumed = engine(tmp_path, resumed_storage, target_dir, 'new')
+    assert TransferScheduler(resumed, max_workers=1).run('download', [DB_NAME]) == {}
+    assert resumed_storage.downloads == 1 + chunk_count - 4
+    assert file_md5(target_dir / DB_NAME) == file_md5(os.path.join('data', DB_NAME))
+
+
+def test_download_without_local_database_drops_stale_sidecars(synthetic_ledger, tmp_path):
+    connection_provider.checkpoint(DatabaseManager().db_path)
+    storage = LocalFolderStorage(tmp_path / 'remote')
+    engine(tmp_path, storage, 'data', 'local').upload(DB_NAME)
+
+    target_dir = tmp_path / 'new_device'
+    target_dir.mkdir()
+    stale_wal = target_dir / (DB_NAME + '-wal')
+    shutil.copy(os.path.join('data', DB_NAME), stale_wal)  # Garbage that must not be replayed
+    engine(tmp_path, storage, target_dir, 'new').download(DB_NAME)
+    assert not stale_wal.exists()
+    assert file_md5(target_dir / DB_NAME) == file_md5(os.path.join('data', DB_NAME))
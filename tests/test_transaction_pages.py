@@ -0,0 +1,38 @@
+# tests/test_transaction_pages.py
+import random
+import pytest
+from create_database import DatabaseManager
+from utils.crud.transaction_pages_core import BASE_QUERY, TransactionPages
+
+
+def all_rows(conn, pages):
+    """The whole filtered view in one query, for reference."""
+    query = BASE_QUERY
+    if pages.where_clauses:
+        query += f" WHERE {' AND '.join(pages.where_clauses)}"
+    return conn.execute(query + " ORDER BY t.date DESC, t.id DESC", pages.params).fetchall()
+
+
+@pytest.mark.parametrize('filters', [
+    None,
+    {'start_date': '2024-01-01', 'end_date': '2024-12-31'},
+    {'account_ids': [1, 2, 3]},
+    {'limit': 450},
+], ids=['all', 'dates', 'accounts', 'limit'])
+def test_random_access_matches_full_query(synthetic_ledger, filters):
+    with DatabaseManager() as db:
+        pages = TransactionPages(db.conn, filters, page_size=50, cached_pages=4)
+        expected = all_rows(db.conn, pages)[:pages.count]
+        assert pages.count == (min(len(expected), filters['limit']) if filters and 'limit' in filters
+                               else len(expected))
+
+        # Scroll from the top, jump to the end, come back up and wander
+        rng = random.Random(0)
+        numbers = (list(range(0, 300)) + list(range(pages.count - 120, pages.count)) + list(range(500, 380, -1))
+                   + [rng.randrange(pages.count) for _ in range(300)])
+        for number in numbers:
+            if number < pages.count:
+                assert tuple(pages.row(number)) == tuple(expected[number]), number
+            assert len(pages.pages) <= 4
+
+        assert pages.row(pages.count) is None
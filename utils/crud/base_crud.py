@@ -1,8 +1,7 @@
 # utils/crud/base_crud.py
-import sqlite3
 from abc import ABC, abstractmethod
 from utils.formatters import format_table_name
-from create_database import DatabaseManager
+from create_database import DatabaseManager, connection_provider
 
 class BaseCRUD(ABC):
     """Abstract base class for CRUD operations."""
@@ -11,7 +10,7 @@ class BaseCRUD(ABC):
         self.table_name = table_name
         self.formatted_table_name = format_table_name(table_name)
         self.db_path = DatabaseManager().db_path
-        self.conn = sqlite3.connect(self.db_path)
+        self.conn = connection_provider.get_connection(self.db_path)
         self.cursor = self.conn.cursor()
 
     def get_columns(self):
@@ -40,5 +39,6 @@ class BaseCRUD(ABC):
         pass
 
     def close_connection(self):
-        """Close the database connection."""
-        self.conn.close()
\ No newline at end of file
+        """Drop this object's reference; the thread's shared connection stays open."""
+        self.cursor = None
+        self.conn = None
\ No newline at end of file
@@ -8,6 +8,8 @@ import sqlite3
 from .base_crud import BaseCRUD
 from .search_dialog import AdvancedSearchDialog
 from utils.formatters import normalize_text, format_table_name
+from utils.money import Money, MONEY_COLUMNS
+from ledger.settings import app_settings
 
 class GenericCRUD(BaseCRUD):
     def __init__(self, table_name):
@@ -21,6 +23,8 @@ class GenericCRUD(BaseCRUD):
         # Filter out normalized_name and create display columns
         display_columns = [col for col in columns if col.lower() != 'normalized_name']
         normalized_name_index = columns.index('normalized_name') if 'normalized_name' in columns else -1
+        money_columns = MONEY_COLUMNS.get(self.table_name, ())
+        money_indexes = {idx for idx, col in enumerate(columns) if col in money_columns}
 
         formatted_columns = [format_table_name(col) for col in display_columns]
 
@@ -35,6 +39,8 @@ class GenericCRUD(BaseCRUD):
                 if col_idx == normalized_name_index:
                     col_offset = 1
                     continue
+                if col_idx in money_indexes:
+                    col = Money.from_db(col)  # Stored as cents
                 table.setItem(row_idx, col_idx - col_offset, QTableWidgetItem(str(col)))
 
         main_window.setCentralWidget(table)
@@ -265,6 +271,8 @@ class GenericCRUD(BaseCRUD):
                 try:
                     self.cursor.execute(f"DELETE FROM {self.table_name} WHERE id = ?", (record_id,))
                     self.conn.commit()
+                    if self.table_name == 'accounts':
+                        app_settings.accounts_changed()
                     QMessageBox.information(main_window, "Success", "Record deleted successfully!")
                 except sqlite3.Error as e:
                     QMessageBox.critical(main_window, "Database Error", str(e))
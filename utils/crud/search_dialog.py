@@ -2,8 +2,93 @@
 from PySide6.QtWidgets import (QDialog, QVBoxLayout, QLineEdit,
                               QTableWidget, QTableWidgetItem,
                               QPushButton, QLabel, QHBoxLayout)
-from utils.formatters import normalize_text, format_table_name
+from PySide6.QtCore import QObject, QTimer, Signal
+from utils.formatters import normalize_text, format_table_name, fts_match_expression
+from create_database import DatabaseManager, connection_provider
+from utils.money import Money, MONEY_COLUMNS
+import queue
 import sqlite3
+import threading
+
+class SearchSignals(QObject):
+    """Signals for search worker communication."""
+    results = Signal(int, list)  # generation, rows
+    error = Signal(int, str)
+
+class SearchWorker:
+    """
+    Runs search queries on a background thread with its own connection.
+
+    Each query carries a generation number. Submitting a newer query interrupts
+    the one in flight (sqlite3.Connection.interrupt) and only the latest queued
+    request is run, so fast typing never piles up work.
+    """
+
+    def __init__(self, db_path, row_limit):
+        self.db_path = db_path
+        self.row_limit = row_limit
+        self.signals = SearchSignals()
+        self.requests = queue.Queue()
+        self.conn = None
+        self.running_generation = None
+        self.latest_generation = 0
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def submit(self, generation, query, params):
+        self.latest_generation = generation
+        self.requests.put((generation, query, params))
+        running = self.running_generation
+        if running is not None and running < generation:
+            self._interrupt()  # Superseded, stop it early
+
+    def stop(self):
+        self.requests.put(None)
+        self._interrupt()
+
+    def _interrupt(self):
+        conn = self.conn
+        if conn is None:
+            return
+        try:
+            conn.interrupt()  # Safe to call from another thread
+        except sqlite3.ProgrammingError:
+            pass  # Worker already closed it
+
+    def _run(self):
+        self.conn = connection_provider.get_connection(self.db_path)
+        try:
+            while True:
+                request = self.requests.get()
+                # Skip straight to the newest request
+                while request is not None and not self.requests.empty():
+                    request = self.requests.get_nowait()
+                if request is None:
+                    break
+
+                generation, query, params = request
+                self.running_generation = generation
+                try:
+                    cursor = self.conn.execute(query, params)
+                    rows = [tuple(row) for row in cursor.fetchmany(self.row_limit + 1)]
+                    cursor.close()
+                except sqlite3.OperationalError as e:
+                    if "interrupt" in str(e).lower():
+                        # A late interrupt can hit the newest query; run it again
+                        if generation == self.latest_generation:
+                            self.requests.put(request)
+                        continue
+                    self.signals.error.emit(generation, str(e))
+                    continue
+                except sqlite3.Error as e:
+                    self.signals.error.emit(generation, str(e))
+                    continue
+                finally:
+                    self.running_generation = None
+                self.signals.results.emit(generation, rows)
+        finally:
+            self.conn = None
+            connection_provider.close_thread_connections()
 
 class AdvancedSearchDialog(QDialog):
     SEARCH_CONFIGS = {  # (Keep this as before - unchanged)
@@ -49,14 +134,17 @@ class AdvancedSearchDialog(QDialog):
     }
 
 
+    SEARCH_DELAY_MS = 250  # Wait for a pause in typing before querying
+    RESULT_LIMIT = 200     # Rows shown; refine the search to narrow further
+    RENDER_CHUNK = 50      # Rows rendered per event-loop pass
+
     def __init__(self, field_type, filter_value=None, parent=None, db_path=None, table_name=None, additional_filter=None): # New parameter
         super().__init__(parent)
         self.field_type = field_type
         self.filter_value = filter_value
         self.selected_item = None
         self.db_path = db_path or 'data/financial_system.db'
-        self.conn = sqlite3.connect(self.db_path)
-        self.conn.row_factory = sqlite3.Row
+        self.conn = connection_provider.get_connection(self.db_path)
         self.cursor = self.conn.cursor()
         self.additional_filter = additional_filter # Store the filter
 
@@ -71,12 +159,16 @@ class AdvancedSearchDialog(QDialog):
             self.base_query = f"SELECT {', '.join(self.display_columns)} FROM {self.table_name}"
             self.raw_column_names = self.display_columns
 
+            # --- FULL-TEXT INDEX (if this table has one) ---
+            self.fts_query = self._build_fts_query()
+
             # --- DYNAMIC FILTER APPLICATION ---
             if self.additional_filter:
                 self.base_query += f" WHERE {self.additional_filter}"
 
 
         else: # keep this part
+            self.fts_query = None
             config = self.SEARCH_CONFIGS[self.field_type]
             self.table_name = config['table']
             self.search_columns = config['search_columns']
@@ -84,15 +176,40 @@ class AdvancedSearchDialog(QDialog):
             self.base_query = config['base_query']
             self.raw_column_names = [col.split(' AS ')[0].split('.')[-1] for col in self.display_columns]
 
+        # Cents columns are shown (and returned) in major units
+        money_columns = MONEY_COLUMNS.get(self.table_name, ())
+        self.money_column_indexes = {i for i, name in enumerate(self.raw_column_names) if name in money_columns}
+
         self.init_ui()
 
+    def _build_fts_query(self):
+        """Ranked FTS5 query for tables with a search index, or None."""
+        if self.table_name not in DatabaseManager.FULL_TEXT_SOURCES:
+            return None
+        fts_table = f"{self.table_name}_fts"
+        self.cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (fts_table,)
+        )
+        if self.cursor.fetchone() is None:
+            return None  # Database not migrated yet, keep the LIKE search
+
+        # The index covers every searchable text column (FULL_TEXT_SOURCES), so
+        # a word search never has to scan the table
+        query = (
+            f"SELECT {', '.join(self.display_columns)} FROM {self.table_name} "
+            f"JOIN (SELECT rowid AS fts_rowid, rank AS fts_rank FROM {fts_table} "
+            f"WHERE {fts_table} MATCH ?) AS fts_match ON {self.table_name}.id = fts_match.fts_rowid"
+        )
+        if self.additional_filter:
+            query += f" WHERE {self.additional_filter}"
+        return query
+
     def init_ui(self):  # (Keep this as before - unchanged)
         self.setWindowTitle(f"Search {format_table_name(self.table_name)}")
         self.setGeometry(200, 200, 800, 500)
         layout = QVBoxLayout()
         self.search_input = QLineEdit()
         self.search_input.setPlaceholderText("Type to search...")
-        self.search_input.textChanged.connect(self.update_results)
         layout.addWidget(self.search_input)
         self.results_table = QTableWidget()
 
@@ -120,16 +237,39 @@ class AdvancedSearchDialog(QDialog):
         self.status_label = QLabel()
         layout.addWidget(self.status_label)
         self.setLayout(layout)
+
+        # --- Background search ---
+        self.search_generation = 0
+        self.search_worker = SearchWorker(self.db_path, self.RESULT_LIMIT)
+        self.search_worker.signals.results.connect(self.show_results)
+        self.search_worker.signals.error.connect(self.show_search_error)
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(self.SEARCH_DELAY_MS)
+        self.search_timer.timeout.connect(self.update_results)
+        self.search_input.textChanged.connect(self.search_timer.start)
         self.update_results()
 
 
-    def update_results(self):  # (Keep this as before - unchanged)
+    def update_results(self):
+        """Build the query for the current search term and hand it to the worker."""
         search_term = self.search_input.text().strip()
         normalized_term = normalize_text(search_term)
         query = self.base_query
         params = []
+        order_by = ""
+
+        # Words go through the search index (ranked, prefix matching); dates,
+        # amounts and IDs still use the column-wise LIKE search below.
+        match_expression = None
+        if self.fts_query and any(c.isalpha() for c in normalized_term):
+            match_expression = fts_match_expression(search_term)
 
-        if search_term:
+        if match_expression:
+            query = self.fts_query
+            params.append(match_expression)
+            order_by = " ORDER BY fts_match.fts_rank"
+        elif search_term:
             where_clauses = []
             for column in self.search_columns:
                 where_clauses.append(f"LOWER({column}) LIKE ?")
@@ -148,16 +288,44 @@ class AdvancedSearchDialog(QDialog):
                 query += " WHERE parent_id = ?"
             params.append(self.filter_value)
 
-        self.cursor.execute(query, params)
-        results = self.cursor.fetchall()
+        query += order_by
+        self.search_generation += 1
+        self.status_label.setText("Searching...")
+        self.search_worker.submit(self.search_generation, query, params)
+
+    def show_results(self, generation, results):
+        """Render the worker's rows, ignoring results of superseded searches."""
+        if generation != self.search_generation:
+            return
+        has_more = len(results) > self.RESULT_LIMIT
+        results = results[:self.RESULT_LIMIT]
+        self.results_table.setRowCount(0)
         self.results_table.setRowCount(len(results))
-        for row_idx, row in enumerate(results):
-            for col_idx, value in enumerate(row):
+        if has_more:
+            self.status_label.setText(f"Showing first {len(results)} items - refine the search to see others")
+        else:
+            self.status_label.setText(f"{len(results)} items found")
+        self._render_chunk(generation, results, 0)
+
+    def _render_chunk(self, generation, results, start):
+        # Fill a few rows per pass so typing stays responsive while rendering
+        if generation != self.search_generation:
+            return
+        end = min(start + self.RENDER_CHUNK, len(results))
+        for row_idx in range(start, end):
+            for col_idx, value in enumerate(results[row_idx]):
+                if col_idx in self.money_column_indexes:
+                    value = Money.from_db(value)
                 self.results_table.setItem(row_idx, col_idx, QTableWidgetItem(str(value)))
-        self.status_label.setText(f"{len(results)} items found")
-        if len(results) == 1:
+        if end < len(results):
+            QTimer.singleShot(0, lambda: self._render_chunk(generation, results, end))
+        elif len(results) == 1:
             self.results_table.selectRow(0)
 
+    def show_search_error(self, generation, message):
+        if generation == self.search_generation:
+            self.status_label.setText(f"Search failed: {message}")
+
     def select_item_and_close(self): # (Keep this as before - unchanged)
         selected_rows = self.results_table.selectedIndexes()
         if not selected_rows:
@@ -166,13 +334,23 @@ class AdvancedSearchDialog(QDialog):
         selected_data = {}
         for i in range(self.results_table.columnCount()):
             raw_col_name = self.raw_column_names[i]
-            selected_data[raw_col_name] = self.results_table.item(row, i).text()
+            item = self.results_table.item(row, i)
+            if item is None:
+                return  # Row not rendered yet
+            selected_data[raw_col_name] = item.text()
         self.selected_item = selected_data
         self.accept()
 
     def get_selected_item(self):  # (Keep this as before - unchanged)
         return self.selected_item
 
+    def done(self, result):
+        # accept()/reject() do not go through closeEvent
+        self.search_timer.stop()
+        self.search_worker.stop()
+        super().done(result)
+
     def closeEvent(self, event):  # (Keep this as before - unchanged)
-        self.conn.close()
+        self.search_timer.stop()
+        self.search_worker.stop()
         super().closeEvent(event)
\ No newline at end of file
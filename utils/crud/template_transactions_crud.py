@@ -7,6 +7,7 @@ from PySide6.QtCore import Qt
 from .generic_crud import GenericCRUD
 from .search_dialog import AdvancedSearchDialog
 from utils.formatters import format_table_name, normalize_text
+from utils.money import Money
 
 
 class TemplateTransactionCRUD(GenericCRUD):
@@ -246,7 +247,7 @@ class TemplateTransactionCRUD(GenericCRUD):
             QMessageBox.warning(None, "Error", "Amount cannot be empty.")
             return False
         try:
-            float(transaction['amount'])  # Check if amount is a valid number
+            Money.parse(transaction['amount'])  # Check if amount is a valid number
         except ValueError:
             QMessageBox.warning(None, "Error", "Invalid amount format.")
             return False
@@ -299,7 +300,7 @@ class TemplateTransactionCRUD(GenericCRUD):
                     (template_transaction_id, debited, credited, amount) 
                     VALUES (?, ?, ?, ?)""",
                     (template_transaction_id, transaction['debited'],
-                    transaction['credited'], float(transaction['amount']))
+                    transaction['credited'], Money.parse(transaction['amount']))
                 )
 
             self.conn.commit()
@@ -362,7 +363,7 @@ class TemplateTransactionCRUD(GenericCRUD):
             table.setItem(row_idx, 0, QTableWidgetItem(trans['description']))
             table.setItem(row_idx, 1, QTableWidgetItem(str(trans['debited']))) # changed
             table.setItem(row_idx, 2, QTableWidgetItem(str(trans['credited']))) # changed
-            table.setItem(row_idx, 3, QTableWidgetItem(str(trans['amount'])))
+            table.setItem(row_idx, 3, QTableWidgetItem(str(Money.from_db(trans['amount']))))
             table.setItem(row_idx, 4, QTableWidgetItem(f"{trans['debit_name']} ({trans['debit_code']})"))
             table.setItem(row_idx, 5, QTableWidgetItem(f"{trans['credit_name']} ({trans['credit_code']})"))
 
@@ -431,7 +432,7 @@ class TemplateTransactionCRUD(GenericCRUD):
                     'description': trans['description'],
                     'debited': trans['debited'],
                     'credited': trans['credited'],
-                    'amount': str(trans['amount']),
+                    'amount': str(Money.from_db(trans['amount'])),
                     'debited_display': f"{trans['debit_name']} ({trans['debit_code']})",
                     'credited_display': f"{trans['credit_name']} ({trans['credit_code']})"
                 }
@@ -531,7 +532,7 @@ class TemplateTransactionCRUD(GenericCRUD):
                     (template_transaction_id, debited, credited, amount) 
                     VALUES (?, ?, ?, ?)""",
                     (template_transaction_id, transaction['debited'],
-                     transaction['credited'], float(transaction['amount']))
+                     transaction['credited'], Money.parse(transaction['amount']))
                 )
 
             self.conn.commit()
@@ -32,7 +32,9 @@ class TransactionFilterDialog(QDialog):
         
         # Number of Transactions
         self.num_transactions_spinbox = QSpinBox()
-        self.num_transactions_spinbox.setRange(1, 10000)
+        # 0 means no cap; the transactions view pages rows in as it scrolls
+        self.num_transactions_spinbox.setRange(0, 10000000)
+        self.num_transactions_spinbox.setSpecialValueText("All")
         self.num_transactions_spinbox.setValue(15)
         self.num_transactions_spinbox.setMinimumHeight(28)
         general_layout.addRow("Number of Transactions:", self.num_transactions_spinbox)
@@ -194,7 +196,7 @@ class TransactionFilterDialog(QDialog):
 
     def get_filters(self):
         """Retrieves and validates the selected filter criteria."""
-        limit = self.num_transactions_spinbox.value()
+        limit = self.num_transactions_spinbox.value() or None  # 0 ("All") means no cap
 
         # Get dates only if checkboxes are checked
         start_date = None
@@ -206,8 +208,8 @@ class TransactionFilterDialog(QDialog):
             end_date = self.end_date_edit.date().toString("yyyy-MM-dd")
 
         # --- Basic Validation ---
-        if limit <= 0:
-            QMessageBox.warning(self, "Validation Error", "Number of transactions must be greater than 0.")
+        if limit is not None and limit < 0:
+            QMessageBox.warning(self, "Validation Error", "Number of transactions cannot be negative.")
             return None  # Indicate validation failure
 
         # Check if start date is after end date (only if both are provided)
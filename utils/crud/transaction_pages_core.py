@@ -0,0 +1,148 @@
+# utils/crud/transaction_pages_core.py
+"""
+Random access by row number to a filtered view of the transactions ledger,
+newest first, holding only a bounded window of it in memory.
+
+Rows are read a page at a time with keyset pagination on (date, id). Pages
+are kept in an LRU keyed by their first row number, so pages the view has
+scrolled away from are dropped. A page that does not follow a cached one
+starts from its first (date, id), found by counting over the date index from
+the nearest page seen before or from the bottom of the ledger.
+"""
+from collections import OrderedDict
+
+PAGE_SIZE = 200
+CACHED_PAGES = 8       # Pages of rows kept; well over one screen
+CACHED_PAGE_KEYS = 4096  # First (date, id) of recently seen pages
+
+# CROSS JOIN keeps transactions as the outer loop so SQLite walks the date
+# index in ORDER BY order and stops after one page.
+BASE_QUERY = """
+    SELECT
+        t.id,
+        t.date,
+        t.description,
+        da.name AS debited_account_name,
+        ca.name AS credited_account_name,
+        t.amount,
+        t.source_type
+    FROM transactions t
+    CROSS JOIN accounts da ON t.debited = da.id
+    CROSS JOIN accounts ca ON t.credited = ca.id
+"""
+
+
+class TransactionPages:
+    """
+    filters may hold 'start_date', 'end_date', 'account_ids' and 'limit' (the
+    newest N rows only). row(n) returns the n-th row as a tuple in
+    BASE_QUERY's column order.
+    """
+
+    # Keyset conditions in (date DESC, id DESC) order
+    AFTER_KEY = "t.date <= ? AND (t.date < ? OR t.id < ?)"
+    AT_OR_AFTER_KEY = "t.date <= ? AND (t.date < ? OR t.id <= ?)"
+
+    def __init__(self, conn, filters=None, page_size=None, cached_pages=CACHED_PAGES):
+        self.conn = conn
+        self.page_size = page_size or PAGE_SIZE
+        self.cached_pages = cached_pages
+        self.pages = OrderedDict()      # first row number -> rows
+        self.page_keys = OrderedDict()  # first row number -> (date, id) of its first row
+
+        filters = filters or {}
+        # --- Filter processing ---
+        self.where_clauses = []
+        self.params = []
+        if filters.get('start_date'):
+            self.where_clauses.append("t.date >= ?")
+            self.params.append(filters['start_date'])
+        if filters.get('end_date'):
+            self.where_clauses.append("t.date <= ?")
+            self.params.append(filters['end_date'])
+        account_ids = filters.get('account_ids')
+        if account_ids:
+            placeholders = ', '.join('?' * len(account_ids))
+            self.where_clauses.append(f"(t.debited IN ({placeholders}) OR t.credited IN ({placeholders}))")
+            self.params.extend(account_ids)
+            self.params.extend(account_ids)
+
+        self.total = self._count()  # Rows matching the filters
+        self.count = self.total
+        row_limit = filters.get('limit')
+        if isinstance(row_limit, int) and row_limit > 0:
+            self.count = min(self.count, row_limit)
+
+    def _where(self, extra_clause=None):
+        clauses = self.where_clauses + ([extra_clause] if extra_clause else [])
+        return f" WHERE {' AND '.join(clauses)}" if clauses else ""
+
+    def _count(self):
+        return self.conn.execute(f"SELECT COUNT(*) FROM transactions t{self._where()}", self.params).fetchone()[0]
+
+    def _start_key(self, start):
+        """
+        (date, id) of row number start. Counted from the nearest page start seen
+        before or from the bottom of the ledger, whichever is closer, over the
+        (date, id) index alone so skipped rows cost no joins.
+        """
+        known = max((page for page in self.page_keys if page <= start), default=None)
+        from_top = start - (known or 0)
+        from_bottom = self.total - 1 - start
+        if from_bottom < from_top:
+            query = f"SELECT t.date, t.id FROM transactions t{self._where()} ORDER BY t.date, t.id LIMIT 1 OFFSET ?"
+            params = self.params + [from_bottom]
+        elif known is None:
+            query = f"SELECT t.date, t.id FROM transactions t{self._where()} ORDER BY t.date DESC, t.id DESC LIMIT 1 OFFSET ?"
+            params = self.params + [from_top]
+        else:
+            key_date, key_id = self.page_keys[known]
+            query = (f"SELECT t.date, t.id FROM transactions t{self._where(self.AT_OR_AFTER_KEY)}"
+                     " ORDER BY t.date DESC, t.id DESC LIMIT 1 OFFSET ?")
+            params = self.params + [key_date, key_date, key_id, from_top]
+        return self.conn.execute(query, params).fetchone()
+
+    def _query(self, key_clause, key_params):
+        """One page of rows from key_clause (if any) on."""
+        query = BASE_QUERY + self._where(key_clause) + " ORDER BY t.date DESC, t.id DESC LIMIT ?"
+        return self.conn.execute(query, self.params + key_params + [self.page_size]).fetchall()
+
+    def _fetch_page(self, start):
+        if start == 0:
+            return self._query(None, [])
+        previous = self.pages.get(start - self.page_size)
+        if previous:
+            # Strictly after the previous page's last row
+            last_date, last_id = previous[-1][1], previous[-1][0]
+            return self._query(self.AFTER_KEY, [last_date, last_date, last_id])
+        key = self._start_key(start)
+        if key is None:
+            return []
+        return self._query(self.AT_OR_AFTER_KEY, [key[0], key[0], key[1]])
+
+    def page(self, start):
+        """The rows of the page beginning at row number start (a multiple of page_size)."""
+        rows = self.pages.get(start)
+        if rows is not None:
+            self.pages.move_to_end(start)
+            return rows
+
+        rows = self._fetch_page(start)
+        self.pages[start] = rows
+        while len(self.pages) > self.cached_pages:
+            self.pages.popitem(last=False)
+        if rows:
+            self.page_keys[start] = (rows[0][1], rows[0][0])
+            self.page_keys.move_to_end(start)
+            while len(self.page_keys) > CACHED_PAGE_KEYS:
+                self.page_keys.popitem(last=False)
+        return rows
+
+    def row(self, number):
+        """The row at position number (0 = newest), or None past the end."""
+        if not 0 <= number < self.count:
+            return None
+        start = number - number % self.page_size
+        rows = self.page(start)
+        offset = number - start
+        return rows[offset] if offset < len(rows) else None
@@ -5,12 +5,15 @@
 import sqlite3
 from PySide6.QtWidgets import (QMessageBox, QComboBox, QDialog, QHBoxLayout,
                               QVBoxLayout, QLineEdit, QPushButton, QLabel,
-                              QTableWidget, QTableWidgetItem, QHeaderView) # Keep HeaderView
-from PySide6.QtCore import Qt, QDate, QLocale
+                              QTableView, QHeaderView) # Keep HeaderView
+from PySide6.QtCore import QDate, QLocale
 from .generic_crud import GenericCRUD
 from .search_dialog import AdvancedSearchDialog
 from .date_select import DateSelectWindow
+from .transactions_table_model import TransactionsTableModel
 from utils.formatters import format_table_name, normalize_text
+from utils.money import Money
+from ledger import LedgerError, post_transaction, update_transaction, reverse_transaction
 
 class TransactionsCRUD(GenericCRUD):
     def __init__(self):
@@ -21,100 +24,29 @@ class TransactionsCRUD(GenericCRUD):
 
     def read(self, main_window, filters=None):
         """Read and display transactions, including source type."""
-        base_query = """
-            SELECT
-                t.id,
-                t.date,
-                t.description,
-                da.name AS debited_account_name,
-                ca.name AS credited_account_name,
-                t.amount,
-                t.source_type  -- Fetch source_type
-            FROM transactions t
-            JOIN accounts da ON t.debited = da.id
-            JOIN accounts ca ON t.credited = ca.id
-        """
-        where_clauses = []
-        params = []
-
-        # --- Filter processing ---
-        if filters:
-            if filters.get('start_date'):
-                where_clauses.append("t.date >= ?")
-                params.append(filters['start_date'])
-            if filters.get('end_date'):
-                where_clauses.append("t.date <= ?")
-                params.append(filters['end_date'])
-            if filters.get('account_ids'):
-                account_ids = filters['account_ids']
-                if account_ids:
-                    placeholders = ', '.join('?' * len(account_ids))
-                    where_clauses.append(f"(t.debited IN ({placeholders}) OR t.credited IN ({placeholders}))")
-                    params.extend(account_ids)
-                    params.extend(account_ids)
-            limit = filters.get('limit', 15)
-            if not isinstance(limit, int) or limit <= 0: limit = 15
-        else:
-            limit = 15
-
-        if where_clauses:
-            query = f"{base_query} WHERE {' AND '.join(where_clauses)}"
-        else:
-            query = base_query
-
-        query += " ORDER BY t.date DESC, t.id DESC"
-        query += " LIMIT ?"
-        params.append(limit)
-        # --- End of Filter processing ---
+        # Keep the old default of the latest 15 rows when no filters are given;
+        # a limit of None pages through the whole ledger as the view scrolls.
+        filters = dict(filters) if filters else {'limit': 15}
 
         try:
-            self.cursor.execute("PRAGMA busy_timeout = 5000;")
-            self.cursor.execute(query, params)
-            records = self.cursor.fetchall()
-
             # --- Display in Table ---
-            table = QTableWidget(main_window)
+            table = QTableView(main_window)
             table.setObjectName("transactionsViewTable")
-            # Add "Source Type" column
-            columns = ["ID", "Date", "Description", "Debited Account", "Credited Account", "Amount", "Source Type"]
-            table.setRowCount(len(records))
-            table.setColumnCount(len(columns))
-            table.setHorizontalHeaderLabels(columns)
-            table.setEditTriggers(QTableWidget.NoEditTriggers)
-            table.setSortingEnabled(False)
+            model = TransactionsTableModel(self.db_path, filters, parent=table)
+            table.setModel(model)
+            table.destroyed.connect(model.close)
+            table.setEditTriggers(QTableView.NoEditTriggers)
+            table.setSortingEnabled(False)  # Rows are ordered by the query (date, id newest first)
             table.verticalHeader().setVisible(False)
             table.setAlternatingRowColors(True)
-            table.setWordWrap(True)
-            table.verticalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
-
-            # Populate the table widget
-            for row_idx, record_row in enumerate(records):
-                 id_item = QTableWidgetItem(str(record_row['id']))
-                 id_item.setTextAlignment(Qt.AlignCenter)
-                 table.setItem(row_idx, 0, id_item)
-                 table.setItem(row_idx, 1, QTableWidgetItem(str(record_row['date'])))
-                 table.setItem(row_idx, 2, QTableWidgetItem(str(record_row['description'] or '')))
-                 table.setItem(row_idx, 3, QTableWidgetItem(str(record_row['debited_account_name'])))
-                 table.setItem(row_idx, 4, QTableWidgetItem(str(record_row['credited_account_name'])))
-                 try:
-                     amount_str = "{:,.2f}".format(float(record_row['amount']))
-                 except (ValueError, TypeError):
-                     amount_str = str(record_row['amount'] or '0.00')
-                 amount_item = QTableWidgetItem(amount_str)
-                 amount_item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter) # Align amount right
-                 table.setItem(row_idx, 5, amount_item)
-                 # Populate the new Source Type column
-                 source_type_item = QTableWidgetItem(str(record_row['source_type']))
-                 source_type_item.setTextAlignment(Qt.AlignCenter)
-                 table.setItem(row_idx, 6, source_type_item)
-
+            table.setWordWrap(False)
 
             # --- Column Sizing Strategy ---
             header = table.horizontalHeader()
             # Make columns interactive initially for user resizing
-            for i in range(table.columnCount()):
+            for i in range(model.columnCount()):
                 header.setSectionResizeMode(i, QHeaderView.Interactive)
-            # Resize based on content first
+            # Size against the first rows only; later pages keep these widths
             table.resizeColumnsToContents()
             # Set minimum widths for better readability
             if table.columnWidth(0) < 60: table.setColumnWidth(0, 60)   # ID
@@ -125,11 +57,7 @@ class TransactionsCRUD(GenericCRUD):
             if table.columnWidth(2) < 200: table.setColumnWidth(2, 200) # Description
             if table.columnWidth(3) < 150: table.setColumnWidth(3, 150) # Debited
             if table.columnWidth(4) < 150: table.setColumnWidth(4, 150) # Credited
-            # Optional: Set Description to stretch if desired after initial sizing
-            # header.setSectionResizeMode(2, QHeaderView.Stretch)
 
-            table.resizeRowsToContents()
-            table.setSortingEnabled(True) # Allow sorting after population
             main_window.setCentralWidget(table)
             main_window.setWindowTitle("FinTrack - View Transactions")
 
@@ -268,7 +196,10 @@ class TransactionsCRUD(GenericCRUD):
             else:
                 current_text_val = ""
                 if current_value is not None:
-                    current_text_val = str(current_value or '')
+                    if col_lower == 'amount':
+                        current_text_val = str(Money.from_db(current_value))  # Stored as cents
+                    else:
+                        current_text_val = str(current_value or '')
                 input_field = QLineEdit(current_text_val)
                 if col_lower == 'amount':
                     input_field.setLocale(QLocale.C) # Ensure '.' decimal separator
@@ -298,33 +229,6 @@ class TransactionsCRUD(GenericCRUD):
         return selected.get('description', selected.get('name', 'N/A'))
 
 
-    # --- _update_account_balance method ---
-    # (Remains the same)
-    def _update_account_balance(self, account_id, amount, operation):
-        if account_id is None:
-             print("Error: Cannot update balance for None account ID.")
-             raise ValueError("Cannot update balance for a missing account ID.")
-        try:
-            amount_float = float(amount)
-        except (ValueError, TypeError) as e:
-             print(f"Error: Invalid amount '{amount}' for balance update. {e}")
-             raise ValueError(f"Invalid amount format for balance update: {amount}")
-
-        if operation == 'add': adjustment = amount_float
-        elif operation == 'subtract': adjustment = -amount_float
-        else: raise ValueError(f"Invalid balance update operation: {operation}")
-
-        try:
-            self.cursor.execute("UPDATE accounts SET balance = balance + ? WHERE id = ?", (adjustment, account_id))
-            print(f"Balance update: Account {account_id}, Operation: {operation}, Amount: {amount_float}, Adjustment: {adjustment}")
-        except sqlite3.Error as e:
-            print(f"DB Error updating account balance for ID {account_id}: {e}")
-            raise
-        except Exception as e:
-             print(f"Unexpected error during balance update for ID {account_id}: {e}")
-             raise
-
-
     # --- _save_record method ---
     def _save_record(self, dialog, inputs, update=False, record_id=None):
         """Saves a transaction, setting source_type='GENERAL' for new records."""
@@ -374,7 +278,7 @@ class TransactionsCRUD(GenericCRUD):
                     return False
             elif col_lower == 'amount':
                  try:
-                     amount = float(value)
+                     amount = Money.parse(value)
                      if amount <= 0:
                          QMessageBox.warning(dialog, "Input Error", "Amount must be a positive number (greater than 0).")
                          return False
@@ -395,111 +299,30 @@ class TransactionsCRUD(GenericCRUD):
         if debited_account_id == credited_account_id:
              QMessageBox.warning(dialog, "Input Error", "Debited and Credited accounts cannot be the same.")
              return False
+        description = dict(zip(columns, values)).get('description')
 
-        # --- 5. Database Transaction ---
-        query = ""
-        final_values = []
+        # --- 5. Database Transaction (balances are kept in step by the ledger layer) ---
         try:
             self.cursor.execute("BEGIN")
-
-            original_debited = None
-            original_credited = None
-            original_amount = None
-
-            db_column_names = self.get_columns()
-            db_cols_lower_set = {name.lower() for name in db_column_names}
-
-            # --- UPDATE Logic (Source Type is NOT updated) ---
             if update and record_id is not None:
-                # Fetch original details for balance reversal
-                # The check preventing edit already happened in the 'edit' method
-                self.cursor.execute("SELECT debited, credited, amount FROM transactions WHERE id = ?", (record_id,))
-                original_data = self.cursor.fetchone()
-                if not original_data:
-                     self.conn.rollback(); raise ValueError(f"Update Error: Original transaction with ID {record_id} not found.")
-                original_debited = original_data['debited']
-                original_credited = original_data['credited']
-                original_amount = original_data['amount']
-
-                # Reverse original balance impact
-                if original_debited is not None and original_amount is not None:
-                    self._update_account_balance(original_debited, original_amount, 'subtract')
-                if original_credited is not None and original_amount is not None:
-                    self._update_account_balance(original_credited, original_amount, 'add')
-
-                # Prepare UPDATE statement, excluding source_type
-                update_columns_clause = []
-                update_values = []
-                col_val_dict = dict(zip(columns, values))
-
-                for col in columns:
-                     col_lower = col.lower()
-                     # Only update columns that exist in the table and are not internal/timestamp/source_type
-                     if col_lower in db_cols_lower_set and col_lower not in ['id', 'created_at', 'updated_at', 'source_type']:
-                         update_columns_clause.append(f"{col} = ?")
-                         update_values.append(col_val_dict[col])
-
-                if 'updated_at' in db_cols_lower_set:
-                     update_columns_clause.append("updated_at = CURRENT_TIMESTAMP")
-
-                set_clause = ', '.join(update_columns_clause)
-                query = f"UPDATE {self.table_name} SET {set_clause} WHERE id = ?"
-                final_values = update_values + [record_id]
-
-            # --- INSERT Logic (Set source_type to 'GENERAL') ---
+                # source_type is never changed; edit() only allows GENERAL records here
+                update_transaction(self.cursor, record_id, transaction_date, description,
+                                   debited_account_id, credited_account_id, amount)
             else:
-                insert_columns = []
-                insert_values = []
-                col_val_dict = dict(zip(columns, values))
-
-                for col in columns:
-                    col_lower = col.lower()
-                    # Only include columns that exist in the table (excluding id)
-                    if col_lower in db_cols_lower_set and col_lower != 'id':
-                        insert_columns.append(col)
-                        insert_values.append(col_val_dict[col])
-
-                # **** Add source_type explicitly for INSERT ****
-                if 'source_type' in db_cols_lower_set and 'source_type' not in [c.lower() for c in insert_columns]:
-                    insert_columns.append('source_type')
-                    insert_values.append('GENERAL') # Default source for manual/template adds
-
-                current_time = sqlite3.Timestamp.now()
-                if 'created_at' in db_cols_lower_set and 'created_at' not in [c.lower() for c in insert_columns]:
-                     insert_columns.append('created_at')
-                     insert_values.append(current_time)
-                if 'updated_at' in db_cols_lower_set and 'updated_at' not in [c.lower() for c in insert_columns]:
-                     insert_columns.append('updated_at')
-                     insert_values.append(current_time)
-
-                placeholders = ', '.join(['?'] * len(insert_columns))
-                query = f"INSERT INTO {self.table_name} ({', '.join(insert_columns)}) VALUES ({placeholders})"
-                final_values = insert_values
-
-            # --- 6. Execute SQL and Update Balances (new impact) ---
-            print(f"Executing Query: {query}") # Debugging
-            print(f"With Values: {final_values}") # Debugging
-            self.cursor.execute(query, final_values)
-
-            # Apply new balance impact
-            if debited_account_id is not None:
-                 self._update_account_balance(debited_account_id, amount, 'add')
-            if credited_account_id is not None:
-                 self._update_account_balance(credited_account_id, amount, 'subtract')
-
-            # --- 7. Commit Transaction ---
+                post_transaction(self.cursor, transaction_date, description,
+                                 debited_account_id, credited_account_id, amount, source_type='GENERAL')
+
+            # --- 6. Commit Transaction ---
             self.conn.commit()
             QMessageBox.information(dialog, "Success", f"Transaction {'updated' if update else 'created'} successfully!")
             dialog.accept()
             return True
 
         except (sqlite3.Error, ValueError, TypeError) as e:
-            # --- 8. Rollback on Error ---
+            # --- 7. Rollback on Error ---
             self.conn.rollback()
             error_message = f"Failed to save transaction: {str(e)}"
             print(f"ERROR during save: {error_message}")
-            print(f"Failed Query (approx): {query}")
-            print(f"Failed Values (approx): {final_values}")
             QMessageBox.critical(dialog, "Database Error", error_message)
             return False
 
@@ -610,7 +433,7 @@ class TransactionsCRUD(GenericCRUD):
                       source_type = trans_data['source_type'] # <<< Get the source type
                       desc_text = trans_data['description'] or 'N/A'
                       if len(desc_text) > 80: desc_text = desc_text[:77] + "..."
-                      amount_formatted = "{:,.2f}".format(float(trans_data['amount'])) if trans_data['amount'] is not None else 'N/A'
+                      amount_formatted = "{:,.2f}".format(Money.from_db(trans_data['amount'])) if trans_data['amount'] is not None else 'N/A'
                       # Include source type in the confirmation message details
                       description_info = (f"\nDescription: {desc_text}\nDate: {trans_data['date']}\nAmount: {amount_formatted}"
                                           f"\nSource: {source_type}")
@@ -646,39 +469,23 @@ class TransactionsCRUD(GenericCRUD):
                     # Start DB transaction for atomicity
                     self.cursor.execute("BEGIN")
 
-                    # Re-fetch balance details right before deletion (source_type already confirmed as GENERAL)
-                    self.cursor.execute("SELECT debited, credited, amount FROM transactions WHERE id = ?", (record_id,))
-                    original_data = self.cursor.fetchone()
-                    if not original_data: # Check if it was deleted between confirmation and now
+                    # Delete and take its impact out of the balances (source_type already confirmed as GENERAL)
+                    try:
+                        reverse_transaction(self.cursor, record_id)
+                    except LedgerError:
+                        # Deleted between confirmation and now
                         self.conn.rollback()
                         QMessageBox.warning(main_window, "Not Found", f"Transaction ID {record_id} no longer exists.")
                         return
 
-                    original_debited = original_data['debited']
-                    original_credited = original_data['credited']
-                    original_amount = original_data['amount']
-
-                    # Reverse balance impacts
-                    if original_debited is not None and original_amount is not None:
-                        self._update_account_balance(original_debited, original_amount, 'subtract')
-                    if original_credited is not None and original_amount is not None:
-                        self._update_account_balance(original_credited, original_amount, 'add')
-
-                    # Delete the transaction record
-                    delete_count = self.cursor.execute(f"DELETE FROM {self.table_name} WHERE id = ?", (record_id,)).rowcount
-
-                    if delete_count == 0: # Should not happen if fetch worked, but good check
-                         self.conn.rollback()
-                         QMessageBox.warning(main_window, "Deletion Failed", f"Transaction ID {record_id} could not be deleted (already gone?). Balances reverted.")
-                    else:
-                        # Commit the changes (deletion and balance updates)
-                        self.conn.commit()
-                        QMessageBox.information(main_window, "Success", f"Transaction ID {record_id} deleted and balances updated.")
-                        # Refresh logic (optional but recommended)
-                        current_widget = main_window.centralWidget()
-                        if isinstance(current_widget, QTableWidget) and current_widget.objectName() == "transactionsViewTable":
-                             # Suggest refresh instead of trying to auto-refresh complex filtered views
-                             QMessageBox.information(main_window, "Refresh Recommended", "Transaction deleted. Please 'View Transactions' again or use the filter/refresh button if available.")
+                    # Commit the changes (deletion and balance updates)
+                    self.conn.commit()
+                    QMessageBox.information(main_window, "Success", f"Transaction ID {record_id} deleted and balances updated.")
+                    # Refresh logic (optional but recommended)
+                    current_widget = main_window.centralWidget()
+                    if isinstance(current_widget, QTableView) and current_widget.objectName() == "transactionsViewTable":
+                         # Suggest refresh instead of trying to auto-refresh complex filtered views
+                         QMessageBox.information(main_window, "Refresh Recommended", "Transaction deleted. Please 'View Transactions' again or use the filter/refresh button if available.")
 
                 except (sqlite3.Error, ValueError, TypeError) as e:
                     # Rollback on any error during the delete process
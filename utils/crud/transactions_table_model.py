@@ -0,0 +1,66 @@
+# utils/crud/transactions_table_model.py
+
+from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex
+from create_database import connection_provider
+from utils.crud.transaction_pages_core import TransactionPages
+from utils.money import Money
+
+class TransactionsTableModel(QAbstractTableModel):
+    """
+    Read-only, lazily paged model over the transactions ledger.
+
+    The row count comes from one COUNT(*); rows are read on demand through
+    TransactionPages, which keeps only the pages around the viewport. Memory
+    stays bounded however far the view scrolls, and jumping to the end reads
+    a single page.
+    """
+
+    COLUMNS = ["ID", "Date", "Description", "Debited Account", "Credited Account", "Amount", "Source Type"]
+
+    def __init__(self, db_path, filters=None, page_size=None, parent=None):
+        super().__init__(parent)
+        self.conn = connection_provider.get_connection(db_path)
+        self.pages = TransactionPages(self.conn, filters, page_size)
+
+    # --- Model interface ---
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self.pages.count
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.COLUMNS[section]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        column = index.column()
+
+        if role == Qt.DisplayRole:
+            row = self.pages.row(index.row())
+            if row is None:
+                return None
+            value = row[column]
+            if column == 5:
+                try:
+                    return "{:,.2f}".format(Money.from_db(value))  # Stored as cents
+                except (ValueError, TypeError):
+                    return str(value or '0.00')
+            if column == 2:
+                return str(value or '')
+            return str(value)
+
+        if role == Qt.TextAlignmentRole:
+            if column in (0, 6):
+                return int(Qt.AlignCenter)
+            if column == 5:
+                return int(Qt.AlignRight | Qt.AlignVCenter)
+        return None
+
+    def close(self):
+        """Drop the model's connection (the thread's shared one stays open)."""
+        self.conn = None
+        self.pages.conn = None
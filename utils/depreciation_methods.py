@@ -1,4 +1,7 @@
 # utils/depreciation_methods.py
+import math
+
+
 def calculate_depreciation(method, cost, salvage_value, life=None, rate=None,
                           units_produced=None, total_units=None,
                           current_book_value=None, period=1): #Added period
@@ -68,4 +71,153 @@ def calculate_depreciation(method, cost, salvage_value, life=None, rate=None,
             return 0, "invalid-units"
         return (cost - salvage_value) * (units_produced / total_units), None
     else:
-        return 0, "invalid-method"
\ No newline at end of file
+        return 0, "invalid-method"
+
+# --- Schedule projection ---
+HALF_CENT = 0.005  # A book value this close to salvage counts as fully depreciated
+
+
+def period_of(purchase_date, on_date):
+    """Depreciation period (month) of on_date, where the purchase month is period 1."""
+    return (on_date.year - purchase_date.year) * 12 + (on_date.month - purchase_date.month) + 1
+
+
+class DepreciationSchedule:
+    """
+    Monthly depreciation of one asset in closed form.
+
+    Period 1 is the purchase month. accumulated(k) and book_value(k) give the
+    position after period k without walking the months before it: straight
+    line is linear, sum of the years' digits an arithmetic series, and the
+    declining-balance methods a geometric decay at the annual rate / 12 that
+    switches to (book value - salvage) / 12 once a year at the full rate would
+    pass salvage. Each period's charge is the annual amount from
+    calculate_depreciation / 12 (sum of the years' digits uses the year the
+    month falls in).
+
+    The schedule ends at end_period: when the book value comes within half a
+    cent of salvage or after the useful life, whichever is first. The last
+    period takes the remainder, so the book value ends at salvage. Units of Production has no closed form (it needs
+    the units of each period) and is rejected like calculate_depreciation does.
+
+    Raises ValueError with calculate_depreciation's error code for invalid input.
+    """
+
+    def __init__(self, method, cost, salvage_value, life=None, rate=None, total_units=None):
+        _, error = calculate_depreciation(method, cost, salvage_value, life=life, rate=rate,
+                                          total_units=total_units, current_book_value=cost, period=1)
+        if error:
+            raise ValueError(error)
+        if method not in ('Straight-Line', "Sum of the Years' Digit", 'Declining Balance', 'Double-Declining Balance'):
+            raise ValueError("invalid-method")
+
+        self.method = method
+        self.cost = float(cost)
+        self.salvage_value = float(salvage_value)
+        self.depreciable = self.cost - self.salvage_value
+        self.life = life
+        if method == 'Double-Declining Balance' and rate is None:
+            rate = (1 / life) * 2
+        self.rate = rate
+        self.declining = method in ('Declining Balance', 'Double-Declining Balance')
+        # Declining balance: monthly decay factor, and the period (if any) and book value
+        # after which the charge becomes (book value - salvage) / 12
+        self.monthly_factor = self.switch_period = self.switch_value = None
+
+        life_months = life * 12 if life else None
+        if self.depreciable <= 0:
+            self.end_period = 0
+        elif not self.declining:
+            self.end_period = life_months
+        else:
+            self.monthly_factor = 1 - rate / 12
+            self.switch_period = self._full_rate_periods()
+            if self.switch_period is not None:
+                self.switch_value = self.cost * self.monthly_factor ** self.switch_period
+            salvage_period = self._salvage_period()
+            self.end_period = salvage_period if life_months is None else min(salvage_period, life_months)
+        # The last period takes the remainder down to salvage, also when a
+        # declining balance is cut off by the useful life
+        self.final_accumulated = self.depreciable
+
+    @classmethod
+    def for_asset(cls, asset):
+        """The schedule of a fixed_assets row (a mapping with its column names)."""
+        return cls(asset['depreciation_method'], asset['original_cost'], asset['salvage_value'],
+                   life=asset['useful_life_years'], rate=asset['depreciation_rate'],
+                   total_units=asset['total_estimated_units'])
+
+    # --- Declining balance ---
+    def _full_rate_periods(self):
+        """Periods charged at the full rate, or None if the rate never overshoots salvage."""
+        keep = 1 - self.rate  # Share of the book value left after a year at the full rate
+        if self.salvage_value == 0:
+            return 0 if keep < 0 else None
+        if keep <= 0 or self.cost * keep < self.salvage_value:
+            return 0
+        periods = max(0, math.ceil(math.log(self.salvage_value / (self.cost * keep)) / math.log(self.monthly_factor)))
+        # Settle floating-point error in the logarithms against the exact test
+        while periods > 0 and self.cost * self.monthly_factor ** (periods - 1) * keep < self.salvage_value:
+            periods -= 1
+        while not self.cost * self.monthly_factor ** periods * keep < self.salvage_value:
+            periods += 1
+        return periods
+
+    def _declining_book_value(self, k):
+        if self.switch_period is None or k <= self.switch_period:
+            return self.cost * self.monthly_factor ** k
+        return self.salvage_value + (self.switch_value - self.salvage_value) * (11 / 12) ** (k - self.switch_period)
+
+    def _salvage_period(self):
+        """First period after which the book value is within half a cent of salvage."""
+        target = self.salvage_value + HALF_CENT
+        if self.switch_period is None or self.cost * self.monthly_factor ** self.switch_period < target:
+            k = math.ceil(math.log(target / self.cost) / math.log(self.monthly_factor))
+        else:
+            k = self.switch_period + math.ceil(
+                math.log(HALF_CENT / (self.switch_value - self.salvage_value)) / math.log(11 / 12))
+        k = max(k, 1)
+        while k > 1 and self._declining_book_value(k - 1) < target:
+            k -= 1
+        while self._declining_book_value(k) >= target:
+            k += 1
+        return k
+
+    # --- Queries ---
+    def _accumulated(self, k):
+        if self.declining:
+            return self.cost - self._declining_book_value(k)
+        if self.method == 'Straight-Line':
+            return self.depreciable * k / self.end_period
+        years, months = divmod(k, 12)  # Sum of the years' digits: full years, then months of the next
+        digits = (self.life * (self.life + 1)) / 2
+        return self.depreciable * (years * self.life - years * (years - 1) / 2 + months * (self.life - years) / 12) / digits
+
+    def accumulated(self, k):
+        """Accumulated depreciation after period k."""
+        if k <= 0:
+            return 0.0
+        if k >= self.end_period:
+            return self.final_accumulated
+        return self._accumulated(k)
+
+    def book_value(self, k):
+        """Book value after period k."""
+        return self.cost - self.accumulated(k)
+
+    def expense(self, k):
+        """Depreciation charged in period k."""
+        if k < 1 or k > self.end_period:
+            return 0.0
+        return self.accumulated(k) - self.accumulated(k - 1)
+
+    def rows(self, first=1, last=None):
+        """[(period, expense, accumulated, book value)] for periods first..last (default: to the end)."""
+        last = self.end_period if last is None else min(last, self.end_period)
+        rows = []
+        previous = self.accumulated(first - 1)
+        for k in range(max(first, 1), last + 1):
+            accumulated = self.accumulated(k)
+            rows.append((k, accumulated - previous, accumulated, self.cost - accumulated))
+            previous = accumulated
+        return rows
@@ -1,9 +1,33 @@
+import hashlib
+import re
 import unicodedata
+from utils.money import Money
 
 def normalize_text(text):
     """Convert text to lowercase and remove accents."""
     return ''.join(c for c in unicodedata.normalize('NFD', text.lower()) if unicodedata.category(c) != 'Mn')
 
+def statement_hash(date, amount, description):
+    """Duplicate-detection key of a posting: date, absolute amount in cents and folded description."""
+    folded = ' '.join(normalize_text(description or '').split())
+    key = f"{date}|{abs(Money.parse(amount)).cents}|{folded}"
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+def fts_match_expression(text, prefix=True):
+    """Build an FTS5 MATCH expression from free text.
+
+    With prefix=True every word must match the start of a token ("car pay" finds
+    "Car payment"); otherwise the words must appear as a phrase. Returns None
+    when the text has no searchable words.
+    """
+    # Split like the unicode61 tokenizer: runs of letters and digits
+    tokens = re.findall(r'[^\W_]+', normalize_text(text or ''))
+    if not tokens:
+        return None
+    if prefix:
+        return ' '.join(f'"{token}"*' for token in tokens)
+    return '"' + ' '.join(tokens) + '"'
+
 def format_table_name(table_name):
     """Convert snake_case to Title Case with spaces and handle ID formatting."""
     # First handle the special case of 'id' as a standalone field
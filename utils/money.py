@@ -0,0 +1,167 @@
+# utils/money.py
+import sqlite3
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+
+CENTS_PER_UNIT = 100
+_CENT = Decimal('0.01')
+
+# Columns stored as INTEGER cents, by table
+MONEY_COLUMNS = {
+    'accounts': ('balance',),
+    'account_period_balances': ('debit_total', 'credit_total'),
+    'transactions': ('amount',),
+    'future_transactions': ('amount',),
+    'recurring_transactions': ('amount',),
+    'template_transaction_details': ('amount',),
+    'debtor_creditor': ('amount',),
+    'debtor_creditor_transactions': ('amount',),
+}
+
+# Columns still stored in major units, by table. Fixed-asset costs and the
+# depreciation schedule keep fractional amounts for the depreciation math;
+# they become Money through Money.parse() where they reach the ledger.
+MAJOR_UNIT_COLUMNS = {
+    'fixed_assets': ('original_cost', 'salvage_value', 'disposal_price'),
+    'depreciation_schedule': ('depreciation_expense', 'accumulated_depreciation', 'book_value'),
+}
+
+
+class Money:
+    """
+    An exact amount of currency held as integer minor units (cents).
+
+    Ledger amounts and account balances are stored as INTEGER cents. Money is
+    built from user input with Money.parse(), from database values with
+    Money.from_db(), and can be passed straight to sqlite3 as a parameter.
+    Formatting works like a number: f"{amount:,.2f}".
+    """
+
+    __slots__ = ('cents',)
+
+    def __init__(self, cents=0):
+        if isinstance(cents, float):
+            if not cents.is_integer():
+                raise ValueError(f"Money needs whole cents, got {cents!r}")
+            cents = int(cents)
+        self.cents = int(cents)
+
+    # --- Construction ---
+    @classmethod
+    def parse(cls, value):
+        """Money from an amount in major units (text, int, float or Decimal), rounded half-up to the cent."""
+        if isinstance(value, Money):
+            return value
+        if value is None:
+            raise ValueError("Amount is required.")
+        if isinstance(value, float):
+            value = repr(value)  # Shortest round-tripping text, so 0.1 stays 0.1
+        try:
+            amount = Decimal(str(value).strip())
+        except InvalidOperation:
+            raise ValueError(f"Invalid amount: {value!r}")
+        if not amount.is_finite():
+            raise ValueError(f"Invalid amount: {value!r}")
+        return cls(int(amount.quantize(_CENT, rounding=ROUND_HALF_UP) * CENTS_PER_UNIT))
+
+    @classmethod
+    def from_db(cls, cents):
+        """Money from a stored cents value (NULL reads as zero)."""
+        return cls(cents or 0)
+
+    # --- Conversion ---
+    def to_decimal(self):
+        return Decimal(self.cents).scaleb(-2)
+
+    def __float__(self):
+        return self.cents / CENTS_PER_UNIT
+
+    def __format__(self, spec):
+        return format(self.to_decimal(), spec or '.2f')
+
+    def __str__(self):
+        return format(self, '.2f')
+
+    def __repr__(self):
+        return f"Money('{self}')"
+
+    # --- Arithmetic (Money with Money; 0 is accepted so sum() works) ---
+    @staticmethod
+    def _cents_of(other):
+        if isinstance(other, Money):
+            return other.cents
+        if isinstance(other, int) and other == 0:
+            return 0
+        return NotImplemented
+
+    def __add__(self, other):
+        cents = self._cents_of(other)
+        return NotImplemented if cents is NotImplemented else Money(self.cents + cents)
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        cents = self._cents_of(other)
+        return NotImplemented if cents is NotImplemented else Money(self.cents - cents)
+
+    def __rsub__(self, other):
+        cents = self._cents_of(other)
+        return NotImplemented if cents is NotImplemented else Money(cents - self.cents)
+
+    def __mul__(self, factor):
+        if isinstance(factor, int):
+            return Money(self.cents * factor)
+        if isinstance(factor, (float, Decimal)):
+            product = Decimal(self.cents) * Decimal(repr(factor) if isinstance(factor, float) else factor)
+            return Money(int(product.quantize(Decimal(1), rounding=ROUND_HALF_UP)))
+        return NotImplemented
+
+    __rmul__ = __mul__
+
+    def __neg__(self):
+        return Money(-self.cents)
+
+    def __abs__(self):
+        return Money(abs(self.cents))
+
+    # --- Comparison (against Money, or plain numbers in major units) ---
+    def _comparable(self, other):
+        """(self, other) as exactly comparable values, or None for other types."""
+        if isinstance(other, Money):
+            return self.cents, other.cents
+        if isinstance(other, float):
+            # The float as typed (shortest repr), so 1234.56 means 1234.56
+            return self.to_decimal(), Decimal(repr(other))
+        if isinstance(other, (int, Decimal)) and not isinstance(other, bool):
+            return self.to_decimal(), other
+        return None
+
+    def __eq__(self, other):
+        pair = self._comparable(other)
+        return NotImplemented if pair is None else pair[0] == pair[1]
+
+    def __lt__(self, other):
+        pair = self._comparable(other)
+        return NotImplemented if pair is None else pair[0] < pair[1]
+
+    def __le__(self, other):
+        pair = self._comparable(other)
+        return NotImplemented if pair is None else pair[0] <= pair[1]
+
+    def __gt__(self, other):
+        pair = self._comparable(other)
+        return NotImplemented if pair is None else pair[0] > pair[1]
+
+    def __ge__(self, other):
+        pair = self._comparable(other)
+        return NotImplemented if pair is None else pair[0] >= pair[1]
+
+    def __bool__(self):
+        return self.cents != 0
+
+    def __hash__(self):
+        # The float of the amount: equal to the int or float this Money equals
+        return hash(float(self))
+
+
+# Store Money parameters as their integer cents
+sqlite3.register_adapter(Money, lambda money: money.cents)